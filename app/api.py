@@ -5,7 +5,7 @@ import os
 from pathlib import Path
 
 from app.api.endpoints import auth, monitoring, configuration, discovery
-from app.api.endpoints.monitoring import start_background_tasks
+from app.api.endpoints.monitoring import record_response_times, start_background_tasks
 from app.middleware.versioning import APIVersionMiddleware
 from app.middleware.rate_limiting import TokenRateLimitMiddleware
 
@@ -37,6 +37,9 @@ if rate_limit_config_path.exists():
 app.add_middleware(TokenRateLimitMiddleware, config=rate_limit_config)
 app.add_middleware(APIVersionMiddleware)
 
+# Time every request for the response_time history
+record_response_times(app)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(monitoring.router)
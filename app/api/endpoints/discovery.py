@@ -12,6 +12,7 @@ from pydantic import BaseModel, Field
 
 from app.core.auth import get_current_user
 from app.components.device_discovery import DeviceDiscovery
+from app.utils.broadcast_hub import get_broadcast_hub
 
 # Initialize router
 router = APIRouter(
@@ -23,8 +24,9 @@ router = APIRouter(
 # Initialize the device discovery component
 discovery = DeviceDiscovery()
 
-# Track active WebSocket connections
-active_ws_clients: Set[WebSocket] = set()
+# Scan progress is streamed on the "discovery" topic of the shared hub
+broadcast_hub = get_broadcast_hub()
+DISCOVERY_TOPIC = "discovery"
 
 # Store scan status information
 scan_statuses = {}
@@ -85,9 +87,27 @@ class DeviceList(BaseModel):
     scan_id: Optional[str] = Field(None, description="ID of the scan that discovered these devices")
     scan_time: Optional[str] = Field(None, description="Time when the scan was performed")
 
+def _publish_discovery(message_type: str, data: Dict[str, Any]):
+    """Send a discovery message to subscribed WebSocket clients."""
+    broadcast_hub.publish(DISCOVERY_TOPIC, {
+        "type": message_type,
+        "topic": DISCOVERY_TOPIC,
+        "data": data
+    })
+
+def _discovery_snapshot():
+    """Get the scans still running for new subscribers."""
+    return None, [status for status in scan_statuses.values()
+                  if status["status"] in ["starting", "in_progress"]]
+
+broadcast_hub.register_topic(DISCOVERY_TOPIC, _discovery_snapshot)
+
 # Helper function for scan progress updates
-async def update_scan_progress(scan_id: str, devices: List[Dict[str, Any]], status_message: str):
-    """Update scan progress and notify WebSocket clients."""
+def update_scan_progress(scan_id: str, devices: List[Dict[str, Any]], status_message: str):
+    """Update scan progress and notify WebSocket clients.
+
+    Safe to call from the scan thread.
+    """
     # Update scan status
     progress = 0.0
     if "complete" in status_message.lower():
@@ -111,18 +131,8 @@ async def update_scan_progress(scan_id: str, devices: List[Dict[str, Any]], stat
         "message": status_message
     }
     
-    # Notify all connected WebSocket clients
-    if active_ws_clients:
-        message = {
-            "type": "scan_update",
-            "data": scan_statuses[scan_id]
-        }
-        
-        for client in list(active_ws_clients):
-            try:
-                await client.send_json(message)
-            except Exception:
-                active_ws_clients.discard(client)
+    # Notify all subscribed WebSocket clients
+    _publish_discovery("scan_update", scan_statuses[scan_id])
 
 # API routes
 @router.post("/scan", response_model=ScanResponse)
@@ -151,29 +161,17 @@ async def start_network_scan(
         "message": "Scan is starting"
     }
     
-    # Define the progress callback
-    async def progress_callback(devices_count, status_message):
-        await update_scan_progress(scan_id, discovery.devices, status_message)
-    
     # Start the scan in the background
     def run_scan():
-        # Create an event loop for the background task
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        # Setup the progress callback to run in the background
-        async def async_progress_callback(devices_count, status_message):
-            await update_scan_progress(scan_id, discovery.devices, status_message)
-        
-        # Create a synchronous wrapper for the callback
-        def sync_callback(devices_count, status_message):
-            loop.run_until_complete(async_progress_callback(devices_count, status_message))
+        # Progress is published through the hub, which hands it to the event loop
+        def progress_callback(devices_count, status_message):
+            update_scan_progress(scan_id, discovery.devices, status_message)
         
         # Run the scan
         result_scan_id, devices = discovery.discover_devices(
             subnet=options.ip_range,
             timeout=options.timeout,
-            progress_callback=sync_callback
+            progress_callback=progress_callback
         )
         
         # Update final status
@@ -188,10 +186,7 @@ async def start_network_scan(
         scan_statuses[scan_id] = final_status
         
         # Send final notification
-        loop.run_until_complete(notify_clients_of_scan_completion(scan_id, devices))
-        
-        # Close the event loop
-        loop.close()
+        notify_clients_of_scan_completion(scan_id, devices)
     
     # Schedule the background task
     background_tasks.add_task(run_scan)
@@ -202,23 +197,13 @@ async def start_network_scan(
         "message": "Scan has been started"
     }
 
-async def notify_clients_of_scan_completion(scan_id: str, devices: List[Dict[str, Any]]):
+def notify_clients_of_scan_completion(scan_id: str, devices: List[Dict[str, Any]]):
     """Notify WebSocket clients when a scan completes."""
-    if active_ws_clients:
-        message = {
-            "type": "scan_completed",
-            "data": {
-                "scan_id": scan_id,
-                "device_count": len(devices),
-                "timestamp": datetime.now().isoformat()
-            }
-        }
-        
-        for client in list(active_ws_clients):
-            try:
-                await client.send_json(message)
-            except Exception:
-                active_ws_clients.discard(client)
+    _publish_discovery("scan_completed", {
+        "scan_id": scan_id,
+        "device_count": len(devices),
+        "timestamp": datetime.now().isoformat()
+    })
 
 @router.get("/scan/{scan_id}", response_model=ScanStatus)
 async def get_scan_status(scan_id: str, current_user = Depends(get_current_user)):
@@ -254,20 +239,10 @@ async def cancel_scan(scan_id: str, current_user = Depends(get_current_user)):
         scan_statuses[scan_id]["message"] = "Scan was cancelled by user"
         
         # Notify WebSocket clients
-        if active_ws_clients:
-            message = {
-                "type": "scan_cancelled",
-                "data": {
-                    "scan_id": scan_id,
-                    "timestamp": datetime.now().isoformat()
-                }
-            }
-            
-            for client in list(active_ws_clients):
-                try:
-                    await client.send_json(message)
-                except Exception:
-                    active_ws_clients.discard(client)
+        _publish_discovery("scan_cancelled", {
+            "scan_id": scan_id,
+            "timestamp": datetime.now().isoformat()
+        })
 
 @router.get("/devices", response_model=DeviceList)
 async def get_discovered_devices(
@@ -335,24 +310,19 @@ async def get_scheduled_scans(current_user = Depends(get_current_user)):
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time discovery updates."""
     await websocket.accept()
-    active_ws_clients.add(websocket)
+    # The snapshot carries any ongoing scans
+    client = await broadcast_hub.connect(websocket, (DISCOVERY_TOPIC,))
     
     try:
-        # Send initial data about any ongoing scans
-        for scan_id, status in scan_statuses.items():
-            if status["status"] in ["starting", "in_progress"]:
-                await websocket.send_json({
-                    "type": "scan_update",
-                    "data": status
-                })
-        
         # Wait for messages
         while True:
             data = await websocket.receive_text()
             # Handle client messages if needed
-            await websocket.send_json({
+            client.send({
                 "type": "acknowledgement",
                 "message": f"Received: {data}"
             })
     except WebSocketDisconnect:
-        active_ws_clients.discard(websocket) 
\ No newline at end of file
+        pass
+    finally:
+        await broadcast_hub.disconnect(client)
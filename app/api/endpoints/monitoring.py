@@ -7,9 +7,12 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import json
 import random
+import psutil
 
 from app.core.auth import get_current_user
 from app.utils.performance import PerformanceMonitor
+from app.utils.broadcast_hub import get_broadcast_hub
+from app.utils.timeseries import get_timeseries_store
 from app.utils.version_helpers import (
     get_api_version, 
     requires_version,
@@ -21,6 +24,31 @@ from app.components.network_topology import topology_ws_handler
 # Initialize performance monitor for real-time stats
 performance_monitor = PerformanceMonitor()
 
+# Rolled-up traffic, alert and system metrics fed by the capture pipeline
+timeseries_store = get_timeseries_store()
+
+# Historical metric name -> time-series metric
+HISTORICAL_METRICS = {
+    "packets_processed": "packets",
+    "attacks_detected": "alerts",
+    "network_throughput": "byte_rate",
+    "cpu_usage": "cpu_usage",
+    "memory_usage": "memory_usage",
+    "response_time": "response_time",
+    "arp_requests": "arp_requests",
+    "arp_replies": "arp_replies",
+    "packet_rate": "packet_rate",
+}
+
+# Historical interval name -> seconds
+HISTORICAL_INTERVALS = {
+    "1s": 1, "10s": 10, "1m": 60, "5m": 300, "15m": 900,
+    "1h": 3600, "6h": 6 * 3600, "1d": 24 * 3600
+}
+
+# Maximum data points returned by /historical
+MAX_HISTORICAL_POINTS = 2000
+
 # Create router for monitoring endpoints
 router = APIRouter(prefix="/api/v1/monitor", tags=["monitoring"])
 
@@ -66,8 +94,16 @@ class NetworkTopology(BaseModel):
     nodes: List[NetworkNode]
     edges: List[NetworkEdge]
 
-# In-memory storage for websocket connections
-active_connections: List[WebSocket] = []
+# Websocket streams; every payload is serialised once and fanned out
+broadcast_hub = get_broadcast_hub()
+
+# Topics a monitoring websocket may subscribe to, and those it starts with
+MONITORING_TOPICS = ("stats", "topology", "alerts", "discovery")
+DEFAULT_TOPICS = ("stats", "topology")
+
+# Last stats update and its version, sent to new stats subscribers
+last_stats: Optional[Dict[str, Any]] = None
+stats_version = 0
 
 # In-memory cache for alerts (in a real app, this would be in a database)
 # For demo purposes only
@@ -135,15 +171,22 @@ async def get_network_stats(
     current_user = Depends(get_current_user)
 ):
     """Get network monitoring statistics."""
-    # Get basic statistics
+    totals = timeseries_store.get_totals()
+    
+    # Rates over the last full minute
+    now = time.time()
+    last_minute = timeseries_store.query("packets", now - 60, now - 1, interval=1, max_points=60)
+    packet_rate = sum(value for _, value in last_minute) / max(len(last_minute), 1)
+    
     stats = {
-        "packets_captured": 1000,
-        "packets_analyzed": 950,
-        "alerts_triggered": 5,
-        "attack_attempts": 2,
-        "blocked_packets": 10,
-        "monitoring_time": 3600,  # seconds
-        "interfaces": ["eth0", "wlan0"],
+        "packets_captured": int(totals["packets"]),
+        "packets_analyzed": int(totals["packets"]),
+        "alerts_triggered": int(totals["alerts"]),
+        "monitoring_time": int(totals["uptime_seconds"]),  # seconds
+        "interfaces": sorted(psutil.net_if_stats().keys()),
+        "packet_rate": packet_rate,
+        "arp_requests": int(totals["arp_requests"]),
+        "arp_replies": int(totals["arp_replies"]),
         "timestamp": datetime.now().isoformat()
     }
     
@@ -159,8 +202,6 @@ async def get_network_stats(
                         "analyzed": d["packets_analyzed"]
                     },
                     "alerts": d["alerts_triggered"],
-                    "attacks": d["attack_attempts"],
-                    "blocked": d["blocked_packets"],
                     "uptime": d["monitoring_time"],
                     "interfaces": d["interfaces"],
                     "time": d["timestamp"]
@@ -171,12 +212,15 @@ async def get_network_stats(
                 "statistics": {
                     "packets": {
                         "captured": d["packets_captured"],
-                        "analyzed": d["packets_analyzed"],
-                        "blocked": d["blocked_packets"]
+                        "analyzed": d["packets_analyzed"]
                     },
                     "security": {
-                        "alerts": d["alerts_triggered"],
-                        "attacks": d["attack_attempts"]
+                        "alerts": d["alerts_triggered"]
+                    },
+                    "traffic": {
+                        "packets_per_second": d["packet_rate"],
+                        "arp_requests": d["arp_requests"],
+                        "arp_replies": d["arp_replies"]
                     },
                     "system": {
                         "uptime_seconds": d["monitoring_time"],
@@ -286,12 +330,9 @@ async def get_topology(
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time monitoring updates"""
     await websocket.accept()
-    active_connections.append(websocket)
+    client = await broadcast_hub.connect(websocket, DEFAULT_TOPICS)
     
     try:
-        # Add client to topology handler
-        topology_ws_handler.add_client(websocket)
-        
         while True:
             # Wait for messages from client
             data = await websocket.receive_text()
@@ -299,51 +340,43 @@ async def websocket_endpoint(websocket: WebSocket):
             try:
                 message = json.loads(data)
                 message_type = message.get("type", "")
+                topic = message.get("topic", "")
                 
                 # Process different message types
                 if message_type == "request_topology_update":
-                    # Client is requesting current topology data
-                    await websocket.send_json({
-                        "type": "topology_update",
-                        "data": {
-                            "devices": sample_topology.nodes,
-                            "connections": sample_topology.edges
-                        },
-                        "timestamp": datetime.now().isoformat()
-                    })
-                
-                elif message_type == "subscribe":
-                    # Client is subscribing to a topic
-                    topic = message.get("topic", "")
-                    if topic:
-                        # In a real implementation, we'd track subscriptions
-                        await websocket.send_json({
-                            "type": "subscription_confirmed",
-                            "topic": topic,
-                            "timestamp": datetime.now().isoformat()
-                        })
+                    # Resubscribing sends a fresh topology snapshot
+                    broadcast_hub.subscribe(client, "topology")
                 
-                elif message_type == "unsubscribe":
-                    # Client is unsubscribing from a topic
-                    topic = message.get("topic", "")
-                    if topic:
-                        # In a real implementation, we'd remove subscription
-                        await websocket.send_json({
-                            "type": "unsubscription_confirmed",
-                            "topic": topic,
+                elif message_type in ("subscribe", "unsubscribe"):
+                    if topic not in MONITORING_TOPICS:
+                        client.send({
+                            "type": "error",
+                            "message": f"Unknown topic: {topic}",
                             "timestamp": datetime.now().isoformat()
                         })
+                        continue
+                    if message_type == "subscribe":
+                        broadcast_hub.subscribe(client, topic)
+                        confirmation = "subscription_confirmed"
+                    else:
+                        broadcast_hub.unsubscribe(client, topic)
+                        confirmation = "unsubscription_confirmed"
+                    client.send({
+                        "type": confirmation,
+                        "topic": topic,
+                        "timestamp": datetime.now().isoformat()
+                    })
                 
                 elif message_type == "ping":
                     # Client ping
-                    await websocket.send_json({
+                    client.send({
                         "type": "pong",
                         "timestamp": datetime.now().isoformat()
                     })
                 
                 else:
                     # Unknown message type
-                    await websocket.send_json({
+                    client.send({
                         "type": "error",
                         "message": f"Unknown message type: {message_type}",
                         "timestamp": datetime.now().isoformat()
@@ -351,21 +384,33 @@ async def websocket_endpoint(websocket: WebSocket):
             
             except json.JSONDecodeError:
                 # Not a valid JSON message
-                await websocket.send_json({
+                client.send({
                     "type": "error",
                     "message": "Invalid JSON message",
                     "timestamp": datetime.now().isoformat()
                 })
                 
     except WebSocketDisconnect:
-        # Remove client from topology handler
-        topology_ws_handler.remove_client(websocket)
-        active_connections.remove(websocket)
+        pass
+    finally:
+        await broadcast_hub.disconnect(client)
+
+def _stats_snapshot():
+    """Get the last stats update for new subscribers."""
+    return stats_version, last_stats
+
+def _alerts_snapshot():
+    """Get the current alerts for new subscribers."""
+    return None, [alert.dict() for alert in sample_alerts]
+
+broadcast_hub.register_topic("stats", _stats_snapshot)
+broadcast_hub.register_topic("alerts", _alerts_snapshot)
 
 # Backend function to broadcast monitoring updates to all connected clients
 async def broadcast_monitoring_updates():
     """Send real-time updates to all connected WebSocket clients"""
-    if not active_connections:
+    global last_stats, stats_version
+    if not broadcast_hub.has_subscribers("stats"):
         return
     
     # Get current network stats
@@ -478,14 +523,12 @@ async def broadcast_monitoring_updates():
         }
     }
     
-    # Send to all connected clients
-    for connection in active_connections:
-        try:
-            await connection.send_json(stats)
-        except Exception:
-            # Remove closed connections
-            if connection in active_connections:
-                active_connections.remove(connection)
+    # Serialised once and queued for every subscriber
+    stats_version += 1
+    stats["topic"] = "stats"
+    stats["version"] = stats_version
+    last_stats = stats["data"]
+    broadcast_hub.publish("stats", stats, stats_version)
 
 # Function to start the background task for real-time updates
 def start_background_tasks(app):
@@ -493,8 +536,8 @@ def start_background_tasks(app):
     @app.on_event("startup")
     async def start_scheduler():
         """Start the background monitoring task"""
-        # Start the topology WebSocket handler update thread
-        topology_ws_handler.start_update_thread(update_interval=1.0)
+        # Start publishing topology diffs
+        topology_ws_handler.start(update_interval=0.5)
         
         # Start the monitor task
         asyncio.create_task(monitor_background_task())
@@ -502,22 +545,35 @@ def start_background_tasks(app):
     @app.on_event("shutdown")
     async def shutdown_event():
         """Clean up on shutdown"""
-        # Stop the topology WebSocket handler
-        topology_ws_handler.stop_update_thread()
+        # Stop publishing topology diffs
+        await topology_ws_handler.stop()
         
-        # Close all websocket connections
-        for connection in active_connections:
-            try:
-                await connection.close()
-            except Exception:
-                pass
+        # Persist the open time-series buckets
+        timeseries_store.close()
         
-        active_connections.clear()
+        # Close all websocket connections
+        await broadcast_hub.close()
+
+def record_response_times(app):
+    """Record how long each API request takes as the response_time gauge"""
+    @app.middleware("http")
+    async def time_request(request: Request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        timeseries_store.record_gauges(response_time=(time.perf_counter() - start) * 1000)
+        return response
 
 # Update the background task to send topology updates
 async def monitor_background_task():
     """Background task to send updates to clients"""
     while True:
+        # Sample system gauges for the historical endpoint
+        metrics = performance_monitor.get_metrics()
+        timeseries_store.record_gauges(
+            cpu_usage=metrics.get("cpu_usage"),
+            memory_usage=metrics.get("memory_usage")
+        )
+        
         # Send monitoring updates to clients
         await broadcast_monitoring_updates()
         
@@ -653,9 +709,15 @@ async def trigger_test_alert(
         description=f"Test {alert_type} alert"
     )
     
+    # Test alerts are not real detections, so they stay out of the alert history
     sample_alerts.append(new_alert)
+    broadcast_hub.publish("alerts", {
+        "type": "alert",
+        "topic": "alerts",
+        "data": new_alert.dict(),
+        "timestamp": datetime.now().isoformat()
+    })
     
-    # In a real implementation, this would trigger a notification to all clients
     return {"status": "success", "message": "Test alert triggered", "alert_id": new_alert.id}
 
 # API route for historical data analysis
@@ -665,7 +727,7 @@ async def get_historical_data(
     metric: str = Query(..., description="Metric to analyze"),
     start_date: str = Query(..., description="Start date in ISO format"),
     end_date: str = Query(..., description="End date in ISO format"),
-    interval: str = Query("1h", description="Interval for data points (1h, 6h, 1d)")
+    interval: str = Query("1h", description="Interval for data points (1s, 10s, 1m, 5m, 15m, 1h, 6h, 1d)")
 ):
     """Get historical data for analysis"""
     try:
@@ -679,48 +741,40 @@ async def get_historical_data(
         )
     
     # Validate metric
-    valid_metrics = ["packets_processed", "attacks_detected", "network_throughput", 
-                    "cpu_usage", "memory_usage", "response_time"]
+    if metric not in HISTORICAL_METRICS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid metric. Must be one of {list(HISTORICAL_METRICS)}"
+        )
     
-    if metric not in valid_metrics:
+    if interval not in HISTORICAL_INTERVALS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid metric. Must be one of {valid_metrics}"
+            detail=f"Invalid interval. Must be one of {list(HISTORICAL_INTERVALS)}"
         )
     
-    # In a real implementation, this would query a time-series database
-    # For demo purposes, generate synthetic data
-    current = start
-    data_points = []
-    
-    # Set interval in hours
-    interval_hours = 1
-    if interval == "6h":
-        interval_hours = 6
-    elif interval == "1d":
-        interval_hours = 24
-    
-    while current <= end:
-        # Generate random value for demo
-        if metric == "packets_processed":
-            value = int(time.time() * 10) % 1000 + 500
-        elif metric == "attacks_detected":
-            value = int(time.time()) % 10
-        elif metric == "network_throughput":
-            value = int(time.time() * 5) % 100 + 50
-        elif metric == "cpu_usage":
-            value = int(time.time() * 2) % 30 + 10
-        elif metric == "memory_usage":
-            value = int(time.time() * 3) % 40 + 20
-        else:  # response_time
-            value = int(time.time() * 4) % 50 + 30
-        
-        data_points.append({
-            "timestamp": current.isoformat(),
+    # Read the rolled-up buckets covering the range
+    try:
+        series = timeseries_store.query(
+            HISTORICAL_METRICS[metric],
+            start.timestamp(),
+            end.timestamp(),
+            interval=HISTORICAL_INTERVALS[interval],
+            max_points=MAX_HISTORICAL_POINTS
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{e}. Use a shorter range or a longer interval"
+        )
+    
+    data_points = [
+        {
+            "timestamp": datetime.fromtimestamp(bucket_start).isoformat(),
             "value": value
-        })
-        
-        current += timedelta(hours=interval_hours)
+        }
+        for bucket_start, value in series
+    ]
     
     return {
         "metric": metric,
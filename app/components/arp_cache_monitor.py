@@ -1,30 +1,46 @@
 import threading
 import time
+import math
 import subprocess
 import re
 import platform
 import ipaddress
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Callable, Tuple
-from scapy.all import sniff, ARP
+from typing import List, Dict, Any, Iterable, Optional, Callable, Tuple
+from scapy.all import ARP
 
 from app.utils.logger import get_logger
 from app.utils.config import get_config
 from app.components.network_scanner import NetworkScanner
+from src.core.arp_batch import ARPBatch
+from src.core.capture_engine import ENGINE_AUTO, FrameBatch, open_capture_engine
+from src.core.expiring_map import ExpiringMap
 
 # Module logger
 logger = get_logger('components.arp_cache_monitor')
 
+# ARP packets per second from one IP that count as suspicious, per alert level
+RATE_THRESHOLDS = {'low': 10, 'medium': 20, 'high': 30}
+
 class ARPCacheMonitor:
-    """Monitor ARP cache for potential spoofing attacks."""
+    """Monitor ARP cache for potential spoofing attacks.
+    
+    Packets come from one capture engine session that stays open while
+    monitoring, filtered to ARP in the kernel and delivered in batches.
+    Each IP's packet rate is an exponentially decaying count updated as its
+    packets arrive, so only the IPs in a batch are checked against the
+    threshold. Entries for IPs that go quiet are swept every check_interval
+    seconds, whether or not packets arrive.
+    """
     
     def __init__(self):
         self._monitoring = False
         self._stop_event = threading.Event()
         self._thread = None
-        self._cache = {}
+        self._engine = None
         self._alert_callback = None
         self._status_callback = None
+        self._alert_level = 'medium'
         self.config = get_config()
         self.network_scanner = NetworkScanner()
         self.alerts = []
@@ -33,6 +49,12 @@ class ARPCacheMonitor:
         self.gateway_ip, self.gateway_interface = self.network_scanner.get_default_gateway()
         self.max_alerts = self.config.get("monitor.max_alerts", 100)
         self.check_interval = self.config.get("monitor.check_interval", 5)  # seconds
+        self.capture_engine = self.config.get("monitor.capture_engine", ENGINE_AUTO)
+        # Time constant of the decaying rate counters, in seconds
+        self.rate_window = self.config.get("monitor.rate_window", 10)
+        # Seconds without packets after which an IP's entry is dropped
+        self.entry_ttl = self.config.get("monitor.entry_ttl", 600)
+        self._cache = ExpiringMap(ttl=self.entry_ttl)
         
     def start_monitoring(self, interface: Optional[str] = None,
                         alert_level: str = 'medium',
@@ -47,7 +69,7 @@ class ARPCacheMonitor:
             interface: Network interface to monitor
             alert_level: Alert level (low, medium, high)
             duration: Duration in seconds (0 for continuous)
-            check_interval: Interval between checks in seconds
+            check_interval: Interval in seconds between sweeps for idle entries
             alert_callback: Callback for alerts
             status_callback: Callback for status updates
             
@@ -59,30 +81,37 @@ class ARPCacheMonitor:
             
         self._alert_callback = alert_callback
         self._status_callback = status_callback
+        self._alert_level = alert_level
+        self.check_interval = check_interval
         self._stop_event.clear()
         self._monitoring = True
         
         def monitor_thread():
-            start_time = datetime.now()
-            
+            timer = None
+            if duration > 0:
+                timer = threading.Timer(duration, self._stop_event.set)
+                timer.daemon = True
+                timer.start()
+                
+            sweeper = threading.Thread(target=self._sweep_idle_entries, daemon=True)
+            sweeper.start()
+                
             try:
-                while not self._stop_event.is_set():
-                    if duration > 0:
-                        elapsed = (datetime.now() - start_time).total_seconds()
-                        if elapsed >= duration:
-                            break
-                            
-                    # Sniff ARP packets
-                    sniff(filter="arp", count=1, timeout=check_interval,
-                          prn=self._process_packet, store=0, iface=interface)
-                    
-                    # Check for suspicious activity
-                    self._check_cache(alert_level)
+                # One capture session for the whole run
+                self._engine = open_capture_engine(self.capture_engine, interface=interface)
+                with self._engine:
+                    self._engine.capture(self._process_frames, self._stop_event)
                     
             except Exception as e:
+                self._monitoring = False
                 if status_callback:
                     status_callback(False, f"Error during monitoring: {str(e)}")
                 return
+            finally:
+                if timer:
+                    timer.cancel()
+                # Also ends the sweeper when the capture itself stopped
+                self._stop_event.set()
                 
             if status_callback:
                 status_callback(True, "Monitoring completed")
@@ -107,46 +136,81 @@ class ARPCacheMonitor:
         """Check if monitoring is active."""
         return self._monitoring
         
+    def get_capture_stats(self) -> Dict[str, Any]:
+        """Get statistics of the capture session.
+        
+        Returns:
+            dict: Capture engine statistics, empty before monitoring starts
+        """
+        return self._engine.get_stats() if self._engine else {}
+        
+    def _process_frames(self, frames: FrameBatch):
+        """Process a batch of captured ARP frames."""
+        batch = ARPBatch.from_frames(frames)
+        batch = batch.select((batch.sender_ip != 0) & (batch.sender_mac != 0))
+        if not len(batch):
+            return
+        self._record_packets(zip(batch.format_column('sender_ip'),
+                                 batch.format_column('sender_mac'),
+                                 batch.timestamp.tolist()))
+        
     def _process_packet(self, packet):
         """Process captured ARP packet."""
         if ARP in packet:
-            ip = packet[ARP].psrc
-            mac = packet[ARP].hwsrc
+            self._record_packets([(packet[ARP].psrc, packet[ARP].hwsrc, float(packet.time))])
+            
+    def _record_packets(self, packets: Iterable[Tuple[str, str, float]]):
+        """Update the cache with (ip, mac, timestamp) packets and check the IPs seen."""
+        changed = {}
+        for ip, mac, timestamp in packets:
+            entry = changed.get(ip) or self._cache.get(ip)
+            if entry is None:
+                entry = {'mac': mac, 'first_seen': timestamp, 'last_seen': timestamp,
+                         'count': 0, 'rate_count': 0.0, 'suspicious': False}
+                self._cache[ip] = entry
+            elif ip not in changed and not self._cache.touch(ip):
+                # Expired by the sweeper since the lookup
+                self._cache[ip] = entry
+            changed[ip] = entry
             
-            if ip not in self._cache:
-                self._cache[ip] = {'mac': mac, 'first_seen': datetime.now(),
-                                 'last_seen': datetime.now(), 'count': 1}
-            else:
-                entry = self._cache[ip]
-                entry['last_seen'] = datetime.now()
-                entry['count'] += 1
+            # Decay the count to this packet's time, then add the packet
+            elapsed = max(timestamp - entry['last_seen'], 0.0)
+            entry['rate_count'] = entry['rate_count'] * math.exp(-elapsed / self.rate_window) + 1.0
+            entry['last_seen'] = max(timestamp, entry['last_seen'])
+            entry['count'] += 1
+            
+            if entry['mac'] != mac:
+                if self._alert_callback:
+                    self._alert_callback({
+                        'severity': 'HIGH',
+                        'message': f'MAC address change detected for {ip}',
+                        'source': ip,
+                        'old_mac': entry['mac'],
+                        'new_mac': mac
+                    })
+                entry['mac'] = mac
                 
-                if entry['mac'] != mac:
-                    if self._alert_callback:
-                        self._alert_callback({
-                            'severity': 'HIGH',
-                            'message': f'MAC address change detected for {ip}',
-                            'source': ip,
-                            'old_mac': entry['mac'],
-                            'new_mac': mac
-                        })
-                    entry['mac'] = mac
-                    
-    def _check_cache(self, alert_level: str):
-        """Check cache for suspicious activity."""
-        now = datetime.now()
+        self._check_rates(changed, self._alert_level)
+        
+    def _sweep_idle_entries(self):
+        """Expire idle cache entries every check_interval until monitoring stops."""
+        while not self._stop_event.wait(self.check_interval):
+            self._cache.expire()
+            
+    def _check_rates(self, entries: Dict[str, Dict[str, Any]], alert_level: str):
+        """Check the packet rates of IPs that just sent packets."""
+        threshold = RATE_THRESHOLDS.get(alert_level, RATE_THRESHOLDS['medium'])
         suspicious_ips = []
         
-        for ip, entry in self._cache.items():
-            # Check for rapid ARP requests
-            time_window = (now - entry['first_seen']).total_seconds()
-            if time_window > 0:
-                rate = entry['count'] / time_window
-                
-                if ((alert_level == 'low' and rate > 10) or
-                    (alert_level == 'medium' and rate > 20) or
-                    (alert_level == 'high' and rate > 30)):
+        for ip, entry in entries.items():
+            rate = self.get_rate(entry)
+            if rate > threshold:
+                # Alert once per burst rather than on every batch
+                if not entry['suspicious']:
+                    entry['suspicious'] = True
                     suspicious_ips.append(ip)
+            elif rate < threshold / 2:
+                entry['suspicious'] = False
                     
         # Report suspicious activity
         if suspicious_ips and self._alert_callback:
@@ -155,6 +219,21 @@ class ARPCacheMonitor:
                 'message': 'Suspicious ARP activity detected',
                 'sources': suspicious_ips
             })
+            
+    def get_rate(self, entry: Dict[str, Any], now: Optional[float] = None) -> float:
+        """Get the recent packet rate of a cache entry.
+        
+        Args:
+            entry: Cache entry
+            now: Time to decay the rate to; the entry's last packet if None
+            
+        Returns:
+            float: Packets per second over roughly the last rate_window seconds
+        """
+        count = entry['rate_count']
+        if now is not None and now > entry['last_seen']:
+            count *= math.exp(-(now - entry['last_seen']) / self.rate_window)
+        return count / self.rate_window
     
     def set_alert_thresholds(self, level: str):
         """Set alert thresholds based on sensitivity level.
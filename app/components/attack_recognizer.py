@@ -1,46 +1,352 @@
 import re
 import time
+import queue
 import threading
-from typing import Dict, List, Any, Optional, Callable, Set, Tuple
+from itertools import islice
+from typing import Dict, List, Any, Optional, Callable, Set, Tuple, Hashable, Iterable
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+from collections import defaultdict, deque, Counter
+from urllib.parse import unquote
 
 from app.utils.logger import get_logger
-from app.utils.database import get_database
+from app.utils.signature_engine import get_web_signature_engine
 
 # Module logger
 logger = get_logger('components.attack_recognizer')
 
+# Seconds of traffic each pattern keeps in its sliding window
+DEFAULT_WINDOW = 300
+
+ARP_REPLY_RE = re.compile(r"([0-9.]+) is-at ([0-9a-f:]+)", re.IGNORECASE)
+DNS_DOMAIN_RE = re.compile(r"query response [A|AAAA]+ ([a-zA-Z0-9.-]+)")
+DNS_ANSWER_RE = re.compile(r"A ([0-9.]+)")
+
+# TCP flag names by the single letters PacketAnalyzer writes ('SA', 'S')
+TCP_FLAG_LETTERS = {'F': 'FIN', 'S': 'SYN', 'R': 'RST', 'P': 'PSH',
+                    'A': 'ACK', 'U': 'URG', 'E': 'ECE', 'C': 'CWR'}
+TCP_FLAG_NAMES = set(TCP_FLAG_LETTERS.values())
+
+
+def packet_time(packet: Dict[str, Any]) -> float:
+    """Get a packet's capture time in seconds since the epoch.
+
+    Args:
+        packet: Packet dictionary with a 'timestamp' or 'time' field
+
+    Returns:
+        float: Capture time, or the current time if the packet has none
+    """
+    value = packet.get('timestamp', packet.get('time'))
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    return time.time()
+
+
+def tcp_flags(packet: Dict[str, Any]) -> Set[str]:
+    """Get the names of a packet's TCP flags.
+
+    Args:
+        packet: Packet dictionary whose 'flags' are either names ('SYN ACK')
+            or single letters as written by PacketAnalyzer ('SA')
+
+    Returns:
+        set: Flag names such as 'SYN' and 'ACK'
+    """
+    flags = str(packet.get('flags') or '').upper()
+    names = {token for token in re.split(r'[^A-Z]+', flags) if token}
+    if names and names <= TCP_FLAG_NAMES:
+        return names
+    return {TCP_FLAG_LETTERS[letter] for letter in flags if letter in TCP_FLAG_LETTERS}
+
+
+class KeyWindow:
+    """Events recorded for one key of a sliding window.
+
+    Each event carries a tuple of (name, value) facets. Per-name counters
+    are updated as events enter and leave the window, so distinct counts
+    never require a rescan.
+    """
+
+    __slots__ = ('events', 'counters')
+
+    def __init__(self):
+        """Initialize an empty key window."""
+        self.events = deque()  # (timestamp, packet_id, facets)
+        self.counters = defaultdict(Counter)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def first(self) -> float:
+        """Timestamp of the oldest event."""
+        return self.events[0][0]
+
+    @property
+    def last(self) -> float:
+        """Timestamp of the newest event."""
+        return self.events[-1][0]
+
+    def add(self, timestamp: float, packet_id: Any, facets: Tuple = ()):
+        """Record an event."""
+        self.events.append((timestamp, packet_id, facets))
+        for name, value in facets:
+            self.counters[name][value] += 1
+
+    def expire(self, cutoff: float):
+        """Drop events older than cutoff."""
+        events = self.events
+        while events and events[0][0] < cutoff:
+            _, _, facets = events.popleft()
+            for name, value in facets:
+                counter = self.counters[name]
+                counter[value] -= 1
+                if counter[value] <= 0:
+                    del counter[value]
+
+    def unique(self, name: str) -> int:
+        """Number of distinct values seen for a facet."""
+        return len(self.counters.get(name, ()))
+
+    def values(self, name: str) -> List[Any]:
+        """Distinct values seen for a facet."""
+        return list(self.counters.get(name, ()))
+
+    def evidence_ids(self, limit: int = 10) -> List[Any]:
+        """IDs of the oldest packets still in the window."""
+        ids = (packet_id for _, packet_id, _ in self.events if packet_id is not None)
+        return list(islice(ids, limit))
+
+
+class SlidingWindow:
+    """Keyed events covering the last `window` seconds of traffic."""
+
+    def __init__(self, window: float = DEFAULT_WINDOW):
+        """Initialize the window.
+
+        Args:
+            window: Seconds of traffic to keep
+        """
+        self.window = window
+        self.keys: Dict[Hashable, KeyWindow] = {}
+        self.newest: Optional[float] = None
+        # (timestamp, key) in arrival order, so expiry only visits old events
+        self._order = deque()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def get(self, key: Hashable) -> Optional[KeyWindow]:
+        """Get the events for a key, if any are still in the window."""
+        return self.keys.get(key)
+
+    def add(self, key: Hashable, timestamp: float, packet_id: Any = None, facets: Tuple = ()):
+        """Record an event for a key."""
+        entry = self.keys.get(key)
+        if entry is None:
+            entry = self.keys[key] = KeyWindow()
+        entry.add(timestamp, packet_id, facets)
+        self._order.append((timestamp, key))
+        if self.newest is None or timestamp > self.newest:
+            self.newest = timestamp
+
+    def expire(self) -> List[Hashable]:
+        """Drop events that fell out of the window.
+
+        Returns:
+            List of keys that no longer have any events
+        """
+        if self.newest is None:
+            return []
+        cutoff = self.newest - self.window
+        removed = []
+        while self._order and self._order[0][0] < cutoff:
+            _, key = self._order.popleft()
+            entry = self.keys.get(key)
+            if entry is None:
+                continue
+            entry.expire(cutoff)
+            if not entry:
+                del self.keys[key]
+                removed.append(key)
+        return removed
+
+
 class AttackPattern:
-    """Base class for attack pattern definitions."""
-    
-    def __init__(self, name: str, description: str, severity: str = "medium"):
+    """Base class for attack pattern definitions.
+
+    Patterns are streaming detectors. observe() maps each packet to the
+    keyed events it adds to a sliding window, evaluate() checks a single
+    key and report() turns the findings into an attack result. update()
+    runs this for one live packet and only evaluates the keys it touched;
+    analyze() feeds a list of packets through a fresh window.
+    """
+
+    def __init__(self, name: str, description: str, severity: str = "medium",
+                 window: float = DEFAULT_WINDOW):
         """Initialize the attack pattern.
-        
+
         Args:
             name: Name of the attack pattern
             description: Description of the attack
             severity: Severity level (low, medium, high, critical)
+            window: Seconds of traffic kept for detection
         """
         self.name = name
         self.description = description
         self.severity = severity
-        
+        self.window = window
+        self.cooldown = window  # Seconds before a reported key is reported again
+
+        # Streaming state
+        self.state = SlidingWindow(window)
+        self._reported: Dict[Hashable, float] = {}
+
+        # Statistics
+        self.packets_processed = 0
+        self.cpu_time = 0.0
+        self.detections = 0
+
+    def observe(self, packet: Dict[str, Any], timestamp: float) -> Iterable[Tuple[Hashable, Optional[Tuple]]]:
+        """Map a packet to the events it adds.
+
+        Args:
+            packet: Packet dictionary
+            timestamp: Packet capture time in seconds
+
+        Returns:
+            (key, facets) pairs. A facets value of None marks the key for
+            evaluation without adding an event.
+        """
+        # To be implemented by subclasses
+        return ()
+
+    def evaluate(self, state: SlidingWindow, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Check one key of the window for the attack.
+
+        Args:
+            state: Sliding window holding the key
+            key: Key to check
+
+        Returns:
+            None if the key is not suspicious, or a finding dict
+        """
+        # To be implemented by subclasses
+        return None
+
+    def report(self, findings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the attack result from findings.
+
+        Args:
+            findings: Non-empty list of findings from evaluate()
+
+        Returns:
+            Dict with attack details
+        """
+        return {
+            'type': self.name.lower().replace(' ', '_'),
+            'name': self.name,
+            'description': self.description,
+            'severity': self.severity,
+            'findings': findings
+        }
+
+    def update(self, packet: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Add a live packet and check the keys it touched.
+
+        Keys already reported within the cooldown are not evaluated again.
+
+        Args:
+            packet: Packet dictionary
+
+        Returns:
+            None if no new attack detected, or a dict with attack details
+        """
+        start = time.thread_time()
+        try:
+            timestamp, touched = self._ingest(self.state, packet)
+            for key in self.state.expire():
+                self._reported.pop(key, None)
+
+            findings = []
+            for key in touched:
+                reported = self._reported.get(key)
+                if reported is not None and timestamp - reported < self.cooldown:
+                    continue
+                finding = self.evaluate(self.state, key)
+                if finding:
+                    findings.append(finding)
+                    self._reported[key] = timestamp
+
+            if not findings:
+                return None
+            self.detections += 1
+            return self.report(findings)
+        finally:
+            self.cpu_time += time.thread_time() - start
+            self.packets_processed += 1
+
     def analyze(self, packets: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Analyze packets for the attack pattern.
-        
+
+        The packets go through a fresh window, so the live state used by
+        update() is left untouched.
+
         Args:
             packets: List of packet dictionaries
-            
+
         Returns:
             None if no attack detected, or a dict with attack details
         """
-        # To be implemented by subclasses
-        return None
-        
+        state = SlidingWindow(self.window)
+        for packet in packets:
+            self._ingest(state, packet)
+            state.expire()
+
+        findings = []
+        for key in list(state.keys):
+            finding = self.evaluate(state, key)
+            if finding:
+                findings.append(finding)
+        return self.report(findings) if findings else None
+
+    def _ingest(self, state: SlidingWindow, packet: Dict[str, Any]) -> Tuple[float, List[Hashable]]:
+        """Record a packet's events and return the keys to evaluate."""
+        timestamp = packet_time(packet)
+        touched = []
+        for key, facets in self.observe(packet, timestamp):
+            if facets is not None:
+                state.add(key, timestamp, packet.get('id'), facets)
+            if key not in touched:
+                touched.append(key)
+        return timestamp, touched
+
+    def reset(self):
+        """Clear the live window and reported keys."""
+        self.state = SlidingWindow(self.window)
+        self._reported.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get processing statistics for this pattern.
+
+        Returns:
+            Dictionary with packet count, CPU time and window size
+        """
+        return {
+            'name': self.name,
+            'packets_processed': self.packets_processed,
+            'cpu_time': self.cpu_time,
+            'cpu_time_per_packet_us': (self.cpu_time / self.packets_processed * 1e6
+                                       if self.packets_processed else 0.0),
+            'detections': self.detections,
+            'tracked_keys': len(self.state)
+        }
+
     def get_details(self) -> Dict[str, str]:
         """Get basic details about this attack pattern.
-        
+
         Returns:
             Dictionary with pattern details
         """
@@ -51,9 +357,14 @@ class AttackPattern:
         }
 
 
+def _as_datetime(timestamp: float) -> datetime:
+    """Convert a window timestamp back to a datetime for reports."""
+    return datetime.fromtimestamp(timestamp)
+
+
 class ARPSpoofPattern(AttackPattern):
     """Detects ARP spoofing attacks."""
-    
+
     def __init__(self):
         """Initialize the ARP spoof pattern recognizer."""
         super().__init__(
@@ -61,79 +372,51 @@ class ARPSpoofPattern(AttackPattern):
             description="Detects ARP poisoning attacks where an attacker associates their MAC address with another host's IP",
             severity="high"
         )
-        
-    def analyze(self, packets: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Analyze packets for ARP spoofing patterns.
-        
-        Args:
-            packets: List of packet dictionaries
-            
-        Returns:
-            None if no attack detected, or a dict with attack details
-        """
-        # Group ARP responses by IP to see if multiple MACs claim the same IP
-        ip_to_macs = defaultdict(set)
-        
-        # Track timestamps for the first and last occurrence
-        first_seen = None
-        last_seen = None
-        evidence_packets = []
-        
-        for packet in packets:
-            # Only look at ARP packets
-            if packet['protocol'] != 'ARP':
-                continue
-                
-            # ARP responses (is-at)
-            if 'is-at' in packet['info']:
-                # Parse IP and MAC from packet info
-                match = re.search(r"([0-9.]+) is-at ([0-9a-f:]+)", packet['info'], re.IGNORECASE)
-                if match:
-                    ip = match.group(1)
-                    mac = match.group(2)
-                    
-                    # Save first and last timestamps
-                    if first_seen is None:
-                        first_seen = packet['timestamp']
-                    last_seen = packet['timestamp']
-                    
-                    # Add the MAC for this IP
-                    ip_to_macs[ip].add(mac)
-                    
-                    # If we've seen multiple MACs for this IP, save as evidence
-                    if len(ip_to_macs[ip]) > 1:
-                        evidence_packets.append(packet)
-        
-        # Check for IPs with multiple MAC addresses
-        suspicious_ips = []
-        for ip, macs in ip_to_macs.items():
-            if len(macs) > 1:
-                suspicious_ips.append({
-                    'ip': ip,
-                    'macs': list(macs)
-                })
-        
-        # No suspicious activity found
-        if not suspicious_ips:
+
+    def observe(self, packet, timestamp):
+        """Record the MAC claimed for an IP by each ARP reply."""
+        # Only look at ARP responses (is-at)
+        info = packet.get('info', '')
+        if packet.get('protocol') != 'ARP' or 'is-at' not in info:
+            return ()
+
+        match = ARP_REPLY_RE.search(info)
+        if not match:
+            return ()
+        return ((match.group(1), (('mac', match.group(2)),)),)
+
+    def evaluate(self, state, key):
+        """Flag an IP claimed by more than one MAC address."""
+        entry = state.get(key)
+        if entry is None or entry.unique('mac') < 2:
             return None
-            
-        # Return attack details
+        return {
+            'ip': key,
+            'macs': entry.values('mac'),
+            'first_seen': _as_datetime(entry.first),
+            'last_seen': _as_datetime(entry.last),
+            'evidence_ids': entry.evidence_ids()
+        }
+
+    def report(self, findings):
+        """Build the ARP spoofing result."""
+        evidence_ids = [pid for f in findings for pid in f['evidence_ids']]
         return {
             'type': 'arp_spoofing',
             'name': self.name,
             'description': self.description,
             'severity': self.severity,
-            'first_seen': first_seen,
-            'last_seen': last_seen,
-            'suspicious_ips': suspicious_ips,
-            'evidence_count': len(evidence_packets),
-            'evidence_ids': [p['id'] for p in evidence_packets][:10]  # First 10 evidence packets
+            'first_seen': min(f['first_seen'] for f in findings),
+            'last_seen': max(f['last_seen'] for f in findings),
+            'suspicious_ips': [{'ip': f['ip'], 'macs': f['macs']} for f in findings],
+            'evidence_count': len(evidence_ids),
+            'evidence_ids': evidence_ids[:10]  # First 10 evidence packets
         }
 
 
 class PortScanPattern(AttackPattern):
     """Detects port scanning attacks."""
-    
+
     def __init__(self):
         """Initialize the port scan pattern recognizer."""
         super().__init__(
@@ -144,98 +427,65 @@ class PortScanPattern(AttackPattern):
         # Configuration
         self.min_ports = 10  # Minimum number of ports scanned to trigger detection
         self.time_window = 60  # Time window in seconds to consider a port scan
-        
-    def analyze(self, packets: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Analyze packets for port scanning patterns.
-        
-        Args:
-            packets: List of packet dictionaries
-            
-        Returns:
-            None if no attack detected, or a dict with attack details
-        """
-        # Track connections (src_ip, dst_ip, dst_port) within time windows
-        scanner_profiles = defaultdict(lambda: defaultdict(set))  # src_ip -> dst_ip -> set(ports)
-        scanner_packet_counts = defaultdict(int)  # src_ip -> packet_count
-        scanner_first_seen = {}  # src_ip -> first_timestamp
-        scanner_last_seen = {}  # src_ip -> last_timestamp
-        scanner_evidence = defaultdict(list)  # src_ip -> list of evidence packet IDs
-        
-        # Only consider SYN packets (for TCP) or initial UDP packets
-        for packet in packets:
-            if packet['protocol'] not in ('TCP', 'UDP'):
-                continue
-                
-            # For TCP, only count SYN packets (scan attempts)
-            if packet['protocol'] == 'TCP' and 'SYN' not in packet.get('flags', ''):
-                continue
-                
-            src_ip = packet.get('src_ip')
-            dst_ip = packet.get('dst_ip')
-            dst_port = packet.get('dst_port')
-            
-            if not all([src_ip, dst_ip, dst_port]):
-                continue
-                
-            # Update scanner profile
-            scanner_profiles[src_ip][dst_ip].add(dst_port)
-            scanner_packet_counts[src_ip] += 1
-            
-            # Track timestamps
-            if src_ip not in scanner_first_seen:
-                scanner_first_seen[src_ip] = packet['timestamp']
-            scanner_last_seen[src_ip] = packet['timestamp']
-            
-            # Save packet ID as evidence
-            if len(scanner_evidence[src_ip]) < 20:  # Limit to 20 packets
-                scanner_evidence[src_ip].append(packet['id'])
-        
-        # Identify port scanning behavior
-        scanners = []
-        
-        for src_ip, dst_profiles in scanner_profiles.items():
-            # Get time frame for this potential scanner
-            first_seen = scanner_first_seen[src_ip]
-            last_seen = scanner_last_seen[src_ip]
-            
-            # Skip if time window is too large
-            time_diff = (last_seen - first_seen).total_seconds()
-            if time_diff > self.time_window and len(scanner_profiles[src_ip]) < 5:
-                continue
-                
-            # Calculate total unique ports scanned across all destinations
-            total_unique_ports = sum(len(ports) for ports in dst_profiles.values())
-            
-            # Check if enough ports were scanned
-            if total_unique_ports >= self.min_ports:
-                scanners.append({
-                    'src_ip': src_ip,
-                    'targets': [
-                        {'ip': dst_ip, 'port_count': len(ports)} 
-                        for dst_ip, ports in dst_profiles.items()
-                    ],
-                    'unique_port_count': total_unique_ports,
-                    'packet_count': scanner_packet_counts[src_ip],
-                    'first_seen': first_seen,
-                    'last_seen': last_seen,
-                    'duration_seconds': time_diff,
-                    'evidence_ids': scanner_evidence[src_ip]
-                })
-        
-        # No port scanning activity detected
-        if not scanners:
+
+    def observe(self, packet, timestamp):
+        """Record the ports probed by each source."""
+        protocol = packet.get('protocol')
+        if protocol not in ('TCP', 'UDP'):
+            return ()
+
+        # For TCP, only count SYN packets (scan attempts)
+        if protocol == 'TCP' and 'SYN' not in tcp_flags(packet):
+            return ()
+
+        src_ip = packet.get('src_ip')
+        dst_ip = packet.get('dst_ip')
+        dst_port = packet.get('dst_port')
+        if not all([src_ip, dst_ip, dst_port]):
+            return ()
+
+        return ((src_ip, (('port', (dst_ip, dst_port)), ('target', dst_ip))),)
+
+    def evaluate(self, state, src_ip):
+        """Flag a source that probed enough ports."""
+        entry = state.get(src_ip)
+        if entry is None:
             return None
-            
-        # Return attack details - focus on the most significant scanner
-        most_active_scanner = max(scanners, key=lambda x: x['unique_port_count'])
-        
+
+        # Skip if the probes are spread out over too long a time
+        time_diff = entry.last - entry.first
+        if time_diff > self.time_window and entry.unique('target') < 5:
+            return None
+
+        # Total unique ports scanned across all destinations
+        total_unique_ports = entry.unique('port')
+        if total_unique_ports < self.min_ports:
+            return None
+
+        ports_per_target = Counter(dst_ip for dst_ip, _ in entry.counters['port'])
+        return {
+            'src_ip': src_ip,
+            'targets': [
+                {'ip': dst_ip, 'port_count': count}
+                for dst_ip, count in ports_per_target.items()
+            ],
+            'unique_port_count': total_unique_ports,
+            'packet_count': len(entry),
+            'first_seen': _as_datetime(entry.first),
+            'last_seen': _as_datetime(entry.last),
+            'duration_seconds': time_diff,
+            'evidence_ids': entry.evidence_ids(20)
+        }
+
+    def report(self, scanners):
+        """Build the port scanning result, focused on the most active scanner."""
         return {
             'type': 'port_scanning',
             'name': self.name,
             'description': self.description,
             'severity': self.severity,
             'scanners': scanners,
-            'most_active': most_active_scanner,
+            'most_active': max(scanners, key=lambda x: x['unique_port_count']),
             'first_seen': min(s['first_seen'] for s in scanners),
             'last_seen': max(s['last_seen'] for s in scanners),
             'evidence_count': sum(len(s['evidence_ids']) for s in scanners),
@@ -244,7 +494,7 @@ class PortScanPattern(AttackPattern):
 
 class DDoSPattern(AttackPattern):
     """Detects distributed denial of service attacks."""
-    
+
     def __init__(self):
         """Initialize the DDoS pattern recognizer."""
         super().__init__(
@@ -255,78 +505,49 @@ class DDoSPattern(AttackPattern):
         # Configuration
         self.threshold_packets_per_second = 100  # Packets per second threshold
         self.min_unique_sources = 3  # Minimum unique source IPs to consider DDoS
-        
-    def analyze(self, packets: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Analyze packets for DDoS patterns.
-        
-        Args:
-            packets: List of packet dictionaries
-            
-        Returns:
-            None if no attack detected, or a dict with attack details
-        """
-        # Group packets by destination IP
-        dest_packets = defaultdict(list)
-        
-        for packet in packets:
-            dst_ip = packet.get('dst_ip')
-            if dst_ip:
-                dest_packets[dst_ip].append(packet)
-                
-        # Analyze traffic patterns for each destination
-        ddos_targets = []
-        
-        for dst_ip, target_packets in dest_packets.items():
-            # Skip if too few packets
-            if len(target_packets) < 50:
-                continue
-                
-            # Get time frame
-            timestamps = [p['timestamp'] for p in target_packets]
-            first_seen = min(timestamps)
-            last_seen = max(timestamps)
-            
-            # Calculate duration in seconds
-            duration = (last_seen - first_seen).total_seconds()
-            if duration < 1:
-                duration = 1  # Avoid division by zero
-                
-            # Calculate packets per second
-            pps = len(target_packets) / duration
-            
-            # Count unique source IPs
-            src_ips = set(p.get('src_ip') for p in target_packets if p.get('src_ip'))
-            
-            # Check if traffic exceeds threshold and has multiple sources
-            if pps >= self.threshold_packets_per_second and len(src_ips) >= self.min_unique_sources:
-                # Calculate protocol distribution
-                protocols = Counter(p.get('protocol') for p in target_packets)
-                
-                # Identify most common source ports (potential reflection attack indicators)
-                src_ports = Counter(p.get('src_port') for p in target_packets if p.get('src_port'))
-                common_ports = src_ports.most_common(5)
-                
-                ddos_targets.append({
-                    'dst_ip': dst_ip,
-                    'packet_count': len(target_packets),
-                    'unique_sources': len(src_ips),
-                    'duration_seconds': duration,
-                    'packets_per_second': pps,
-                    'first_seen': first_seen,
-                    'last_seen': last_seen,
-                    'protocols': dict(protocols),
-                    'common_src_ports': common_ports,
-                    'evidence_ids': [p['id'] for p in target_packets[:10]]  # First 10 packets as evidence
-                })
-                
-        # No DDoS targets identified
-        if not ddos_targets:
+        self.min_packets = 50  # Minimum packets to a target before checking rates
+
+    def observe(self, packet, timestamp):
+        """Record traffic per destination."""
+        dst_ip = packet.get('dst_ip')
+        if not dst_ip:
+            return ()
+
+        facets = [('protocol', packet.get('protocol'))]
+        if packet.get('src_ip'):
+            facets.append(('src', packet['src_ip']))
+        if packet.get('src_port'):
+            facets.append(('src_port', packet['src_port']))
+        return ((dst_ip, tuple(facets)),)
+
+    def evaluate(self, state, dst_ip):
+        """Flag a destination receiving a high rate from many sources."""
+        entry = state.get(dst_ip)
+        if entry is None or len(entry) < self.min_packets:
             return None
-            
-        # Sort targets by packets per second (most severe first)
+
+        duration = max(entry.last - entry.first, 1)  # Avoid division by zero
+        pps = len(entry) / duration
+        if pps < self.threshold_packets_per_second or entry.unique('src') < self.min_unique_sources:
+            return None
+
+        return {
+            'dst_ip': dst_ip,
+            'packet_count': len(entry),
+            'unique_sources': entry.unique('src'),
+            'duration_seconds': duration,
+            'packets_per_second': pps,
+            'first_seen': _as_datetime(entry.first),
+            'last_seen': _as_datetime(entry.last),
+            'protocols': dict(entry.counters['protocol']),
+            # Most common source ports (potential reflection attack indicators)
+            'common_src_ports': entry.counters['src_port'].most_common(5),
+            'evidence_ids': entry.evidence_ids()
+        }
+
+    def report(self, ddos_targets):
+        """Build the DDoS result, most severe target first."""
         ddos_targets.sort(key=lambda x: x['packets_per_second'], reverse=True)
-        
-        # Return attack details
         return {
             'type': 'ddos',
             'name': self.name,
@@ -341,7 +562,7 @@ class DDoSPattern(AttackPattern):
 
 class DNSPoisoningPattern(AttackPattern):
     """Detects DNS poisoning attacks."""
-    
+
     def __init__(self):
         """Initialize the DNS poisoning pattern recognizer."""
         super().__init__(
@@ -349,87 +570,50 @@ class DNSPoisoningPattern(AttackPattern):
             description="Detects potential DNS poisoning attempts with conflicting DNS responses",
             severity="high"
         )
-        
-    def analyze(self, packets: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Analyze packets for DNS poisoning patterns.
-        
-        Args:
-            packets: List of packet dictionaries
-            
-        Returns:
-            None if no attack detected, or a dict with attack details
-        """
-        # Track DNS responses by domain name
-        dns_responses = defaultdict(list)  # domain -> list of (ip, response_packet)
-        dns_servers = defaultdict(set)  # domain -> set of dns_server_ips
-        
-        for packet in packets:
-            # Only interested in DNS responses
-            if packet.get('protocol') != 'DNS' or 'response' not in packet.get('info', '').lower():
-                continue
-                
-            # Try to extract domain and response IP from info
-            info = packet.get('info', '')
-            
-            # Parse domain and IP from known formats
-            domain = None
-            response_ip = None
-            
-            # Extract domain from DNS query info (e.g., "Standard query response A example.com")
-            domain_match = re.search(r"query response [A|AAAA]+ ([a-zA-Z0-9.-]+)", info)
-            if domain_match:
-                domain = domain_match.group(1)
-                
-            # Extract IP from DNS response (e.g., "A 192.168.1.1")
-            ip_match = re.search(r"A ([0-9.]+)", info)
-            if ip_match:
-                response_ip = ip_match.group(1)
-                
-            # Skip if we couldn't extract the necessary info
-            if not domain or not response_ip:
-                continue
-                
-            # Record DNS server IP
-            dns_server_ip = packet.get('src_ip')
-            if dns_server_ip:
-                dns_servers[domain].add(dns_server_ip)
-                
-            # Add response to our tracking
-            dns_responses[domain].append({
-                'ip': response_ip,
-                'packet_id': packet['id'],
-                'timestamp': packet['timestamp'],
-                'dns_server': dns_server_ip
-            })
-        
-        # Look for domains with conflicting responses
-        suspicious_domains = []
-        
-        for domain, responses in dns_responses.items():
-            # Skip if only one response
-            if len(responses) <= 1:
-                continue
-                
-            # Get unique IPs for this domain
-            unique_ips = set(r['ip'] for r in responses)
-            
-            # If multiple different IPs were returned for the same domain
-            if len(unique_ips) > 1:
-                suspicious_domains.append({
-                    'domain': domain,
-                    'responses': responses,
-                    'unique_ips': list(unique_ips),
-                    'dns_servers': list(dns_servers[domain]),
-                    'first_seen': min(r['timestamp'] for r in responses),
-                    'last_seen': max(r['timestamp'] for r in responses),
-                    'evidence_ids': [r['packet_id'] for r in responses]
-                })
-                
-        # No suspicious DNS activity found
-        if not suspicious_domains:
+
+    def observe(self, packet, timestamp):
+        """Record the address returned for each domain."""
+        # Only interested in DNS responses
+        info = packet.get('info', '')
+        if packet.get('protocol') != 'DNS' or 'response' not in info.lower():
+            return ()
+
+        # Extract domain (e.g., "Standard query response A example.com") and IP (e.g., "A 192.168.1.1")
+        domain_match = DNS_DOMAIN_RE.search(info)
+        ip_match = DNS_ANSWER_RE.search(info)
+        if not domain_match or not ip_match:
+            return ()
+
+        return ((domain_match.group(1), (('ip', ip_match.group(1)), ('dns_server', packet.get('src_ip')))),)
+
+    def evaluate(self, state, domain):
+        """Flag a domain that resolved to conflicting addresses."""
+        entry = state.get(domain)
+        if entry is None or len(entry) <= 1 or entry.unique('ip') <= 1:
             return None
-            
-        # Return attack details
+
+        responses = []
+        for timestamp, packet_id, facets in entry.events:
+            response = dict(facets)
+            responses.append({
+                'ip': response['ip'],
+                'packet_id': packet_id,
+                'timestamp': _as_datetime(timestamp),
+                'dns_server': response['dns_server']
+            })
+
+        return {
+            'domain': domain,
+            'responses': responses,
+            'unique_ips': entry.values('ip'),
+            'dns_servers': [ip for ip in entry.values('dns_server') if ip],
+            'first_seen': _as_datetime(entry.first),
+            'last_seen': _as_datetime(entry.last),
+            'evidence_ids': [r['packet_id'] for r in responses]
+        }
+
+    def report(self, suspicious_domains):
+        """Build the DNS poisoning result."""
         return {
             'type': 'dns_poisoning',
             'name': self.name,
@@ -444,7 +628,7 @@ class DNSPoisoningPattern(AttackPattern):
 
 class MitMPattern(AttackPattern):
     """Detects Man-in-the-Middle attacks based on network traffic patterns."""
-    
+
     def __init__(self):
         """Initialize the MitM pattern recognizer."""
         super().__init__(
@@ -452,108 +636,111 @@ class MitMPattern(AttackPattern):
             description="Detects potential Man-in-the-Middle attacks through traffic redirection patterns",
             severity="critical"
         )
-        
-    def analyze(self, packets: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Analyze packets for MitM attack indicators.
-        
-        Args:
-            packets: List of packet dictionaries
-            
-        Returns:
-            None if no attack detected, or a dict with attack details
-        """
-        # Track normal traffic flows
-        flows = defaultdict(list)  # (src_ip, dst_ip) -> list of packets
-        
-        # Track redirected traffic anomalies
-        redirected_flows = []
-        evidence_packets = []
-        first_seen = None
-        last_seen = None
-        
-        # Identify traffic flow patterns
-        for packet in packets:
-            if 'src_ip' not in packet or 'dst_ip' not in packet:
-                continue
-                
-            src_ip = packet['src_ip']
-            dst_ip = packet['dst_ip']
-            
-            # Update timestamp tracking
-            if first_seen is None:
-                first_seen = packet['timestamp']
-            last_seen = packet['timestamp']
-            
-            # Only consider TCP and UDP
-            if packet['protocol'] not in ('TCP', 'UDP'):
-                continue
-                
-            # Add to flow tracking
-            flows[(src_ip, dst_ip)].append(packet)
-            
-            # Look for TTL anomalies that might indicate redirection
-            if 'ttl' in packet and packet['ttl'] < 5:  # Very low TTL can indicate redirection
-                evidence_packets.append(packet)
-        
-        # Look for asymmetric routing (sign of potential MitM)
-        for (src_ip, dst_ip), packets_in_flow in flows.items():
-            # Check if there's a reverse flow
-            if (dst_ip, src_ip) in flows:
-                forward_path = {p.get('src_mac', '') for p in packets_in_flow}
-                reverse_path = {p.get('dst_mac', '') for p in flows[(dst_ip, src_ip)]}
-                
-                # If the MAC addresses in the path don't match expectations, it could be MitM
-                if len(forward_path) > 1 or len(reverse_path) > 1:
-                    redirected_flows.append({
-                        'src_ip': src_ip,
-                        'dst_ip': dst_ip,
-                        'forward_macs': list(forward_path),
-                        'reverse_macs': list(reverse_path),
-                        'packet_count': len(packets_in_flow)
-                    })
-                    evidence_packets.extend(packets_in_flow[:5])  # Add some evidence
-        
-        # Check for ICMP redirects (another MitM technique)
-        icmp_redirects = [p for p in packets if p['protocol'] == 'ICMP' and 'redirect' in p.get('info', '').lower()]
-        if icmp_redirects:
-            redirected_flows.append({
-                'type': 'icmp_redirect',
-                'count': len(icmp_redirects),
-                'sources': list(set(p.get('src_ip', '') for p in icmp_redirects))
-            })
-            evidence_packets.extend(icmp_redirects[:5])
-            
+        self.min_ssl_issues = 4  # TLS alerts needed on their own to report
+
+    def observe(self, packet, timestamp):
+        """Record flows, ICMP redirects and TLS errors."""
+        protocol = packet.get('protocol')
+        info = packet.get('info', '').lower()
+
+        # ICMP redirects (another MitM technique)
+        if protocol == 'ICMP' and 'redirect' in info:
+            return (('icmp_redirect', (('src', packet.get('src_ip', '')),)),)
+
         # SSL/TLS issues that might indicate MitM
-        ssl_issues = []
-        for packet in packets:
-            info = packet.get('info', '').lower()
-            if 'protocol' in packet and packet['protocol'] == 'TLS':
-                if 'alert' in info or 'error' in info or 'warning' in info:
-                    ssl_issues.append(packet)
-                    evidence_packets.append(packet)
-        
-        # If we found any indicators, report the attack
-        if redirected_flows or len(ssl_issues) > 3:
+        if protocol == 'TLS' and ('alert' in info or 'error' in info or 'warning' in info):
+            return (('ssl_issue', ()),)
+
+        src_ip = packet.get('src_ip')
+        dst_ip = packet.get('dst_ip')
+        if not src_ip or not dst_ip or protocol not in ('TCP', 'UDP'):
+            return ()
+
+        events = [
+            (('flow', src_ip, dst_ip), (('src_mac', packet.get('src_mac', '')),
+                                        ('dst_mac', packet.get('dst_mac', '')))),
+            # The reverse flow's path is compared against this one
+            (('flow', dst_ip, src_ip), None)
+        ]
+        # Very low TTL can indicate redirection
+        if 'ttl' in packet and packet['ttl'] < 5:
+            events.append((('low_ttl', src_ip, dst_ip), ()))
+        return events
+
+    def evaluate(self, state, key):
+        """Flag asymmetric flows, ICMP redirects and repeated TLS errors."""
+        entry = state.get(key)
+        if entry is None:
+            return None
+
+        kind = key[0]
+        if kind == 'flow':
+            _, src_ip, dst_ip = key
+            reverse = state.get(('flow', dst_ip, src_ip))
+            if reverse is None:
+                return None
+
+            # If the MAC addresses in the path don't match expectations, it could be MitM
+            forward_path = entry.values('src_mac')
+            reverse_path = reverse.values('dst_mac')
+            if len(forward_path) <= 1 and len(reverse_path) <= 1:
+                return None
             return {
-                'type': 'mitm_attack',
-                'name': self.name,
-                'description': self.description,
-                'severity': self.severity,
-                'first_seen': first_seen,
-                'last_seen': last_seen,
-                'evidence_count': len(evidence_packets),
-                'evidence_ids': [p['id'] for p in evidence_packets[:10]],
-                'redirected_flows': redirected_flows,
-                'ssl_issues': len(ssl_issues),
-                'confidence': 'medium'
+                'flow': {
+                    'src_ip': src_ip,
+                    'dst_ip': dst_ip,
+                    'forward_macs': forward_path,
+                    'reverse_macs': reverse_path,
+                    'packet_count': len(entry)
+                },
+                'first_seen': entry.first,
+                'last_seen': entry.last,
+                'evidence_ids': entry.evidence_ids(5)
             }
-            
+
+        if kind == 'icmp_redirect':
+            return {
+                'flow': {
+                    'type': 'icmp_redirect',
+                    'count': len(entry),
+                    'sources': entry.values('src')
+                },
+                'first_seen': entry.first,
+                'last_seen': entry.last,
+                'evidence_ids': entry.evidence_ids(5)
+            }
+
+        if kind == 'ssl_issue' and len(entry) >= self.min_ssl_issues:
+            return {
+                'ssl_issues': len(entry),
+                'first_seen': entry.first,
+                'last_seen': entry.last,
+                'evidence_ids': entry.evidence_ids()
+            }
+
         return None
 
+    def report(self, findings):
+        """Build the MitM result."""
+        evidence_ids = [pid for f in findings for pid in f['evidence_ids']]
+        return {
+            'type': 'mitm_attack',
+            'name': self.name,
+            'description': self.description,
+            'severity': self.severity,
+            'first_seen': _as_datetime(min(f['first_seen'] for f in findings)),
+            'last_seen': _as_datetime(max(f['last_seen'] for f in findings)),
+            'evidence_count': len(evidence_ids),
+            'evidence_ids': evidence_ids[:10],
+            'redirected_flows': [f['flow'] for f in findings if 'flow' in f],
+            'ssl_issues': sum(f.get('ssl_issues', 0) for f in findings),
+            'confidence': 'medium'
+        }
+
 
 class SYNFloodPattern(AttackPattern):
     """Detects TCP SYN flood attacks."""
-    
+
     def __init__(self):
         """Initialize the SYN flood pattern recognizer."""
         super().__init__(
@@ -565,114 +752,75 @@ class SYNFloodPattern(AttackPattern):
         self.threshold_rate = 100  # SYN packets per second to trigger detection
         self.min_syn_count = 200   # Minimum SYN packets to consider an attack
         self.time_window = 10      # Time window in seconds to calculate rate
-        
-    def analyze(self, packets: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Analyze packets for SYN flood patterns.
-        
-        Args:
-            packets: List of packet dictionaries
-            
-        Returns:
-            None if no attack detected, or a dict with attack details
-        """
-        # Track SYN packets by target (dst_ip, dst_port)
-        syn_packets = defaultdict(list)
-        first_seen = None
-        last_seen = None
-        
-        # Collect all SYN packets
-        for packet in packets:
-            if packet['protocol'] != 'TCP':
-                continue
-                
-            flags = packet.get('flags', '')
-            if 'SYN' not in flags or 'ACK' in flags:  # Only pure SYN packets
-                continue
-                
-            dst_ip = packet.get('dst_ip')
-            dst_port = packet.get('dst_port')
-            if not dst_ip or not dst_port:
-                continue
-                
-            # Update timestamp tracking
-            if first_seen is None:
-                first_seen = packet['timestamp']
-            last_seen = packet['timestamp']
-            
-            # Group by target
-            target = (dst_ip, dst_port)
-            syn_packets[target].append(packet)
-        
-        # No SYN packets found
-        if not syn_packets:
+
+    def observe(self, packet, timestamp):
+        """Record pure SYN packets per target."""
+        if packet.get('protocol') != 'TCP':
+            return ()
+
+        flags = tcp_flags(packet)
+        if 'SYN' not in flags or 'ACK' in flags:  # Only pure SYN packets
+            return ()
+
+        dst_ip = packet.get('dst_ip')
+        dst_port = packet.get('dst_port')
+        if not dst_ip or not dst_port:
+            return ()
+
+        return (((dst_ip, dst_port), (('src', packet.get('src_ip', '')),)),)
+
+    def evaluate(self, state, target):
+        """Flag a target receiving SYN packets faster than the threshold."""
+        entry = state.get(target)
+        if entry is None or len(entry) < self.min_syn_count:
             return None
-            
-        # Calculate SYN flood metrics
-        flood_targets = []
-        
-        for target, packets_to_target in syn_packets.items():
-            dst_ip, dst_port = target
-            
-            # Skip if not enough SYN packets
-            if len(packets_to_target) < self.min_syn_count:
-                continue
-                
-            # Calculate time span and rate
-            target_first = min(p['timestamp'] for p in packets_to_target)
-            target_last = max(p['timestamp'] for p in packets_to_target)
-            time_span = (target_last - target_first).total_seconds()
-            
-            # Skip if time span is too small to calculate rate
-            if time_span < 1:
-                continue
-                
-            rate = len(packets_to_target) / time_span
-            
-            # Count unique source IPs
-            source_ips = set(p.get('src_ip', '') for p in packets_to_target)
-            
-            # If rate exceeds threshold, consider it a flood
-            if rate > self.threshold_rate:
-                flood_targets.append({
-                    'dst_ip': dst_ip,
-                    'dst_port': dst_port,
-                    'service': self._get_service_name(dst_port),
-                    'syn_count': len(packets_to_target),
-                    'rate_per_second': rate,
-                    'source_ip_count': len(source_ips),
-                    'first_seen': target_first,
-                    'last_seen': target_last,
-                    'duration_seconds': time_span,
-                    'evidence_ids': [p['id'] for p in packets_to_target[:10]]
-                })
-        
-        # No flood targets identified
-        if not flood_targets:
+
+        # Skip if time span is too small to calculate rate
+        time_span = entry.last - entry.first
+        if time_span < 1:
             return None
-            
-        # Sort targets by severity (rate)
+
+        rate = len(entry) / time_span
+        if rate <= self.threshold_rate:
+            return None
+
+        dst_ip, dst_port = target
+        return {
+            'dst_ip': dst_ip,
+            'dst_port': dst_port,
+            'service': self._get_service_name(dst_port),
+            'syn_count': len(entry),
+            'rate_per_second': rate,
+            'source_ip_count': entry.unique('src'),
+            'first_seen': _as_datetime(entry.first),
+            'last_seen': _as_datetime(entry.last),
+            'duration_seconds': time_span,
+            'evidence_ids': entry.evidence_ids()
+        }
+
+    def report(self, flood_targets):
+        """Build the SYN flood result, highest rate first."""
         flood_targets.sort(key=lambda x: x['rate_per_second'], reverse=True)
-        
         return {
             'type': 'syn_flood',
             'name': self.name,
             'description': self.description,
             'severity': self.severity,
-            'first_seen': first_seen,
-            'last_seen': last_seen,
+            'first_seen': min(t['first_seen'] for t in flood_targets),
+            'last_seen': max(t['last_seen'] for t in flood_targets),
             'targets': flood_targets,
             'total_targets': len(flood_targets),
             'evidence_count': sum(t['syn_count'] for t in flood_targets),
             'max_rate': max(t['rate_per_second'] for t in flood_targets),
             'distributed': any(t['source_ip_count'] > 3 for t in flood_targets)
         }
-        
+
     def _get_service_name(self, port: int) -> str:
         """Get service name for common ports.
-        
+
         Args:
             port: Port number
-            
+
         Returns:
             Service name or "unknown"
         """
@@ -699,129 +847,127 @@ class SYNFloodPattern(AttackPattern):
 
 class SMBExploitPattern(AttackPattern):
     """Detects SMB-related attacks such as EternalBlue and brute force attempts."""
-    
+
     def __init__(self):
         """Initialize the SMB exploit pattern recognizer."""
-        super().__init__(
-            name="SMB Exploit/Brute Force",
-            description="Detects attempts to exploit SMB vulnerabilities or brute force SMB authentication",
-            severity="critical"
-        )
-        # Configuration
-        self.smb_ports = {139, 445}  # Common SMB ports
-        self.threshold_attempts = 10  # Number of attempts to consider as brute force
-        self.suspicious_smb_signatures = [
-            b'\x00\x00\x00\x45',  # EternalBlue signature in Trans2 request
-            b'\x00\x00\x00\x54', 
-            b'\x00\x00\x00\xc8', 
-            b'\x00\x00\xfb\x91',  # DoublePulsar backdoor signature
-            b'\xff\x53\x4d\x42'   # Common in MS17-010 exploits
-        ]
-        
-    def analyze(self, packets: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Analyze packets for SMB-related attack patterns.
-        
-        Args:
-            packets: List of packet dictionaries
-            
-        Returns:
-            None if no attack detected, or a dict with attack details
-        """
-        # Track SMB traffic per source
-        smb_sources = defaultdict(list)  # src_ip -> list of packets
-        smb_failed_auth = defaultdict(int)  # src_ip -> count of failed auth attempts
-        
-        # Track exploit attempts
-        exploit_attempts = []
-        suspicious_packets = []
-        
-        first_seen = None
-        last_seen = None
-        
-        for packet in packets:
-            if 'src_ip' not in packet or 'dst_ip' not in packet:
-                continue
-                
-            # Update timestamp tracking
-            if first_seen is None:
-                first_seen = packet['timestamp']
-            last_seen = packet['timestamp']
-            
-            # Check if it's SMB traffic
-            dst_port = packet.get('dst_port')
-            if not dst_port or dst_port not in self.smb_ports:
-                continue
-                
-            src_ip = packet.get('src_ip')
-            smb_sources[src_ip].append(packet)
-            
-            # Look for authentication failures
-            if 'info' in packet and ('status: ACCESS_DENIED' in packet['info'] or 
-                                     'authentication failed' in packet['info'].lower()):
-                smb_failed_auth[src_ip] += 1
-                suspicious_packets.append(packet)
-            
-            # Look for suspicious hex signatures in packet data
-            if 'raw_data' in packet:
-                for signature in self.suspicious_smb_signatures:
-                    if signature in packet.get('raw_data', b''):
-                        exploit_attempts.append({
-                            'src_ip': src_ip,
-                            'dst_ip': packet.get('dst_ip'),
-                            'timestamp': packet['timestamp'],
-                            'signature': signature.hex(),
-                            'packet_id': packet['id']
-                        })
-                        suspicious_packets.append(packet)
-                        break
-        
-        # Check for brute force attempts
-        brute_force_sources = []
-        for src_ip, fail_count in smb_failed_auth.items():
-            if fail_count >= self.threshold_attempts:
-                brute_force_sources.append({
+        super().__init__(
+            name="SMB Exploit/Brute Force",
+            description="Detects attempts to exploit SMB vulnerabilities or brute force SMB authentication",
+            severity="critical"
+        )
+        # Configuration
+        self.smb_ports = {139, 445}  # Common SMB ports
+        self.threshold_attempts = 10  # Number of attempts to consider as brute force
+        self.suspicious_smb_signatures = [
+            b'\x00\x00\x00\x45',  # EternalBlue signature in Trans2 request
+            b'\x00\x00\x00\x54',
+            b'\x00\x00\x00\xc8',
+            b'\x00\x00\xfb\x91',  # DoublePulsar backdoor signature
+            b'\xff\x53\x4d\x42'   # Common in MS17-010 exploits
+        ]
+
+    def observe(self, packet, timestamp):
+        """Record SMB traffic, authentication failures and exploit signatures."""
+        src_ip = packet.get('src_ip')
+        if not src_ip or not packet.get('dst_ip'):
+            return ()
+
+        # Check if it's SMB traffic
+        if packet.get('dst_port') not in self.smb_ports:
+            return ()
+
+        events = [(('smb', src_ip), ())]
+
+        # Look for authentication failures
+        info = packet.get('info', '')
+        if 'status: ACCESS_DENIED' in info or 'authentication failed' in info.lower():
+            events.append((('auth_failure', src_ip), ()))
+
+        # Look for suspicious hex signatures in packet data
+        raw_data = packet.get('raw_data')
+        if raw_data:
+            for signature in self.suspicious_smb_signatures:
+                if signature in raw_data:
+                    events.append((('exploit', src_ip), (('dst_ip', packet['dst_ip']),
+                                                         ('signature', signature.hex()))))
+                    break
+        return events
+
+    def evaluate(self, state, key):
+        """Flag exploit signatures and repeated authentication failures."""
+        entry = state.get(key)
+        if entry is None:
+            return None
+
+        kind, src_ip = key
+        if kind == 'exploit':
+            attempts = []
+            for timestamp, packet_id, facets in entry.events:
+                attempt = dict(facets)
+                attempts.append({
                     'src_ip': src_ip,
-                    'failed_attempts': fail_count,
-                    'packet_count': len(smb_sources[src_ip])
+                    'dst_ip': attempt['dst_ip'],
+                    'timestamp': _as_datetime(timestamp),
+                    'signature': attempt['signature'],
+                    'packet_id': packet_id
                 })
-        
-        # If either exploit attempts or brute force is detected, report
-        if exploit_attempts or brute_force_sources:
-            attack_type = None
-            if exploit_attempts:
-                attack_type = "smb_exploit"
-            elif brute_force_sources:
-                attack_type = "smb_brute_force"
-            else:
-                attack_type = "smb_suspicious"
-                
-            # Determine severity based on the type of attack
-            severity = self.severity
-            if attack_type == "smb_exploit":
-                severity = "critical"  # Exploits are always critical
-            elif attack_type == "smb_brute_force":
-                severity = "high"
-                
+            return {'exploit_attempts': attempts, 'first_seen': entry.first,
+                    'last_seen': entry.last, 'evidence_ids': entry.evidence_ids()}
+
+        if kind == 'auth_failure' and len(entry) >= self.threshold_attempts:
+            smb_traffic = state.get(('smb', src_ip))
             return {
-                'type': attack_type,
-                'name': self.name,
-                'description': self.description,
-                'severity': severity,
-                'first_seen': first_seen,
-                'last_seen': last_seen,
-                'exploit_attempts': exploit_attempts,
-                'brute_force_sources': brute_force_sources,
-                'evidence_count': len(suspicious_packets),
-                'evidence_ids': [p['id'] for p in suspicious_packets[:10]],
-                'exploitation_risk': "High" if exploit_attempts else "Medium"
+                'brute_force': {
+                    'src_ip': src_ip,
+                    'failed_attempts': len(entry),
+                    'packet_count': len(smb_traffic) if smb_traffic else len(entry)
+                },
+                'first_seen': entry.first,
+                'last_seen': entry.last,
+                'evidence_ids': entry.evidence_ids()
             }
-            
+
         return None
 
+    def report(self, findings):
+        """Build the SMB result; exploits take precedence over brute force."""
+        exploit_attempts = [a for f in findings for a in f.get('exploit_attempts', ())]
+        brute_force_sources = [f['brute_force'] for f in findings if 'brute_force' in f]
+        evidence_ids = [pid for f in findings for pid in f['evidence_ids']]
+
+        # Exploits are always critical
+        if exploit_attempts:
+            attack_type, severity = "smb_exploit", "critical"
+        else:
+            attack_type, severity = "smb_brute_force", "high"
+
+        return {
+            'type': attack_type,
+            'name': self.name,
+            'description': self.description,
+            'severity': severity,
+            'first_seen': _as_datetime(min(f['first_seen'] for f in findings)),
+            'last_seen': _as_datetime(max(f['last_seen'] for f in findings)),
+            'exploit_attempts': exploit_attempts,
+            'brute_force_sources': brute_force_sources,
+            'evidence_count': len(evidence_ids),
+            'evidence_ids': evidence_ids[:10],
+            'exploitation_risk': "High" if exploit_attempts else "Medium"
+        }
+
 
 class SSHBruteForcePattern(AttackPattern):
     """Detects SSH brute force login attempts and related attacks."""
-    
+
+    # SSH-specific error messages that suggest brute force
+    AUTH_FAILURE_INDICATORS = (
+        'authentication failure',
+        'failed password',
+        'invalid user',
+        'connection closed by remote host',
+        'too many authentication failures'
+    )
+
     def __init__(self):
         """Initialize the SSH brute force pattern recognizer."""
         super().__init__(
@@ -834,132 +980,84 @@ class SSHBruteForcePattern(AttackPattern):
         self.threshold_attempts = 5   # Number of connection attempts to trigger detection
         self.time_window = 60         # Time window in seconds to consider for brute force
         self.max_normal_failures = 3  # Max failed attempts considered normal
-        
-    def analyze(self, packets: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Analyze packets for SSH brute force patterns.
-        
-        Args:
-            packets: List of packet dictionaries
-            
-        Returns:
-            None if no attack detected, or a dict with attack details
-        """
-        # Group SSH traffic by source
-        ssh_connections = defaultdict(list)  # src_ip -> list of packets
-        ssh_connection_attempts = defaultdict(int)  # src_ip -> count of connection attempts
-        
-        # Track session information
-        ssh_sessions = defaultdict(set)  # src_ip -> set of dst_ips
-        first_seen = None
-        last_seen = None
-        evidence_packets = []
-        
-        # Track SSH-specific error messages that suggest brute force
-        auth_failure_indicators = [
-            'authentication failure',
-            'failed password',
-            'invalid user',
-            'connection closed by remote host',
-            'too many authentication failures'
-        ]
-        
-        for packet in packets:
-            if 'src_ip' not in packet or 'dst_ip' not in packet:
-                continue
-                
-            # Update timestamp tracking
-            packet_time = packet['timestamp']
-            if first_seen is None:
-                first_seen = packet_time
-            last_seen = packet_time
-            
-            # Check if it's SSH traffic
-            dst_port = packet.get('dst_port')
-            if not dst_port or dst_port not in self.ssh_ports:
-                continue
-                
-            src_ip = packet.get('src_ip')
-            dst_ip = packet.get('dst_ip')
-            
-            # Track SSH sessions
-            ssh_sessions[src_ip].add(dst_ip)
-            
-            # Look for TCP SYN packets (connection attempts)
-            if packet['protocol'] == 'TCP' and 'SYN' in packet.get('flags', ''):
-                ssh_connection_attempts[src_ip] += 1
-                ssh_connections[src_ip].append(packet)
-            
-            # Look for authentication failures in packet info
-            info = packet.get('info', '').lower()
-            for indicator in auth_failure_indicators:
-                if indicator in info:
-                    evidence_packets.append(packet)
-                    break
-        
-        # Identify brute force attempts
-        brute_force_sources = []
-        
-        for src_ip, attempts in ssh_connection_attempts.items():
-            # Skip if not enough connection attempts
-            if attempts < self.threshold_attempts:
-                continue
-                
-            # Calculate time frame for this source
-            src_packets = ssh_connections[src_ip]
-            src_first = min(p['timestamp'] for p in src_packets)
-            src_last = max(p['timestamp'] for p in src_packets)
-            time_span = (src_last - src_first).total_seconds()
-            
-            # Skip if time span is too large (not concentrated enough)
-            if time_span > self.time_window and attempts < self.threshold_attempts * 2:
-                continue
-                
-            # Calculate rate of attempts
-            rate = attempts / max(1, time_span)
-            
-            # Number of unique targets
-            targets_count = len(ssh_sessions[src_ip])
-            
-            # If attempts are concentrated or target multiple hosts, consider it brute force
-            if rate >= 1 or targets_count > 1:
-                brute_force_sources.append({
-                    'src_ip': src_ip,
-                    'connection_attempts': attempts,
-                    'unique_targets': targets_count,
-                    'target_ips': list(ssh_sessions[src_ip]),
-                    'rate_per_second': rate,
-                    'first_seen': src_first,
-                    'last_seen': src_last,
-                    'duration_seconds': time_span
-                })
-                evidence_packets.extend(src_packets[:5])  # Add some evidence
-        
-        # No brute force detected
-        if not brute_force_sources:
+
+    def observe(self, packet, timestamp):
+        """Record SSH connection attempts and the hosts they target."""
+        src_ip = packet.get('src_ip')
+        dst_ip = packet.get('dst_ip')
+        if not src_ip or not dst_ip or packet.get('dst_port') not in self.ssh_ports:
+            return ()
+
+        events = [(('session', src_ip), (('dst_ip', dst_ip),))]
+
+        # TCP SYN packets are connection attempts
+        if packet.get('protocol') == 'TCP' and 'SYN' in tcp_flags(packet):
+            events.append((('attempt', src_ip), ()))
+
+        info = packet.get('info', '').lower()
+        if any(indicator in info for indicator in self.AUTH_FAILURE_INDICATORS):
+            events.append((('auth_failure', src_ip), ()))
+        return events
+
+    def evaluate(self, state, key):
+        """Flag a source making concentrated or multi-host connection attempts."""
+        kind, src_ip = key
+        entry = state.get(key)
+        if kind != 'attempt' or entry is None:
             return None
-            
-        # Sort by severity (number of attempts)
+
+        attempts = len(entry)
+        if attempts < self.threshold_attempts:
+            return None
+
+        # Skip if time span is too large (not concentrated enough)
+        time_span = entry.last - entry.first
+        if time_span > self.time_window and attempts < self.threshold_attempts * 2:
+            return None
+
+        rate = attempts / max(1, time_span)
+        sessions = state.get(('session', src_ip))
+        target_ips = sessions.values('dst_ip') if sessions else []
+
+        # If attempts are concentrated or target multiple hosts, consider it brute force
+        if rate < 1 and len(target_ips) <= 1:
+            return None
+
+        failures = state.get(('auth_failure', src_ip))
+        return {
+            'src_ip': src_ip,
+            'connection_attempts': attempts,
+            'unique_targets': len(target_ips),
+            'target_ips': target_ips,
+            'rate_per_second': rate,
+            'first_seen': _as_datetime(entry.first),
+            'last_seen': _as_datetime(entry.last),
+            'duration_seconds': time_span,
+            'evidence_ids': entry.evidence_ids(5) + (failures.evidence_ids(5) if failures else [])
+        }
+
+    def report(self, brute_force_sources):
+        """Build the SSH brute force result, most attempts first."""
         brute_force_sources.sort(key=lambda x: x['connection_attempts'], reverse=True)
-        
-        # Return attack details
+        evidence_ids = [pid for s in brute_force_sources for pid in s.pop('evidence_ids')]
         return {
             'type': 'ssh_brute_force',
             'name': self.name,
             'description': self.description,
             'severity': self.severity,
-            'first_seen': first_seen,
-            'last_seen': last_seen,
+            'first_seen': min(s['first_seen'] for s in brute_force_sources),
+            'last_seen': max(s['last_seen'] for s in brute_force_sources),
             'sources': brute_force_sources,
             'total_sources': len(brute_force_sources),
-            'evidence_count': len(evidence_packets),
-            'evidence_ids': [p['id'] for p in evidence_packets[:10]],
+            'evidence_count': len(evidence_ids),
+            'evidence_ids': evidence_ids[:10],
             'max_attempts': max(s['connection_attempts'] for s in brute_force_sources)
         }
 
 
 class WebAttackPattern(AttackPattern):
     """Detects HTTP/HTTPS-based attacks including SQL injection, XSS, and other web app attacks."""
-    
+
     def __init__(self):
         """Initialize the web attack pattern recognizer."""
         super().__init__(
@@ -969,199 +1067,118 @@ class WebAttackPattern(AttackPattern):
         )
         # Configuration
         self.web_ports = {80, 443, 8080, 8443}  # Common web ports
-        
-        # Attack signatures for different attack types
-        self.sql_injection_patterns = [
-            r"'--", r"';", r"OR 1=1", r"' OR '1'='1", r" OR 1=1", 
-            r"DROP TABLE", r"UNION SELECT", r"' UNION SELECT", 
-            r"/*", r"*/", r"@@version", r"admin'--", r"' or 0=0 --",
-            r"INFORMATION_SCHEMA", r"sysobjects", r"xp_cmdshell", r"sp_password"
-        ]
-        
-        self.xss_patterns = [
-            r"<script>", r"</script>", r"<img src=", r"onerror=",
-            r"javascript:", r"onload=", r"alert\(", r"String.fromCharCode",
-            r"eval\(", r"document.cookie", r"document.location"
-        ]
-        
-        self.path_traversal_patterns = [
-            r"\.\.\/", r"\.\.\\", r"%2e%2e%2f", r"%252e%252e%255c",
-            r"\.\.%2f", r"\.\.%5c", r"/etc/passwd", r"C:\\Windows\\system32",
-            r"boot.ini", r"win.ini", r"/proc/self/", r"/var/www/"
-        ]
-        
-        self.command_injection_patterns = [
-            r";\s*\w+", r"\|\s*\w+", r"`\w+`", r"\$\(\w+\)",
-            r"ping ", r"wget ", r"curl ", r"nc ", r"bash ", r"cmd ",
-            r"cat /", r"rm -", r"chmod ", r"; ls", r"& dir"
-        ]
-        
-        self.file_inclusion_patterns = [
-            r"include=http", r"file=http", r"page=http", r"data=http",
-            r"include=ftp", r"php://input", r"zip://", r"phar://",
-            r"expect://", r"php://filter", r"/proc/self/environ"
-        ]
-        
-    def analyze(self, packets: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Analyze packets for web attack patterns.
-        
-        Args:
-            packets: List of packet dictionaries
-            
-        Returns:
-            None if no attack detected, or a dict with attack details
-        """
-        # Group by source and track attack types
-        attack_sources = defaultdict(lambda: defaultdict(list))  # src_ip -> attack_type -> list of packets
-        evidence_packets = []
-        
-        first_seen = None
-        last_seen = None
-        
-        for packet in packets:
-            if 'src_ip' not in packet or 'dst_ip' not in packet:
-                continue
-                
-            # Update timestamp tracking
-            packet_time = packet['timestamp']
-            if first_seen is None:
-                first_seen = packet_time
-            last_seen = packet_time
-            
-            # Check if it's web traffic
-            dst_port = packet.get('dst_port')
-            if not dst_port or dst_port not in self.web_ports:
-                continue
-                
-            src_ip = packet.get('src_ip')
-            dst_ip = packet.get('dst_ip')
-            
-            # Get HTTP request information (if available)
-            info = packet.get('info', '').lower()
-            http_request = packet.get('http_request', '')
-            payload = ''
-            
-            # Try to extract the HTTP payload from different fields
-            if http_request:
-                payload = http_request
-            elif 'raw_data' in packet:
-                # Try to decode raw data to string if it's HTTP
-                try:
-                    raw_data = packet['raw_data']
-                    if isinstance(raw_data, bytes):
-                        raw_str = raw_data.decode('utf-8', errors='ignore')
-                        if 'HTTP/' in raw_str or 'GET ' in raw_str or 'POST ' in raw_str:
-                            payload = raw_str
-                except:
-                    pass
-            
-            # URL decode the payload to catch encoded attacks
-            try:
-                from urllib.parse import unquote
-                payload = unquote(payload)
-            except:
-                pass
-                
-            # Check for attack signatures
-            self._check_attack_patterns(src_ip, dst_ip, packet, payload, 'sql_injection', 
-                                      self.sql_injection_patterns, attack_sources)
-            self._check_attack_patterns(src_ip, dst_ip, packet, payload, 'xss', 
-                                      self.xss_patterns, attack_sources)
-            self._check_attack_patterns(src_ip, dst_ip, packet, payload, 'path_traversal', 
-                                      self.path_traversal_patterns, attack_sources)
-            self._check_attack_patterns(src_ip, dst_ip, packet, payload, 'command_injection', 
-                                      self.command_injection_patterns, attack_sources)
-            self._check_attack_patterns(src_ip, dst_ip, packet, payload, 'file_inclusion', 
-                                      self.file_inclusion_patterns, attack_sources)
-        
-        # Process the collected attacks
-        if not attack_sources:
+
+        # SQL injection, XSS, path traversal, command injection and file
+        # inclusion signatures, matched in a single pass per payload
+        self.signature_engine = get_web_signature_engine()
+
+    def observe(self, packet, timestamp):
+        """Record the attack types matched by each source's web requests."""
+        src_ip = packet.get('src_ip')
+        if not src_ip or not packet.get('dst_ip'):
+            return ()
+
+        # Check if it's web traffic
+        if packet.get('dst_port') not in self.web_ports:
+            return ()
+
+        # The packet analyzer may already have scanned the payload
+        matches = packet.get('web_signatures')
+        if matches is None:
+            matches = self.signature_engine.scan(self._get_payload(packet))
+        return [((src_ip, attack_type), ()) for attack_type in matches]
+
+    def _get_payload(self, packet: Dict[str, Any]) -> str:
+        """Extract the URL-decoded HTTP payload of a packet."""
+        payload = packet.get('http_request', '')
+        if not payload and isinstance(packet.get('raw_data'), bytes):
+            # Try to decode raw data to string if it's HTTP
+            raw_str = packet['raw_data'].decode('utf-8', errors='ignore')
+            if 'HTTP/' in raw_str or 'GET ' in raw_str or 'POST ' in raw_str:
+                payload = raw_str
+
+        # URL decode the payload to catch encoded attacks
+        try:
+            return unquote(payload)
+        except Exception:
+            return payload
+
+    def evaluate(self, state, key):
+        """Report every source and attack type with matching requests."""
+        entry = state.get(key)
+        if entry is None:
             return None
-            
-        # Compile attack statistics
-        attack_stats = []
-        total_evidence = 0
-        
-        for src_ip, attack_types in attack_sources.items():
-            source_stats = {
-                'src_ip': src_ip,
+        src_ip, attack_type = key
+        return {
+            'src_ip': src_ip,
+            'type': attack_type,
+            'count': len(entry),
+            'first_seen': entry.first,
+            'last_seen': entry.last,
+            'evidence_ids': entry.evidence_ids(5)
+        }
+
+    def report(self, findings):
+        """Build the web attack result grouped by source."""
+        sources = {}
+        for finding in findings:
+            source = sources.setdefault(finding['src_ip'], {
+                'src_ip': finding['src_ip'],
                 'attack_types': [],
                 'total_attempts': 0
-            }
-            
-            for attack_type, packets_list in attack_types.items():
-                source_stats['attack_types'].append({
-                    'type': attack_type,
-                    'count': len(packets_list),
-                    'evidence_ids': [p['id'] for p in packets_list[:5]]
-                })
-                source_stats['total_attempts'] += len(packets_list)
-                total_evidence += len(packets_list)
-                evidence_packets.extend(packets_list[:5])
-            
-            attack_stats.append(source_stats)
-            
+            })
+            source['attack_types'].append({
+                'type': finding['type'],
+                'count': finding['count'],
+                'evidence_ids': finding['evidence_ids']
+            })
+            source['total_attempts'] += finding['count']
+
         # Sort by total attempts
-        attack_stats.sort(key=lambda x: x['total_attempts'], reverse=True)
-        
-        # Determine most common attack type
-        all_attack_types = []
-        for source in attack_stats:
-            for attack_type in source['attack_types']:
-                all_attack_types.append(attack_type['type'])
-                
-        if all_attack_types:
-            from collections import Counter
-            most_common = Counter(all_attack_types).most_common(1)[0][0]
-        else:
-            most_common = 'unknown'
-        
-        # Return attack details
+        attack_stats = sorted(sources.values(), key=lambda x: x['total_attempts'], reverse=True)
+
+        # Most common attack type across sources
+        all_attack_types = [f['type'] for f in findings]
+        most_common = Counter(all_attack_types).most_common(1)[0][0]
+        total_evidence = sum(f['count'] for f in findings)
+
         return {
             'type': f'web_{most_common}',
             'name': self.name,
             'description': self.description,
             'severity': self.severity,
-            'first_seen': first_seen,
-            'last_seen': last_seen,
+            'first_seen': _as_datetime(min(f['first_seen'] for f in findings)),
+            'last_seen': _as_datetime(max(f['last_seen'] for f in findings)),
             'sources': attack_stats,
             'total_sources': len(attack_stats),
             'most_common_attack': most_common,
             'evidence_count': min(total_evidence, 50),  # Cap at 50 packets
-            'evidence_ids': [p['id'] for p in evidence_packets[:10]],
+            'evidence_ids': [pid for f in findings for pid in f['evidence_ids']][:10],
             'attack_types_found': list(set(all_attack_types))
         }
-        
-    def _check_attack_patterns(self, src_ip, dst_ip, packet, payload, attack_type, 
-                              patterns, attack_sources):
-        """Check payload against attack patterns and update attack_sources if match found.
-        
-        Args:
-            src_ip: Source IP address
-            dst_ip: Destination IP address
-            packet: Packet dictionary
-            payload: String payload to check for patterns
-            attack_type: Type of attack (e.g., 'sql_injection')
-            patterns: List of regex patterns to check
-            attack_sources: Dictionary to update with matches
-        """
-        import re
-        for pattern in patterns:
-            if re.search(pattern, payload, re.IGNORECASE):
-                attack_sources[src_ip][attack_type].append(packet)
-                return  # One match is enough for this packet
 
 
 class AttackRecognizer:
-    """Monitors network traffic for attack patterns."""
-    
-    def __init__(self):
-        """Initialize the attack recognizer."""
+    """Monitors network traffic for attack patterns.
+
+    Packets are pushed in through process_packet(), usually by subscribing
+    to a PacketAnalyzer, and a detection thread feeds them to every pattern
+    as they arrive.
+    """
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 500):
+        """Initialize the attack recognizer.
+
+        Args:
+            max_queue: Maximum number of packets waiting for analysis
+            batch_size: Maximum number of packets analyzed per batch
+        """
         self.running = False
         self.detection_thread = None
         self.callback = None
-        self.database = get_database()
-        
+        self.packet_source = None
+        self.batch_size = batch_size
+
         # Initialize attack patterns
         self.patterns = [
             ARPSpoofPattern(),
@@ -1174,91 +1191,142 @@ class AttackRecognizer:
             SSHBruteForcePattern(),
             WebAttackPattern()
         ]
-        
+
+        # Live packets waiting for the detection thread
+        self.packet_queue = queue.Queue(maxsize=max_queue)
+        self.packets_dropped = 0
+
         # Store detections
         self.detected_attacks = []
-        
-    def start_detection(self, callback: Optional[Callable[[bool, str, Dict[str, Any]], None]] = None) -> bool:
+
+    def start_detection(self, callback: Optional[Callable[[bool, str, Dict[str, Any]], None]] = None,
+                        packet_source: Optional[Any] = None) -> bool:
         """Start attack pattern detection.
-        
+
         Args:
             callback: Function to call when an attack is detected
                      callback(success, message, details)
-            
+            packet_source: Optional object with add_packet_listener(), such as
+                           a PacketAnalyzer, to subscribe to
+
         Returns:
             bool: True if detection started successfully
         """
         if self.running:
             logger.warning("Attack pattern detection already running")
             return False
-            
+
         self.callback = callback
         self.running = True
-        
+
+        if packet_source is not None:
+            packet_source.add_packet_listener(self.process_packet)
+            self.packet_source = packet_source
+
         # Start detection in a separate thread
         self.detection_thread = threading.Thread(
             target=self._detection_loop,
             daemon=True
         )
         self.detection_thread.start()
-        
+
         logger.info("Attack pattern detection started")
         return True
-        
+
     def stop_detection(self) -> bool:
         """Stop attack pattern detection.
-        
+
         Returns:
             bool: True if detection was stopped
         """
         if not self.running:
             logger.warning("Attack pattern detection not running")
             return False
-            
+
         self.running = False
+        if self.packet_source is not None:
+            self.packet_source.remove_packet_listener(self.process_packet)
+            self.packet_source = None
+
         if self.detection_thread:
             self.detection_thread.join(timeout=2)
-            
+
         logger.info("Attack pattern detection stopped")
         return True
-        
+
+    def process_packet(self, packet: Dict[str, Any]) -> bool:
+        """Queue a live packet for analysis without blocking.
+
+        Args:
+            packet: Packet dictionary
+
+        Returns:
+            bool: True if the packet was queued, False if detection is
+                  stopped or the queue is full
+        """
+        if not self.running:
+            return False
+        try:
+            self.packet_queue.put_nowait(packet)
+        except queue.Full:
+            self.packets_dropped += 1
+            return False
+        return True
+
+    def get_packets_for_analysis(self, timeout: float = 0.2) -> List[Dict[str, Any]]:
+        """Take the next batch of queued packets.
+
+        Args:
+            timeout: Maximum time to wait for the first packet
+
+        Returns:
+            Up to batch_size packets, or an empty list on timeout
+        """
+        try:
+            packets = [self.packet_queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        while len(packets) < self.batch_size:
+            try:
+                packets.append(self.packet_queue.get_nowait())
+            except queue.Empty:
+                break
+        return packets
+
     def _detection_loop(self):
         """Main detection loop running in separate thread."""
         while self.running:
             try:
-                # Get active session data (most recent session)
-                active_session = self.database.get_active_session()
-                
-                if active_session:
-                    # Get packets from the active session (last 5 minutes)
-                    end_time = datetime.now()
-                    start_time = end_time - timedelta(minutes=5)
-                    
-                    packets = self.database.get_packets_by_timerange(
-                        active_session['id'],
-                        start_time,
-                        end_time
-                    )
-                    
-                    if packets:
-                        # Analyze packets with each pattern detector
-                        self._analyze_patterns(packets)
-                
-                # Sleep before next analysis
-                for _ in range(10):  # Check every second if we should stop
-                    if not self.running:
-                        break
-                    time.sleep(1)
-                    
+                packets = self.get_packets_for_analysis()
+                if packets:
+                    self._process_packets(packets)
+
             except Exception as e:
                 logger.error(f"Error in attack detection loop: {e}")
                 if self.callback:
                     self.callback(False, f"Detection error: {e}", None)
-                time.sleep(5)  # Wait a bit before trying again
-                
+                time.sleep(1)  # Wait a bit before trying again
+
+    def _process_packets(self, packets: List[Dict[str, Any]]):
+        """Feed live packets to every pattern's streaming detector.
+
+        Args:
+            packets: List of packet dictionaries
+        """
+        for packet in packets:
+            for pattern in self.patterns:
+                try:
+                    result = pattern.update(packet)
+                except Exception as e:
+                    logger.error(f"Error analyzing with pattern {pattern.name}: {e}")
+                    continue
+                if result:
+                    self._handle_detection(result)
+
     def _analyze_patterns(self, packets: List[Dict[str, Any]]):
-        """Analyze packets using all pattern detectors.
-        
+        """Analyze a batch of packets using all pattern detectors.
+
         Args:
             packets: List of packet dictionaries
         """
@@ -1266,28 +1334,36 @@ class AttackRecognizer:
             try:
                 # Apply the pattern detector
                 result = pattern.analyze(packets)
-                
-                # If attack was detected
-                if result:
-                    # Check if we've already detected this attack recently
-                    if not self._is_duplicate_detection(result):
-                        # Add to detected attacks
-                        result['detection_time'] = datetime.now()
-                        self.detected_attacks.append(result)
-                        
-                        # Create an appropriate message
-                        message = self._format_detection_message(result)
-                        
-                        # Notify via callback
-                        if self.callback:
-                            self.callback(True, message, result)
-                            
-                        # Log the detection
-                        logger.warning(f"Attack detected: {result['name']} - {message}")
-                        
             except Exception as e:
                 logger.error(f"Error analyzing with pattern {pattern.name}: {e}")
-                
+                continue
+            if result:
+                self._handle_detection(result)
+
+    def _handle_detection(self, result: Dict[str, Any]):
+        """Record and announce a detection unless it is a recent duplicate.
+
+        Args:
+            result: Attack detection result
+        """
+        # Check if we've already detected this attack recently
+        if self._is_duplicate_detection(result):
+            return
+
+        # Add to detected attacks
+        result['detection_time'] = datetime.now()
+        self.detected_attacks.append(result)
+
+        # Create an appropriate message
+        message = self._format_detection_message(result)
+
+        # Notify via callback
+        if self.callback:
+            self.callback(True, message, result)
+
+        # Log the detection
+        logger.warning(f"Attack detected: {result['name']} - {message}")
+
     def _is_duplicate_detection(self, result: Dict[str, Any]) -> bool:
         """Check if this attack was recently detected.
         
@@ -1384,6 +1460,11 @@ class AttackRecognizer:
             return f"{severity}: DNS Poisoning detected for {len(domains)} domains: {', '.join(domains[:3])}" + \
                    (f"... and {len(domains)-3} more" if len(domains) > 3 else "")
                    
+        elif attack_type == 'mitm_attack':
+            flows = result.get('redirected_flows', [])
+            return f"{severity}: Possible MITM attack - {len(flows)} redirected flows, " + \
+                   f"{result.get('ssl_issues', 0)} TLS errors"
+
         else:
             return f"{severity}: {result.get('name', 'Unknown attack')} detected"
             
@@ -1401,4 +1482,26 @@ class AttackRecognizer:
         Returns:
             List of pattern details (name, description, severity)
         """
-        return [pattern.get_details() for pattern in self.patterns] 
\ No newline at end of file
+        return [pattern.get_details() for pattern in self.patterns]
+
+    def get_detector_stats(self) -> List[Dict[str, Any]]:
+        """Get per-pattern processing statistics.
+
+        Returns:
+            List of pattern statistics including CPU time spent
+        """
+        return [pattern.get_stats() for pattern in self.patterns]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get recognizer statistics.
+
+        Returns:
+            Dict with queue depth, dropped packets and per-pattern stats
+        """
+        return {
+            'running': self.running,
+            'queue_size': self.packet_queue.qsize(),
+            'packets_dropped': self.packets_dropped,
+            'detections': len(self.detected_attacks),
+            'patterns': self.get_detector_stats()
+        }
@@ -4,7 +4,7 @@ from PyQt5.QtWidgets import (
     QGroupBox, QFormLayout, QTextEdit, QComboBox, QCheckBox,
     QTabWidget, QMessageBox, QListWidget, QListWidgetItem
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QColor, QBrush, QFont
 
 import threading
@@ -25,13 +25,19 @@ class AttackView(QWidget):
     status_changed = pyqtSignal(str)  # Emitted when status changes
     attack_detected = pyqtSignal(dict)  # Emitted when an attack is detected
     
-    def __init__(self, parent=None):
-        """Initialize the attack view component."""
+    def __init__(self, parent=None, packet_source=None):
+        """Initialize the attack view component.
+        
+        Args:
+            parent: Parent widget
+            packet_source: Packet analyzer whose live packets are analyzed
+        """
         super().__init__(parent)
         
         # Get database and create attack recognizer
         self.database = get_database()
         self.recognizer = AttackRecognizer()
+        self.packet_source = packet_source
         
         # Setup UI
         self.setup_ui()
@@ -152,7 +158,10 @@ class AttackView(QWidget):
                 # Eventually implement filtering by pattern
                 pass
                 
-            success = self.recognizer.start_detection(callback=self.handle_attack_detected)
+            success = self.recognizer.start_detection(
+                callback=self.handle_attack_detected,
+                packet_source=self.packet_source
+            )
             
             if success:
                 self.start_button.setText("Stop Detection")
@@ -201,6 +210,7 @@ class AttackView(QWidget):
         else:
             self._update_ui_with_detection(success, message, details)
         
+    @pyqtSlot(bool, str, object)
     def _update_ui_with_detection(self, success, message, details):
         """Update UI with attack detection (called in main thread).
         
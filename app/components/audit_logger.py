@@ -1,10 +1,9 @@
-import json
-import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 
+from app.utils.audit_store import AuditStore
 from app.utils.logger import get_logger
 
 # Module logger
@@ -47,14 +46,17 @@ class AuditEventType(Enum):
 class AuditLogger:
     """Audit logging system for tracking security operations."""
     
-    def __init__(self, log_dir: str = 'logs/audit'):
+    def __init__(self, log_dir: str = 'logs/audit', flush_interval: float = 1.0):
         """Initialize the audit logger.
         
         Args:
             log_dir: Directory to store audit logs
+            flush_interval: Seconds events may be buffered before they are
+                written and fsynced
         """
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.store = AuditStore(str(self.log_dir), flush_interval=flush_interval)
         
         # Current log file
         self.current_log = self._get_log_file()
@@ -66,8 +68,7 @@ class AuditLogger:
         Returns:
             Path: Path to the current log file
         """
-        date_str = datetime.now().strftime('%Y-%m-%d')
-        return self.log_dir / f'audit_{date_str}.log'
+        return Path(self.store.segment_path(datetime.now().date()))
     
     def _write_log(self, event: Dict[str, Any]):
         """Write an audit event to the log file.
@@ -75,19 +76,15 @@ class AuditLogger:
         Args:
             event: Event data to log
         """
-        # Check if we need to rotate the log file
-        current_log = self._get_log_file()
-        if current_log != self.current_log:
-            self.current_log = current_log
-        
         # Add timestamp if not present
         if 'timestamp' not in event:
             event['timestamp'] = datetime.now().isoformat()
         
-        # Write to log file
+        # Events are buffered and written to their day's segment
         try:
-            with open(self.current_log, 'a') as f:
-                f.write(json.dumps(event) + '\n')
+            self.current_log = Path(self.store.segment_path(
+                datetime.fromisoformat(event['timestamp']).date()))
+            self.store.append(event)
         except Exception as e:
             logger.error(f"Failed to write audit log: {e}")
     
@@ -114,59 +111,41 @@ class AuditLogger:
     
     def get_events(self, start_time: Optional[datetime] = None,
                   end_time: Optional[datetime] = None,
-                  event_type: Optional[AuditEventType] = None,
+                  event_type: Optional[Union[AuditEventType, str]] = None,
                   username: Optional[str] = None,
                   site_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get audit events matching the specified criteria.
         
+        Only the day segments in the time range whose indexes may hold the
+        username, event type and site ID are read, starting at the first
+        indexed block that can contain start_time.
+        
         Args:
             start_time: Optional start time to filter events
             end_time: Optional end time to filter events
-            event_type: Optional event type to filter
+            event_type: Optional event type (or its value) to filter
             username: Optional username to filter
             site_id: Optional site ID to filter
             
         Returns:
-            List[Dict[str, Any]]: List of matching audit events
+            List[Dict[str, Any]]: List of matching audit events, oldest day first
         """
-        events = []
-        
-        # Get all log files in the date range
-        log_files = []
-        if start_time and end_time:
-            current_date = start_time
-            while current_date <= end_time:
-                log_file = self.log_dir / f'audit_{current_date.strftime("%Y-%m-%d")}.log'
-                if log_file.exists():
-                    log_files.append(log_file)
-                current_date = current_date.replace(day=current_date.day + 1)
-        else:
-            log_files = list(self.log_dir.glob('audit_*.log'))
-        
-        # Read and filter events
-        for log_file in log_files:
-            try:
-                with open(log_file, 'r') as f:
-                    for line in f:
-                        event = json.loads(line)
-                        
-                        # Apply filters
-                        if start_time and datetime.fromisoformat(event['timestamp']) < start_time:
-                            continue
-                        if end_time and datetime.fromisoformat(event['timestamp']) > end_time:
-                            continue
-                        if event_type and event['type'] != event_type.value:
-                            continue
-                        if username and event['username'] != username:
-                            continue
-                        if site_id and event.get('site_id') != site_id:
-                            continue
-                        
-                        events.append(event)
-            except Exception as e:
-                logger.error(f"Error reading log file {log_file}: {e}")
-        
-        return events
+        if isinstance(event_type, AuditEventType):
+            event_type = event_type.value
+        try:
+            return self.store.query(start_time, end_time, type=event_type,
+                                    username=username or None, site_id=site_id or None)
+        except Exception as e:
+            logger.error(f"Error reading audit logs: {e}")
+            return []
+    
+    def flush(self):
+        """Write buffered events to disk."""
+        self.store.flush()
+    
+    def close(self):
+        """Flush buffered events and stop the periodic writer."""
+        self.store.close()
     
     def clear_events(self, before: Optional[datetime] = None):
         """Clear audit events older than the specified date.
@@ -174,19 +153,4 @@ class AuditLogger:
         Args:
             before: Optional date to clear events before
         """
-        if not before:
-            # Clear all events
-            for log_file in self.log_dir.glob('audit_*.log'):
-                try:
-                    log_file.unlink()
-                except Exception as e:
-                    logger.error(f"Error deleting log file {log_file}: {e}")
-        else:
-            # Clear events before the specified date
-            for log_file in self.log_dir.glob('audit_*.log'):
-                try:
-                    file_date = datetime.strptime(log_file.stem.split('_')[1], '%Y-%m-%d')
-                    if file_date < before:
-                        log_file.unlink()
-                except Exception as e:
-                    logger.error(f"Error deleting log file {log_file}: {e}") 
\ No newline at end of file
+        self.store.delete_before(before.date() if before else None)
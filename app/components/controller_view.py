@@ -250,7 +250,7 @@ class ControllerView(QWidget):
         # Display events
         for event in events:
             self.audit_logs_text.append(
-                f"[{event['timestamp']}] {event['event_type']} - "
+                f"[{event['timestamp']}] {event['type']} - "
                 f"User: {event['username']}, Site: {event['site_id']}\n"
                 f"Details: {event['details']}\n"
             )
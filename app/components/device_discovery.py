@@ -11,6 +11,7 @@ from scapy.all import ARP, Ether, srp
 from app.components.network_scanner import NetworkScanner
 from app.utils.logger import get_logger
 from app.utils.config import get_config
+from app.utils.mac_vendor import get_vendor_name
 
 # Module logger
 logger = get_logger('components.device_discovery')
@@ -165,21 +166,7 @@ class DeviceDiscovery:
                 continue
                 
             # Use vendor information to guess device type
-            vendor = device.get('vendor', '').lower()
-            
-            # Basic classification based on common vendors
-            if any(x in vendor for x in ['cisco', 'juniper', 'huawei', 'arista']):
-                categories['router'].append(device)
-            elif any(x in vendor for x in ['vmware', 'microsoft', 'linux', 'unix', 'oracle']):
-                categories['server'].append(device)
-            elif any(x in vendor for x in ['apple', 'samsung', 'xiaomi', 'huawei']):
-                categories['mobile'].append(device)
-            elif any(x in vendor for x in ['dell', 'hp', 'lenovo', 'acer', 'asus']):
-                categories['desktop'].append(device)
-            elif any(x in vendor for x in ['nest', 'ring', 'sonos', 'roku', 'amazon']):
-                categories['iot'].append(device)
-            else:
-                categories['unknown'].append(device)
+            categories[self._category_for_vendor(device.get('vendor', ''))].append(device)
                 
         return categories
     
@@ -280,11 +267,12 @@ class DeviceDiscovery:
                 device = {
                     'ip': received.psrc,
                     'mac': received.hwsrc,
-                    'hostname': self._get_hostname(received.psrc)
+                    'hostname': self._get_hostname(received.psrc),
+                    'vendor': get_vendor_name(received.hwsrc)
                 }
                 
                 if classify:
-                    device['type'] = self._classify_device(received.hwsrc)
+                    device['type'] = self._category_for_vendor(device['vendor'])
                     
                 if ports:
                     device['open_ports'] = self._scan_ports(received.psrc, ports)
@@ -310,8 +298,25 @@ class DeviceDiscovery:
             
     def _classify_device(self, mac: str) -> str:
         """Classify device by MAC address."""
-        # TODO: Implement MAC address vendor lookup
-        return "unknown"
+        return self._category_for_vendor(get_vendor_name(mac))
+        
+    @staticmethod
+    def _category_for_vendor(vendor: str) -> str:
+        """Guess a device category from its vendor name."""
+        vendor = (vendor or '').lower()
+        
+        # Basic classification based on common vendors
+        if any(x in vendor for x in ['cisco', 'juniper', 'huawei', 'arista']):
+            return 'router'
+        elif any(x in vendor for x in ['vmware', 'microsoft', 'linux', 'unix', 'oracle']):
+            return 'server'
+        elif any(x in vendor for x in ['apple', 'samsung', 'xiaomi', 'huawei']):
+            return 'mobile'
+        elif any(x in vendor for x in ['dell', 'hp', 'lenovo', 'acer', 'asus']):
+            return 'desktop'
+        elif any(x in vendor for x in ['nest', 'ring', 'sonos', 'roku', 'amazon']):
+            return 'iot'
+        return 'unknown'
         
     def _scan_ports(self, ip: str, ports: List[int]) -> List[int]:
         """Scan ports on a device."""
@@ -156,6 +156,21 @@ class MainWindow(QMainWindow):
         # Setup system tray
         self.setup_tray()
         
+    def create_packets_tab(self):
+        """Create the packet capture and analysis tab."""
+        self.packet_view = PacketView()
+        self.packet_analysis_tab = self.packet_view
+        self.packet_view.capture_started.connect(self.handle_capture_toggle)
+        self.packet_view.status_changed.connect(self.update_status)
+        return self.packet_view
+        
+    def create_attacks_tab(self):
+        """Create the attack pattern tab, fed by the packets captured in the packets tab."""
+        self.attack_view = AttackView(packet_source=self.packet_view.analyzer)
+        self.attack_view.attack_detected.connect(self.handle_attack_detected)
+        self.attack_view.status_changed.connect(self.update_status)
+        return self.attack_view
+        
     def setup_tray(self):
         self.tray_icon = QSystemTrayIcon(self)
         tray_menu = QMenu()
@@ -542,6 +557,7 @@ class MainWindow(QMainWindow):
                 self.spoofer.stop_spoofing()
             if self.detector.running:
                 self.detector.stop_detection()
+            self.scanner.close()
             event.accept()
 
     def apply_filter(self, filter_text):
@@ -11,6 +11,7 @@ from threading import Lock
 from app.components.ml_integration import MLIntegration
 from app.ml.rule_engine import RuleEngine
 from app.ml.context_tracker import ContextTracker
+from app.ml.feature_extraction import FeatureExtractor
 from app.utils.logger import get_logger
 
 logger = get_logger('components.ml_controller')
@@ -22,6 +23,9 @@ class MLController:
         """Initialize the ML controller."""
         self.ml_integration = MLIntegration()
         self.rule_engine = RuleEngine()
+        self.feature_extractor = FeatureExtractor()
+        # The tracker keeps its own packet window, as its history window is
+        # longer than the extractor's
         self.context_tracker = ContextTracker()
         
         self.running = False
@@ -182,7 +186,8 @@ class MLController:
         # Update statistics
         self.stats["packets_analyzed"] += 1
         
-        # Update context tracker with packet information
+        # Extract features, then update the context tracker
+        features = self.feature_extractor.extract_features(packet)
         self.context_tracker.update(packet)
         
         # Get current context for rule evaluation
@@ -246,6 +251,7 @@ class MLController:
         
         # Combine results (prefer rule-based if both detected)
         combined_result = ml_result.copy()
+        combined_result['features'] = features
         if rule_results:
             combined_result['is_threat'] = True
             combined_result['rule_detection'] = True
@@ -2,131 +2,228 @@ import sys
 import time
 from datetime import datetime
 from collections import deque
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from app.utils.object_pool import ObjectPool, SPSCRing, TokenBucket, UNPOOLED
 from app.utils.performance import PerformanceMonitor
 
+PACKET_FIELDS = ("timestamp", "src_mac", "dst_mac", "src_ip", "dst_ip", "protocol", "length", "info")
+
+def _new_packet_record():
+    return dict.fromkeys(PACKET_FIELDS)
+
+def _reset_packet_record(record):
+    record.clear()
+    record.update(_EMPTY_RECORD)
+
+_EMPTY_RECORD = _new_packet_record()
+
 class NetworkMonitor(QObject):
+    """Packet monitor with pooled packet records and a throttled ingest ring.
+    
+    Packets are copied into preallocated records and pushed onto a
+    single-producer/single-consumer ring (capture side). drain() takes them
+    off the ring as fast as a token bucket allows (processing side); the
+    rest wait on the ring, and only packets that find the ring full are
+    dropped. Records are returned to the pool when they leave the packet
+    buffer or are rejected.
+    
+    The records in packet_buffer belong to the pool: once evicted they are
+    cleared and reused for later packets. Use get_packets() for copies that
+    can be kept.
+    """
+    
     arp_attack_detected = pyqtSignal(dict)
     
-    def __init__(self):
+    def __init__(self, pool_size=None, ring_capacity=8192,
+                 max_packet_rate=10000, burst_size=5000,
+                 memory_sample_interval=1.0, buffer_size=10000):
+        """Initialize the monitor.
+        
+        Args:
+            pool_size: Packet records preallocated; by default enough for a
+                full packet buffer and a full ring
+            ring_capacity: Packets that can wait for processing
+            max_packet_rate: Packets processed per second at most
+            burst_size: Packets that can be processed at once after a pause
+            memory_sample_interval: Seconds between memory samples
+            buffer_size: Most recent valid packets kept
+        """
         super().__init__()
         self.performance_monitor = PerformanceMonitor()
-        self.packet_buffer = deque(maxlen=10000)  # Limit buffer size
-        self.object_pool = {}
-        self.pool_size = 1000
-        self.pool_allocations = 0
-        self.pool_releases = 0
+        self.packet_buffer = deque(maxlen=buffer_size)
+        # Pool slots of the records in packet_buffer, in the same order
+        self._buffer_slots = deque()
+        self.ingest_ring = SPSCRing(ring_capacity)
+        if pool_size is None:
+            # The ring rounds its capacity up to a power of two
+            pool_size = buffer_size + self.ingest_ring.capacity
+        self.pool_size = pool_size
+        self.object_pool = ObjectPool(pool_size, _new_packet_record, _reset_packet_record)
+        self.throttle = TokenBucket(max_packet_rate, burst_size)
         self.packets_processed = 0
+        self.packets_dropped = 0
+        self.throttled_drains = 0
         self.invalid_packets_detected = 0
         self.duplicate_packets_detected = 0
         self.is_monitoring_active = False
         self.is_throttled = False
         self.memory_warning_issued = False
         self.error_recovery_attempted = False
-        self.last_processing_time = time.time()
-        self.processing_interval = 0.001  # 1ms between processing batches
+        
+        # Drains packets left on the ring by throttling
+        self._drain_timer = QTimer(self)
+        self._drain_timer.setSingleShot(True)
+        self._drain_timer.timeout.connect(self.drain)
+        
+        # Memory is sampled periodically rather than per packet
+        self._memory_timer = QTimer(self)
+        self._memory_timer.timeout.connect(self._sample_memory)
+        self._memory_timer.start(int(memory_sample_interval * 1000))
+        self._sample_memory()
+        
+    @property
+    def pool_allocations(self):
+        return self.object_pool.allocations
+    
+    @property
+    def pool_releases(self):
+        return self.object_pool.releases
         
     def initialize_object_pool(self, size):
-        """Initialize the object pool with a given size"""
+        """Initialize the object pool with a given size
+        
+        Raises:
+            RuntimeError: If monitoring is active or packets are still queued,
+                as their records belong to the current pool
+        """
+        if self.is_monitoring_active or len(self.ingest_ring):
+            raise RuntimeError("Cannot replace the object pool while packets are being queued")
+        self._release_buffer()
         self.pool_size = size
-        self.object_pool = {}
-        for i in range(size):
-            self.object_pool[i] = {
-                "timestamp": None,
-                "src_mac": None,
-                "dst_mac": None,
-                "src_ip": None,
-                "dst_ip": None,
-                "protocol": None,
-                "length": None,
-                "info": None,
-                "in_use": False
-            }
+        self.object_pool = ObjectPool(size, _new_packet_record, _reset_packet_record)
     
     def allocate_from_pool(self):
         """Allocate an object from the pool"""
-        self.pool_allocations += 1
-        for obj_id, obj in self.object_pool.items():
-            if not obj["in_use"]:
-                obj["in_use"] = True
-                return obj_id, obj
-        # If pool is full, create a new object
-        new_id = len(self.object_pool)
-        new_obj = {
-            "timestamp": None,
-            "src_mac": None,
-            "dst_mac": None,
-            "src_ip": None,
-            "dst_ip": None,
-            "protocol": None,
-            "length": None,
-            "info": None,
-            "in_use": True
-        }
-        self.object_pool[new_id] = new_obj
-        return new_id, new_obj
+        return self.object_pool.allocate()
     
     def release_to_pool(self, obj_id):
         """Release an object back to the pool"""
-        if obj_id in self.object_pool:
-            self.object_pool[obj_id]["in_use"] = False
-            self.pool_releases += 1
+        if isinstance(obj_id, tuple):
+            obj_id = obj_id[0]
+        self.object_pool.release(obj_id)
     
     def clear_object_pool(self):
         """Clear the object pool"""
+        self._release_buffer()
         self.object_pool.clear()
-        self.pool_allocations = 0
-        self.pool_releases = 0
+        
+    def start_monitoring(self):
+        """Start packet monitoring"""
+        self.is_monitoring_active = True
+        self.throttle.refill()
+        self._sample_memory()
     
-    def process_packet(self, packet):
-        """Process a single packet"""
+    def enqueue_packet(self, packet):
+        """Queue a packet for processing (capture side)
+        
+        Args:
+            packet: Packet dictionary
+            
+        Returns:
+            bool: False if the ring was full and the packet was dropped
+        """
+        slot, record = self.object_pool.allocate()
+        record.update(packet)
+        if not self.ingest_ring.push((slot, record)):
+            self.object_pool.release(slot)
+            self.packets_dropped += 1
+            return False
+        return True
+    
+    def drain(self):
+        """Process queued packets as fast as the throttle allows (processing side)
+        
+        Returns:
+            int: Number of packets taken off the ring
+        """
+        queued = len(self.ingest_ring)
+        if not queued:
+            self.is_throttled = False
+            return 0
+            
         start_time = time.time()
+        items = self.ingest_ring.pop_many(self.throttle.take(queued))
+        for slot, record in items:
+            self._process_record(slot, record)
         
-        # Check if throttling is needed
-        current_time = time.time()
-        if current_time - self.last_processing_time < self.processing_interval:
-            self.is_throttled = True
-            return
+        if items:
+            processing_time = time.time() - start_time
+            self.performance_monitor.record_processing_time(processing_time / len(items))
         
-        self.is_throttled = False
+        # Whatever the bucket did not allow stays queued for later
+        self.is_throttled = len(self.ingest_ring) > 0
+        if self.is_throttled:
+            self.throttled_drains += 1
+            if not self._drain_timer.isActive():
+                self._drain_timer.start(max(1, int(self.throttle.time_until(1) * 1000) + 1))
+        return len(items)
+    
+    def get_packets(self):
+        """Get copies of the buffered packets, oldest first
+        
+        Returns:
+            list: Packet dictionaries that stay valid after eviction
+        """
+        return [dict(record) for record in self.packet_buffer]
+    
+    def process_packet(self, packet):
+        """Process a single packet"""
+        self.enqueue_packet(packet)
+        self.drain()
+    
+    def process_packet_batch(self, packets):
+        """Process a batch of packets"""
+        for packet in packets:
+            self.enqueue_packet(packet)
+        self.drain()
         
+    def _process_record(self, slot, record):
+        """Validate, de-duplicate and buffer a dequeued packet record"""
         # Validate packet
-        if not self._validate_packet(packet):
+        if not self._validate_packet(record):
             self.invalid_packets_detected += 1
+            self.object_pool.release(slot)
             return
         
         # Check for duplicates
-        if self._is_duplicate_packet(packet):
+        if self._is_duplicate_packet(record):
             self.duplicate_packets_detected += 1
+            self.object_pool.release(slot)
             return
         
-        # Process packet
-        self.packet_buffer.append(packet)
+        # Process packet; the record evicted from a full buffer goes back to the pool
+        if len(self.packet_buffer) == self.packet_buffer.maxlen:
+            self.object_pool.release(self._buffer_slots.popleft())
+        self.packet_buffer.append(record)
+        self._buffer_slots.append(slot)
         self.packets_processed += 1
-        
-        # Update performance metrics
-        processing_time = time.time() - start_time
-        self.performance_monitor.record_processing_time(processing_time)
         self.performance_monitor.increment_packet_count()
+        
+    def _sample_memory(self):
+        """Record memory usage and check for memory warnings"""
         self.performance_monitor.record_memory_usage()
         
         # Check for memory warnings
         if self.performance_monitor.metrics["memory_usage"] > 100 * 1024 * 1024:  # 100MB
             self.memory_warning_issued = True
-        
-        self.last_processing_time = current_time
-    
-    def process_packet_batch(self, packets):
-        """Process a batch of packets"""
-        start_time = time.time()
-        
-        # Process each packet in the batch
-        for packet in packets:
-            self.process_packet(packet)
-        
-        # Update batch processing metrics
-        batch_time = time.time() - start_time
-        self.performance_monitor.record_processing_time(batch_time / len(packets))
+            
+    def _release_buffer(self):
+        """Empty the packet buffer, returning its records to the pool"""
+        for slot in self._buffer_slots:
+            if slot != UNPOOLED:
+                self.object_pool.release(slot)
+        self._buffer_slots.clear()
+        self.packet_buffer.clear()
     
     def _validate_packet(self, packet):
         """Validate packet format and content"""
@@ -189,6 +286,8 @@ class NetworkMonitor(QObject):
     def reset_counters(self):
         """Reset all counters and metrics"""
         self.packets_processed = 0
+        self.packets_dropped = 0
+        self.throttled_drains = 0
         self.invalid_packets_detected = 0
         self.duplicate_packets_detected = 0
         self.memory_warning_issued = False
@@ -197,11 +296,30 @@ class NetworkMonitor(QObject):
     
     def get_performance_report(self):
         """Get detailed performance report"""
-        return self.performance_monitor.get_performance_report()
+        report = self.performance_monitor.get_performance_report()
+        report["ingest"] = {
+            "pool": self.object_pool.get_stats(),
+            "ring": self.ingest_ring.get_stats(),
+            "throttle": {
+                "max_packet_rate": self.throttle.rate,
+                "burst_size": self.throttle.burst,
+                "is_throttled": self.is_throttled,
+                "throttled_drains": self.throttled_drains
+            },
+            "dropped": {
+                "ring_full": self.packets_dropped,
+                "invalid": self.invalid_packets_detected,
+                "duplicate": self.duplicate_packets_detected
+            }
+        }
+        return report
     
     def stop_monitoring(self):
         """Stop packet monitoring"""
         self.is_monitoring_active = False
-        self.packet_buffer.clear()
+        self._drain_timer.stop()
+        # Packets still queued are discarded with the buffer
+        for slot, _ in self.ingest_ring.pop_many(len(self.ingest_ring)):
+            self.object_pool.release(slot)
         self.clear_object_pool()
         self.reset_counters() 
\ No newline at end of file
@@ -13,6 +13,8 @@ import socket
 from app.utils.logger import get_logger
 from app.utils.config import get_config
 from app.utils.mac_vendor import get_vendor_name
+from app.utils.arp_sweep import ArpSweeper
+from app.utils.hostname_resolver import HostnameResolver
 
 # Module logger
 logger = get_logger('components.network_scanner')
@@ -27,8 +29,15 @@ class NetworkScanner:
         self.timeout = self.config.get("scanner.timeout", 5)  
         # Reduce default batch size to avoid overwhelming the network
         self.batch_size = self.config.get("scanner.batch_size", 32)  
+        # ARP requests sent per second during a sweep
+        self.send_rate = self.config.get("scanner.send_rate", 5000)
+        # Seconds to wait for pending hostname lookups at the end of a scan
+        self.dns_timeout = self.config.get("scanner.dns_timeout", 2)
+        # Shortest interval between streamed progress callbacks
+        self.stream_interval = self.config.get("scanner.stream_interval", 0.5)
         self.cache = {}
         self.cache_timeout = self.config.get("scanner.cache_timeout", 60 * 30)
+        self.sweeper = None
         
         # Check for root/admin privileges
         self._check_privileges()
@@ -37,6 +46,12 @@ class NetworkScanner:
         if self.config.get("scanner.save_results", True):
             self._ensure_results_dir()
         
+        # Reverse DNS runs in the background with a cache kept between runs
+        self.resolver = HostnameResolver(
+            cache_path=os.path.join(self._get_base_dir(), 'hostname_cache.json'),
+            max_workers=self.config.get("scanner.dns_workers", 16)
+        )
+        
     def _check_privileges(self):
         """Check if the program has the necessary privileges for ARP scanning."""
         try:
@@ -111,11 +126,14 @@ class NetworkScanner:
                 return f"{ip_parts[0]}.{ip_parts[1]}.{ip_parts[2]}.0/24"
             return None
         
-    def start_scan(self, callback: Optional[Callable] = None) -> bool:
+    def start_scan(self, callback: Optional[Callable] = None,
+                   device_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> bool:
         """Start scanning the network for devices.
         
         Args:
             callback: Optional callback function that is called with scan results
+            device_callback: Optional callback called with each device as soon
+                as it answers, and again when its hostname has been resolved
             
         Returns:
             True if scan started successfully, False otherwise
@@ -139,34 +157,36 @@ class NetworkScanner:
         # Start scanning in a separate thread
         self.scan_thread = threading.Thread(
             target=self._scan_thread,
-            args=(network_range, callback)
+            args=(network_range, callback, device_callback)
         )
         self.scan_thread.daemon = True
         self.scan_thread.start()
         
         return True
         
-    def _scan_thread(self, network_range: str, callback: Optional[Callable]):
+    def _scan_thread(self, network_range: str, callback: Optional[Callable],
+                     device_callback: Optional[Callable[[Dict[str, Any]], None]] = None):
         """Thread function to perform the actual network scan.
         
         Args:
             network_range: Network range in CIDR notation
             callback: Optional callback to be called with results
+            device_callback: Optional callback for each discovered device
         """
         try:
             network = ipaddress.IPv4Network(network_range)
             total_ips = network.num_addresses
             discovered_devices = []
+            devices_lock = threading.Lock()
+            lookups = []
+            last_update = 0.0
             start_time = time.time()
             
             # Skip network and broadcast addresses for regular subnets
             host_ips = list(network.hosts()) if total_ips > 2 else list(network)
             
-            # Calculate optimal batch size based on network size
-            batch_size = min(self.batch_size, len(host_ips))
-            
-            # First, scan the gateway and cached devices for faster initial results
-            gateway_ip, _ = self.get_default_gateway()
+            # Probe the gateway and cached devices first for faster initial results
+            gateway_ip, interface = self.get_default_gateway()
             initial_targets = []
             
             if gateway_ip:
@@ -179,40 +199,62 @@ class NetworkScanner:
                           ipaddress.IPv4Address(ip) in network]
             
             initial_targets.extend(cached_ips)
-            
-            # Convert initial targets to IP objects for removal from main list
-            initial_target_objects = [ipaddress.IPv4Address(ip) for ip in initial_targets if ip]
-            remaining_ips = [ip for ip in host_ips if ip not in initial_target_objects]
-            
-            # Scan initial targets first if any exist
-            if initial_targets:
-                initial_devices = self._batch_scan(initial_targets, is_priority=True)
-                discovered_devices.extend(initial_devices)
+            targets = list(dict.fromkeys(initial_targets + [str(ip) for ip in host_ips]))
+            
+            def on_device(device: Dict[str, Any]):
+                nonlocal last_update
+                with devices_lock:
+                    discovered_devices.append(device)
+                    now = time.time()
+                    stream = now - last_update >= self.stream_interval
+                    if stream:
+                        last_update = now
+                        snapshot = discovered_devices.copy()
                 
-                # Send an early callback with initial results
-                if callback and initial_devices:
-                    callback(initial_devices.copy(), "Initial scan results")
-            
-            # Process remaining IPs in batches
-            for i in range(0, len(remaining_ips), batch_size):
-                if not self.scanning:
-                    logger.info("Scan stopped by user")
-                    break
-                    
-                batch = remaining_ips[i:i+batch_size]
-                batch_devices = self._batch_scan(batch)
-                discovered_devices.extend(batch_devices)
+                if device_callback:
+                    device_callback(device)
+                if callback and stream:
+                    callback(snapshot, f"Scan in progress: {len(snapshot)} devices found")
+            
+            def on_reply(ip: str, mac: str):
+                device, lookup = self._create_device(ip, mac, device_callback)
+                if lookup is not None:
+                    lookups.append(lookup)
+                on_device(device)
+            
+            self.sweeper = self._create_sweeper(interface)
+            if self.sweeper is not None:
+                answered = set()
                 
-                # Update progress if there's a significant number of devices
-                progress = min(100, (i + batch_size) / len(remaining_ips) * 100)
-                logger.debug(f"Scan progress: {progress:.1f}% ({len(discovered_devices)} devices found)")
+                def on_sweep_reply(ip: str, mac: str):
+                    answered.add(ip)
+                    on_reply(ip, mac)
                 
-                # Optionally provide progress updates via callback
-                if callback and batch_devices:
-                    callback(discovered_devices.copy(), 
-                             f"Scan in progress: {progress:.1f}% complete")
+                try:
+                    # Every request goes out at once; replies stream in as they arrive
+                    self.sweeper.sweep(targets, on_reply=on_sweep_reply)
+                    logger.debug(f"ARP sweep stats: {self.sweeper.stats}")
+                except OSError as e:
+                    # Typically PermissionError: raw sockets need root/CAP_NET_RAW
+                    logger.warning(f"ARP sweep failed on {interface}, falling back to batched scan: {e}")
+                    self.sweeper = None
+                    self._scan_in_batches([ip for ip in targets if ip not in answered], on_reply)
+            else:
+                self._scan_in_batches(targets, on_reply)
+            self.sweeper = None
+            
+            # Give outstanding hostname lookups a bounded time to finish
+            deadline = time.time() + self.dns_timeout
+            for lookup in list(lookups):
+                try:
+                    lookup.result(max(0.0, deadline - time.time()))
+                except Exception:
+                    pass
+            self.resolver.save()
             
             # Update final device list
+            with devices_lock:
+                discovered_devices = discovered_devices.copy()
             self.devices = discovered_devices
             scan_time = time.time() - start_time
             
@@ -220,6 +262,8 @@ class NetworkScanner:
             if self.config.get("scanner.save_results", True):
                 self._save_scan_results(discovered_devices)
             
+            if not self.scanning:
+                logger.info("Scan stopped by user")
             logger.info(f"Scan completed in {scan_time:.2f} seconds, found {len(discovered_devices)} devices")
             
             if callback:
@@ -231,9 +275,44 @@ class NetworkScanner:
                 callback([], f"Scan error: {str(e)}")
                 
         finally:
+            self.sweeper = None
             self.scanning = False
     
-    def _batch_scan(self, ip_batch, is_priority=False) -> List[Dict[str, Any]]:
+    def _create_sweeper(self, interface: Optional[str]) -> Optional[ArpSweeper]:
+        """Create a raw-socket ARP sweeper for an interface.
+        
+        Args:
+            interface: Interface to sweep from
+            
+        Returns:
+            ArpSweeper, or None if the interface addresses are unknown
+        """
+        if not interface:
+            return None
+        try:
+            addresses = netifaces.ifaddresses(interface)
+            src_mac = addresses[netifaces.AF_LINK][0]['addr']
+            src_ip = addresses[netifaces.AF_INET][0]['addr']
+            return ArpSweeper(interface, src_mac, src_ip, rate=self.send_rate, timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f"ARP sweep unavailable on {interface}, falling back to batched scan: {e}")
+            return None
+    
+    def _scan_in_batches(self, targets: List[str], on_reply: Callable[[str, str], None]):
+        """Scan targets batch by batch with scapy when no sweeper is available.
+        
+        Args:
+            targets: IP addresses to scan, in order
+            on_reply: Called with (ip, mac) for each answering device
+        """
+        batch_size = max(1, min(self.batch_size, len(targets)))
+        for i in range(0, len(targets), batch_size):
+            if not self.scanning:
+                break
+            for ip_address, mac_address in self._batch_scan(targets[i:i + batch_size]):
+                on_reply(ip_address, mac_address)
+    
+    def _batch_scan(self, ip_batch, is_priority=False) -> List[Tuple[str, str]]:
         """Scan a batch of IP addresses.
         
         Args:
@@ -241,7 +320,7 @@ class NetworkScanner:
             is_priority: Whether this is a priority batch (gateway, cached devices)
             
         Returns:
-            List of discovered devices in this batch
+            List of (ip, mac) pairs that answered in this batch
         """
         # Convert IP objects to strings if needed
         ip_strings = [str(ip) for ip in ip_batch]
@@ -269,40 +348,51 @@ class NetworkScanner:
                     logger.warning(f"ARP request failed (attempt {retry + 1}), retrying: {e}")
                     time.sleep(1)  # Wait before retry
             
-            # Process results
-            devices = []
-            for sent, received in result:
-                try:
-                    mac_address = received.hwsrc
-                    ip_address = received.psrc
-                    
-                    # Basic validation of MAC and IP
-                    if not mac_address or not ip_address:
-                        continue
-                        
-                    # Get device info with error handling
-                    device_info = {
-                        'ip': ip_address,
-                        'mac': mac_address,
-                        'vendor': get_vendor_name(mac_address) or 'Unknown',
-                        'hostname': self._get_hostname(ip_address),
-                        'last_seen': datetime.now().isoformat()
-                    }
-                    
-                    # Update cache
-                    self.cache[ip_address] = (device_info, time.time())
-                    devices.append(device_info)
-                    
-                except Exception as e:
-                    logger.warning(f"Error processing device {ip_address if 'ip_address' in locals() else 'unknown'}: {e}")
-                    continue
-            
-            return devices
+            # Basic validation of MAC and IP
+            return [(received.psrc, received.hwsrc) for sent, received in result
+                    if received.psrc and received.hwsrc]
             
         except Exception as e:
             logger.error(f"Batch scan error: {str(e)}")
             return []
+    
+    def _create_device(self, ip_address: str, mac_address: str,
+                       device_callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """Build the record of an answering device.
+        
+        The hostname comes from the resolver cache when possible. Otherwise
+        a placeholder is used and the lookup continues in the background.
+        
+        Args:
+            ip_address: IP address of the device
+            mac_address: MAC address of the device
+            device_callback: Called with the device once its hostname is resolved
             
+        Returns:
+            Tuple of the device dictionary and the pending lookup future, if any
+        """
+        found, hostname = self.resolver.get_cached(ip_address)
+        device_info = {
+            'ip': ip_address,
+            'mac': mac_address,
+            'vendor': get_vendor_name(mac_address) or 'Unknown',
+            'hostname': hostname or self._default_hostname(ip_address),
+            'last_seen': datetime.now().isoformat()
+        }
+        
+        # Update cache
+        self.cache[ip_address] = (device_info, time.time())
+        if found:
+            return device_info, None
+        
+        def on_resolved(ip: str, resolved: Optional[str]):
+            if resolved:
+                device_info['hostname'] = resolved
+                if device_callback:
+                    device_callback(device_info)
+        
+        return device_info, self.resolver.resolve_async(ip_address, on_resolved)
+    
     def _get_hostname(self, ip: str) -> str:
         """Try to resolve hostname from IP address.
         
@@ -317,15 +407,35 @@ class NetworkScanner:
             hostname = socket.getfqdn(ip)
             # If getfqdn just returns the IP, it's not resolved
             if hostname == ip:
-                if ip.split('.')[-1] == '1':
-                    return "Router"
-                return f"Device ({ip})"
+                return self._default_hostname(ip)
             return hostname
         except Exception as e:
             logger.debug(f"Failed to resolve hostname for {ip}: {e}")
-            if ip.split('.')[-1] == '1':
-                return "Router"
-            return f"Device ({ip})"
+            return self._default_hostname(ip)
+    
+    def _default_hostname(self, ip: str) -> str:
+        """Get the name shown for a device without a DNS name.
+        
+        Args:
+            ip: The IP address of the device
+            
+        Returns:
+            Default device name
+        """
+        if ip.split('.')[-1] == '1':
+            return "Router"
+        return f"Device ({ip})"
+    
+    def _get_base_dir(self) -> str:
+        """Get the per-user ARPGuard data directory.
+        
+        Returns:
+            Path to the data directory
+        """
+        if os.name == 'nt':  # Windows
+            return os.path.join(os.environ.get('APPDATA', ''), 'ARPGuard')
+        # macOS, Linux
+        return os.path.join(os.path.expanduser('~'), '.arpguard')
             
     def _ensure_results_dir(self) -> str:
         """Ensure the scan results directory exists.
@@ -333,12 +443,7 @@ class NetworkScanner:
         Returns:
             Path to the scan results directory
         """
-        if os.name == 'nt':  # Windows
-            base_dir = os.path.join(os.environ.get('APPDATA', ''), 'ARPGuard')
-        else:  # macOS, Linux
-            base_dir = os.path.join(os.path.expanduser('~'), '.arpguard')
-            
-        results_dir = os.path.join(base_dir, 'scan_results')
+        results_dir = os.path.join(self._get_base_dir(), 'scan_results')
         
         try:
             os.makedirs(results_dir, exist_ok=True)
@@ -426,6 +531,8 @@ class NetworkScanner:
             
         logger.info("Stopping network scan")
         self.scanning = False
+        if self.sweeper is not None:
+            self.sweeper.stop()
         
         # Wait for scan thread to complete
         if self.scan_thread and self.scan_thread.is_alive():
@@ -433,6 +540,18 @@ class NetworkScanner:
             
         return True
     
+    def close(self):
+        """Stop any scan and release the hostname resolver's worker threads."""
+        if self.scanning:
+            self.stop_scan()
+        self.resolver.shutdown()
+        
+    def __del__(self):
+        """Clean up resources when the scanner is destroyed."""
+        resolver = getattr(self, 'resolver', None)
+        if resolver is not None:
+            resolver.shutdown()
+    
     def clear_cache(self):
         """Clear the device cache."""
         self.cache = {}
@@ -460,12 +579,8 @@ class NetworkScanner:
             if host_count > 2:
                 host_count -= 2
                 
-            # Calculate number of batches
-            batch_size = self.batch_size
-            batch_count = (host_count + batch_size - 1) // batch_size
-            
-            # Estimate time based on batch count and timeout
-            estimate = batch_count * self.timeout
+            # Requests go out at the send rate, then one reply window
+            estimate = host_count / self.send_rate + self.timeout
             
             # Add some overhead for processing
             estimate = estimate * 1.1
@@ -15,11 +15,22 @@ import asyncio
 from datetime import datetime
 import time
 
+import numpy as np
+
+from app.utils.broadcast_hub import BroadcastHub, diff_items, get_broadcast_hub
+from app.utils.force_layout import ForceLayout
 from app.utils.logger import get_logger
 
 # Module logger
 logger = get_logger('components.network_topology')
 
+# Iterations and starting step size for a layout from random positions
+LAYOUT_ITERATIONS = 100
+LAYOUT_TEMPERATURE = 0.1
+# Warm-started layouts only need to settle nodes that moved or were added
+WARM_LAYOUT_ITERATIONS = 30
+WARM_LAYOUT_TEMPERATURE = 0.05
+
 class NetworkNode:
     """Represents a node in the network topology."""
     
@@ -70,6 +81,7 @@ class NetworkTopologyView(QWidget):
     # Signals
     node_selected = pyqtSignal(str)  # Emitted when a node is selected, passes node_id
     node_double_clicked = pyqtSignal(str)  # Emitted when a node is double-clicked
+    _layout_ready = pyqtSignal()  # Emitted from the layout thread when a layout finishes
     
     def __init__(self, parent=None):
         """Initialize the network topology view.
@@ -97,6 +109,13 @@ class NetworkTopologyView(QWidget):
         self.attraction_force = 0.06
         self.damping = 0.85
         
+        # Background force-directed layout
+        self._layout_lock = threading.Lock()
+        self._layout_generation = 0
+        self._layout_result = None
+        self._layout_thread = None
+        self._layout_ready.connect(self._apply_layout_result)
+        
         # Setup UI
         self.setup_ui()
     
@@ -226,6 +245,8 @@ class NetworkTopologyView(QWidget):
         if not self.nodes:
             return
             
+        # A background layout must not overwrite the one applied now
+        self.cancel_layout()
         if self.layout_algorithm == "force-directed":
             self._apply_force_directed_layout()
         elif self.layout_algorithm == "circular":
@@ -236,58 +257,111 @@ class NetworkTopologyView(QWidget):
         self._update_scene()
     
     def _apply_force_directed_layout(self):
-        """Apply a force-directed layout algorithm."""
+        """Start a force-directed layout on a background thread.
+
+        Nodes keep their current positions as the starting point, so after
+        an incremental change only a few iterations are needed. The scene is
+        updated when the layout finishes; a newer layout request cancels a
+        running one.
+        """
         if not self.nodes:
             return
-            
-        # Initialize with random positions if not set
-        for node in self.nodes.values():
-            if node.x == 0 and node.y == 0:
-                node.x = random.uniform(-200, 200)
-                node.y = random.uniform(-200, 200)
-        
-        # Perform iterations of force-directed layout
-        iterations = 100
-        temperature = 0.1
-        cooling_factor = 0.99
-        
-        for i in range(iterations):
-            # Calculate repulsive forces
-            for node1_id, node1 in self.nodes.items():
-                force_x = 0
-                force_y = 0
-                
-                # Repulsive forces between all nodes
-                for node2_id, node2 in self.nodes.items():
-                    if node1_id != node2_id:
-                        dx = node1.x - node2.x
-                        dy = node1.y - node2.y
-                        distance = max(1.0, math.sqrt(dx * dx + dy * dy))
-                        
-                        # Apply repulsive force
-                        repulsive_force = self.repulsion_force / (distance * distance)
-                        force_x += (dx / distance) * repulsive_force
-                        force_y += (dy / distance) * repulsive_force
-                
-                # Attractive forces between connected nodes
-                for connected_id in node1.connected_to:
-                    if connected_id in self.nodes:
-                        node2 = self.nodes[connected_id]
-                        dx = node1.x - node2.x
-                        dy = node1.y - node2.y
-                        distance = max(1.0, math.sqrt(dx * dx + dy * dy))
-                        
-                        # Apply attractive force
-                        attractive_force = -self.attraction_force * (distance - self.edge_length)
-                        force_x += (dx / distance) * attractive_force
-                        force_y += (dy / distance) * attractive_force
-                
-                # Apply forces with damping
-                node1.x += force_x * temperature
-                node1.y += force_y * temperature
-            
-            # Cool down the system
-            temperature *= cooling_factor
+
+        node_ids = list(self.nodes)
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        positions = np.array([(node.x, node.y) for node in self.nodes.values()], dtype=np.float64)
+        edges = np.array([(index[node_id], index[other_id])
+                          for node_id, node in self.nodes.items()
+                          for other_id in node.connected_to if other_id in index],
+                         dtype=np.intp).reshape(-1, 2)
+
+        # Nodes still at the origin have never been laid out
+        new = (positions[:, 0] == 0) & (positions[:, 1] == 0)
+        if new.all():
+            spread = max(200.0, self.edge_length * math.sqrt(len(node_ids)) / 2)
+            positions = np.random.uniform(-spread, spread, positions.shape)
+            iterations, temperature = LAYOUT_ITERATIONS, LAYOUT_TEMPERATURE
+        else:
+            # Place new nodes next to a neighbour that already has a position
+            for i in np.nonzero(new)[0]:
+                placed = [index[other_id] for other_id in self.nodes[node_ids[i]].connected_to
+                          if other_id in index and not new[index[other_id]]]
+                anchor = positions[placed[0]] if placed else positions[~new].mean(axis=0)
+                positions[i] = anchor + np.random.uniform(-self.edge_length, self.edge_length, 2)
+            iterations, temperature = WARM_LAYOUT_ITERATIONS, WARM_LAYOUT_TEMPERATURE
+        # Show new nodes at their starting points until the layout finishes
+        for i in np.nonzero(new)[0]:
+            self.nodes[node_ids[i]].x, self.nodes[node_ids[i]].y = positions[i].tolist()
+
+        engine = ForceLayout(repulsion=self.repulsion_force,
+                             attraction=self.attraction_force,
+                             edge_length=self.edge_length)
+        with self._layout_lock:
+            self._layout_generation += 1
+            generation = self._layout_generation
+        self._layout_thread = threading.Thread(
+            target=self._run_force_layout,
+            args=(engine, generation, node_ids, positions, edges, iterations, temperature),
+            name='topology-layout', daemon=True
+        )
+        self._layout_thread.start()
+
+    def _run_force_layout(self, engine, generation, node_ids, positions, edges,
+                          iterations, temperature):
+        """Run the layout engine and hand the result to the main thread."""
+        def superseded():
+            return generation != self._layout_generation
+
+        try:
+            start = time.perf_counter()
+            positions, done = engine.run(positions, edges, iterations=iterations,
+                                         temperature=temperature, should_stop=superseded)
+            logger.debug(f"Laid out {len(node_ids)} nodes in {done} iterations "
+                         f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+        except Exception as e:
+            logger.error(f"Error computing force-directed layout: {e}")
+            return
+        with self._layout_lock:
+            if superseded():
+                return
+            self._layout_result = (node_ids, positions)
+        self._layout_ready.emit()
+
+    def _apply_layout_result(self):
+        """Move nodes to the positions of the last finished layout."""
+        with self._layout_lock:
+            result, self._layout_result = self._layout_result, None
+        if result is None:
+            return
+        node_ids, positions = result
+        for node_id, (x, y) in zip(node_ids, positions.tolist()):
+            node = self.nodes.get(node_id)
+            if node is not None:
+                node.x, node.y = x, y
+        self._update_scene()
+
+    def cancel_layout(self):
+        """Stop any layout running in the background."""
+        with self._layout_lock:
+            self._layout_generation += 1
+            self._layout_result = None
+
+    def wait_for_layout(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a background layout and apply it.
+
+        Args:
+            timeout: Seconds to wait, or None to wait until it finishes
+
+        Returns:
+            True if no layout is still running
+        """
+        thread = self._layout_thread
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                return False
+        self._apply_layout_result()
+        return True
     
     def _apply_circular_layout(self):
         """Apply a circular layout algorithm."""
@@ -774,171 +848,148 @@ class NetworkTopologyView(QWidget):
         self.attraction_force = force / 1000.0 
 
 class NetworkTopologyWebSocketHandler:
-    """Handles WebSocket connections for network topology data."""
-    
-    def __init__(self):
-        """Initialize the WebSocket handler."""
-        self.clients = set()
-        self.topology_data = {
-            "devices": [],
-            "connections": []
-        }
-        self.lock = threading.Lock()
-        self._topology_changed = False
-        self._update_thread = None
-        self._running = False
+    """Streams network topology changes to websocket subscribers.
+
+    Subscribers of the topology topic get a snapshot and then versioned
+    diffs of the devices and connections added, changed or removed since
+    the previous version. Changes are batched and published on an interval.
+    """
     
-    def start_update_thread(self, update_interval: float = 1.0):
-        """Start the update thread that sends topology updates to clients.
+    def __init__(self, hub: Optional[BroadcastHub] = None, topic: str = "topology"):
+        """Initialize the WebSocket handler.
         
         Args:
-            update_interval: How often to check for and send updates (in seconds)
+            hub: Broadcast hub to publish on; the shared hub by default
+            topic: Topic the topology is published under
         """
-        if self._update_thread is not None and self._update_thread.is_alive():
-            return  # Already running
-        
-        self._running = True
-        self._update_thread = threading.Thread(
-            target=self._update_loop,
-            args=(update_interval,),
-            daemon=True
-        )
-        self._update_thread.start()
+        self.hub = hub or get_broadcast_hub()
+        self.topic = topic
+        self.lock = threading.Lock()
+        self.version = 0
+        self.devices: Dict[str, dict] = {}
+        self.connections: Dict[str, dict] = {}
+        # Devices and connections as of self.version
+        self._published_devices: Dict[str, dict] = {}
+        self._published_connections: Dict[str, dict] = {}
+        self._dirty_devices: Set[str] = set()
+        self._dirty_connections: Set[str] = set()
+        self._update_task = None
+        self.hub.register_topic(topic, self.snapshot)
     
-    def stop_update_thread(self):
-        """Stop the update thread."""
-        self._running = False
-        if self._update_thread is not None:
-            self._update_thread.join(timeout=2.0)
-            self._update_thread = None
+    @property
+    def topology_data(self) -> Dict[str, List[dict]]:
+        """Current devices and connections as lists."""
+        with self.lock:
+            return {
+                "devices": list(self.devices.values()),
+                "connections": list(self.connections.values())
+            }
     
-    def _update_loop(self, interval: float):
-        """Background thread that sends updates to clients when the topology changes.
+    def start(self, update_interval: float = 0.5):
+        """Start publishing changes from the running event loop.
         
         Args:
-            interval: How often to check for changes (in seconds)
+            update_interval: Seconds between diffs
         """
-        while self._running:
-            # Check if topology has changed
-            with self.lock:
-                if self._topology_changed and self.clients:
-                    # Create a copy of the topology data
-                    update_data = {
-                        "type": "topology_update",
-                        "timestamp": datetime.now().isoformat(),
-                        "data": {
-                            "devices": self.topology_data["devices"],
-                            "connections": self.topology_data["connections"]
-                        }
-                    }
-                    self._topology_changed = False
-                else:
-                    update_data = None
-            
-            # If there's an update, send it to all clients
-            if update_data is not None:
-                message = json.dumps(update_data)
-                for client in list(self.clients):
-                    try:
-                        # This is a synchronous operation in a background thread
-                        # In a real async environment, this would be handled differently
-                        asyncio.run(self._send_to_client(client, message))
-                    except Exception as e:
-                        logger.error(f"Error sending topology update to client: {e}")
-                        # Remove failed client
-                        self.clients.discard(client)
-            
-            # Sleep for the interval
-            time.sleep(interval)
+        if self._update_task is not None and not self._update_task.done():
+            return  # Already running
+        self._update_task = asyncio.ensure_future(self._update_loop(update_interval))
+    
+    async def stop(self):
+        """Stop publishing and send any pending changes."""
+        if self._update_task is not None:
+            self._update_task.cancel()
+            try:
+                await self._update_task
+            except asyncio.CancelledError:
+                pass
+            self._update_task = None
+        self.flush()
     
-    async def _send_to_client(self, client, message):
-        """Send a message to a client asynchronously.
+    async def _update_loop(self, interval: float):
+        """Publish batched changes every interval.
         
         Args:
-            client: WebSocket client
-            message: Message to send
+            interval: How often to check for changes (in seconds)
         """
-        try:
-            await client.send_text(message)
-        except Exception as e:
-            logger.error(f"Error sending to client: {e}")
-            raise
+        while True:
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error publishing topology diff: {e}")
+            await asyncio.sleep(interval)
     
-    def add_client(self, client):
-        """Add a new WebSocket client.
+    def flush(self) -> int:
+        """Publish the changes made since the last version, if any.
         
-        Args:
-            client: WebSocket client to add
+        Returns:
+            The current topology version
         """
         with self.lock:
-            self.clients.add(client)
-            # Send the current topology to the new client
-            if self.topology_data["devices"]:
-                update_data = {
-                    "type": "topology_update",
-                    "timestamp": datetime.now().isoformat(),
-                    "data": {
-                        "devices": self.topology_data["devices"],
-                        "connections": self.topology_data["connections"]
-                    }
-                }
-                message = json.dumps(update_data)
-                # Schedule the async send
-                asyncio.create_task(self._send_to_client(client, message))
+            if not self._dirty_devices and not self._dirty_connections:
+                return self.version
+            devices = diff_items(self._published_devices, self.devices, self._dirty_devices)
+            connections = diff_items(self._published_connections, self.connections,
+                                     self._dirty_connections)
+            for published, current, dirty in (
+                (self._published_devices, self.devices, self._dirty_devices),
+                (self._published_connections, self.connections, self._dirty_connections)
+            ):
+                for item_id in dirty:
+                    if item_id in current:
+                        published[item_id] = current[item_id]
+                    else:
+                        published.pop(item_id, None)
+                dirty.clear()
+            if not any(devices.values()) and not any(connections.values()):
+                return self.version
+            self.version += 1
+            version = self.version
+            message = {
+                "type": "topology_diff",
+                "topic": self.topic,
+                "version": version,
+                "base_version": version - 1,
+                "timestamp": datetime.now().isoformat(),
+                "devices": devices,
+                "connections": connections
+            }
+        self.hub.publish(self.topic, message, version)
+        return version
     
-    def remove_client(self, client):
-        """Remove a WebSocket client.
-        
-        Args:
-            client: WebSocket client to remove
-        """
+    def snapshot(self) -> Tuple[int, Dict[str, List[dict]]]:
+        """Get the current version and topology for a new subscriber."""
+        self.flush()
         with self.lock:
-            self.clients.discard(client)
+            return self.version, {
+                "devices": list(self._published_devices.values()),
+                "connections": list(self._published_connections.values())
+            }
     
     def update_topology(self, devices, connections):
-        """Update the network topology data.
+        """Replace the network topology data.
         
         Args:
             devices: List of device data
             connections: List of connection data
         """
         with self.lock:
-            self.topology_data["devices"] = devices
-            self.topology_data["connections"] = connections
-            self._topology_changed = True
+            self._dirty_devices.update(self.devices)
+            self._dirty_connections.update(self.connections)
+            self.devices = {device["id"]: device for device in devices}
+            self.connections = {connection["id"]: connection for connection in connections}
+            self._dirty_devices.update(self.devices)
+            self._dirty_connections.update(self.connections)
     
     def add_device(self, device):
-        """Add a new device to the topology.
+        """Add a new device to the topology, replacing one with the same ID.
         
         Args:
             device: Device data to add
         """
         with self.lock:
-            # Check if the device already exists
-            for i, existing_device in enumerate(self.topology_data["devices"]):
-                if existing_device["id"] == device["id"]:
-                    # Update the existing device
-                    self.topology_data["devices"][i] = device
-                    break
-            else:
-                # Device doesn't exist, add it
-                self.topology_data["devices"].append(device)
-            
-            self._topology_changed = True
-            
-            # Send immediate notification to clients
-            update_data = {
-                "type": "device_added",
-                "timestamp": datetime.now().isoformat(),
-                "data": device
-            }
-            message = json.dumps(update_data)
-            for client in list(self.clients):
-                try:
-                    asyncio.run(self._send_to_client(client, message))
-                except Exception:
-                    # Remove failed client
-                    self.clients.discard(client)
+            self.devices[device["id"]] = device
+            self._dirty_devices.add(device["id"])
     
     def update_device(self, device_id, updates):
         """Update an existing device.
@@ -948,96 +999,34 @@ class NetworkTopologyWebSocketHandler:
             updates: Dictionary of field updates
         """
         with self.lock:
-            # Find the device
-            for i, device in enumerate(self.topology_data["devices"]):
-                if device["id"] == device_id:
-                    # Update the device
-                    self.topology_data["devices"][i].update(updates)
-                    updated_device = self.topology_data["devices"][i]
-                    self._topology_changed = True
-                    
-                    # Send immediate notification to clients
-                    update_data = {
-                        "type": "device_updated",
-                        "timestamp": datetime.now().isoformat(),
-                        "data": updated_device
-                    }
-                    message = json.dumps(update_data)
-                    for client in list(self.clients):
-                        try:
-                            asyncio.run(self._send_to_client(client, message))
-                        except Exception:
-                            # Remove failed client
-                            self.clients.discard(client)
-                    
-                    break
+            if device_id in self.devices:
+                # Replace rather than mutate, the published copy is shared
+                self.devices[device_id] = {**self.devices[device_id], **updates}
+                self._dirty_devices.add(device_id)
     
     def remove_device(self, device_id):
-        """Remove a device from the topology.
+        """Remove a device and its connections from the topology.
         
         Args:
             device_id: ID of the device to remove
         """
         with self.lock:
-            # Remove the device
-            self.topology_data["devices"] = [
-                d for d in self.topology_data["devices"] if d["id"] != device_id
-            ]
-            
-            # Remove connections involving this device
-            self.topology_data["connections"] = [
-                c for c in self.topology_data["connections"] 
-                if c["source"] != device_id and c["target"] != device_id
-            ]
-            
-            self._topology_changed = True
-            
-            # Send immediate notification to clients
-            update_data = {
-                "type": "device_removed",
-                "timestamp": datetime.now().isoformat(),
-                "data": device_id
-            }
-            message = json.dumps(update_data)
-            for client in list(self.clients):
-                try:
-                    asyncio.run(self._send_to_client(client, message))
-                except Exception:
-                    # Remove failed client
-                    self.clients.discard(client)
+            if self.devices.pop(device_id, None) is not None:
+                self._dirty_devices.add(device_id)
+            for connection_id, connection in list(self.connections.items()):
+                if device_id in (connection["source"], connection["target"]):
+                    del self.connections[connection_id]
+                    self._dirty_connections.add(connection_id)
     
     def add_connection(self, connection):
-        """Add a new connection to the topology.
+        """Add a new connection to the topology, replacing one with the same ID.
         
         Args:
             connection: Connection data to add
         """
         with self.lock:
-            # Check if the connection already exists
-            for i, existing_conn in enumerate(self.topology_data["connections"]):
-                if existing_conn["id"] == connection["id"]:
-                    # Update the existing connection
-                    self.topology_data["connections"][i] = connection
-                    break
-            else:
-                # Connection doesn't exist, add it
-                self.topology_data["connections"].append(connection)
-            
-            self._topology_changed = True
-            
-            # Send immediate notification to clients
-            update_data = {
-                "type": "connection_added",
-                "timestamp": datetime.now().isoformat(),
-                "data": connection
-            }
-            message = json.dumps(update_data)
-            for client in list(self.clients):
-                try:
-                    asyncio.run(self._send_to_client(client, message))
-                except Exception:
-                    # Remove failed client
-                    self.clients.discard(client)
+            self.connections[connection["id"]] = connection
+            self._dirty_connections.add(connection["id"])
     
     def remove_connection(self, connection_id):
         """Remove a connection from the topology.
@@ -1046,26 +1035,8 @@ class NetworkTopologyWebSocketHandler:
             connection_id: ID of the connection to remove
         """
         with self.lock:
-            # Remove the connection
-            self.topology_data["connections"] = [
-                c for c in self.topology_data["connections"] if c["id"] != connection_id
-            ]
-            
-            self._topology_changed = True
-            
-            # Send immediate notification to clients
-            update_data = {
-                "type": "connection_removed",
-                "timestamp": datetime.now().isoformat(),
-                "data": connection_id
-            }
-            message = json.dumps(update_data)
-            for client in list(self.clients):
-                try:
-                    asyncio.run(self._send_to_client(client, message))
-                except Exception:
-                    # Remove failed client
-                    self.clients.discard(client)
+            if self.connections.pop(connection_id, None) is not None:
+                self._dirty_connections.add(connection_id)
 
 # Create a global instance of the WebSocket handler
-topology_ws_handler = NetworkTopologyWebSocketHandler() 
\ No newline at end of file
+topology_ws_handler = NetworkTopologyWebSocketHandler()
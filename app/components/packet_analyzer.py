@@ -3,6 +3,7 @@ import time
 from datetime import datetime
 from typing import Dict, List, Set, Callable, Optional, Any, Tuple
 from collections import defaultdict, Counter
+from urllib.parse import unquote
 
 from scapy.all import sniff, Ether, IP, TCP, UDP, ICMP, ARP, Raw
 from scapy.layers.http import HTTP, HTTPRequest, HTTPResponse
@@ -12,6 +13,8 @@ import netifaces
 from app.utils.logger import get_logger
 from app.utils.config import get_config
 from app.utils.database import get_database
+from app.utils.timeseries import get_timeseries_store
+from app.utils.signature_engine import get_web_signature_engine
 from app.utils.memory_manager import MemoryManager, PacketMemoryOptimizer, MemoryPressureLevel
 
 # Module logger
@@ -56,13 +59,19 @@ class PacketAnalyzer:
         self.capture_filter = None  # BPF filter string
         self.exclude_ips = set()  # IPs to exclude from capture
         
+        # Web attack signatures checked against HTTP payloads
+        self.signature_engine = get_web_signature_engine()
+        
         # Packet callback
         self.packet_callback = None
         self.status_callback = None
+        self.packet_listeners = []  # Subscribers to the processed packet stream
+        self.listener_errors = 0  # Packets a subscriber raised an exception on
         
         # Database session
         self.db_session_id = None
         self.database = get_database()
+        self.timeseries = get_timeseries_store()
         
         # Memory management statistics
         self.mem_packets_dropped = 0
@@ -77,6 +86,24 @@ class PacketAnalyzer:
         self.stop_capture()
         self.memory_manager.stop_monitoring()
         
+    def add_packet_listener(self, listener: Callable[[Dict[str, Any]], Any]):
+        """Subscribe to every processed packet.
+
+        Args:
+            listener: Function called with each packet dictionary
+        """
+        if listener not in self.packet_listeners:
+            self.packet_listeners.append(listener)
+
+    def remove_packet_listener(self, listener: Callable[[Dict[str, Any]], Any]):
+        """Unsubscribe a packet listener.
+
+        Args:
+            listener: Function previously passed to add_packet_listener
+        """
+        if listener in self.packet_listeners:
+            self.packet_listeners.remove(listener)
+
     def start_capture(self, 
                      interface: Optional[str] = None,
                      packet_filter: Optional[str] = None,
@@ -399,6 +426,20 @@ class PacketAnalyzer:
                     self.packet_callback(packet)
                 except Exception as e:
                     logger.error(f"Error in packet callback: {e}")
+
+        # Publish to stream subscribers; a failing packet does not stop the rest
+        for listener in list(self.packet_listeners):
+            errors = 0
+            for packet in self.packet_buffer:
+                try:
+                    listener(packet)
+                except Exception as e:
+                    if not errors:
+                        logger.error(f"Error in packet listener: {e}")
+                    errors += 1
+            if errors:
+                self.listener_errors += errors
+                logger.warning(f"Packet listener failed on {errors} of {len(self.packet_buffer)} packets")
                     
         # Clear buffer
         processed_count = len(self.packet_buffer)
@@ -660,6 +701,9 @@ class PacketAnalyzer:
         if 'dst_port' in packet_info:
             self.port_counts[packet_info['dst_port']] += 1
             
+        # Feed the monitoring rollups
+        self.timeseries.record_packet(packet_info)
+            
     def _extract_packet_features(self, packet):
         """Extract useful information from a packet.
         
@@ -701,12 +745,16 @@ class PacketAnalyzer:
                 self._add_connection(info['src_ip'], info['dst_ip'], info['dst_port'], 'TCP')
                 
                 # Check for HTTP data
-                if Raw in packet and packet[TCP].dport in (80, 8080):
+                # Scapy may dissect the payload as its HTTP layer rather than Raw
+                if packet[TCP].dport in (80, 8080) and len(packet[TCP].payload):
                     try:
-                        payload = packet[Raw].load.decode('utf-8', errors='ignore')
+                        payload = bytes(packet[TCP].payload).decode('utf-8', errors='ignore')
                         if payload.startswith(('GET ', 'POST ', 'HTTP')):
                             info['protocol'] = 'HTTP'
                             info['http_data'] = self._parse_http(payload)
+                            info['http_request'] = payload
+                            # Attack families in the URL-decoded payload
+                            info['web_signatures'] = self.signature_engine.scan(unquote(payload))
                     except:
                         pass
                         
@@ -879,4071 +927,3 @@ class PacketAnalyzer:
         """
         conn_tuple = (src_ip, dst_ip, dst_port, protocol)
         self.connection_pairs.add(conn_tuple)
-        
-    def _update_analytics(self, packet_info: Dict[str, Any]):
-        """Update statistical counters based on packet info.
-        
-        Args:
-            packet_info: The packet information dictionary
-        """
-        # Increment packet count
-        self.packets_analyzed += 1
-        
-        # Add packet length to byte count
-        if 'length' in packet_info:
-            self.bytes_analyzed += packet_info['length']
-            
-        # Update protocol counter
-        protocol = packet_info.get('protocol', 'UNKNOWN')
-        self.protocol_counts[protocol] += 1
-        
-        # Update IP counters
-        if 'src_ip' in packet_info:
-            self.ip_counts[packet_info['src_ip']] += 1
-            
-        if 'dst_ip' in packet_info:
-            self.dst_ip_counts[packet_info['dst_ip']] += 1
-            
-        # Update port counter
-        if 'dst_port' in packet_info:
-            self.port_counts[packet_info['dst_port']] += 1
-            
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            for interface in netifaces.interfaces():
-                if interface != 'lo' and interface != 'localhost':
-                    addresses = netifaces.ifaddresses(interface)
-                    if netifaces.AF_INET in addresses:
-                        return interface
-                        
-        except Exception as e:
-            logger.error(f"Error determining default interface: {e}")
-            
-        return None 
-
-    def _maybe_save_traffic_snapshot(self) -> None:
-        """Save traffic snapshot if enough time has passed."""
-        if not self.db_session_id:
-            return
-            
-        now = datetime.now()
-        
-        # Initialize last snapshot time if needed
-        if self.stats['last_snapshot_time'] is None:
-            self.stats['last_snapshot_time'] = now
-            return
-            
-        # Check if it's time for a new snapshot (every 10 seconds)
-        time_since_last = (now - self.stats['last_snapshot_time']).total_seconds()
-        if time_since_last >= 10:
-            self._save_traffic_snapshot()
-            self.stats['last_snapshot_time'] = now
-    
-    def _save_traffic_snapshot(self) -> None:
-        """Save a traffic snapshot to the database."""
-        if not self.db_session_id:
-            return
-            
-        try:
-            # Get current statistics
-            stats = self.get_statistics()
-            
-            # Prepare protocol stats
-            protocol_stats = {}
-            for proto, count in self.protocol_counts.items():
-                protocol_stats[proto] = {
-                    'count': count,
-                    'bytes': self.bytes_analyzed
-                }
-                
-            # Add protocol stats to database
-            self.database.add_protocol_stats(
-                self.db_session_id,
-                datetime.now(),
-                protocol_stats
-            )
-            
-            # Prepare IP stats
-            ip_stats = {}
-            for ip, traffic in self.ip_counts.items():
-                ip_stats[ip] = {
-                    'sent_packets': traffic,
-                    'recv_packets': self.dst_ip_counts[ip],
-                    'sent_bytes': self.bytes_analyzed
-                }
-                
-            # Add IP stats to database
-            self.database.add_ip_stats(
-                self.db_session_id,
-                datetime.now(),
-                ip_stats
-            )
-            
-            # Add traffic snapshot
-            self.database.add_traffic_snapshot(
-                self.db_session_id,
-                datetime.now(),
-                stats['duration_seconds'],
-                stats['packets_analyzed'],
-                stats['bytes_analyzed'],
-                stats['packets_per_second'],
-                stats['bytes_per_second'],
-                {
-                    'top_source_ips': dict(Counter(self.ip_counts).most_common(10)),
-                    'top_destination_ips': dict(Counter(self.dst_ip_counts).most_common(10)),
-                    'tcp_ports': dict(Counter(self.port_counts).most_common(10)),
-                    'http_methods': dict(Counter(self.protocol_counts).most_common(10)),
-                    'dns_queries': dict(Counter(self.protocol_counts).most_common(10))
-                }
-            )
-            
-            logger.debug(f"Saved traffic snapshot for session {self.db_session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error saving traffic snapshot: {e}")
-        
-    def _handle_memory_pressure(self, level: MemoryPressureLevel):
-        """
-        Handle changes in memory pressure level.
-        
-        Args:
-            level: New memory pressure level
-        """
-        logger.info(f"Memory pressure changed to {level}, adjusting packet capture behavior")
-        
-        # Adjust buffer size based on memory pressure
-        new_buffer_size = max(10, self.memory_manager.get_max_buffer_size() // 10)
-        
-        # Log the change
-        logger.info(f"Adjusting packet buffer size from {self.buffer_size} to {new_buffer_size}")
-        
-        # Update buffer size
-        self.buffer_size = new_buffer_size
-        
-        # Trim history if pressure is high or critical
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL):
-            self._trim_packet_history(aggressive=True)
-            
-        # Process any pending packets in buffer if high/critical pressure
-        if level in (MemoryPressureLevel.HIGH, MemoryPressureLevel.CRITICAL) and len(self.packet_buffer) > 0:
-            self._process_packet_buffer()
-
-        # Register the adaptive action
-        self.memory_manager.register_adaptive_action()
-        
-    def _trim_packet_history(self, aggressive=False):
-        """
-        Trim packet history to reduce memory usage.
-        
-        Args:
-            aggressive: If True, trim more aggressively
-        """
-        if not self.packet_history:
-            return
-            
-        current_size = len(self.packet_history)
-        
-        if aggressive:
-            # Keep only 25% of packets during high memory pressure
-            target_size = max(100, current_size // 4)
-        else:
-            # Keep 50% of packets during normal trim
-            target_size = max(100, current_size // 2)
-            
-        if current_size > target_size:
-            # Keep newest packets, discard oldest
-            self.packet_history = self.packet_history[-target_size:]
-            logger.info(f"Trimmed packet history from {current_size} to {len(self.packet_history)}")
-        
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get memory management statistics.
-        
-        Returns:
-            Dict containing memory statistics
-        """
-        mem_metrics = self.memory_manager.get_metrics()
-        optimizer_metrics = self.packet_optimizer.get_metrics()
-        
-        stats = {
-            "current_memory_usage": mem_metrics.get("current_memory_usage", 0),
-            "peak_memory_usage": mem_metrics.get("peak_memory_usage", 0),
-            "memory_pressure_level": mem_metrics.get("current_pressure_level", "LOW"),
-            "memory_checks": mem_metrics.get("memory_checks", 0),
-            "pressure_changes": mem_metrics.get("pressure_changes", 0),
-            "gc_invocations": mem_metrics.get("gc_invocations", 0),
-            "packets_dropped": mem_metrics.get("packets_dropped", 0) + self.mem_packets_dropped,
-            "packets_optimized": optimizer_metrics.get("packets_optimized", 0),
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0),
-            "payloads_truncated": optimizer_metrics.get("payloads_truncated", 0),
-            "buffer_size": self.buffer_size,
-            "max_buffer_size": self.memory_manager.get_max_buffer_size(),
-            "history_size": len(self.packet_history),
-            "ip_cache_size": optimizer_metrics.get("ip_cache_size", 0),
-            "mac_cache_size": optimizer_metrics.get("mac_cache_size", 0),
-            "current_strategy": {
-                "sampling_rate": self.memory_manager.get_current_strategy().get("sampling_rate", 1.0),
-                "max_payload_size": self.packet_optimizer.max_payload_size
-            },
-            "process_memory": mem_metrics.get("process_memory", {})
-        }
-        
-        return stats
-        
-    def _reset_statistics(self):
-        """Reset all statistical counters."""
-        self.protocol_counts = Counter()
-        self.ip_counts = defaultdict(int)
-        self.dst_ip_counts = defaultdict(int)
-        self.port_counts = defaultdict(int)
-        self.connection_pairs = set()
-        self.bytes_analyzed = 0
-        self.packets_analyzed = 0
-        self.packet_history = []
-        
-    def _send_status_update(self):
-        """Send a status update via the callback if registered."""
-        if not self.status_callback:
-            return
-            
-        current_time = datetime.now()
-        duration = (current_time - self.start_time).total_seconds()
-        packets_per_second = self.packets_analyzed / max(1, duration)
-        
-        status_message = (
-            f"Captured {self.packets_analyzed} packets "
-            f"({self.bytes_analyzed} bytes) in {duration:.1f} seconds "
-            f"({packets_per_second:.1f} packets/sec)"
-        )
-        
-        self.status_callback(True, status_message)
-        
-    def _get_default_interface(self) -> Optional[str]:
-        """Get the default network interface.
-        
-        Returns:
-            str: Interface name or None if unavailable
-        """
-        try:
-            # Get the default gateway interface
-            gateways = netifaces.gateways()
-            if 'default' in gateways and netifaces.AF_INET in gateways['default']:
-                _, interface = gateways['default'][netifaces.AF_INET]
-                return interface
-                
-            # If no default found, try to use the first non-loopback interface
-            "bytes_saved": optimizer_metrics.get("bytes_saved", 0
\ No newline at end of file
@@ -0,0 +1,546 @@
+"""
+Model and filter proxy for the packet table.
+
+PacketTableModel keeps packets in a columnar ring buffer: one list per
+column, so a row is a handful of list lookups and no widget items exist
+for rows that are not on screen. The oldest packets are overwritten once
+the buffer is full. PacketFilterProxyModel filters and sorts without
+rescanning the whole buffer on every insert.
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from PyQt5.QtCore import QAbstractProxyModel, QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush, QColor
+
+# Column headers, in display order
+COLUMNS = ["Time", "Source", "Destination", "Protocol", "Length", "Info", "Status"]
+LENGTH_COLUMN = 4
+
+# Row background by status; these take precedence over protocol colours
+STATUS_BRUSHES = {
+    'Suspicious': QBrush(QColor(255, 200, 200)),
+    'Malicious': QBrush(QColor(255, 150, 150))
+}
+
+# Row background by protocol
+PROTOCOL_BRUSHES = {
+    'TCP': QBrush(QColor(240, 248, 255)),   # Light blue
+    'UDP': QBrush(QColor(255, 250, 240)),   # Light yellow
+    'HTTP': QBrush(QColor(255, 240, 245)),  # Light pink
+    'DNS': QBrush(QColor(240, 255, 240)),   # Light green
+    'ARP': QBrush(QColor(255, 228, 225)),   # Misty rose
+    'ICMP': QBrush(QColor(224, 255, 255))   # Light cyan
+}
+
+# Fields matched by the search box
+SEARCH_FIELDS = ('src_ip', 'dst_ip', 'info', 'src_port', 'dst_port')
+
+ALL_PROTOCOLS = "All Protocols"
+
+# A sorted insert or eviction touching more separate runs of rows than
+# this is applied in one pass under a model reset instead of run by run
+MAX_ROW_RUNS = 16
+
+
+def search_key(packet: Dict[str, Any]) -> str:
+    """Build the lowercase text the search box is matched against.
+
+    Args:
+        packet: Packet information
+
+    Returns:
+        str: The searchable fields, lowercased and separated by newlines
+    """
+    return "\n".join(str(packet.get(field, '')) for field in SEARCH_FIELDS).lower()
+
+
+def _insert_at(items: List[Any], positions: List[int], new: List[Any]) -> List[Any]:
+    """Copy a list with each new item inserted before the given position.
+
+    Positions are ascending indexes into the original list; the copy is
+    made slice by slice in one pass.
+    """
+    merged = []
+    previous = 0
+    for position, item in zip(positions, new):
+        merged.extend(items[previous:position])
+        merged.append(item)
+        previous = position
+    merged.extend(items[previous:])
+    return merged
+
+
+def _delete_at(items: List[Any], positions: List[int]) -> List[Any]:
+    """Copy a list without the items at the given ascending positions."""
+    kept = []
+    previous = 0
+    for position in positions:
+        kept.extend(items[previous:position])
+        previous = position + 1
+    kept.extend(items[previous:])
+    return kept
+
+
+class PacketTableModel(QAbstractTableModel):
+    """Table model over a fixed-capacity columnar ring buffer of packets.
+
+    Rows are in arrival order. Every packet also gets a sequence number
+    that does not change as older rows are evicted, so proxies can refer
+    to rows without being renumbered.
+    """
+
+    def __init__(self, capacity: int = 1000000, parent=None):
+        """Initialize the model.
+
+        Args:
+            capacity: Packets kept before the oldest are overwritten
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._capacity = max(1, capacity)
+        self._columns: List[List[str]] = [[] for _ in COLUMNS]
+        self._lengths: List[int] = []
+        self._keys: List[str] = []
+        self._brushes: List[Optional[QBrush]] = []
+        self._packets: List[Dict[str, Any]] = []
+        self._start = 0        # Slot of row 0
+        self._count = 0        # Rows held
+        self.first_seq = 0     # Sequence number of row 0
+
+    @property
+    def capacity(self) -> int:
+        """Packets kept before the oldest are overwritten."""
+        return self._capacity
+
+    def set_capacity(self, capacity: int) -> None:
+        """Change the capacity, evicting the oldest rows if needed.
+
+        Args:
+            capacity: New capacity
+        """
+        capacity = max(1, capacity)
+        if capacity == self._capacity:
+            return
+        self.evict(self._count - capacity)
+        # Lay the rows out from slot 0 again
+        order = [(self._start + i) % self._capacity for i in range(self._count)]
+        for name in ('_lengths', '_keys', '_brushes', '_packets'):
+            column = getattr(self, name)
+            setattr(self, name, [column[slot] for slot in order])
+        self._columns = [[column[slot] for slot in order] for column in self._columns]
+        self._start = 0
+        self._capacity = capacity
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next packet will get."""
+        return self.first_seq + self._count
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if row >= self._count:
+            return None
+        slot = (self._start + row) % self._capacity
+        if role == Qt.DisplayRole:
+            return self._columns[index.column()][slot]
+        if role == Qt.BackgroundRole:
+            return self._brushes[slot]
+        if role == Qt.UserRole:
+            return self._packets[slot]
+        return None
+
+    def packet(self, row: int) -> Optional[Dict[str, Any]]:
+        """Get the packet information of a row."""
+        if 0 <= row < self._count:
+            return self._packets[(self._start + row) % self._capacity]
+        return None
+
+    def slot_of(self, seq: int) -> int:
+        """Get the buffer slot of a held sequence number."""
+        return (self._start + seq - self.first_seq) % self._capacity
+
+    def value(self, seq: int, column: int):
+        """Get the sort value of a column for a held sequence number."""
+        slot = self.slot_of(seq)
+        if column == LENGTH_COLUMN:
+            return self._lengths[slot]
+        return self._columns[column][slot]
+
+    def add_packets(self, packets: List[Dict[str, Any]]) -> None:
+        """Append packets in one insert, evicting the oldest if full.
+
+        Args:
+            packets: Packet information dicts, oldest first
+        """
+        if not packets:
+            return
+        if len(packets) > self._capacity:
+            packets = packets[-self._capacity:]
+        self.evict(self._count + len(packets) - self._capacity)
+
+        first = self._count
+        self.beginInsertRows(QModelIndex(), first, first + len(packets) - 1)
+        for packet in packets:
+            status = packet.get('status', '')
+            protocol = packet.get('protocol', '')
+            try:
+                length = int(packet.get('length', 0) or 0)
+            except (TypeError, ValueError):
+                length = 0
+            values = (
+                str(packet.get('timestamp', '')),
+                str(packet.get('src_ip', '')),
+                str(packet.get('dst_ip', '')),
+                str(protocol),
+                str(length),
+                str(packet.get('info', '')),
+                str(status)
+            )
+            brush = STATUS_BRUSHES.get(status) or PROTOCOL_BRUSHES.get(protocol)
+            key = search_key(packet)
+            slot = (self._start + self._count) % self._capacity
+            if slot == len(self._packets):
+                for column, value in zip(self._columns, values):
+                    column.append(value)
+                self._lengths.append(length)
+                self._keys.append(key)
+                self._brushes.append(brush)
+                self._packets.append(packet)
+            else:
+                for column, value in zip(self._columns, values):
+                    column[slot] = value
+                self._lengths[slot] = length
+                self._keys[slot] = key
+                self._brushes[slot] = brush
+                self._packets[slot] = packet
+            self._count += 1
+        self.endInsertRows()
+
+    def evict(self, count: int) -> None:
+        """Remove the oldest rows.
+
+        Args:
+            count: Rows to remove
+        """
+        count = min(count, self._count)
+        if count <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        for i in range(count):
+            # Drop the reference so the packet can be freed now
+            self._packets[(self._start + i) % self._capacity] = None
+        self._start = (self._start + count) % self._capacity
+        self._count -= count
+        self.first_seq += count
+        self.endRemoveRows()
+
+    def clear(self) -> None:
+        """Remove every row."""
+        self.beginResetModel()
+        self._columns = [[] for _ in COLUMNS]
+        self._lengths, self._keys, self._brushes, self._packets = [], [], [], []
+        self.first_seq += self._count
+        self._start = self._count = 0
+        self.endResetModel()
+
+
+class PacketFilterProxyModel(QAbstractProxyModel):
+    """Filters and sorts a PacketTableModel incrementally.
+
+    Rows are kept as a list of source sequence numbers. New source rows
+    are matched on their own and appended, or inserted in sort order,
+    instead of re-filtering the whole model; narrowing the search text
+    only re-checks rows that matched before. Matching uses the model's
+    precomputed lowercase search keys.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._protocol = ALL_PROTOCOLS
+        self._search = ""
+        # Matching sequence numbers, ascending by (sort value, seq)
+        self._seqs: List[int] = []
+        self._sort_keys: List[Tuple[Any, int]] = []
+        self._sort_column: Optional[int] = None
+        self._descending = False
+
+    def setSourceModel(self, model: PacketTableModel) -> None:
+        old = self.sourceModel()
+        if old is not None:
+            old.rowsInserted.disconnect(self._source_rows_inserted)
+            old.rowsRemoved.disconnect(self._source_rows_removed)
+            old.modelReset.disconnect(self._rebuild)
+        super().setSourceModel(model)
+        model.rowsInserted.connect(self._source_rows_inserted)
+        model.rowsRemoved.connect(self._source_rows_removed)
+        model.modelReset.connect(self._rebuild)
+        self._rebuild()
+
+    # Filtering
+
+    def set_filter(self, protocol: str = ALL_PROTOCOLS, search: str = "") -> None:
+        """Show only packets of a protocol whose search fields contain text.
+
+        Args:
+            protocol: Protocol to show, or ALL_PROTOCOLS
+            search: Text to find, case-insensitive
+        """
+        search = search.lower()
+        if protocol == self._protocol and search == self._search:
+            return
+        if protocol == self._protocol and self._search in search:
+            # Narrowing: only rows that matched before can still match
+            self.layoutAboutToBeChanged.emit()
+            old_rows = self._persistent_rows()
+            self._protocol, self._search = protocol, search
+            if self._sort_column is None:
+                self._seqs = self._matching(self._seqs)
+            else:
+                kept = set(self._matching(self._seqs))
+                self._sort_keys = [key for key in self._sort_keys if key[1] in kept]
+                self._seqs = [seq for _, seq in self._sort_keys]
+            self._update_persistent(old_rows)
+            self.layoutChanged.emit()
+            return
+        self._protocol, self._search = protocol, search
+        self._rebuild()
+
+    def is_filtered(self) -> bool:
+        """Whether any filter is set."""
+        return self._protocol != ALL_PROTOCOLS or bool(self._search)
+
+    def _matching(self, seqs: Iterable[int]) -> List[int]:
+        """Filter sequence numbers in one pass."""
+        model = self.sourceModel()
+        protocol = None if self._protocol == ALL_PROTOCOLS else self._protocol
+        search = self._search
+        if protocol is None and not search:
+            return list(seqs)
+        keys, protocols, start, first, capacity = (
+            model._keys, model._columns[3], model._start, model.first_seq, model.capacity
+        )
+        matched = []
+        for seq in seqs:
+            slot = (start + seq - first) % capacity
+            if protocol is not None and protocols[slot] != protocol:
+                continue
+            if search and search not in keys[slot]:
+                continue
+            matched.append(seq)
+        return matched
+
+    # Sorting
+
+    @property
+    def arrival_order(self) -> bool:
+        """Whether rows are in arrival order rather than sorted by a column."""
+        return self._sort_column is None
+
+    @property
+    def descending(self) -> bool:
+        """Whether the last row comes first."""
+        return self._descending
+
+    def sort(self, column: int, order=Qt.AscendingOrder) -> None:
+        """Sort by a column; a negative column restores arrival order."""
+        self.layoutAboutToBeChanged.emit()
+        old_rows = self._persistent_rows()
+        self._descending = order == Qt.DescendingOrder
+        if column is None or column < 0:
+            self._sort_column = None
+            self._seqs.sort()
+            self._sort_keys = []
+        else:
+            self._sort_column = column
+            model = self.sourceModel()
+            self._sort_keys = sorted((model.value(seq, column), seq) for seq in self._seqs)
+            self._seqs = [seq for _, seq in self._sort_keys]
+        self._update_persistent(old_rows)
+        self.layoutChanged.emit()
+
+    # Source changes
+
+    def _rebuild(self) -> None:
+        self.beginResetModel()
+        model = self.sourceModel()
+        self._seqs = self._matching(range(model.first_seq, model.next_seq))
+        if self._sort_column is not None:
+            self._sort_keys = sorted((model.value(seq, self._sort_column), seq) for seq in self._seqs)
+            self._seqs = [seq for _, seq in self._sort_keys]
+        else:
+            self._sort_keys = []
+        self.endResetModel()
+
+    def _source_rows_inserted(self, parent, first, last) -> None:
+        model = self.sourceModel()
+        new = self._matching(range(model.first_seq + first, model.first_seq + last + 1))
+        if not new:
+            return
+        if self._sort_column is None:
+            # Arrival order: the new rows go on the end
+            n = len(self._seqs)
+            if self._descending:
+                self.beginInsertRows(QModelIndex(), 0, len(new) - 1)
+            else:
+                self.beginInsertRows(QModelIndex(), n, n + len(new) - 1)
+            self._seqs.extend(new)
+            self.endInsertRows()
+            return
+        column = self._sort_column
+        keys = sorted((model.value(seq, column), seq) for seq in new)
+        positions = [bisect_left(self._sort_keys, key) for key in keys]
+        # Runs of new keys that land at the same position
+        runs = [i for i in range(len(keys)) if i == 0 or positions[i] != positions[i - 1]]
+        if len(runs) > MAX_ROW_RUNS:
+            self.beginResetModel()
+            self._sort_keys = _insert_at(self._sort_keys, positions, keys)
+            self._seqs = _insert_at(self._seqs, positions, [seq for _, seq in keys])
+            self.endResetModel()
+            return
+        # Last run first so the positions of earlier runs stay valid
+        for start, stop in reversed(list(zip(runs, runs[1:] + [len(keys)]))):
+            self._insert_positions(positions[start], keys[start:stop])
+
+    def _source_rows_removed(self, parent, first, last) -> None:
+        # The model only removes its oldest rows, so the evicted sequence
+        # numbers are the range just below the new first_seq
+        first_seq = self.sourceModel().first_seq
+        if self._sort_column is None:
+            count = bisect_left(self._seqs, first_seq)
+            if count:
+                self._remove_positions(0, count)
+            return
+        # Their values are still in the buffer until new rows overwrite them
+        evicted = range(first_seq - (last - first + 1), first_seq)
+        positions = sorted(p for p in map(self._position_of, evicted) if p >= 0)
+        if not positions:
+            return
+        runs = [i for i in range(len(positions))
+                if i == 0 or positions[i] != positions[i - 1] + 1]
+        if len(runs) > MAX_ROW_RUNS:
+            self.beginResetModel()
+            self._sort_keys = _delete_at(self._sort_keys, positions)
+            self._seqs = _delete_at(self._seqs, positions)
+            self.endResetModel()
+            return
+        # Last run first so the positions of earlier runs stay valid
+        for start, stop in reversed(list(zip(runs, runs[1:] + [len(positions)]))):
+            self._remove_positions(positions[start], positions[stop - 1] + 1)
+
+    def _insert_positions(self, position: int, keys: List[Tuple[Any, int]]) -> None:
+        """Insert sorted keys at an internal position."""
+        n = len(self._seqs) + len(keys)
+        first, last = self._to_row(position, n), self._to_row(position + len(keys) - 1, n)
+        self.beginInsertRows(QModelIndex(), min(first, last), max(first, last))
+        self._sort_keys[position:position] = keys
+        self._seqs[position:position] = [seq for _, seq in keys]
+        self.endInsertRows()
+
+    def _remove_positions(self, start: int, stop: int) -> None:
+        """Remove internal positions [start, stop)."""
+        n = len(self._seqs)
+        first, last = self._to_row(start, n), self._to_row(stop - 1, n)
+        self.beginRemoveRows(QModelIndex(), min(first, last), max(first, last))
+        del self._seqs[start:stop]
+        if self._sort_keys:
+            del self._sort_keys[start:stop]
+        self.endRemoveRows()
+
+    # Mapping
+
+    def _to_row(self, position: int, n: int) -> int:
+        """Convert an internal position to a proxy row and back."""
+        return n - 1 - position if self._descending else position
+
+    def _persistent_rows(self) -> List[Tuple[QModelIndex, int]]:
+        """Remember the sequence number behind each persistent index."""
+        n = len(self._seqs)
+        return [(index, self._seqs[self._to_row(index.row(), n)])
+                for index in self.persistentIndexList() if index.isValid() and index.row() < n]
+
+    def _update_persistent(self, old_rows: List[Tuple[QModelIndex, int]]) -> None:
+        """Move persistent indexes to where their rows went."""
+        if not old_rows:
+            return
+        wanted = {seq for _, seq in old_rows}
+        positions = {seq: i for i, seq in enumerate(self._seqs) if seq in wanted}
+        n = len(self._seqs)
+        old, new = [], []
+        for index, seq in old_rows:
+            old.append(index)
+            position = positions.get(seq)
+            new.append(QModelIndex() if position is None
+                       else self.index(self._to_row(position, n), index.column()))
+        self.changePersistentIndexList(old, new)
+
+    def _position_of(self, seq: int) -> int:
+        if self._sort_column is None:
+            position = bisect_left(self._seqs, seq)
+        else:
+            key = (self.sourceModel().value(seq, self._sort_column), seq)
+            position = bisect_left(self._sort_keys, key)
+        if position < len(self._seqs) and self._seqs[position] == seq:
+            return position
+        return -1
+
+    def seq(self, row: int) -> int:
+        """Get the source sequence number of a proxy row."""
+        return self._seqs[self._to_row(row, len(self._seqs))]
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._seqs)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._seqs) and 0 <= column < len(COLUMNS)):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or proxy_index.row() >= len(self._seqs):
+            return QModelIndex()
+        model = self.sourceModel()
+        row = self.seq(proxy_index.row()) - model.first_seq
+        if row < 0:
+            return QModelIndex()
+        return model.index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        position = self._position_of(self.sourceModel().first_seq + source_index.row())
+        if position < 0:
+            return QModelIndex()
+        return self.index(self._to_row(position, len(self._seqs)), source_index.column())
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._seqs):
+            return None
+        model = self.sourceModel()
+        seq = self.seq(index.row())
+        if seq < model.first_seq:
+            return None
+        return model.data(model.index(seq - model.first_seq, index.column()), role)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        return self.sourceModel().headerData(section, orientation, role)
@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QTableView,
     QPushButton, QLabel, QComboBox, QFrame, QSplitter, QTreeWidget,
     QTreeWidgetItem, QCheckBox, QLineEdit, QFormLayout, QGroupBox,
     QTabWidget, QProgressBar, QToolBar, QAction, QMenu, QHeaderView,
@@ -8,49 +8,74 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon, QColor, QBrush, QFont
 
+import threading
 import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import json
 
 from app.components.packet_analyzer import PacketAnalyzer
+from app.components.packet_table_model import PacketFilterProxyModel, PacketTableModel
 from app.utils.logger import get_logger
 
 # Module logger
 logger = get_logger('components.packet_view')
 
-class PacketDisplay(QTableWidget):
-    """Custom table widget for displaying packet information."""
+class PacketDisplay(QTableView):
+    """Table view for displaying packet information.
+    
+    Packets live in a PacketTableModel ring buffer and are shown through a
+    PacketFilterProxyModel, so only visible rows cost anything to draw.
+    add_packet() may be called from any thread; packets are buffered and
+    inserted on the GUI thread in batches.
+    """
+    
+    # Emitted with (shown, total) rows after packets are added or filtered
+    rows_changed = pyqtSignal(int, int)
+    
+    # Queued to the GUI thread when the first packet of a batch arrives
+    _packets_pending = pyqtSignal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setColumnCount(7)
-        self.setHorizontalHeaderLabels([
-            "Time", "Source", "Destination", "Protocol", "Length", "Info", "Status"
-        ])
         
         # Memory optimization settings
-        self.max_displayed_packets = 1000  # Maximum packets to display
+        self.max_displayed_packets = 1000000  # Maximum packets to retain
         self.packet_buffer = []  # Buffer for new packets
-        self.buffer_size = 50  # Process packets in batches of 50
+        self.buffer_lock = threading.Lock()
+        self.flush_interval = 100  # Insert buffered packets every 100 ms
         self.memory_threshold = 0.8  # Memory usage threshold (80%)
         
+        self.packet_model = PacketTableModel(self.max_displayed_packets, self)
+        self.proxy_model = PacketFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.packet_model)
+        self.setModel(self.proxy_model)
+        
         # Performance optimization
-        self.setSortingEnabled(True)
         self.setAlternatingRowColors(True)
-        self.setSelectionBehavior(QTableWidget.SelectRows)
-        self.setSelectionMode(QTableWidget.SingleSelection)
-        self.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.setSelectionBehavior(QTableView.SelectRows)
+        self.setSelectionMode(QTableView.SingleSelection)
+        self.setEditTriggers(QTableView.NoEditTriggers)
+        self.setWordWrap(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 6)
+        self.verticalHeader().hide()
+        # Start in arrival order; clicking a header sorts by that column
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.setSortingEnabled(True)
         
-        # Configure columns
+        # Configure columns; resizing to contents would measure every row
         header = self.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # Time
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)  # Source
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # Destination
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Protocol
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Length
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        for column, width in enumerate((150, 120, 120, 70, 60, 0, 80)):
+            if width:
+                self.setColumnWidth(column, width)
         header.setSectionResizeMode(5, QHeaderView.Stretch)  # Info
-        header.setSectionResizeMode(6, QHeaderView.ResizeToContents)  # Status
+        
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self._process_packet_buffer)
+        self._packets_pending.connect(self._schedule_flush, Qt.QueuedConnection)
         
         # Memory monitoring
         self.last_memory_check = time.time()
@@ -69,76 +94,91 @@ class PacketDisplay(QTableWidget):
             memory = psutil.virtual_memory()
             memory_usage = memory.percent / 100.0
             
+            capacity = self.max_displayed_packets
             if memory_usage > self.memory_threshold:
-                # Reduce displayed packets when memory usage is high
-                new_max = int(self.max_displayed_packets * (1 - (memory_usage - self.memory_threshold)))
-                if new_max < 100:  # Keep at least 100 packets
-                    new_max = 100
+                # Reduce retained packets when memory usage is high
+                capacity = int(capacity * (1 - (memory_usage - self.memory_threshold)))
+                if capacity < 100:  # Keep at least 100 packets
+                    capacity = 100
                     
-                if new_max < self.rowCount():
-                    # Remove oldest packets
-                    self.setRowCount(new_max)
-                    logger.info(f"Reduced displayed packets to {new_max} due to high memory usage")
+            if capacity != self.packet_model.capacity:
+                self.packet_model.set_capacity(capacity)
+                logger.info(f"Retaining up to {capacity} packets")
                     
         except ImportError:
             logger.warning("psutil not available for memory monitoring")
             
+    def _schedule_flush(self):
+        """Insert buffered packets once the flush interval has passed."""
+        if not self.flush_timer.isActive():
+            self.flush_timer.start(self.flush_interval)
+            
     def _process_packet_buffer(self):
-        """Process buffered packets in batches to reduce memory pressure."""
-        if not self.packet_buffer:
+        """Insert buffered packets into the model in one batch."""
+        with self.buffer_lock:
+            packets, self.packet_buffer = self.packet_buffer, []
+        if not packets:
             return
             
-        # Process packets in batches
-        for packet in self.packet_buffer:
-            # Add new row
-            row = self.rowCount()
-            self.insertRow(row)
-            
-            # Set packet data
-            self.setItem(row, 0, QTableWidgetItem(packet.get('timestamp', '')))
-            self.setItem(row, 1, QTableWidgetItem(packet.get('src_ip', '')))
-            self.setItem(row, 2, QTableWidgetItem(packet.get('dst_ip', '')))
-            self.setItem(row, 3, QTableWidgetItem(packet.get('protocol', '')))
-            self.setItem(row, 4, QTableWidgetItem(str(packet.get('length', 0))))
-            self.setItem(row, 5, QTableWidgetItem(packet.get('info', '')))
-            self.setItem(row, 6, QTableWidgetItem(packet.get('status', '')))
-            
-            # Apply color based on status
-            if packet.get('status') == 'Suspicious':
-                for col in range(self.columnCount()):
-                    self.item(row, col).setBackground(QColor(255, 200, 200))
-            elif packet.get('status') == 'Malicious':
-                for col in range(self.columnCount()):
-                    self.item(row, col).setBackground(QColor(255, 150, 150))
-                    
-        # Clear buffer
-        self.packet_buffer = []
+        # Keep following new packets if the view was at the newest one
+        scrollbar = self.verticalScrollBar()
+        newest_first = self.proxy_model.descending
+        follow = scrollbar.value() == (scrollbar.minimum() if newest_first else scrollbar.maximum())
+        
+        self._check_memory_usage()
+        self.packet_model.add_packets(packets)
         
-        # Limit total rows
-        while self.rowCount() > self.max_displayed_packets:
-            self.removeRow(0)
+        if follow and self.proxy_model.arrival_order:
+            if newest_first:
+                self.scrollToTop()
+            else:
+                self.scrollToBottom()
+        self.rows_changed.emit(self.proxy_model.rowCount(), self.packet_model.rowCount())
             
     def add_packet(self, packet):
         """Add a new packet to the display.
         
+        Safe to call from any thread.
+        
         Args:
             packet (dict): Packet information
         """
-        # Add to buffer
-        self.packet_buffer.append(packet)
-        
-        # Process buffer if it's full
-        if len(self.packet_buffer) >= self.buffer_size:
-            self._process_packet_buffer()
+        with self.buffer_lock:
+            self.packet_buffer.append(packet)
+            first = len(self.packet_buffer) == 1
+        if first:
+            self._packets_pending.emit()
             
-        # Check memory usage periodically
-        self._check_memory_usage()
+    def flush(self):
+        """Insert buffered packets now. Must be called on the GUI thread."""
+        self.flush_timer.stop()
+        self._process_packet_buffer()
+        
+    def set_filter(self, protocol, search_text):
+        """Show only matching packets.
+        
+        Args:
+            protocol: Protocol to show, or "All Protocols"
+            search_text: Text to find in addresses, ports and info
+        """
+        self.proxy_model.set_filter(protocol, search_text)
+        self.rows_changed.emit(self.proxy_model.rowCount(), self.packet_model.rowCount())
         
     def clear(self):
         """Clear all packets from the display."""
-        super().clear()
-        self.setRowCount(0)
-        self.packet_buffer = []
+        with self.buffer_lock:
+            self.packet_buffer = []
+        self.flush_timer.stop()
+        self.packet_model.clear()
+        self.rows_changed.emit(0, 0)
+        
+    def rowCount(self):
+        """Get the number of packets retained.
+        
+        Returns:
+            int: Packets in the model, whether or not they are filtered out
+        """
+        return self.packet_model.rowCount()
         
     def get_selected_packet(self):
         """Get the currently selected packet.
@@ -146,20 +186,10 @@ class PacketDisplay(QTableWidget):
         Returns:
             dict: Packet information or None if no packet selected
         """
-        selected = self.selectedItems()
-        if not selected:
+        rows = self.selectionModel().selectedRows()
+        if not rows:
             return None
-            
-        row = selected[0].row()
-        return {
-            'timestamp': self.item(row, 0).text(),
-            'src_ip': self.item(row, 1).text(),
-            'dst_ip': self.item(row, 2).text(),
-            'protocol': self.item(row, 3).text(),
-            'length': int(self.item(row, 4).text()),
-            'info': self.item(row, 5).text(),
-            'status': self.item(row, 6).text()
-        }
+        return self.packet_model.packet(self.proxy_model.mapToSource(rows[0]).row())
 
 class PacketView(QWidget):
     """User interface component for displaying packet capture and analysis."""
@@ -202,7 +232,8 @@ class PacketView(QWidget):
         
         # Upper part - packet table
         self.packet_table = PacketDisplay()
-        self.packet_table.itemSelectionChanged.connect(self.show_packet_details)
+        self.packet_table.selectionModel().selectionChanged.connect(self.show_packet_details)
+        self.packet_table.rows_changed.connect(self.update_packet_count)
         
         # Lower part - tabs for details, statistics, etc.
         detail_tabs = QTabWidget()
@@ -405,15 +436,20 @@ class PacketView(QWidget):
         Args:
             packet_info: Dictionary with packet information
         """
-        # Add to packet table
+        # Buffered by the table and inserted on the GUI thread in batches
         self.packet_table.add_packet(packet_info)
         
-        # Update packet count
-        self.packet_count_label.setText(f"{self.packet_table.rowCount()} packets")
+    def update_packet_count(self, shown, total):
+        """Update the packet count label.
         
-        # Auto-scroll to bottom if the last row was visible
-        if self.packet_table.rowCount() > 0 and self.packet_table.isRowVisible(self.packet_table.rowCount() - 1):
-            self.packet_table.scrollToBottom()
+        Args:
+            shown: Packets passing the display filter
+            total: Packets retained
+        """
+        if self.packet_table.proxy_model.is_filtered():
+            self.packet_count_label.setText(f"{shown} of {total} packets")
+        else:
+            self.packet_count_label.setText(f"{total} packets")
             
     def handle_status_update(self, success, message):
         """Handle status updates from the packet analyzer.
@@ -477,7 +513,7 @@ class PacketView(QWidget):
         summary = QTreeWidgetItem(self.packet_detail_tree, ["Packet", ""])
         
         # Add general info
-        time_str = selected_packet['timestamp']
+        time_str = str(selected_packet.get('timestamp', ''))
         QTreeWidgetItem(summary, ["Time", time_str])
         
         if 'length' in selected_packet:
@@ -616,91 +652,12 @@ class PacketView(QWidget):
         except Exception as e:
             logger.error(f"Error updating hex view: {e}")
             
-    def apply_protocol_color(self, row, protocol):
-        """Apply color to a row based on the protocol.
-        
-        Args:
-            row: Row index
-            protocol: Protocol name
-        """
-        color = None
-        
-        if protocol == 'TCP':
-            color = QColor(240, 248, 255)  # Light blue
-        elif protocol == 'UDP':
-            color = QColor(255, 250, 240)  # Light yellow
-        elif protocol == 'HTTP':
-            color = QColor(255, 240, 245)  # Light pink
-        elif protocol == 'DNS':
-            color = QColor(240, 255, 240)  # Light green
-        elif protocol == 'ARP':
-            color = QColor(255, 228, 225)  # Misty rose
-        elif protocol == 'ICMP':
-            color = QColor(224, 255, 255)  # Light cyan
-            
-        if color:
-            brush = QBrush(color)
-            for col in range(self.packet_table.columnCount()):
-                item = self.packet_table.item(row, col)
-                if item:
-                    item.setBackground(brush)
-                    
     def apply_display_filter(self):
         """Apply display filters to the packet table."""
-        protocol_filter = self.protocol_combo.currentText()
-        search_text = self.search_input.text().lower()
-        
-        # Show all rows first
-        for row in range(self.packet_table.rowCount()):
-            self.packet_table.setRowHidden(row, False)
-            
-        # If no filters, we're done
-        if protocol_filter == "All Protocols" and not search_text:
-            return
-            
-        # Apply filters
-        for row in range(self.packet_table.rowCount()):
-            # Get packet info for this row
-            time_item = self.packet_table.item(row, 0)
-            packet_info = time_item.data(Qt.UserRole) if time_item else None
-            
-            if not packet_info:
-                continue
-                
-            # Filter by protocol if needed
-            show_row = True
-            if protocol_filter != "All Protocols":
-                if packet_info.get('protocol', '') != protocol_filter:
-                    show_row = False
-                    
-            # Filter by search text if provided
-            if show_row and search_text:
-                # Search in multiple fields
-                search_fields = [
-                    packet_info.get('src_ip', ''),
-                    packet_info.get('dst_ip', ''),
-                    packet_info.get('info', ''),
-                    str(packet_info.get('src_port', '')),
-                    str(packet_info.get('dst_port', ''))
-                ]
-                
-                found = False
-                for field in search_fields:
-                    if search_text in field.lower():
-                        found = True
-                        break
-                        
-                if not found:
-                    show_row = False
-                    
-            # Apply visibility
-            self.packet_table.setRowHidden(row, not show_row)
-            
-        # Update the packet count
-        visible_count = sum(1 for row in range(self.packet_table.rowCount()) 
-                          if not self.packet_table.isRowHidden(row))
-                          
-        self.packet_count_label.setText(f"{visible_count} of {self.packet_table.rowCount()} packets")
+        self.packet_table.set_filter(
+            self.protocol_combo.currentText(),
+            self.search_input.text()
+        )
         
     def clear_packets(self):
         """Clear all packets from the display."""
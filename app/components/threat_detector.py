@@ -9,6 +9,7 @@ import netifaces
 from app.utils.logger import get_logger
 from app.utils.config import get_config
 from app.utils.mac_vendor import get_vendor_for_mac
+from app.utils.timeseries import get_timeseries_store
 from app.ml.packet_converter import convert_arp_packet
 
 # Module logger
@@ -381,6 +382,9 @@ class ThreatDetector:
         self.threats[ip]['macs'].add(mac)
         self.threats[ip]['last_seen'] = timestamp
         
+        # Count the alert for the monitoring time series
+        get_timeseries_store().record_alert(timestamp.timestamp() if isinstance(timestamp, datetime) else None)
+        
         # Log the threat
         gateway_str = " (GATEWAY)" if is_gateway else ""
         log_message = f"Potential ARP spoofing detected{gateway_str}: {ip} -> {mac}"
@@ -1,5 +1,4 @@
 import threading
-import socket
 import time
 import ipaddress
 import subprocess
@@ -13,15 +12,38 @@ from datetime import datetime
 from PyQt5.QtCore import pyqtSignal, QObject
 
 from app.utils.logger import get_logger
+from app.utils.port_scanner import PortScanner
 
 # Module logger
 logger = get_logger('components.vulnerability_scanner')
 
+# Port to service name mapping
+PORT_SERVICES = {
+    21: "FTP",
+    22: "SSH",
+    23: "Telnet",
+    25: "SMTP",
+    53: "DNS",
+    80: "HTTP",
+    110: "POP3",
+    139: "NetBIOS",
+    143: "IMAP",
+    443: "HTTPS",
+    445: "SMB",
+    993: "IMAPS",
+    995: "POP3S",
+    3306: "MySQL",
+    3389: "RDP",
+    5900: "VNC",
+    8080: "HTTP-Proxy"
+}
+
 class VulnerabilityScanner(QObject):
     """Component for scanning network devices for vulnerabilities."""
     
     # Signals
     scan_progress = pyqtSignal(int, int)  # emits (current, total)
+    port_progress = pyqtSignal(int, int)  # emits (ports scanned, total ports)
     scan_complete = pyqtSignal(list, str)  # emits (vulnerabilities, message)
     vulnerability_found = pyqtSignal(dict)  # emits vulnerability details
     
@@ -33,6 +55,7 @@ class VulnerabilityScanner(QObject):
         self.running = False
         self.should_stop = False
         self.scan_thread = None
+        self.port_scanner = None
         
         # Scan results
         self.vulnerabilities = []
@@ -40,7 +63,8 @@ class VulnerabilityScanner(QObject):
         # Scan configuration
         self.scan_timeout = 2  # seconds
         self.port_scan_timeout = 0.5  # seconds
-        self.max_threads = 10
+        self.max_threads = 10  # Connections open at once per target
+        self.max_concurrency = 256  # Connections open at once across all targets
         self.common_ports = [
             21, 22, 23, 25, 53, 80, 110, 111, 135, 139, 
             143, 443, 445, 993, 995, 1723, 3306, 3389, 5900, 8080
@@ -221,6 +245,8 @@ class VulnerabilityScanner(QObject):
             return False
         
         self.should_stop = True
+        if self.port_scanner:
+            self.port_scanner.cancel()
         if self.scan_thread:
             self.scan_thread.join(timeout=2.0)
         
@@ -251,6 +277,9 @@ class VulnerabilityScanner(QObject):
         if 'max_threads' in options:
             self.max_threads = max(1, min(50, options['max_threads']))
         
+        if 'max_concurrency' in options:
+            self.max_concurrency = max(1, options['max_concurrency'])
+        
         if 'ports' in options and options['ports']:
             self.common_ports = options['ports']
         
@@ -288,20 +317,51 @@ class VulnerabilityScanner(QObject):
             # Emit initial progress
             self.scan_progress.emit(0, total_targets)
             
-            # Process each target
-            for i, target in enumerate(targets):
-                # Check if we should stop
-                if self.should_stop:
-                    break
-                
-                # Scan the target
-                self._scan_target(target)
-                
-                # Update progress
-                self.scan_progress.emit(i + 1, total_targets)
-                
-                # Brief pause to prevent overwhelming the network
-                time.sleep(0.05)
+            # Group targets by IP address
+            targets_by_ip = {}
+            for target in targets:
+                target_ip = target.get('ip')
+                if not target_ip:
+                    logger.warning("Target missing IP address, skipping")
+                    continue
+                targets_by_ip.setdefault(target_ip, []).append(target)
+            
+            completed = total_targets - sum(len(group) for group in targets_by_ip.values())
+            completed_lock = threading.Lock()
+            last_percent = -1
+            
+            def on_port_progress(done: int, total: int):
+                nonlocal last_percent
+                # Limit GUI updates to one per percent
+                percent = done * 100 // total
+                if percent != last_percent:
+                    last_percent = percent
+                    self.port_progress.emit(done, total)
+            
+            def on_host_complete(target_ip: str, result: Dict):
+                nonlocal completed
+                # Runs on a worker thread, so the scan is not held up
+                for target in targets_by_ip[target_ip]:
+                    self._check_target(target, result)
+                with completed_lock:
+                    completed += len(targets_by_ip[target_ip])
+                    self.scan_progress.emit(completed, total_targets)
+            
+            # Scan every target concurrently
+            self.port_scanner = PortScanner(
+                timeout=self.port_scan_timeout,
+                max_concurrency=self.max_concurrency,
+                per_host_limit=self.max_threads
+            )
+            if not self.should_stop:
+                self.port_scanner.scan(
+                    list(targets_by_ip), self.common_ports,
+                    progress=on_port_progress, host_complete=on_host_complete
+                )
+                logger.info(
+                    f"Scanned {self.port_scanner.stats['ports_scanned']} ports at "
+                    f"{self.port_scanner.stats['ports_per_second']:.0f} ports/s"
+                )
             
             # Calculate scan duration
             duration = time.time() - start_time
@@ -334,18 +394,18 @@ class VulnerabilityScanner(QObject):
             # Ensure running state is reset
             self.running = False
     
-    def _scan_target(self, target: Dict):
-        """Scan a single target for vulnerabilities.
+    def _check_target(self, target: Dict, scan_result: Dict):
+        """Check a scanned target for vulnerabilities.
         
         Args:
             target: Dictionary with target information ('ip', 'mac', etc.)
+            scan_result: Port scan result with 'ports' and 'banners'
         """
-        target_ip = target.get('ip')
-        if not target_ip:
-            logger.warning("Target missing IP address, skipping")
+        target_ip = target['ip']
+        if self.should_stop:
             return
         
-        logger.info(f"Scanning target {target_ip} for vulnerabilities")
+        logger.info(f"Checking target {target_ip} for vulnerabilities")
         
         # Basic info about the target
         target_info = {
@@ -357,67 +417,21 @@ class VulnerabilityScanner(QObject):
         }
         
         try:
-            # Step 1: Port scan to find open ports
-            open_ports = self._scan_ports(target_ip)
-            if self.should_stop:
-                return
-                
-            # Step 2: Service identification on open ports
-            services = self._identify_services(target_ip, open_ports)
-            if self.should_stop:
-                return
-                
-            # Step 3: Check for common vulnerabilities
+            open_ports = scan_result['ports']
+            services = self._identify_services(target_ip, open_ports, scan_result['banners'])
             self._check_vulnerabilities(target_info, open_ports, services)
             
         except Exception as e:
             logger.error(f"Error scanning target {target_ip}: {e}")
     
-    def _scan_ports(self, ip: str) -> Dict[int, bool]:
-        """Scan for open ports on the target.
-        
-        Args:
-            ip: IP address to scan
-            
-        Returns:
-            Dict[int, bool]: Dictionary of port numbers and their open status
-        """
-        result = {}
-        scan_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        scan_socket.settimeout(self.port_scan_timeout)
-        
-        for port in self.common_ports:
-            # Check if we should stop
-            if self.should_stop:
-                scan_socket.close()
-                return result
-                
-            try:
-                connection = scan_socket.connect_ex((ip, port))
-                is_open = (connection == 0)
-                result[port] = is_open
-                
-                if is_open:
-                    logger.debug(f"Port {port} is open on {ip}")
-                
-                # Close the connection
-                scan_socket.close()
-                scan_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                scan_socket.settimeout(self.port_scan_timeout)
-                
-            except Exception as e:
-                logger.debug(f"Error scanning port {port} on {ip}: {e}")
-                result[port] = False
-        
-        scan_socket.close()
-        return result
-    
-    def _identify_services(self, ip: str, open_ports: Dict[int, bool]) -> Dict[int, Dict]:
+    def _identify_services(self, ip: str, open_ports: Dict[int, bool],
+                           banners: Dict[int, bytes]) -> Dict[int, Dict]:
         """Identify services running on open ports.
         
         Args:
             ip: IP address of the target
             open_ports: Dictionary of port numbers and their open status
+            banners: Banners read from the probed open ports
             
         Returns:
             Dict[int, Dict]: Dictionary of port numbers and service information
@@ -428,106 +442,18 @@ class VulnerabilityScanner(QObject):
             # Skip closed ports
             if not is_open:
                 continue
-                
-            # Check if we should stop
-            if self.should_stop:
-                return services
             
-            # Try to identify the service
-            service_info = self._probe_service(ip, port)
-            if service_info:
-                services[port] = service_info
-                logger.debug(f"Identified service on {ip}:{port} - {service_info.get('name', 'Unknown')}")
+            name = PORT_SERVICES.get(port, "Unknown")
+            banner = banners.get(port, b"").decode('utf-8', errors='ignore').strip()
+            services[port] = {
+                'name': name,
+                'banner': banner,
+                'version': self._extract_version(banner, name) if banner else ""
+            }
+            logger.debug(f"Identified service on {ip}:{port} - {name}")
         
         return services
     
-    def _probe_service(self, ip: str, port: int) -> Dict:
-        """Probe a port to identify the running service.
-        
-        Args:
-            ip: IP address of the target
-            port: Port number to probe
-            
-        Returns:
-            Dict: Service information or empty dict if not identified
-        """
-        # Common protocol probes and their expected responses
-        probe_data = {
-            21: b"",  # FTP - just connect
-            22: b"",  # SSH - just connect
-            23: b"",  # Telnet - just connect
-            25: b"HELO arpguard.local\r\n",  # SMTP
-            80: b"GET / HTTP/1.0\r\nHost: %b\r\n\r\n" % ip.encode(),  # HTTP
-            110: b"",  # POP3 - just connect
-            143: b"",  # IMAP - just connect
-            443: b"",  # HTTPS - just connect, SSL will be handled separately
-            3306: b"",  # MySQL - just connect
-            3389: b"",  # RDP - just connect
-            5900: b""   # VNC - just connect
-        }
-        
-        # Port to service name mapping
-        port_service_map = {
-            21: "FTP",
-            22: "SSH",
-            23: "Telnet",
-            25: "SMTP",
-            53: "DNS",
-            80: "HTTP",
-            110: "POP3",
-            139: "NetBIOS",
-            143: "IMAP",
-            443: "HTTPS",
-            445: "SMB",
-            993: "IMAPS",
-            995: "POP3S",
-            3306: "MySQL",
-            3389: "RDP",
-            5900: "VNC",
-            8080: "HTTP-Proxy"
-        }
-        
-        # Get default service name based on port
-        default_service = {
-            'name': port_service_map.get(port, "Unknown"),
-            'banner': "",
-            'version': ""
-        }
-        
-        # For some ports, just return the default service name
-        if port not in probe_data:
-            return default_service
-        
-        # Try to connect and get a banner
-        try:
-            probe_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            probe_socket.settimeout(self.port_scan_timeout)
-            probe_socket.connect((ip, port))
-            
-            # Send probe data if needed
-            if probe_data[port]:
-                probe_socket.send(probe_data[port])
-            
-            # Try to receive a banner
-            banner = probe_socket.recv(1024)
-            probe_socket.close()
-            
-            # Process the banner
-            banner_str = banner.decode('utf-8', errors='ignore').strip()
-            
-            # Update service info
-            service_info = {
-                'name': default_service['name'],
-                'banner': banner_str,
-                'version': self._extract_version(banner_str, default_service['name'])
-            }
-            
-            return service_info
-            
-        except Exception as e:
-            logger.debug(f"Error probing service on {ip}:{port} - {e}")
-            return default_service
-    
     def _extract_version(self, banner: str, service_name: str) -> str:
         """Extract version information from a service banner.
         
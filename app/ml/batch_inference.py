@@ -0,0 +1,233 @@
+"""
+Micro-batching inference service for ARPGuard.
+
+Collects individual inference requests into small batches so models can
+score a whole matrix per call instead of paying sklearn's per-call
+overhead for every packet.
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.utils.logger import get_logger
+
+# Get module logger
+logger = get_logger("ml.batch_inference")
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+
+class MicroBatcher:
+    """Accumulates requests and runs them through a batch function.
+
+    A batch is dispatched once it holds max_batch_size items or its oldest
+    item has waited max_wait_ms, so no request waits longer than
+    max_wait_ms (plus the run time of the batch ahead of it) for a slot.
+
+    The batch function receives a list of items and must return one result
+    per item, in order.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], Sequence[Any]],
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0,
+                 name: str = "ml-batcher"):
+        """Initialize the micro-batcher.
+
+        Args:
+            batch_fn: Function scoring a list of items
+            max_batch_size: Maximum number of items per batch
+            max_wait_ms: Maximum time an item waits for its batch to fill
+            name: Name of the dispatch thread
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+
+        # Pending (item, future, enqueue time) tuples
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        """Reset batch and latency counters."""
+        self.started_at = time.time()
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.batch_size_histogram: Dict[int, int] = {}
+        self.latency_histogram: Dict[str, int] = {}
+        self.max_latency_ms = 0.0
+
+    def start(self):
+        """Start the dispatch thread."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._dispatch_loop, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info(f"Micro-batcher started (max_batch_size={self.max_batch_size}, "
+                    f"max_wait_ms={self.max_wait_ms})")
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the dispatch thread after flushing pending requests.
+
+        Args:
+            timeout: Time to wait for the thread to exit
+        """
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify_all()
+
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info("Micro-batcher stopped")
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item for batched inference.
+
+        Starts the dispatch thread on first use.
+
+        Args:
+            item: Item to score
+
+        Returns:
+            Future resolved with the item's result
+        """
+        if not self._running:
+            self.start()
+
+        future = Future()
+        with self._condition:
+            self._pending.append((item, future, time.monotonic()))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch_size:
+                self._condition.notify()
+        return future
+
+    def run(self, items: List[Any]) -> List[Any]:
+        """Score items on the calling thread, max_batch_size at a time.
+
+        Args:
+            items: Items to score
+
+        Returns:
+            One result per item, in order
+        """
+        results = []
+        for start in range(0, len(items), self.max_batch_size):
+            chunk = items[start:start + self.max_batch_size]
+            begin = time.monotonic()
+            chunk_results = self.batch_fn(chunk)
+            self._record_batch(len(chunk), time.monotonic() - begin, [begin] * len(chunk))
+            results.extend(chunk_results)
+        return results
+
+    def _dispatch_loop(self):
+        """Collect batches and resolve their futures."""
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+
+                # Wait for the batch to fill until the oldest item's deadline
+                deadline = self._pending[0][2] + self.max_wait_ms / 1000.0
+                while self._running and len(self._pending) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                count = min(len(self._pending), self.max_batch_size)
+                batch = [self._pending.popleft() for _ in range(count)]
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[tuple]):
+        """Run one batch and resolve its futures."""
+        items = [entry[0] for entry in batch]
+        begin = time.monotonic()
+        try:
+            results = self.batch_fn(items)
+            if len(results) != len(items):
+                raise ValueError(f"Batch function returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            logger.error(f"Error running inference batch of {len(items)}: {e}")
+            with self._stats_lock:
+                self.errors += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        self._record_batch(len(items), time.monotonic() - begin, [entry[2] for entry in batch])
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def _record_batch(self, size: int, duration: float, enqueued_at: List[float]):
+        """Update the batch size, throughput and latency statistics."""
+        now = time.monotonic()
+        bucket = 1 << (size - 1).bit_length()
+
+        with self._stats_lock:
+            self.batches += 1
+            self.items += size
+            self.busy_time += duration
+            self.batch_size_histogram[bucket] = self.batch_size_histogram.get(bucket, 0) + 1
+
+            for enqueued in enqueued_at:
+                latency_ms = (now - enqueued) * 1000.0
+                self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+                label = next((f"<={limit}ms" for limit in LATENCY_BUCKETS_MS if latency_ms <= limit),
+                             f">{LATENCY_BUCKETS_MS[-1]}ms")
+                self.latency_histogram[label] = self.latency_histogram.get(label, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics.
+
+        Returns:
+            Dict with batch counts, throughput and histograms
+        """
+        with self._stats_lock:
+            elapsed = max(time.time() - self.started_at, 1e-6)
+            return {
+                "running": self._running,
+                "pending": len(self._pending),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "batches": self.batches,
+                "items": self.items,
+                "errors": self.errors,
+                "average_batch_size": self.items / self.batches if self.batches else 0.0,
+                "items_per_second": self.items / elapsed,
+                "busy_items_per_second": self.items / self.busy_time if self.busy_time else 0.0,
+                "max_latency_ms": self.max_latency_ms,
+                # Keys are the upper bound of each power-of-two size bucket
+                "batch_size_histogram": {
+                    str(size): count for size, count in sorted(self.batch_size_histogram.items())
+                },
+                "latency_histogram": {
+                    label: self.latency_histogram[label]
+                    for label in [f"<={limit}ms" for limit in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+                    if label in self.latency_histogram
+                }
+            }
+
+    def reset_stats(self):
+        """Reset batching statistics."""
+        with self._stats_lock:
+            self._reset_stats()
@@ -7,10 +7,11 @@ for effective rule-based detection of ARP-based attacks.
 
 import time
 from datetime import datetime, timedelta
-from collections import deque, defaultdict
+from collections import defaultdict
 from threading import Lock
 from typing import Dict, List, Any, Optional, Set, Deque, Tuple
 
+from app.ml.feature_store import TemporalFeatureStore
 from app.utils.logger import get_logger
 
 # Setup module logger
@@ -24,12 +25,17 @@ class ContextTracker:
     that rules need to evaluate packets effectively.
     """
     
-    def __init__(self, history_window: int = 300):
+    def __init__(self, history_window: int = 300,
+                 feature_store: Optional[TemporalFeatureStore] = None):
         """
         Initialize the context tracker.
         
         Args:
             history_window: Number of seconds to maintain history for
+            feature_store: Packet window shared with a FeatureExtractor. The
+                extractor records packets into it, so the tracker only reads
+                it; its window should cover history_window. Without one the
+                tracker keeps and fills its own, sized to history_window.
         """
         self.history_window = history_window
         self.lock = Lock()
@@ -43,8 +49,11 @@ class ContextTracker:
         # Maps MAC -> timestamp -> packet count
         self.packet_history = defaultdict(lambda: defaultdict(int))
         
-        # Recent packets for each MAC (sliding window)
-        self.recent_packets = defaultdict(lambda: deque(maxlen=100))
+        # Recent packet window (per-MAC counts are read from it)
+        self.owns_feature_store = feature_store is None
+        if feature_store is None:
+            feature_store = TemporalFeatureStore(capacity=1000, window=history_window)
+        self.feature_store = feature_store
         
         # Gateway information
         self.gateway_ip = None
@@ -76,7 +85,8 @@ class ContextTracker:
                 return
                 
             # Store packet in recent history
-            self.recent_packets[src_mac].append(packet)
+            if self.owns_feature_store:
+                self.feature_store.add_packet(packet)
             
             # Update packet count
             self.packet_history[src_mac][self._get_time_bucket(timestamp)] += 1
@@ -184,7 +194,7 @@ class ContextTracker:
         # and have high packet counts
         if packet.get("op") == 2 and packet.get("src_ip") == packet.get("dst_ip"):
             src_mac = packet.get("src_mac")
-            recent_count = len(self.recent_packets.get(src_mac, []))
+            recent_count = self.feature_store.mac_count(src_mac)
             
             # If we've seen multiple packets from this MAC, it might be a gateway
             return recent_count > 5
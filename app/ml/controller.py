@@ -12,11 +12,13 @@ import logging
 import threading
 import time
 from datetime import datetime
+from concurrent.futures import Future
 from typing import Dict, List, Any, Optional, Tuple, Union
 
 from app.utils.logger import get_logger
 from app.utils.config import get_config
 from app.ml.engine import MLEngine
+from app.ml.batch_inference import MicroBatcher
 from app.ml.feature_extraction import FeatureExtractor
 
 # Get module logger
@@ -66,6 +68,17 @@ class MLController:
         # Training lock
         self.training_lock = threading.Lock()
         
+        # Guards stats and detections, updated by callers and the batcher thread
+        self.stats_lock = threading.Lock()
+        
+        # Micro-batching inference for submitted packets
+        self.batcher = MicroBatcher(
+            self._infer_batch,
+            max_batch_size=self.config.get("ml.batch.max_size", 64),
+            max_wait_ms=self.config.get("ml.batch.max_wait_ms", 5.0),
+            name="ml-inference-batcher"
+        )
+        
         # Load models if available
         self._load_models()
         
@@ -98,7 +111,8 @@ class MLController:
             features = self.feature_extractor.extract_features(packet)
             
             # Update statistics
-            self.stats["packets_analyzed"] += 1
+            with self.stats_lock:
+                self.stats["packets_analyzed"] += 1
             
             # ML analysis enabled?
             if not self.config.get("ml.detection.enabled", True):
@@ -106,44 +120,131 @@ class MLController:
                 
             # Process with ML engine
             ml_result = self.ml_engine.process(packet, features)
-            
-            # If any detections, update stats and store
-            if ml_result.get("detections", []):
-                detections = ml_result["detections"]
-                self.stats["threats_detected"] += len(detections)
-                self.stats["ml_detections"] += len(detections)
-                
-                # Update type-specific stats
-                for detection in detections:
-                    evidence = detection.get("evidence", {})
-                    
-                    if evidence.get("detection_type") == "anomaly":
-                        self.stats["ml_engine"]["anomaly_stats"]["total_detections"] += 1
-                    elif evidence.get("detection_type") == "classification":
-                        self.stats["ml_engine"]["classifier_stats"]["total_detections"] += 1
-                
-                # Store detections
-                timestamp = datetime.now().isoformat()
-                for detection in detections:
-                    detection["timestamp"] = timestamp
-                    detection["type"] = "ml_based"
-                    self.detections.append(detection)
-                    
-                # Trim if needed
-                if len(self.detections) > self.max_detections:
-                    self.detections = self.detections[-self.max_detections:]
-                    
-                # Update last detection timestamp
-                self.stats["last_detection"] = timestamp
-                
-                # Add to result
-                result["detections"].extend(detections)
+            result["detections"].extend(self._record_detections(ml_result))
         
         except Exception as e:
             logger.error(f"Error processing packet with ML: {e}")
             
         return result
     
+    def process_packets(self, packets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Process several packets through the ML pipeline in batches.
+        
+        Features are extracted in packet order, then the packets are scored
+        max_batch_size at a time on the calling thread.
+        
+        Args:
+            packets: The packets to process
+            
+        Returns:
+            List with one dict of detection results per packet
+        """
+        items = self._extract_batch(packets)
+        if not self.config.get("ml.detection.enabled", True):
+            return [{"detections": []} for _ in packets]
+        
+        try:
+            return self.batcher.run(items)
+        except Exception as e:
+            logger.error(f"Error processing packet batch with ML: {e}")
+            return [{"detections": []} for _ in packets]
+    
+    def submit_packet(self, packet: Dict[str, Any]) -> Future:
+        """Queue a packet for micro-batched ML inference.
+        
+        The packet is scored together with other submitted packets once a
+        batch fills up or the oldest packet has waited ml.batch.max_wait_ms.
+        
+        Args:
+            packet: The packet to process
+            
+        Returns:
+            Future resolved with the packet's dict of detection results
+        """
+        items = self._extract_batch([packet])
+        if not self.config.get("ml.detection.enabled", True):
+            future = Future()
+            future.set_result({"detections": []})
+            return future
+        return self.batcher.submit(items[0])
+    
+    def _extract_batch(self, packets: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, float]]]:
+        """Extract features for packets in order.
+        
+        Args:
+            packets: The packets to featurise
+            
+        Returns:
+            List of (packet, features) pairs
+        """
+        try:
+            features_list = self.feature_extractor.extract_features_batch(packets)
+        except Exception as e:
+            logger.error(f"Error extracting features for ML: {e}")
+            features_list = [{} for _ in packets]
+        items = list(zip(packets, features_list))
+        
+        with self.stats_lock:
+            self.stats["packets_analyzed"] += len(packets)
+        return items
+    
+    def _infer_batch(self, items: List[Tuple[Dict[str, Any], Dict[str, float]]]) -> List[Dict[str, Any]]:
+        """Score a batch of (packet, features) pairs and record detections.
+        
+        Args:
+            items: Packets with their extracted features
+            
+        Returns:
+            List with one dict of detection results per packet
+        """
+        ml_results = self.ml_engine.process_batch(
+            [packet for packet, _ in items],
+            [features for _, features in items]
+        )
+        return [{"detections": self._record_detections(ml_result)} for ml_result in ml_results]
+    
+    def _record_detections(self, ml_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Update statistics and history with an engine result.
+        
+        Args:
+            ml_result: Result from the ML engine for one packet
+            
+        Returns:
+            List of recorded detections
+        """
+        detections = ml_result.get("detections", [])
+        if not detections:
+            return []
+        
+        with self.stats_lock:
+            self.stats["threats_detected"] += len(detections)
+            self.stats["ml_detections"] += len(detections)
+            
+            # Update type-specific stats
+            for detection in detections:
+                evidence = detection.get("evidence", {})
+                
+                if evidence.get("detection_type") == "anomaly":
+                    self.stats["ml_engine"]["anomaly_stats"]["total_detections"] += 1
+                elif evidence.get("detection_type") == "classification":
+                    self.stats["ml_engine"]["classifier_stats"]["total_detections"] += 1
+            
+            # Store detections
+            timestamp = datetime.now().isoformat()
+            for detection in detections:
+                detection["timestamp"] = timestamp
+                detection["type"] = "ml_based"
+                self.detections.append(detection)
+                
+            # Trim if needed
+            if len(self.detections) > self.max_detections:
+                self.detections = self.detections[-self.max_detections:]
+                
+            # Update last detection timestamp
+            self.stats["last_detection"] = timestamp
+        
+        return detections
+    
     def load_sample_data(self) -> Dict[str, Any]:
         """Load sample data and train models.
         
@@ -305,7 +406,9 @@ class MLController:
         Returns:
             Dict containing current statistics
         """
-        return self.stats
+        stats = dict(self.stats)
+        stats["batching"] = self.batcher.get_stats()
+        return stats
     
     def get_recent_detections(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent detections.
@@ -351,6 +454,7 @@ class MLController:
         
         # Clear detections
         self.detections = []
+        self.batcher.reset_stats()
         
         logger.info("Statistics and detections cleared")
         
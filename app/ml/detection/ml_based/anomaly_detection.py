@@ -146,52 +146,70 @@ class AnomalyDetectionEngine:
             logger.warning("Anomaly detector not ready, skipping detection")
             return None
             
-        try:
-            # Extract features
-            features = extract_packet_features(packet)
+        return self.detect_batch([packet])[0]
+    
+    def detect_batch(self, packets: List[Dict[str, Any]]) -> List[Optional[AnomalyResult]]:
+        """Detect anomalies in several packets with one model call.
+        
+        Args:
+            packets: List of packet dictionaries
             
-            # Reshape for model
-            features_reshaped = features.reshape(1, -1)
+        Returns:
+            List with an AnomalyResult for each anomalous packet, None otherwise
+        """
+        results: List[Optional[AnomalyResult]] = [None] * len(packets)
+        if not packets:
+            return results
+        
+        if not self.detector_ready:
+            logger.warning("Anomaly detector not ready, skipping detection")
+            return results
             
-            # Detect anomalies
-            anomalies, scores = self.detector.detect_anomalies(features_reshaped)
+        try:
+            # Extract features into one matrix
+            features = np.array([extract_packet_features(packet) for packet in packets])
             
-            # Create result if anomaly detected
-            if anomalies[0]:
-                # Get feature contribution to the anomaly
-                contributions = self._get_feature_contributions(features_reshaped)
-                
-                result = AnomalyResult(
-                    is_anomaly=True,
-                    score=float(scores[0]),
-                    features_contribution=contributions,
-                    timestamp=datetime.now(),
-                    source_ip=packet.get("src_ip"),
-                    source_mac=packet.get("src_mac"),
-                    packet_info=packet
-                )
-                
-                # Add to history
-                self.detection_history.append({
-                    "timestamp": result.timestamp,
-                    "source_ip": result.source_ip,
-                    "source_mac": result.source_mac,
-                    "score": result.score,
-                    "contributions": result.features_contribution
-                })
-                
-                # Keep limited history
-                if len(self.detection_history) > 1000:
-                    self.detection_history = self.detection_history[-1000:]
-                    
-                logger.info(f"Anomaly detected: score={result.score:.4f}, src={result.source_ip}")
-                return result
-                
-            return None
+            # Detect anomalies
+            anomalies, scores = self.detector.detect_anomalies(features)
             
+            # Feature contributions for the anomalous rows only
+            anomalous_rows = [i for i in range(len(packets)) if anomalies[i]]
+            if not anomalous_rows:
+                return results
+            contributions = self._get_feature_contributions_batch(features[anomalous_rows])
         except Exception as e:
             logger.error(f"Error during anomaly detection: {e}")
-            return None
+            return results
+        
+        for row, i in enumerate(anomalous_rows):
+            packet = packets[i]
+            result = AnomalyResult(
+                is_anomaly=True,
+                score=float(scores[i]),
+                features_contribution=contributions[row],
+                timestamp=datetime.now(),
+                source_ip=packet.get("src_ip"),
+                source_mac=packet.get("src_mac"),
+                packet_info=packet
+            )
+            
+            # Add to history
+            self.detection_history.append({
+                "timestamp": result.timestamp,
+                "source_ip": result.source_ip,
+                "source_mac": result.source_mac,
+                "score": result.score,
+                "contributions": result.features_contribution
+            })
+            
+            logger.info(f"Anomaly detected: score={result.score:.4f}, src={result.source_ip}")
+            results[i] = result
+        
+        # Keep limited history
+        if len(self.detection_history) > 1000:
+            self.detection_history = self.detection_history[-1000:]
+            
+        return results
             
     def _get_feature_contributions(self, features: np.ndarray) -> Dict[str, float]:
         """Calculate feature contributions to anomaly detection.
@@ -202,24 +220,37 @@ class AnomalyDetectionEngine:
         Returns:
             Dictionary mapping feature names to contribution scores
         """
+        return self._get_feature_contributions_batch(features)[0]
+    
+    def _get_feature_contributions_batch(self, features: np.ndarray) -> List[Dict[str, float]]:
+        """Calculate feature contributions for each row of a feature matrix.
+        
+        Args:
+            features: Feature matrix
+            
+        Returns:
+            List of dictionaries mapping feature names to contribution scores
+        """
         try:
             # Get reconstruction
             reconstruction = self.detector.model.predict(features)
             
             # Calculate error for each feature
-            feature_errors = np.square(features - reconstruction)[0]
+            feature_errors = np.square(features - reconstruction)
             
-            # Create contribution dictionary
-            contributions = {}
-            for i, name in enumerate(self.feature_names):
-                if i < len(feature_errors):
-                    contributions[name] = float(feature_errors[i])
-                    
-            return contributions
+            # Create contribution dictionaries
+            return [
+                {
+                    name: float(row_errors[i])
+                    for i, name in enumerate(self.feature_names)
+                    if i < len(row_errors)
+                }
+                for row_errors in feature_errors
+            ]
             
         except Exception as e:
             logger.error(f"Error calculating feature contributions: {e}")
-            return {name: 0.0 for name in self.feature_names}
+            return [{name: 0.0 for name in self.feature_names} for _ in range(len(features))]
             
     def train(self, packets: List[Dict[str, Any]], is_anomaly: Optional[List[bool]] = None) -> Dict[str, Any]:
         """Train the anomaly detection model.
@@ -196,61 +196,99 @@ class MLClassifier:
             logger.warning("ML classifier not ready, skipping classification")
             return None
             
-        try:
-            # Extract features
-            features = extract_packet_features(packet)
-            
-            # Scale features
-            features_scaled = self.scaler.transform(features.reshape(1, -1))
-            
-            # Get prediction and probabilities
-            prediction = self.model.predict(features_scaled)[0]
-            probabilities = self.model.predict_proba(features_scaled)[0]
-            
-            # Get class name
-            attack_type = self.class_names.get(prediction, "unknown")
-            
-            # Get highest probability
-            confidence = float(probabilities[prediction])
+        return self.classify_batch([packet])[0]
+    
+    def classify_batch(self, packets: List[Dict[str, Any]]) -> List[Optional[ClassificationResult]]:
+        """Classify several packets with one scaler and model call each.
+        
+        Args:
+            packets: List of packet dictionaries
             
-            # Create result
-            is_attack = prediction > 0 and confidence >= self.classification_threshold
+        Returns:
+            List with a ClassificationResult for each attack packet, None otherwise
+        """
+        results: List[Optional[ClassificationResult]] = [None] * len(packets)
+        if not packets:
+            return results
+        
+        if not self.classifier_ready:
+            logger.warning("ML classifier not ready, skipping classification")
+            return results
             
-            if is_attack:
-                result = ClassificationResult(
-                    is_attack=is_attack,
-                    attack_type=attack_type,
-                    probability=float(probabilities[prediction]),
-                    confidence=confidence,
-                    timestamp=datetime.now(),
-                    source_ip=packet.get("src_ip"),
-                    source_mac=packet.get("src_mac"),
-                    packet_info=packet
-                )
-                
-                # Add to history
-                self.detection_history.append({
-                    "timestamp": result.timestamp,
-                    "source_ip": result.source_ip,
-                    "source_mac": result.source_mac,
-                    "attack_type": result.attack_type,
-                    "probability": result.probability,
-                    "confidence": result.confidence
-                })
-                
-                # Keep limited history
-                if len(self.detection_history) > 1000:
-                    self.detection_history = self.detection_history[-1000:]
-                    
-                logger.info(f"Classification: {result.attack_type} (conf={result.confidence:.4f}), src={result.source_ip}")
-                return result
+        try:
+            # Extract features into one matrix
+            features = np.array([extract_packet_features(packet) for packet in packets])
             
-            return None
+            # Scale features
+            features_scaled = self.scaler.transform(features)
             
+            # Get predictions and probabilities
+            predictions = self.model.predict(features_scaled)
+            probabilities = self.model.predict_proba(features_scaled)
         except Exception as e:
             logger.error(f"Error during ML classification: {e}")
+            return results
+        
+        for i, packet in enumerate(packets):
+            try:
+                results[i] = self._build_result(packet, predictions[i], probabilities[i])
+            except Exception as e:
+                logger.error(f"Error during ML classification: {e}")
+        
+        return results
+    
+    def _build_result(self, packet: Dict[str, Any], prediction: int,
+                      probabilities: np.ndarray) -> Optional[ClassificationResult]:
+        """Create the result for one classified packet.
+        
+        Args:
+            packet: Dictionary containing packet data
+            prediction: Predicted class
+            probabilities: Class probabilities for the packet
+            
+        Returns:
+            ClassificationResult if the packet is an attack, None otherwise
+        """
+        # Get class name
+        attack_type = self.class_names.get(prediction, "unknown")
+        
+        # Get highest probability
+        confidence = float(probabilities[prediction])
+        
+        # Create result
+        is_attack = prediction > 0 and confidence >= self.classification_threshold
+        
+        if not is_attack:
             return None
             
+        result = ClassificationResult(
+            is_attack=is_attack,
+            attack_type=attack_type,
+            probability=float(probabilities[prediction]),
+            confidence=confidence,
+            timestamp=datetime.now(),
+            source_ip=packet.get("src_ip"),
+            source_mac=packet.get("src_mac"),
+            packet_info=packet
+        )
+        
+        # Add to history
+        self.detection_history.append({
+            "timestamp": result.timestamp,
+            "source_ip": result.source_ip,
+            "source_mac": result.source_mac,
+            "attack_type": result.attack_type,
+            "probability": result.probability,
+            "confidence": result.confidence
+        })
+        
+        # Keep limited history
+        if len(self.detection_history) > 1000:
+            self.detection_history = self.detection_history[-1000:]
+            
+        logger.info(f"Classification: {result.attack_type} (conf={result.confidence:.4f}), src={result.source_ip}")
+        return result
+            
     def train(self, packets: List[Dict[str, Any]], labels: List[int]) -> Dict[str, Any]:
         """Train the ML classifier.
         
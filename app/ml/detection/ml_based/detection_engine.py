@@ -14,6 +14,7 @@ from app.utils.logger import get_logger
 from app.utils.config import get_config
 from app.ml.detection.ml_based.anomaly_detection import AnomalyDetectionEngine, AnomalyResult
 from app.ml.detection.ml_based.classifier import MLClassifier, ClassificationResult
+from src.core.expiring_map import ExpiringMap
 
 # Set up module logger
 logger = get_logger("ml.detection.ml_based.detection_engine")
@@ -67,8 +68,8 @@ class MLDetectionEngine:
         self.anomaly_severity = self.config.get("ml.detection.anomaly_severity", "MEDIUM")
         
         # Cache recently seen packets to avoid duplicate detections
-        self.recent_detections: Dict[str, Set[str]] = {}  # source_ip -> set of MAC addresses
         self.detection_cache_ttl = self.config.get("ml.detection.cache_ttl", 60)  # seconds
+        self.recent_detections: ExpiringMap = ExpiringMap(ttl=self.detection_cache_ttl)  # (source_ip, MAC) -> timestamp
         
         logger.info("Initialized ML Detection Engine")
         
@@ -81,24 +82,66 @@ class MLDetectionEngine:
         Returns:
             MLDetectionResult if a threat is detected, None otherwise
         """
-        source_ip = packet.get("src_ip")
-        source_mac = packet.get("src_mac")
+        return self.detect_batch([packet])[0]
+    
+    def detect_batch(self, packets: List[Dict[str, Any]]) -> List[Optional[MLDetectionResult]]:
+        """Detect threats in several packets at once.
         
-        # Skip packet if it was recently detected as a threat
-        if self._is_duplicate_detection(source_ip, source_mac):
-            return None
+        Packets not recently detected are scored together, with one call
+        per model for the whole batch.
+        
+        Args:
+            packets: List of packet dictionaries
+            
+        Returns:
+            List with an MLDetectionResult for each threat, None otherwise
+        """
+        results: List[Optional[MLDetectionResult]] = [None] * len(packets)
+        
+        # Skip packets that were recently detected as a threat
+        pending = [
+            i for i, packet in enumerate(packets)
+            if not self._is_duplicate_detection(packet.get("src_ip"), packet.get("src_mac"))
+        ]
+        if not pending:
+            return results
+        batch = [packets[i] for i in pending]
         
         # Results from different detection methods
-        anomaly_result = None
-        classification_result = None
+        anomaly_results = [None] * len(batch)
+        classification_results = [None] * len(batch)
         
         # Run anomaly detection if enabled
         if self.use_anomaly_detection:
-            anomaly_result = self.anomaly_engine.detect(packet)
+            anomaly_results = self.anomaly_engine.detect_batch(batch)
             
         # Run classification if enabled
         if self.use_classification:
-            classification_result = self.classifier.classify(packet)
+            classification_results = self.classifier.classify_batch(batch)
+        
+        for row, i in enumerate(pending):
+            packet = packets[i]
+            # An earlier packet in this batch may have been detected for the same source
+            if row and self._is_duplicate_detection(packet.get("src_ip"), packet.get("src_mac")):
+                continue
+            results[i] = self._combine_results(packet, anomaly_results[row], classification_results[row])
+        
+        return results
+    
+    def _combine_results(self, packet: Dict[str, Any], anomaly_result: Optional[AnomalyResult],
+                         classification_result: Optional[ClassificationResult]) -> Optional[MLDetectionResult]:
+        """Combine the anomaly and classification results for one packet.
+        
+        Args:
+            packet: Dictionary containing packet data
+            anomaly_result: Anomaly detection result, if any
+            classification_result: Classification result, if any
+            
+        Returns:
+            MLDetectionResult if a threat is detected, None otherwise
+        """
+        source_ip = packet.get("src_ip")
+        source_mac = packet.get("src_mac")
             
         # If neither detected anything, return None
         if not anomaly_result and not classification_result:
@@ -211,14 +254,8 @@ class MLDetectionEngine:
         if not source_ip or not source_mac:
             return False
             
-        # Clean up old entries
-        self._cleanup_detection_cache()
-        
         # Check if this IP+MAC combination was recently detected
-        if source_ip in self.recent_detections and source_mac in self.recent_detections[source_ip]:
-            return True
-            
-        return False
+        return (source_ip, source_mac) in self.recent_detections
         
     def _record_detection(self, source_ip: Optional[str], source_mac: Optional[str]):
         """Record a detection in the cache.
@@ -230,18 +267,8 @@ class MLDetectionEngine:
         if not source_ip or not source_mac:
             return
             
-        # Add to cache
-        if source_ip not in self.recent_detections:
-            self.recent_detections[source_ip] = set()
-        
-        self.recent_detections[source_ip].add(source_mac)
-        
-    def _cleanup_detection_cache(self):
-        """Clean up old entries in the detection cache."""
-        # In a real implementation, we would track timestamps and clean up
-        # based on TTL. For simplicity, we'll reset the cache when it gets too large.
-        if sum(len(macs) for macs in self.recent_detections.values()) > 1000:
-            self.recent_detections = {}
+        # Add to cache; entries expire after detection_cache_ttl seconds
+        self.recent_detections[(source_ip, source_mac)] = datetime.now().timestamp()
             
     def train_models(self, packets: List[Dict[str, Any]], labels: Optional[List[int]] = None) -> Dict[str, Any]:
         """Train all ML models.
@@ -64,37 +64,87 @@ class MLEngine:
         Returns:
             Dict containing detection results
         """
-        result = {"detections": []}
+        return self.process_batch([packet], [features])[0]
+    
+    def process_batch(self, packets: List[Dict[str, Any]],
+                      features_list: List[Dict[str, float]]) -> List[Dict[str, Any]]:
+        """Process several packets through the ML pipeline at once.
         
-        try:
-            # Skip if no models are loaded
-            if not self.anomaly_detector and not self.classifier:
-                return result
-                
-            # Convert features to array format
-            feature_names = sorted(features.keys())
-            feature_array = np.array([features[f] for f in feature_names]).reshape(1, -1)
+        Packets are scored as one matrix, so the scaler and each model are
+        called once per batch instead of once per packet.
+        
+        Args:
+            packets: The packets to analyze
+            features_list: Extracted features for each packet
             
-            # Scale features if scaler exists
-            if self.scaler:
-                feature_array = self.scaler.transform(feature_array)
-                
-            # Anomaly detection
-            if self.use_anomaly_detection and self.anomaly_detector:
-                anomaly_result = self._detect_anomaly(feature_array, features, packet)
+        Returns:
+            List with one dict of detection results per packet
+        """
+        results = [{"detections": []} for _ in packets]
+        
+        # Skip if no models are loaded
+        if not packets or (not self.anomaly_detector and not self.classifier):
+            return results
+        
+        # Rows with the same feature names share one matrix
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for i, features in enumerate(features_list):
+            groups.setdefault(tuple(sorted(features.keys())), []).append(i)
+        
+        for feature_names, rows in groups.items():
+            try:
+                self._process_rows(packets, features_list, results, feature_names, rows)
+            except Exception as e:
+                logger.error(f"Error processing packet with ML: {e}")
+        
+        return results
+    
+    def _process_rows(self, packets: List[Dict[str, Any]], features_list: List[Dict[str, float]],
+                      results: List[Dict[str, Any]], feature_names: Tuple[str, ...], rows: List[int]):
+        """Score one group of rows and append their detections.
+        
+        Args:
+            packets: All packets in the batch
+            features_list: Features for all packets in the batch
+            results: Result dicts to fill, one per packet
+            feature_names: Sorted feature names shared by the rows
+            rows: Indices of the packets in this group
+        """
+        # Convert features to array format
+        feature_array = np.array([[features_list[i][f] for f in feature_names] for i in rows])
+        
+        # Scale features if scaler exists
+        if self.scaler:
+            feature_array = self.scaler.transform(feature_array)
+        
+        # Anomaly detection
+        anomaly_scores = None
+        if self.use_anomaly_detection and self.anomaly_detector:
+            try:
+                anomaly_scores = self.anomaly_detector.decision_function(feature_array)
+            except Exception as e:
+                logger.error(f"Error in anomaly detection: {e}")
+        
+        # Classification
+        probabilities = None
+        if self.use_classification and self.classifier:
+            try:
+                probabilities = self.classifier.predict_proba(feature_array)
+            except Exception as e:
+                logger.error(f"Error in classification: {e}")
+        
+        for row, i in enumerate(rows):
+            if anomaly_scores is not None:
+                anomaly_result = self._anomaly_detection(anomaly_scores[row], features_list[i], packets[i])
                 if anomaly_result:
-                    result["detections"].append(anomaly_result)
-                    
-            # Classification
-            if self.use_classification and self.classifier:
-                classification_result = self._classify(feature_array, features, packet)
-                if classification_result:
-                    result["detections"].append(classification_result)
-                    
-        except Exception as e:
-            logger.error(f"Error processing packet with ML: {e}")
+                    results[i]["detections"].append(anomaly_result)
             
-        return result
+            if probabilities is not None:
+                classification_result = self._classification_detection(
+                    probabilities[row], features_list[i], packets[i]
+                )
+                if classification_result:
+                    results[i]["detections"].append(classification_result)
     
     def _detect_anomaly(self, feature_array: np.ndarray, features: Dict[str, float], 
                          packet: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -109,37 +159,48 @@ class MLEngine:
             Detection result dict if anomaly detected, None otherwise
         """
         try:
-            # Get anomaly score (-1 for anomalies, 1 for normal data in IsolationForest)
             score = self.anomaly_detector.decision_function(feature_array)[0]
-            
-            # Convert to anomaly score (0-1 where 1 is definitely anomalous)
-            # IsolationForest returns negative scores for anomalies, so we invert
-            anomaly_score = 1 - (score + 1) / 2
-            
-            # Skip if score is below threshold
-            if anomaly_score < self.min_confidence:
-                return None
-                
-            # Create detection
-            detection = {
-                "confidence": float(anomaly_score),
-                "severity": self.anomaly_severity,
-                "evidence": {
-                    "detection_type": "anomaly",
-                    "anomaly_score": float(anomaly_score),
-                    "source_ip": packet.get("src_ip"),
-                    "source_mac": packet.get("src_mac"),
-                    "contributing_features": self._get_contributing_features(features)
-                }
-            }
-            
-            logger.info(f"Anomaly detected: score={anomaly_score:.2f}, severity={self.anomaly_severity}")
-            return detection
-            
+            return self._anomaly_detection(score, features, packet)
         except Exception as e:
             logger.error(f"Error in anomaly detection: {e}")
             return None
     
+    def _anomaly_detection(self, score: float, features: Dict[str, float],
+                           packet: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build the anomaly detection for one decision function score.
+        
+        Args:
+            score: IsolationForest decision function value
+            features: Original feature dictionary
+            packet: The original packet
+            
+        Returns:
+            Detection result dict if anomaly detected, None otherwise
+        """
+        # Convert to anomaly score (0-1 where 1 is definitely anomalous)
+        # IsolationForest returns negative scores for anomalies, so we invert
+        anomaly_score = 1 - (score + 1) / 2
+        
+        # Skip if score is below threshold
+        if anomaly_score < self.min_confidence:
+            return None
+            
+        # Create detection
+        detection = {
+            "confidence": float(anomaly_score),
+            "severity": self.anomaly_severity,
+            "evidence": {
+                "detection_type": "anomaly",
+                "anomaly_score": float(anomaly_score),
+                "source_ip": packet.get("src_ip"),
+                "source_mac": packet.get("src_mac"),
+                "contributing_features": self._get_contributing_features(features)
+            }
+        }
+        
+        logger.info(f"Anomaly detected: score={anomaly_score:.2f}, severity={self.anomaly_severity}")
+        return detection
+    
     def _classify(self, feature_array: np.ndarray, features: Dict[str, float], 
                   packet: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Classify the packet type.
@@ -153,47 +214,58 @@ class MLEngine:
             Detection result dict if attack detected, None otherwise
         """
         try:
-            # Get prediction probabilities
             probs = self.classifier.predict_proba(feature_array)[0]
-            
-            # Get predicted class
-            predicted_class = self.classifier.classes_[np.argmax(probs)]
-            max_prob = np.max(probs)
-            
-            # Skip if benign or confidence is low
-            if predicted_class == "benign" or max_prob < self.min_confidence:
-                return None
-                
-            # Map attack type to severity
-            severity_map = {
-                "spoofing": "HIGH",
-                "mitm": "CRITICAL",
-                "dos": "MEDIUM",
-                "recon": "LOW"
-            }
-            
-            severity = severity_map.get(predicted_class, "MEDIUM")
-            
-            # Create detection
-            detection = {
-                "confidence": float(max_prob),
-                "severity": severity,
-                "evidence": {
-                    "detection_type": "classification",
-                    "attack_type": predicted_class,
-                    "source_ip": packet.get("src_ip"),
-                    "source_mac": packet.get("src_mac"),
-                    "contributing_features": self._get_contributing_features(features)
-                }
-            }
-            
-            logger.info(f"Attack classified: type={predicted_class}, confidence={max_prob:.2f}, severity={severity}")
-            return detection
-            
+            return self._classification_detection(probs, features, packet)
         except Exception as e:
             logger.error(f"Error in classification: {e}")
             return None
     
+    def _classification_detection(self, probs: np.ndarray, features: Dict[str, float],
+                                  packet: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build the classification detection for one row of class probabilities.
+        
+        Args:
+            probs: Class probabilities for the packet
+            features: Original feature dictionary
+            packet: The original packet
+            
+        Returns:
+            Detection result dict if attack detected, None otherwise
+        """
+        # Get predicted class
+        predicted_class = self.classifier.classes_[np.argmax(probs)]
+        max_prob = np.max(probs)
+        
+        # Skip if benign or confidence is low
+        if predicted_class == "benign" or max_prob < self.min_confidence:
+            return None
+            
+        # Map attack type to severity
+        severity_map = {
+            "spoofing": "HIGH",
+            "mitm": "CRITICAL",
+            "dos": "MEDIUM",
+            "recon": "LOW"
+        }
+        
+        severity = severity_map.get(predicted_class, "MEDIUM")
+        
+        # Create detection
+        detection = {
+            "confidence": float(max_prob),
+            "severity": severity,
+            "evidence": {
+                "detection_type": "classification",
+                "attack_type": predicted_class,
+                "source_ip": packet.get("src_ip"),
+                "source_mac": packet.get("src_mac"),
+                "contributing_features": self._get_contributing_features(features)
+            }
+        }
+        
+        logger.info(f"Attack classified: type={predicted_class}, confidence={max_prob:.2f}, severity={severity}")
+        return detection
+    
     def _get_contributing_features(self, features: Dict[str, float]) -> Dict[str, float]:
         """Calculate features that most contributed to the detection.
         
@@ -10,6 +10,7 @@ import ipaddress
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 
+from app.ml.feature_store import TemporalFeatureStore, TEMPORAL_FEATURES, encode_packet
 from app.utils.logger import get_logger
 
 # Get module logger
@@ -22,12 +23,17 @@ class FeatureExtractor:
     to be used in machine learning models.
     """
     
-    def __init__(self):
-        """Initialize the feature extractor."""
+    def __init__(self, feature_store: Optional[TemporalFeatureStore] = None):
+        """Initialize the feature extractor.
+        
+        Args:
+            feature_store: Packet window to record into and read temporal
+                features from (a 100 packet / 30 second window by default)
+        """
         # Keep track of recent traffic to calculate temporal features
-        self.recent_packets = []
-        self.max_recent_packets = 100
-        self.packet_window = 30  # 30 second window
+        if feature_store is None:
+            feature_store = TemporalFeatureStore(capacity=100, window=30)
+        self.feature_store = feature_store
         
         # Keep track of IPs and MACs seen
         self.ip_mac_mappings = {}  # IP -> set of MACs
@@ -89,6 +95,78 @@ class FeatureExtractor:
             
         return features
     
+    def extract_features_batch(self, packets: List[Dict[str, Any]]) -> List[Dict[str, float]]:
+        """Extract features from several ARP packets in arrival order.
+        
+        Gives the same features as calling extract_features() on each packet
+        in turn, but computes the temporal features for the whole batch in
+        one vectorised pass over the feature store.
+        
+        Args:
+            packets: List of ARP packet dictionaries
+            
+        Returns:
+            List of feature dictionaries, one per packet
+        """
+        results = [{} for _ in packets]
+        rows, valid = [], []
+        
+        for i, packet in enumerate(packets):
+            try:
+                results[i].update(self._extract_basic_features(packet))
+                rows.append(encode_packet(packet))
+                valid.append(i)
+            except Exception as e:
+                logger.error(f"Error extracting features: {e}")
+                
+        if not valid:
+            return results
+            
+        columns = self.feature_store.add_batch(rows)
+        temporal = [columns[name].tolist() for name in TEMPORAL_FEATURES]
+        
+        for row, i in enumerate(valid):
+            packet = packets[i]
+            features = results[i]
+            try:
+                self._update_ip_mac_mappings(packet)
+                features.update(zip(TEMPORAL_FEATURES, (column[row] for column in temporal)))
+                features.update(self._extract_relationship_features(packet))
+                features.update(self._extract_network_features(packet))
+            except Exception as e:
+                logger.error(f"Error extracting features: {e}")
+                
+        return results
+    
+    @property
+    def recent_packets(self) -> List[Dict[str, Any]]:
+        """Packets currently in the temporal window, oldest first."""
+        return self.feature_store.rows()
+    
+    @recent_packets.setter
+    def recent_packets(self, packets: List[Dict[str, Any]]):
+        self.feature_store.clear()
+        for packet in packets:
+            self.feature_store.add_packet(packet)
+    
+    @property
+    def max_recent_packets(self) -> int:
+        """Maximum number of packets kept for temporal features."""
+        return self.feature_store.capacity
+    
+    @max_recent_packets.setter
+    def max_recent_packets(self, capacity: int):
+        self.feature_store.resize(capacity)
+    
+    @property
+    def packet_window(self) -> float:
+        """Length of the temporal window in seconds."""
+        return self.feature_store.window
+    
+    @packet_window.setter
+    def packet_window(self, window: float):
+        self.feature_store.window = window
+    
     def _extract_basic_features(self, packet: Dict[str, Any]) -> Dict[str, float]:
         """Extract basic features from the packet.
         
@@ -150,28 +228,7 @@ class FeatureExtractor:
         Args:
             packet: Current packet
         """
-        # Get current time
-        now = datetime.now().timestamp() if "timestamp" not in packet else \
-              packet["timestamp"].timestamp() if isinstance(packet["timestamp"], datetime) else \
-              float(packet["timestamp"])
-        
-        # Add packet with timestamp
-        packet_copy = packet.copy()
-        if "timestamp" not in packet_copy:
-            packet_copy["timestamp"] = now
-            
-        self.recent_packets.append(packet_copy)
-        
-        # Remove old packets outside window
-        self.recent_packets = [
-            p for p in self.recent_packets 
-            if now - (p["timestamp"].timestamp() if isinstance(p["timestamp"], datetime) 
-                     else float(p["timestamp"])) <= self.packet_window
-        ]
-        
-        # Limit size
-        if len(self.recent_packets) > self.max_recent_packets:
-            self.recent_packets = self.recent_packets[-self.max_recent_packets:]
+        self.feature_store.add_packet(packet)
     
     def _update_ip_mac_mappings(self, packet: Dict[str, Any]):
         """Update IP to MAC and MAC to IP mappings.
@@ -202,74 +259,8 @@ class FeatureExtractor:
         Returns:
             Dictionary of temporal features
         """
-        features = {}
-        
-        if not self.recent_packets:
-            # Default values for no history
-            features["packet_rate"] = 0.0
-            features["request_rate"] = 0.0
-            features["reply_rate"] = 0.0
-            features["src_mac_freq"] = 0.0
-            features["src_ip_freq"] = 0.0
-            features["unique_ip_count"] = 0.0
-            features["unique_mac_count"] = 0.0
-            features["request_reply_ratio"] = 0.5  # Neutral value
-            return features
-            
-        # Get current values
-        src_mac = packet.get("src_mac", "").lower()
-        src_ip = packet.get("src_ip", "")
-        
-        # Time window
-        now = datetime.now().timestamp() if "timestamp" not in packet else \
-              packet["timestamp"].timestamp() if isinstance(packet["timestamp"], datetime) else \
-              float(packet["timestamp"])
-        
-        oldest_time = min(
-            p["timestamp"].timestamp() if isinstance(p["timestamp"], datetime) 
-            else float(p["timestamp"]) 
-            for p in self.recent_packets
-        )
-        
-        time_window = max(now - oldest_time, 1.0)  # Avoid division by zero
-        
-        # Packet rate
-        features["packet_rate"] = len(self.recent_packets) / time_window
-        
-        # Request/reply counts
-        request_count = sum(1 for p in self.recent_packets if p.get("op") == 1)
-        reply_count = sum(1 for p in self.recent_packets if p.get("op") == 2)
-        
-        # Request/reply rates
-        features["request_rate"] = request_count / time_window
-        features["reply_rate"] = reply_count / time_window
-        
-        # Request/reply ratio
-        total = request_count + reply_count
-        features["request_reply_ratio"] = request_count / total if total > 0 else 0.5
-        
-        # Frequency of current source MAC
-        if src_mac:
-            src_mac_count = sum(1 for p in self.recent_packets if p.get("src_mac", "").lower() == src_mac)
-            features["src_mac_freq"] = src_mac_count / len(self.recent_packets)
-        else:
-            features["src_mac_freq"] = 0.0
-            
-        # Frequency of current source IP
-        if src_ip:
-            src_ip_count = sum(1 for p in self.recent_packets if p.get("src_ip") == src_ip)
-            features["src_ip_freq"] = src_ip_count / len(self.recent_packets)
-        else:
-            features["src_ip_freq"] = 0.0
-            
-        # Unique IP and MAC counts (normalized)
-        unique_ips = set(p.get("src_ip") for p in self.recent_packets if p.get("src_ip"))
-        unique_macs = set(p.get("src_mac", "").lower() for p in self.recent_packets if p.get("src_mac"))
-        
-        features["unique_ip_count"] = len(unique_ips) / len(self.recent_packets)
-        features["unique_mac_count"] = len(unique_macs) / len(self.recent_packets)
-        
-        return features
+        now, _, src_ip, src_mac = encode_packet(packet)
+        return self.feature_store.features(now, src_ip, src_mac)
     
     def _extract_relationship_features(self, packet: Dict[str, Any]) -> Dict[str, float]:
         """Extract features related to IP/MAC relationships.
@@ -0,0 +1,350 @@
+"""
+Columnar packet window for temporal ML features.
+
+Keeps the recent ARP packets as preallocated NumPy columns in a ring buffer
+together with running counters, so every temporal feature is O(1) per packet
+and a whole batch can be featurised with one vectorised pass.
+"""
+
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Column value for a missing IP or MAC
+MISSING = -1
+
+# ARP operation codes stored in the op column (anything else is stored as 0)
+OP_REQUEST = 1
+OP_REPLY = 2
+
+# Names of the temporal features, in extraction order
+TEMPORAL_FEATURES = (
+    "packet_rate",
+    "request_rate",
+    "reply_rate",
+    "request_reply_ratio",
+    "src_mac_freq",
+    "src_ip_freq",
+    "unique_ip_count",
+    "unique_mac_count",
+)
+
+
+def to_timestamp(value: Any) -> float:
+    """Convert a packet timestamp (datetime, number or None) to epoch seconds."""
+    if value is None:
+        return time.time()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _fallback_key(value: str) -> int:
+    # Unparsable addresses still need a stable key; keep it clear of real values
+    return -2 - (hash(value) & 0xFFFFFFFFFFFF)
+
+
+def ip_to_int(ip: Optional[str]) -> int:
+    """Encode a dotted-quad IPv4 address as an integer key."""
+    if not ip:
+        return MISSING
+    parts = ip.split(".")
+    if len(parts) == 4:
+        try:
+            a, b, c, d = (int(part) for part in parts)
+            if 0 <= a <= 255 and 0 <= b <= 255 and 0 <= c <= 255 and 0 <= d <= 255:
+                return (a << 24) | (b << 16) | (c << 8) | d
+        except ValueError:
+            pass
+    return _fallback_key(ip)
+
+
+def int_to_ip(value: int) -> Optional[str]:
+    """Decode an IP key; returns None for missing or unparsable addresses."""
+    if value < 0:
+        return None
+    return f"{value >> 24 & 255}.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}"
+
+
+def mac_to_int(mac: Optional[str]) -> int:
+    """Encode a MAC address (any case, ':' or '-' separated) as an integer key."""
+    if not mac:
+        return MISSING
+    digits = mac.replace(":", "").replace("-", "")
+    if len(digits) == 12:
+        try:
+            return int(digits, 16)
+        except ValueError:
+            pass
+    return _fallback_key(mac.lower())
+
+
+def int_to_mac(value: int) -> Optional[str]:
+    """Decode a MAC key; returns None for missing or unparsable addresses."""
+    if value < 0:
+        return None
+    return ":".join(f"{value >> shift & 255:02x}" for shift in range(40, -1, -8))
+
+
+def encode_packet(packet: Dict[str, Any]) -> Tuple[float, int, int, int]:
+    """Encode a packet as a (timestamp, op, src_ip, src_mac) row."""
+    op = packet.get("op")
+    return (
+        to_timestamp(packet.get("timestamp")),
+        op if op in (OP_REQUEST, OP_REPLY) else 0,
+        ip_to_int(packet.get("src_ip")),
+        mac_to_int(packet.get("src_mac")),
+    )
+
+
+class TemporalFeatureStore:
+    """Ring buffer of recent packets with running per-window aggregates.
+
+    Packets older than the window (relative to the newest timestamp seen) are
+    evicted from the oldest end, as is the oldest packet once the buffer is
+    full. Request/reply totals, per-IP and per-MAC counts and the oldest
+    timestamp are updated on every insert and eviction.
+
+    Packets are expected in roughly ascending timestamp order; one arriving
+    already outside the window is not stored.
+    """
+
+    def __init__(self, capacity: int = 100, window: float = 30.0):
+        """Initialize the store.
+
+        Args:
+            capacity: Maximum number of packets kept
+            window: Window length in seconds
+        """
+        self.window = window
+        self._allocate(max(1, capacity))
+        self.clear()
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.ops = np.zeros(capacity, dtype=np.int8)
+        self.src_ips = np.full(capacity, MISSING, dtype=np.int64)
+        self.src_macs = np.full(capacity, MISSING, dtype=np.int64)
+
+    def clear(self):
+        """Drop all packets and reset the aggregates."""
+        self._start = 0
+        self._size = 0
+        self._inserted = 0
+        self.newest: Optional[float] = None
+        self.request_count = 0
+        self.reply_count = 0
+        self.ip_counts: Dict[int, int] = {}
+        self.mac_counts: Dict[int, int] = {}
+        # Ascending (timestamp, sequence) candidates for the window minimum
+        self._minima: Deque[Tuple[float, int]] = deque()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def oldest(self) -> Optional[float]:
+        """Earliest timestamp in the window."""
+        return self._minima[0][0] if self._minima else None
+
+    def resize(self, capacity: int):
+        """Change the capacity, keeping the newest packets.
+
+        Args:
+            capacity: New maximum number of packets
+        """
+        capacity = max(1, capacity)
+        if capacity == self.capacity:
+            return
+        while self._size > capacity:
+            self._evict()
+
+        index = (self._start + np.arange(self._size)) % self.capacity
+        columns = (self.timestamps[index], self.ops[index], self.src_ips[index], self.src_macs[index])
+        self._allocate(capacity)
+        self.timestamps[:self._size], self.ops[:self._size], \
+            self.src_ips[:self._size], self.src_macs[:self._size] = columns
+        self._start = 0
+
+    def add(self, timestamp: float, op: int, src_ip: int, src_mac: int) -> bool:
+        """Insert one encoded packet and evict what falls out of the window.
+
+        Args:
+            timestamp: Packet time in epoch seconds
+            op: ARP operation (OP_REQUEST, OP_REPLY or 0)
+            src_ip: Encoded source IP (see ip_to_int)
+            src_mac: Encoded source MAC (see mac_to_int)
+
+        Returns:
+            False if the packet was already outside the window and not stored
+        """
+        if self.newest is None or timestamp > self.newest:
+            self.newest = timestamp
+        elif self.newest - timestamp > self.window:
+            return False
+
+        if self._size == self.capacity:
+            self._evict()
+
+        slot = (self._start + self._size) % self.capacity
+        self.timestamps[slot] = timestamp
+        self.ops[slot] = op
+        self.src_ips[slot] = src_ip
+        self.src_macs[slot] = src_mac
+        self._size += 1
+
+        if op == OP_REQUEST:
+            self.request_count += 1
+        elif op == OP_REPLY:
+            self.reply_count += 1
+        if src_ip != MISSING:
+            self.ip_counts[src_ip] = self.ip_counts.get(src_ip, 0) + 1
+        if src_mac != MISSING:
+            self.mac_counts[src_mac] = self.mac_counts.get(src_mac, 0) + 1
+
+        minima = self._minima
+        while minima and minima[-1][0] >= timestamp:
+            minima.pop()
+        minima.append((timestamp, self._inserted))
+        self._inserted += 1
+
+        cutoff = self.newest - self.window
+        while self._size and self.timestamps[self._start] < cutoff:
+            self._evict()
+        return True
+
+    def add_packet(self, packet: Dict[str, Any]) -> bool:
+        """Insert a packet dictionary (see add)."""
+        return self.add(*encode_packet(packet))
+
+    def _evict(self):
+        slot = self._start
+        op = self.ops[slot]
+        if op == OP_REQUEST:
+            self.request_count -= 1
+        elif op == OP_REPLY:
+            self.reply_count -= 1
+        self._decrement(self.ip_counts, int(self.src_ips[slot]))
+        self._decrement(self.mac_counts, int(self.src_macs[slot]))
+
+        if self._minima and self._minima[0][1] == self._inserted - self._size:
+            self._minima.popleft()
+        self._start = (slot + 1) % self.capacity
+        self._size -= 1
+
+    @staticmethod
+    def _decrement(counts: Dict[int, int], key: int):
+        if key == MISSING:
+            return
+        remaining = counts[key] - 1
+        if remaining:
+            counts[key] = remaining
+        else:
+            del counts[key]
+
+    def mac_count(self, mac: Optional[str]) -> int:
+        """Get the number of packets from a MAC in the window."""
+        return self.mac_counts.get(mac_to_int(mac), 0)
+
+    def ip_count(self, ip: Optional[str]) -> int:
+        """Get the number of packets from an IP in the window."""
+        return self.ip_counts.get(ip_to_int(ip), 0)
+
+    def features(self, now: float, src_ip: int, src_mac: int) -> Dict[str, float]:
+        """Compute the temporal features for a packet against the current window.
+
+        Args:
+            now: Packet time in epoch seconds
+            src_ip: Encoded source IP
+            src_mac: Encoded source MAC
+
+        Returns:
+            Dictionary of temporal features
+        """
+        size = self._size
+        if not size:
+            features = dict.fromkeys(TEMPORAL_FEATURES, 0.0)
+            features["request_reply_ratio"] = 0.5  # Neutral value
+            return features
+
+        time_window = max(now - self._minima[0][0], 1.0)
+        total = self.request_count + self.reply_count
+        return {
+            "packet_rate": size / time_window,
+            "request_rate": self.request_count / time_window,
+            "reply_rate": self.reply_count / time_window,
+            "request_reply_ratio": self.request_count / total if total else 0.5,
+            "src_mac_freq": self.mac_counts.get(src_mac, 0) / size if src_mac != MISSING else 0.0,
+            "src_ip_freq": self.ip_counts.get(src_ip, 0) / size if src_ip != MISSING else 0.0,
+            "unique_ip_count": len(self.ip_counts) / size,
+            "unique_mac_count": len(self.mac_counts) / size,
+        }
+
+    def add_batch(self, rows: Sequence[Tuple[float, int, int, int]]) -> Dict[str, np.ndarray]:
+        """Insert packets in order and compute their temporal features.
+
+        Each row's features see the window right after its own insert, as
+        if add() and features() were called once per row; the divisions are
+        done column-wise at the end.
+
+        Args:
+            rows: Encoded (timestamp, op, src_ip, src_mac) rows
+
+        Returns:
+            Dictionary mapping each temporal feature name to a column
+        """
+        n = len(rows)
+        # Per-row window state: size, requests, replies, own MAC/IP counts, uniques
+        counts = np.zeros((n, 7), dtype=np.int64)
+        now = np.empty(n, dtype=np.float64)
+        oldest = np.empty(n, dtype=np.float64)
+
+        for i, (timestamp, op, src_ip, src_mac) in enumerate(rows):
+            self.add(timestamp, op, src_ip, src_mac)
+            now[i] = timestamp
+            oldest[i] = self._minima[0][0] if self._minima else timestamp
+            counts[i] = (
+                self._size, self.request_count, self.reply_count,
+                self.mac_counts.get(src_mac, 0) if src_mac != MISSING else 0,
+                self.ip_counts.get(src_ip, 0) if src_ip != MISSING else 0,
+                len(self.ip_counts), len(self.mac_counts),
+            )
+
+        size, requests, replies, mac_hits, ip_hits, unique_ips, unique_macs = counts.T.astype(np.float64)
+        time_window = np.maximum(now - oldest, 1.0)
+        total = requests + replies
+        # Rows inserted into an empty window that rejected them have no history
+        empty = size == 0
+        size_or_one = np.where(empty, 1.0, size)
+
+        return {
+            "packet_rate": size / time_window,
+            "request_rate": requests / time_window,
+            "reply_rate": replies / time_window,
+            "request_reply_ratio": np.where(total > 0, requests / np.maximum(total, 1.0), 0.5),
+            "src_mac_freq": mac_hits / size_or_one,
+            "src_ip_freq": ip_hits / size_or_one,
+            "unique_ip_count": unique_ips / size_or_one,
+            "unique_mac_count": unique_macs / size_or_one,
+        }
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Get the packets in the window, oldest first.
+
+        Returns:
+            List of dicts with timestamp, op, src_ip and src_mac
+        """
+        index = (self._start + np.arange(self._size)) % self.capacity
+        return [
+            {
+                "timestamp": float(self.timestamps[i]),
+                "op": int(self.ops[i]),
+                "src_ip": int_to_ip(int(self.src_ips[i])),
+                "src_mac": int_to_mac(int(self.src_macs[i])),
+            }
+            for i in index
+        ]
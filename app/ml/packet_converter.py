@@ -70,6 +70,53 @@ def convert_arp_packet(packet: Any) -> Dict[str, Any]:
         logger.error(f"Error converting packet: {e}")
         return {}
         
+def convert_arp_batch(batch: Any) -> List[Dict[str, Any]]:
+    """
+    Convert a columnar ARP batch to a list of packet dictionaries.
+    
+    Args:
+        batch: Columnar ARP batch (src.core.arp_batch.ARPBatch) with integer
+            opcode/hw_type/proto_type/hw_len/proto_len/sender_mac/sender_ip/
+            target_mac/target_ip/timestamp arrays
+        
+    Returns:
+        List of dictionaries in the convert_arp_packet() format
+    """
+    try:
+        timestamps = [datetime.fromtimestamp(ts) if ts else datetime.now() for ts in batch.timestamp.tolist()]
+        
+        return [
+            {
+                "type": "arp",
+                "timestamp": timestamp,
+                "op": op,
+                "src_mac": src_mac,
+                "dst_mac": dst_mac,
+                "src_ip": src_ip,
+                "dst_ip": dst_ip,
+                "hw_type": hw_type,
+                "proto_type": proto_type,
+                "hw_len": hw_len,
+                "proto_len": proto_len,
+            }
+            for timestamp, op, src_mac, dst_mac, src_ip, dst_ip, hw_type, proto_type, hw_len, proto_len in zip(
+                timestamps,
+                batch.opcode.tolist(),
+                batch.format_column("sender_mac"),
+                batch.format_column("target_mac"),
+                batch.format_column("sender_ip"),
+                batch.format_column("target_ip"),
+                batch.hw_type.tolist(),
+                batch.proto_type.tolist(),
+                batch.hw_len.tolist(),
+                batch.proto_len.tolist(),
+            )
+        ]
+        
+    except Exception as e:
+        logger.error(f"Error converting packet batch: {e}")
+        return []
+        
 def extract_packet_features(packet_dict: Dict[str, Any]) -> np.ndarray:
     """
     Extract features from a packet dictionary for ML models.
@@ -112,6 +159,41 @@ def extract_packet_features(packet_dict: Dict[str, Any]) -> np.ndarray:
         logger.error(f"Error extracting features: {e}")
         return np.zeros(11, dtype=np.float32)  # Return zeroes on error
         
+def extract_batch_features(batch: Any) -> np.ndarray:
+    """
+    Extract ML features for a whole columnar ARP batch at once.
+    
+    Produces the same columns as extract_packet_features(), computed directly
+    from the integer address columns without formatting any strings.
+    
+    Args:
+        batch: Columnar ARP batch (src.core.arp_batch.ARPBatch)
+        
+    Returns:
+        Numpy array of shape (len(batch), 11)
+    """
+    try:
+        is_gratuitous = (batch.opcode == 2) & (batch.sender_ip == batch.target_ip)
+        is_broadcast = batch.target_mac == 0xFFFFFFFFFFFF
+        
+        return np.column_stack([
+            batch.opcode,
+            batch.sender_mac,
+            batch.target_mac,
+            batch.sender_ip,
+            batch.target_ip,
+            batch.hw_type,
+            batch.proto_type,
+            batch.hw_len,
+            batch.proto_len,
+            is_gratuitous,
+            is_broadcast,
+        ]).astype(np.float32)
+        
+    except Exception as e:
+        logger.error(f"Error extracting batch features: {e}")
+        return np.zeros((len(batch), 11), dtype=np.float32)
+        
 def mac_to_int(mac_str: Optional[str]) -> int:
     """
     Convert a MAC address string to an integer.
@@ -0,0 +1,242 @@
+"""
+Raw-socket ARP sweep.
+
+ARP requests for every target are written from one prebuilt frame
+template at a fixed rate, while a receiver thread matches replies to
+targets by IP address. The whole sweep takes the send time plus a single
+reply timeout, however many addresses are probed.
+"""
+
+import socket
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from app.utils.logger import get_logger
+
+# Module logger
+logger = get_logger('utils.arp_sweep')
+
+ETH_P_ARP = 0x0806
+ARP_REQUEST = 1
+ARP_REPLY = 2
+ARP_FRAME_LEN = 42
+RECEIVE_BUFFER_SIZE = 1 << 22
+
+# Ethernet header and ARP body up to the target protocol address
+_ARP_HEADER = struct.Struct("!6s6sHHHBBH6s4s6s")
+# Offsets into a 42 byte Ethernet + ARP frame
+_ETHERTYPE = slice(12, 14)
+_OPCODE = slice(20, 22)
+_SENDER_MAC = slice(22, 28)
+_SENDER_IP = slice(28, 32)
+_TARGET_IP_OFFSET = 38
+
+
+def mac_to_bytes(mac: str) -> bytes:
+    """Convert a colon separated MAC address to bytes."""
+    return bytes.fromhex(mac.replace(':', '').replace('-', ''))
+
+
+def build_request_template(src_mac: str, src_ip: str) -> bytearray:
+    """Build a broadcast ARP request with an empty target address.
+
+    Args:
+        src_mac: MAC address of the sending interface
+        src_ip: IPv4 address of the sending interface
+
+    Returns:
+        42 byte frame; the target IP goes at byte 38
+    """
+    return bytearray(_ARP_HEADER.pack(
+        b"\xff" * 6, mac_to_bytes(src_mac), ETH_P_ARP,
+        1, 0x0800, 6, 4, ARP_REQUEST,
+        mac_to_bytes(src_mac), socket.inet_aton(src_ip), b"\x00" * 6
+    ) + b"\x00" * 4)
+
+
+def parse_reply(frame: bytes):
+    """Get (sender_ip, sender_mac) from an ARP reply frame.
+
+    Returns:
+        Tuple of the packed IPv4 address and MAC string, or None if the
+        frame is not an ARP reply
+    """
+    if len(frame) < ARP_FRAME_LEN or frame[_ETHERTYPE] != b"\x08\x06":
+        return None
+    if frame[_OPCODE] != b"\x00\x02":
+        return None
+    return bytes(frame[_SENDER_IP]), ':'.join(f"{b:02x}" for b in frame[_SENDER_MAC])
+
+
+class FrameSocket:
+    """Sends and receives raw Ethernet frames on one interface.
+
+    Uses an AF_PACKET socket on Linux and scapy's layer 2 sockets elsewhere.
+    """
+
+    def __init__(self, interface: str, timeout: float = 0.1):
+        """Open the socket.
+
+        Args:
+            interface: Network interface name
+            timeout: Longest time recv() blocks
+        """
+        self.interface = interface
+        self._scapy = None
+        if hasattr(socket, 'AF_PACKET'):
+            self._sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ARP))
+            self._sock.bind((interface, ETH_P_ARP))
+            # Room for replies arriving in bursts during a large sweep
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER_SIZE)
+            self._sock.settimeout(timeout)
+        else:
+            from scapy.all import conf
+            self._sock = conf.L2socket(iface=interface, filter="arp")
+            self._scapy = timeout
+
+    def send(self, frame) -> None:
+        """Send one frame."""
+        if self._scapy is None:
+            self._sock.send(frame)
+        else:
+            self._sock.send(bytes(frame))
+
+    def recv(self) -> Optional[bytes]:
+        """Receive one frame, or None if none arrived in time."""
+        if self._scapy is None:
+            try:
+                return self._sock.recv(2048)
+            except socket.timeout:
+                return None
+        if not self._sock.select([self._sock], self._scapy):
+            return None
+        packet = self._sock.recv()
+        return bytes(packet) if packet is not None else None
+
+    def close(self) -> None:
+        """Close the socket."""
+        self._sock.close()
+
+
+class ArpSweeper:
+    """Probes many IPv4 addresses with ARP requests at a fixed rate."""
+
+    def __init__(self,
+                 interface: str,
+                 src_mac: str,
+                 src_ip: str,
+                 rate: float = 5000,
+                 timeout: float = 2.0,
+                 socket_factory: Callable[[str], FrameSocket] = FrameSocket):
+        """Initialize the sweeper.
+
+        Args:
+            interface: Interface to send on
+            src_mac: MAC address of the interface
+            src_ip: IPv4 address of the interface
+            rate: Requests sent per second
+            timeout: Seconds to wait for replies after the last request
+            socket_factory: Creates the socket for an interface
+        """
+        self.interface = interface
+        self.rate = max(1.0, rate)
+        self.timeout = timeout
+        self.socket_factory = socket_factory
+        self.template = build_request_template(src_mac, src_ip)
+        self.stats = {}  # Figures from the last sweep
+        self._stop = threading.Event()
+
+    def sweep(self, targets: Iterable[str],
+              on_reply: Optional[Callable[[str, str], None]] = None) -> Dict[str, str]:
+        """Send an ARP request to every target and collect the replies.
+
+        Args:
+            targets: IPv4 addresses to probe, in sending order
+            on_reply: Called with (ip, mac) from the receiver thread the
+                first time each target answers
+
+        Returns:
+            Dict mapping each answering IP address to its MAC address
+        """
+        self._stop.clear()
+        packed = {}
+        for ip in targets:
+            packed.setdefault(socket.inet_aton(str(ip)), str(ip))
+        replies: Dict[str, str] = {}
+        sock = self.socket_factory(self.interface)
+        start = time.perf_counter()
+        receiver = threading.Thread(target=self._receive, args=(sock, packed, replies, on_reply),
+                                    name='arp-sweep-receiver', daemon=True)
+        receiver.start()
+        try:
+            sent = self._send(sock, packed)
+            send_time = time.perf_counter() - start
+            # One reply window after the last request
+            self._stop.wait(self.timeout)
+        finally:
+            self._stop.set()
+            receiver.join()
+            sock.close()
+
+        self.stats = {
+            'targets': len(packed),
+            'sent': sent,
+            'replies': len(replies),
+            'send_time': send_time,
+            'elapsed': time.perf_counter() - start
+        }
+        logger.debug(f"ARP sweep of {len(packed)} addresses got {len(replies)} replies "
+                     f"in {self.stats['elapsed']:.2f}s")
+        return replies
+
+    def stop(self) -> None:
+        """Stop the running sweep. Safe to call from any thread."""
+        self._stop.set()
+
+    def _send(self, sock: FrameSocket, packed: Dict[bytes, str]) -> int:
+        """Write one request per target, pacing sends to the configured rate."""
+        frame = bytearray(self.template)
+        start = time.perf_counter()
+        sent = 0
+        for target in packed:
+            if self._stop.is_set():
+                break
+            frame[_TARGET_IP_OFFSET:] = target
+            try:
+                sock.send(frame)
+            except OSError as e:
+                logger.debug(f"Failed to send ARP request to {packed[target]}: {e}")
+                continue
+            sent += 1
+            # Check the pace every 64 frames rather than sleeping per frame
+            if sent % 64 == 0:
+                ahead = sent / self.rate - (time.perf_counter() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+        return sent
+
+    def _receive(self, sock: FrameSocket, packed: Dict[bytes, str], replies: Dict[str, str],
+                 on_reply: Optional[Callable[[str, str], None]]) -> None:
+        """Match ARP replies to targets until the sweep stops."""
+        while not self._stop.is_set():
+            try:
+                frame = sock.recv()
+            except OSError as e:
+                logger.debug(f"ARP sweep receive failed: {e}")
+                continue
+            if frame is None:
+                continue
+            reply = parse_reply(frame)
+            if reply is None:
+                continue
+            ip = packed.get(reply[0])
+            if ip is None or ip in replies:
+                continue
+            replies[ip] = reply[1]
+            if on_reply:
+                try:
+                    on_reply(ip, reply[1])
+                except Exception as e:
+                    logger.error(f"Error handling ARP reply from {ip}: {e}")
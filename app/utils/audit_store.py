@@ -0,0 +1,449 @@
+"""
+Segmented audit event store for ARPGuard.
+
+Events are appended as JSON lines to one segment file per day through a
+buffered writer that is flushed and fsynced periodically. Each segment has
+a small index file next to it holding a sparse timestamp index (the byte
+offset of every INDEX_INTERVAL-th event) and Bloom filters of the
+usernames, event types and site IDs it contains. A query opens only the
+segments in its date range whose filters may match, seeks to the first
+block that can hold its start time and stops at the first block past its
+end time.
+
+Index files are derived from the segments: an index that is missing or
+behind its segment (written by an older version, another process, or
+before a crash) is brought up to date by reading only the lines it has
+not seen.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from app.utils.logger import get_logger
+
+# Module logger
+logger = get_logger('utils.audit_store')
+
+SEGMENT_PREFIX = 'audit_'
+SEGMENT_SUFFIX = '.log'
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 1
+
+# Events between entries of the sparse timestamp index
+INDEX_INTERVAL = 64
+
+# Event fields with a Bloom filter per segment
+FILTERED_FIELDS = ('username', 'type', 'site_id')
+
+TimeLike = Union[datetime, str, float, int]
+
+
+def to_epoch(value: TimeLike) -> float:
+    """Convert a datetime, ISO 8601 string or epoch seconds to epoch seconds.
+
+    Naive datetimes are taken as local time, as datetime.now() produces.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, bits: int = 4096, hashes: int = 4, data: Optional[bytes] = None):
+        """Initialize the filter.
+
+        Args:
+            bits: Number of bits; a multiple of 8
+            hashes: Bit positions set per value
+            data: Bits of a saved filter
+        """
+        self.bits = bits
+        self.hashes = hashes
+        self.data = bytearray(data) if data is not None else bytearray(bits // 8)
+
+    def _positions(self, value: str) -> Iterator[int]:
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.bits
+
+    def add(self, value: str):
+        """Add a value."""
+        for position in self._positions(value):
+            self.data[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.data[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(value))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'bits': self.bits, 'hashes': self.hashes, 'data': self.data.hex()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BloomFilter':
+        return cls(data['bits'], data['hashes'], bytes.fromhex(data['data']))
+
+
+class SegmentIndex:
+    """Sparse timestamp index and Bloom filters of one day's segment."""
+
+    def __init__(self):
+        self.size = 0              # Bytes of the segment indexed so far
+        self.count = 0             # Events indexed so far
+        self.times: List[float] = []
+        self.offsets: List[int] = []
+        self.min_time: Optional[float] = None
+        self.max_time: Optional[float] = None
+        # False once an event is older than the one before it; time ranges
+        # then cannot be found by binary search
+        self.ordered = True
+        self.filters = {name: BloomFilter() for name in FILTERED_FIELDS}
+
+    def add(self, event: Dict[str, Any], timestamp: float, offset: int):
+        """Index an event that starts at a byte offset."""
+        if self.max_time is not None and timestamp < self.max_time:
+            self.ordered = False
+        if self.count % INDEX_INTERVAL == 0:
+            self.times.append(timestamp)
+            self.offsets.append(offset)
+        if self.min_time is None:
+            self.min_time = self.max_time = timestamp
+        else:
+            self.min_time = min(self.min_time, timestamp)
+            self.max_time = max(self.max_time, timestamp)
+        self.count += 1
+        for name in FILTERED_FIELDS:
+            value = event.get(name)
+            if value is not None:
+                self.filters[name].add(str(value))
+
+    def may_contain(self, name: str, value: Any) -> bool:
+        """Check a field value against its Bloom filter."""
+        return str(value) in self.filters[name]
+
+    def block_range(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int, int, int]:
+        """Find where events in a time range lie in the segment.
+
+        Returns:
+            (read from, read up to, no start check from, end check from) as
+            byte offsets; events before the third offset may be earlier
+            than start and events from the fourth on may be later than end
+        """
+        if not self.ordered or not self.times:
+            return 0, self.size, self.size, 0
+        read_from, checked_until = 0, 0
+        if start is not None:
+            first = bisect_left(self.times, start)
+            read_from = self.offsets[max(first - 1, 0)]
+            checked_until = self.offsets[first] if first < len(self.offsets) else self.size
+        read_until, check_from = self.size, 0
+        if end is not None:
+            after = bisect_right(self.times, end)
+            if after < len(self.offsets):
+                read_until = self.offsets[after]
+            check_from = self.offsets[max(after - 1, 0)]
+        return read_from, read_until, checked_until, check_from
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': INDEX_VERSION,
+            'size': self.size,
+            'count': self.count,
+            'times': self.times,
+            'offsets': self.offsets,
+            'min_time': self.min_time,
+            'max_time': self.max_time,
+            'ordered': self.ordered,
+            'filters': {name: bloom.to_dict() for name, bloom in self.filters.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SegmentIndex':
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"unsupported index version {data.get('version')}")
+        index = cls()
+        index.size = data['size']
+        index.count = data['count']
+        index.times = data['times']
+        index.offsets = data['offsets']
+        index.min_time = data['min_time']
+        index.max_time = data['max_time']
+        index.ordered = data['ordered']
+        index.filters = {name: BloomFilter.from_dict(data['filters'][name]) for name in FILTERED_FIELDS}
+        return index
+
+
+class AuditStore:
+    """Day-segmented, indexed store of audit events."""
+
+    def __init__(self, directory: str, flush_interval: float = 1.0,
+                 buffer_size: int = 64 * 1024):
+        """Initialize the store.
+
+        Args:
+            directory: Directory holding the segment and index files
+            flush_interval: Seconds buffered events may wait before they are
+                written and fsynced
+            buffer_size: Buffered bytes that trigger an early write
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+
+        self._lock = threading.RLock()
+        # Encoded lines waiting to be written, per segment day
+        self._pending: Dict[date, List[bytes]] = {}
+        self._pending_bytes = 0
+        self._timer: Optional[threading.Timer] = None
+        self._indexes: Dict[date, SegmentIndex] = {}
+        # Segments written since their index file was saved
+        self._dirty_indexes = set()
+        self._closed = False
+        atexit.register(self.close)
+
+    def segment_path(self, day: date) -> str:
+        """Get the segment file of a day."""
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{day.isoformat()}{SEGMENT_SUFFIX}")
+
+    def segments(self) -> List[date]:
+        """Get the days with a segment file, oldest first."""
+        days = []
+        for filename in os.listdir(self.directory):
+            if filename.startswith(SEGMENT_PREFIX) and filename.endswith(SEGMENT_SUFFIX):
+                try:
+                    days.append(date.fromisoformat(filename[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(days)
+
+    def append(self, event: Dict[str, Any]):
+        """Queue an event for writing.
+
+        Args:
+            event: Event with an ISO 8601 'timestamp'; it is stored in the
+                segment of that timestamp's day
+        """
+        day = datetime.fromisoformat(event['timestamp']).date()
+        line = (json.dumps(event) + '\n').encode('utf-8')
+        with self._lock:
+            self._pending.setdefault(day, []).append(line)
+            self._pending_bytes += len(line)
+            if self._pending_bytes >= self.buffer_size:
+                self._write_pending()
+            elif self._timer is None and not self._closed:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write buffered events, fsync them and save the segment indexes."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._write_pending()
+            for day in list(self._dirty_indexes):
+                self._save_index(day, self._catch_up(day))
+            self._dirty_indexes.clear()
+
+    def close(self):
+        """Flush and stop the periodic writer."""
+        with self._lock:
+            self.flush()
+            self._closed = True
+        atexit.unregister(self.close)
+
+    def query(self, start_time: Optional[TimeLike] = None,
+              end_time: Optional[TimeLike] = None,
+              **filters: Any) -> List[Dict[str, Any]]:
+        """Get events in a time range that match field values.
+
+        Args:
+            start_time: Earliest event time, inclusive
+            end_time: Latest event time, inclusive
+            **filters: Field name -> required value, e.g. username='admin'
+
+        Returns:
+            Matching events, oldest segment first, in the order written
+        """
+        start = to_epoch(start_time) if start_time is not None else None
+        end = to_epoch(end_time) if end_time is not None else None
+        filters = {name: value for name, value in filters.items() if value is not None}
+        # A value must appear as a JSON string somewhere on a matching line,
+        # so most other lines are rejected without being parsed
+        tokens = [json.dumps(value) if isinstance(value, str) else None for value in filters.values()]
+        tokens = [token.encode('utf-8') for token in tokens if token is not None]
+
+        # Segment days are local dates of their events, so only days inside
+        # the range (plus one either side for clock adjustments) can match
+        first_day = datetime.fromtimestamp(start - 86400).date() if start is not None else None
+        last_day = datetime.fromtimestamp(end + 86400).date() if end is not None else None
+
+        with self._lock:
+            self._write_pending()
+            days = [day for day in self.segments()
+                    if (first_day is None or day >= first_day) and (last_day is None or day <= last_day)]
+
+        events = []
+        for day in days:
+            with self._lock:
+                index = self._catch_up(day)
+            if index is None or not index.count:
+                continue
+            if start is not None and index.max_time < start:
+                continue
+            if end is not None and index.min_time > end:
+                continue
+            if any(name in FILTERED_FIELDS and not index.may_contain(name, value)
+                   for name, value in filters.items()):
+                continue
+            events.extend(self._scan(day, index, start, end, filters, tokens))
+        return events
+
+    def delete_before(self, day: Optional[date] = None) -> int:
+        """Delete whole segments.
+
+        Args:
+            day: Delete segments of days before this one; all if None
+
+        Returns:
+            Number of segments deleted
+        """
+        deleted = 0
+        with self._lock:
+            self._write_pending()
+            for segment_day in self.segments():
+                if day is not None and segment_day >= day:
+                    continue
+                path = self.segment_path(segment_day)
+                for filename in (path, path + INDEX_SUFFIX):
+                    try:
+                        os.remove(filename)
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        logger.error(f"Error deleting audit file {filename}: {e}")
+                self._indexes.pop(segment_day, None)
+                self._dirty_indexes.discard(segment_day)
+                deleted += 1
+        return deleted
+
+    def _write_pending(self):
+        """Append buffered lines to their segments and fsync them."""
+        pending, self._pending, self._pending_bytes = self._pending, {}, 0
+        for day, lines in pending.items():
+            try:
+                fd = os.open(self.segment_path(day), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    # One write of whole lines, so lines appended by other
+                    # processes are never interleaved with these
+                    os.write(fd, b''.join(lines))
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                self._dirty_indexes.add(day)
+            except OSError as e:
+                logger.error(f"Failed to write audit log: {e}")
+
+    def _catch_up(self, day: date) -> Optional[SegmentIndex]:
+        """Get a segment's index, indexing any lines it has not seen."""
+        path = self.segment_path(day)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            self._indexes.pop(day, None)
+            return None
+
+        index = self._indexes.get(day)
+        if index is None:
+            index = self._load_index(day)
+        if index.size > size:
+            # The segment was replaced or truncated
+            index = SegmentIndex()
+        if index.size < size:
+            with open(path, 'rb') as f:
+                f.seek(index.size)
+                offset = index.size
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        # A line still being written
+                        break
+                    try:
+                        event = json.loads(line)
+                        index.add(event, to_epoch(event['timestamp']), offset)
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning(f"Skipping malformed audit record in {path} at {offset}")
+                    offset += len(line)
+            grew = offset > index.size
+            index.size = offset
+            if grew and day not in self._dirty_indexes:
+                self._save_index(day, index)
+        self._indexes[day] = index
+        return index
+
+    def _load_index(self, day: date) -> SegmentIndex:
+        try:
+            with open(self.segment_path(day) + INDEX_SUFFIX, 'r') as f:
+                return SegmentIndex.from_dict(json.load(f))
+        except FileNotFoundError:
+            return SegmentIndex()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Rebuilding audit index for {day}: {e}")
+            return SegmentIndex()
+
+    def _save_index(self, day: date, index: Optional[SegmentIndex]):
+        if index is None:
+            return
+        path = self.segment_path(day) + INDEX_SUFFIX
+        try:
+            with open(path + '.tmp', 'w') as f:
+                json.dump(index.to_dict(), f)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            logger.error(f"Failed to save audit index {path}: {e}")
+
+    def _scan(self, day: date, index: SegmentIndex, start: Optional[float], end: Optional[float],
+              filters: Dict[str, Any], tokens: List[bytes]) -> List[Dict[str, Any]]:
+        """Read the matching events of one segment."""
+        read_from, read_until, checked_until, check_from = index.block_range(start, end)
+        events = []
+        try:
+            with open(self.segment_path(day), 'rb') as f:
+                f.seek(read_from)
+                offset = read_from
+                while offset < read_until:
+                    line = f.readline()
+                    if not line:
+                        break
+                    line_offset = offset
+                    offset += len(line)
+                    if tokens and not all(token in line for token in tokens):
+                        continue
+                    try:
+                        event = json.loads(line)
+                        if any(event.get(name) != value for name, value in filters.items()):
+                            continue
+                        if (start is not None and line_offset < checked_until) or \
+                                (end is not None and line_offset >= check_from):
+                            timestamp = to_epoch(event['timestamp'])
+                            if (start is not None and timestamp < start) or \
+                                    (end is not None and timestamp > end):
+                                continue
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    events.append(event)
+        except OSError as e:
+            logger.error(f"Error reading audit segment {day}: {e}")
+        return events
@@ -0,0 +1,286 @@
+"""
+Publish/subscribe hub for websocket streams.
+
+Clients subscribe to topics and get a snapshot of the topic followed by
+every later message. A message is serialised once and the same text is
+queued for every subscriber; each client has its own bounded queue and
+sender task, so a slow client is dropped instead of holding up the rest.
+Publishing is safe from any thread; fan-out runs on the event loop.
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.utils.logger import get_logger
+
+# Module logger
+logger = get_logger('utils.broadcast_hub')
+
+# Close code sent to clients that fall too far behind
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+# Topic -> callable returning (version, data) for new subscribers
+SnapshotProvider = Callable[[], Tuple[Optional[int], Any]]
+
+
+def diff_items(previous: Dict[str, Any], current: Dict[str, Any],
+               ids: Iterable[str]) -> Dict[str, List[Any]]:
+    """Compare two versions of a collection at the given ids.
+
+    Args:
+        previous: Items by id as last published
+        current: Items by id now
+        ids: Ids that may have changed
+
+    Returns:
+        Dict with the 'added' and 'changed' items and the 'removed' ids
+    """
+    diff = {'added': [], 'changed': [], 'removed': []}
+    for item_id in ids:
+        old = previous.get(item_id)
+        new = current.get(item_id)
+        if new is None:
+            if old is not None:
+                diff['removed'].append(item_id)
+        elif old is None:
+            diff['added'].append(new)
+        elif old != new:
+            diff['changed'].append(new)
+    return diff
+
+
+class HubClient:
+    """One websocket connection with its subscriptions and send queue."""
+
+    def __init__(self, websocket, max_queue: int):
+        """Initialize the client.
+
+        Args:
+            websocket: Connection with async send_text() and close()
+            max_queue: Messages that may wait to be sent
+        """
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        # Topic -> version of the snapshot the client got, or None
+        self.topics: Dict[str, Optional[int]] = {}
+        self.dropped = False
+        self.task: Optional[asyncio.Task] = None
+
+    def send(self, message) -> bool:
+        """Queue a message for this client only.
+
+        Args:
+            message: Dict to serialise, or text
+
+        Returns:
+            False if the queue is full
+        """
+        text = message if isinstance(message, str) else json.dumps(message, default=str)
+        try:
+            self.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+
+class BroadcastHub:
+    """Fans messages on named topics out to subscribed websocket clients."""
+
+    def __init__(self, max_queue: int = 256):
+        """Initialize the hub.
+
+        Args:
+            max_queue: Messages a client may fall behind before it is dropped
+        """
+        self.max_queue = max_queue
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Set[HubClient] = set()
+        self._subscribers: Dict[str, Set[HubClient]] = {}
+        self._snapshots: Dict[str, SnapshotProvider] = {}
+        self.stats = {
+            'published': 0,
+            'delivered': 0,
+            'clients_dropped': 0
+        }
+
+    def register_topic(self, topic: str, snapshot: SnapshotProvider) -> None:
+        """Set how the snapshot for new subscribers of a topic is built.
+
+        Args:
+            topic: Topic name
+            snapshot: Called on the event loop; returns (version, data).
+                Messages published with a version no newer than the
+                snapshot are not sent to that subscriber.
+        """
+        self._snapshots[topic] = snapshot
+
+    async def connect(self, websocket, topics: Iterable[str] = ()) -> HubClient:
+        """Start streaming to an accepted websocket.
+
+        Args:
+            websocket: Connection with async send_text() and close()
+            topics: Topics to subscribe to straight away
+
+        Returns:
+            The client, for subscribe() and disconnect()
+        """
+        self._loop = asyncio.get_running_loop()
+        client = HubClient(websocket, self.max_queue)
+        client.task = asyncio.create_task(self._sender(client))
+        self._clients.add(client)
+        for topic in topics:
+            self.subscribe(client, topic)
+        return client
+
+    async def disconnect(self, client: HubClient) -> None:
+        """Stop streaming to a client."""
+        self._remove(client)
+        if client.task is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
+            try:
+                await client.task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    def subscribe(self, client: HubClient, topic: str) -> None:
+        """Subscribe a client to a topic and queue the topic's snapshot.
+
+        Subscribing again sends a fresh snapshot. Must run on the event loop.
+        """
+        version = None
+        provider = self._snapshots.get(topic)
+        if provider is not None:
+            try:
+                version, data = provider()
+            except Exception as e:
+                logger.error(f"Error building snapshot for topic {topic}: {e}")
+            else:
+                self._queue(client, {
+                    "type": "snapshot",
+                    "topic": topic,
+                    "version": version,
+                    "data": data,
+                    "timestamp": datetime.now().isoformat()
+                })
+        client.topics[topic] = version
+        self._subscribers.setdefault(topic, set()).add(client)
+
+    def unsubscribe(self, client: HubClient, topic: str) -> None:
+        """Unsubscribe a client from a topic."""
+        client.topics.pop(topic, None)
+        self._subscribers.get(topic, set()).discard(client)
+
+    def has_subscribers(self, topic: str) -> bool:
+        """Check whether anyone would receive a message on a topic."""
+        return bool(self._subscribers.get(topic))
+
+    def publish(self, topic: str, message, version: Optional[int] = None) -> None:
+        """Send a message to every subscriber of a topic.
+
+        Safe to call from any thread.
+
+        Args:
+            topic: Topic name
+            message: Dict to serialise, or text
+            version: Version of the topic after this message, if versioned
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self.has_subscribers(topic):
+            return
+        text = message if isinstance(message, str) else json.dumps(message, default=str)
+        if _running_loop() is loop:
+            self._fan_out(topic, text, version)
+        else:
+            loop.call_soon_threadsafe(self._fan_out, topic, text, version)
+
+    async def close(self) -> None:
+        """Disconnect and close every client."""
+        for client in list(self._clients):
+            await self.disconnect(client)
+            try:
+                await client.websocket.close()
+            except Exception:
+                pass
+
+    @property
+    def client_count(self) -> int:
+        """Number of connected clients."""
+        return len(self._clients)
+
+    def _fan_out(self, topic: str, text: str, version: Optional[int]) -> None:
+        """Queue serialised text for each subscriber on the event loop."""
+        self.stats['published'] += 1
+        for client in list(self._subscribers.get(topic, ())):
+            seen = client.topics.get(topic)
+            if version is not None and seen is not None and version <= seen:
+                continue
+            self._queue(client, text)
+
+    def _queue(self, client: HubClient, message) -> None:
+        """Queue a message for a client, dropping the client if it is full."""
+        if client.dropped:
+            return
+        if client.send(message):
+            self.stats['delivered'] += 1
+            return
+        logger.warning(f"Dropping websocket client {self.max_queue} messages behind")
+        self.stats['clients_dropped'] += 1
+        self._remove(client)
+        if client.task is not None:
+            client.task.cancel()
+        asyncio.ensure_future(self._close_slow(client))
+
+    async def _close_slow(self, client: HubClient) -> None:
+        """Close the connection of a dropped client."""
+        try:
+            await client.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
+
+    def _remove(self, client: HubClient) -> None:
+        """Forget a client and its subscriptions."""
+        client.dropped = True
+        self._clients.discard(client)
+        for topic in client.topics:
+            self._subscribers.get(topic, set()).discard(client)
+
+    async def _sender(self, client: HubClient) -> None:
+        """Write queued messages to one client's websocket."""
+        try:
+            while True:
+                text = await client.queue.get()
+                await client.websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Websocket send failed, disconnecting client: {e}")
+            self._remove(client)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Get the event loop running in this thread, if any."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+# Global hub instance
+_hub_instance = None
+_hub_lock = threading.Lock()
+
+
+def get_broadcast_hub() -> BroadcastHub:
+    """Get the broadcast hub singleton instance.
+
+    Returns:
+        BroadcastHub: The hub shared by all websocket endpoints
+    """
+    global _hub_instance
+    with _hub_lock:
+        if _hub_instance is None:
+            _hub_instance = BroadcastHub()
+        return _hub_instance
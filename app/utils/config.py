@@ -48,7 +48,10 @@ CONFIG_SCHEMA = {
                 "alert_level": {"type": "string", "enum": ["low", "medium", "high"]},
                 "check_interval": {"type": "integer", "minimum": 1},
                 "output_format": {"type": "string", "enum": ["normal", "json"]},
-                "known_devices_file": {"type": "string"}
+                "known_devices_file": {"type": "string"},
+                "capture_engine": {"type": "string", "enum": ["auto", "ring", "scapy"]},
+                "rate_window": {"type": "number", "exclusiveMinimum": 0},
+                "entry_ttl": {"type": "number", "exclusiveMinimum": 0}
             },
             "required": ["alert_level", "check_interval", "output_format"]
         },
@@ -99,7 +102,10 @@ DEFAULT_CONFIG = {
         'alert_level': 'medium',
         'check_interval': 1,
         'output_format': 'normal',
-        'known_devices_file': 'known_devices.json'
+        'known_devices_file': 'known_devices.json',
+        'capture_engine': 'auto',
+        'rate_window': 10,
+        'entry_ttl': 600
     },
     'analyze': {
         'pcap_dir': 'captures',
@@ -460,6 +466,15 @@ monitor:
   
   # Known devices database file
   known_devices_file: known_devices.json
+  
+  # Capture backend (auto, ring, scapy)
+  capture_engine: auto
+  
+  # Seconds over which per-IP ARP rates are averaged
+  rate_window: 10
+  
+  # Seconds without packets before an IP is forgotten
+  entry_ttl: 600
 
 analyze:
   # Directory for packet captures
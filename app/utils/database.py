@@ -1,10 +1,13 @@
 import os
 import sqlite3
 import json
+import threading
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
+from urllib.request import pathname2url
 
 from app.utils.logger import get_logger
+from app.utils.packet_writer import PacketWriter, INSERT_PACKETS_SQL, packet_row
 
 # Module logger
 logger = get_logger('utils.database')
@@ -12,11 +15,17 @@ logger = get_logger('utils.database')
 class Database:
     """Database manager for ARPGuard using SQLite."""
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None,
+                 write_queue_size: int = 10000,
+                 write_batch_size: int = 500,
+                 write_flush_interval: float = 0.5):
         """Initialize the database connection.
         
         Args:
             db_path: Path to the SQLite database file. If None, uses default location.
+            write_queue_size: Maximum number of packets waiting to be written
+            write_batch_size: Maximum number of packets per write transaction
+            write_flush_interval: Maximum seconds a packet waits to be committed
         """
         if db_path is None:
             # Use default location in user's home directory
@@ -30,17 +39,36 @@ class Database:
             
         self.db_path = db_path
         self.conn = None
+        self.in_memory = db_path in ("", ":memory:")
+        
+        # Read-only connections, one per reading thread
+        self._readers = threading.local()
+        self._reader_conns = []
+        self._reader_lock = threading.Lock()
         
         # Initialize database
         self._initialize()
         
+        # Batched packet writer with its own connection
+        self.packet_writer = PacketWriter(
+            self._connect_writer,
+            max_queue=write_queue_size,
+            batch_size=write_batch_size,
+            flush_interval=write_flush_interval
+        )
+        
     def _initialize(self):
         """Initialize the database connection and create tables if they don't exist."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, timeout=10.0, check_same_thread=False)
             
-            # Enable foreign keys
-            self.conn.execute("PRAGMA foreign_keys = ON")
+            # Page size only takes effect before the first table is created
+            self.conn.execute("PRAGMA page_size = 4096")
+            
+            # WAL lets readers run alongside the packet writer
+            if not self.in_memory:
+                self.conn.execute("PRAGMA journal_mode = WAL")
+            self._configure_connection(self.conn)
             
             # Create tables if they don't exist
             self._create_tables()
@@ -51,6 +79,43 @@ class Database:
             logger.error(f"Database initialization error: {e}")
             raise
         
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection):
+        """Apply per-connection pragmas."""
+        # Enable foreign keys
+        conn.execute("PRAGMA foreign_keys = ON")
+        
+        # With WAL, NORMAL only syncs at checkpoints and stays crash-safe
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        
+    def _connect_writer(self) -> sqlite3.Connection:
+        """Open the packet writer's connection."""
+        conn = sqlite3.connect(self.db_path, timeout=10.0)
+        self._configure_connection(conn)
+        return conn
+        
+    def _reader(self) -> sqlite3.Connection:
+        """Get the calling thread's read-only connection.
+        
+        Reads go through their own connections so queries from the GUI
+        never wait behind packet writes.
+        
+        Returns:
+            sqlite3.Connection: Read-only connection (the main one for in-memory databases)
+        """
+        if self.in_memory:
+            return self.conn
+            
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            uri = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=10.0, check_same_thread=False)
+            self._readers.conn = conn
+            with self._reader_lock:
+                self._reader_conns.append(conn)
+        return conn
+        
     def _create_tables(self):
         """Create database tables if they don't exist."""
         cursor = self.conn.cursor()
@@ -144,7 +209,18 @@ class Database:
         self.conn.commit()
         
     def close(self):
-        """Close the database connection."""
+        """Write out queued packets and close all connections."""
+        writer = getattr(self, "packet_writer", None)
+        if writer:
+            writer.stop()
+            
+        if hasattr(self, "_reader_lock"):
+            with self._reader_lock:
+                for conn in self._reader_conns:
+                    conn.close()
+                self._reader_conns = []
+            self._readers = threading.local()
+        
         if self.conn:
             self.conn.close()
             self.conn = None
@@ -200,6 +276,9 @@ class Database:
         Returns:
             bool: True if successful
         """
+        # Let queued packets reach the table before the session is closed
+        self.flush_packets()
+        
         try:
             cursor = self.conn.cursor()
             cursor.execute(
@@ -271,6 +350,56 @@ class Database:
             # Continue without raising - we don't want to crash the capture
             return -1
     
+    def add_packets(self, session_id: int, packets: List[Dict[str, Any]]) -> int:
+        """Queue captured packets for a batched write.
+        
+        Never blocks the caller: packets that do not fit in the write queue
+        are dropped and counted in get_writer_stats().
+        
+        Args:
+            session_id: ID of the capture session
+            packets: List of packet dictionaries
+        
+        Returns:
+            int: Number of packets accepted
+        """
+        if not packets:
+            return 0
+            
+        if self.in_memory:
+            # A private in-memory database cannot be shared with a writer thread
+            try:
+                with self.conn:
+                    self.conn.executemany(
+                        INSERT_PACKETS_SQL,
+                        [packet_row(session_id, packet, self.packet_writer.store_raw) for packet in packets]
+                    )
+                return len(packets)
+            except sqlite3.Error as e:
+                logger.error(f"Error adding packets: {e}")
+                return 0
+                
+        return self.packet_writer.submit(session_id, packets)
+    
+    def flush_packets(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued packet has been committed.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            bool: True if all queued packets were written in time
+        """
+        return self.packet_writer.flush(timeout)
+    
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Get packet writer statistics.
+        
+        Returns:
+            Dictionary with queue depth and written/dropped counters
+        """
+        return self.packet_writer.get_stats()
+    
     def add_protocol_stats(self, session_id: int, timestamp: datetime, 
                           stats: Dict[str, Dict[str, int]]) -> bool:
         """Add protocol statistics to the database.
@@ -405,7 +534,7 @@ class Database:
             List of dictionaries with session details
         """
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             cursor.execute(
                 '''
                 SELECT id, start_time, end_time, description, interface,
@@ -454,7 +583,7 @@ class Database:
             List of dictionaries with packet details
         """
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             
             query = '''
                 SELECT id, capture_time, protocol, src_ip, dst_ip,
@@ -514,7 +643,7 @@ class Database:
             Dictionary with protocols and their packet counts
         """
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             cursor.execute(
                 '''
                 SELECT protocol, COUNT(*) as count
@@ -546,7 +675,7 @@ class Database:
             List of dictionaries with traffic snapshot details
         """
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             cursor.execute(
                 '''
                 SELECT timestamp, total_packets, total_bytes,
@@ -594,7 +723,7 @@ class Database:
             Dictionary with IP addresses and their traffic stats
         """
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             
             # Query for source IPs (sent packets)
             cursor.execute(
@@ -671,7 +800,7 @@ class Database:
             Dictionary with session summary
         """
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             
             # Get session details
             cursor.execute(
@@ -730,6 +859,9 @@ class Database:
         Returns:
             bool: True if successful
         """
+        # Queued packets for this session would otherwise fail their foreign key
+        self.flush_packets()
+        
         try:
             cursor = self.conn.cursor()
             
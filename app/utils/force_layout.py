@@ -0,0 +1,259 @@
+"""
+Force-directed graph layout with NumPy.
+
+Repulsion uses a Barnes-Hut style approximation over a quadtree stored as a
+stack of uniform grids, one per tree level. Each node feels the nodes in
+its own and neighbouring leaf cells exactly. Cells further away are taken
+as their total mass at their centre of mass, at the coarsest level where
+they are still at least one cell width away; above the leaf level the
+pull is worked out once per cell rather than once per node. That keeps a step at
+O(n log n) instead of the O(n^2) pairwise sum.
+
+The grid spans the central quantiles of the node positions rather than the
+full bounding box, so a few far outliers cannot squash everyone else into
+one cell; outliers are clamped into the border cells. Cells that still hold
+more than max_occupancy nodes push their neighbours as a single mass at
+their centre of mass instead of node by node.
+"""
+
+import math
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+# Below this many nodes the exact pairwise sum is cheaper than the tree
+DIRECT_THRESHOLD = 256
+
+# Fraction of nodes on each side the grid bounds may leave out
+OUTLIER_QUANTILE = 0.01
+
+# Empty cells around each grid, wide enough for the furthest offset
+PADDING = 3
+
+# Child cells of a cell's 3x3 parent neighbourhood, as offsets from the
+# cell for each parity of its coordinate; the near 3x3 block is excluded
+_FAR_OFFSETS = [
+    [(a - 2 - px, b - 2 - py) for a in range(6) for b in range(6)
+     if abs(a - 2 - px) > 1 or abs(b - 2 - py) > 1]
+    for px in (0, 1) for py in (0, 1)
+]
+
+
+class ForceLayout:
+    """Spring-electrical layout: connected nodes attract, all nodes repel."""
+
+    def __init__(self,
+                 repulsion: float = 10000.0,
+                 attraction: float = 0.06,
+                 edge_length: float = 150.0,
+                 leaf_size: int = 2,
+                 max_depth: int = 10,
+                 max_occupancy: int = 64,
+                 tolerance: float = 0.5):
+        """Initialize the layout.
+
+        Args:
+            repulsion: Strength of the inverse-square repulsion
+            attraction: Spring constant between connected nodes
+            edge_length: Rest length of the springs
+            leaf_size: Average nodes per leaf cell the tree aims for
+            max_depth: Deepest quadtree level
+            max_occupancy: Most nodes in a leaf cell whose push on its
+                neighbours is summed exactly
+            tolerance: Largest node movement, in pixels, at which the
+                layout counts as converged
+        """
+        self.repulsion = repulsion
+        self.attraction = attraction
+        self.edge_length = edge_length
+        self.leaf_size = leaf_size
+        self.max_depth = max_depth
+        self.max_occupancy = max_occupancy
+        self.tolerance = tolerance
+
+    def run(self,
+            positions: np.ndarray,
+            edges: np.ndarray,
+            iterations: int = 100,
+            temperature: float = 0.1,
+            cooling: float = 0.99,
+            should_stop: Optional[Callable[[], bool]] = None) -> Tuple[np.ndarray, int]:
+        """Move nodes until the layout converges or iterations run out.
+
+        Args:
+            positions: (n, 2) starting positions; warm-start with the
+                previous layout so only a few iterations are needed
+            edges: (m, 2) node index pairs; each pair pulls its first node
+                towards its second
+            iterations: Most iterations to run
+            temperature: Step size for the first iteration
+            cooling: Factor the step size shrinks by every iteration
+            should_stop: Polled every iteration; returning True aborts
+
+        Returns:
+            Tuple of the new (n, 2) positions and the iterations run
+        """
+        pos = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+        if len(pos) == 0:
+            return pos, 0
+
+        done = 0
+        for done in range(1, iterations + 1):
+            if should_stop is not None and should_stop():
+                done -= 1
+                break
+            step = self.forces(pos, edges) * temperature
+            # Keep a single step from throwing nodes across the view
+            length = np.hypot(step[:, 0], step[:, 1])
+            too_long = length > self.edge_length
+            if too_long.any():
+                step[too_long] *= (self.edge_length / length[too_long])[:, None]
+                length[too_long] = self.edge_length
+            pos += step
+            temperature *= cooling
+            if length.max() < self.tolerance:
+                break
+        return pos, done
+
+    def forces(self, pos: np.ndarray, edges: np.ndarray) -> np.ndarray:
+        """Get the net force on every node."""
+        force = self.repulsion_forces(pos)
+        if len(edges):
+            src, dst = edges[:, 0], edges[:, 1]
+            delta = pos[src] - pos[dst]
+            distance = np.maximum(1.0, np.hypot(delta[:, 0], delta[:, 1]))
+            pull = -self.attraction * (distance - self.edge_length) / distance
+            n = len(pos)
+            force[:, 0] += np.bincount(src, weights=delta[:, 0] * pull, minlength=n)
+            force[:, 1] += np.bincount(src, weights=delta[:, 1] * pull, minlength=n)
+        return force
+
+    def repulsion_forces(self, pos: np.ndarray) -> np.ndarray:
+        """Get the repulsion on every node from all the others."""
+        n = len(pos)
+        if n <= DIRECT_THRESHOLD:
+            return self._direct_repulsion(pos)
+
+        # Leaf grid sized for about leaf_size nodes per cell
+        depth = int(min(self.max_depth, max(2, math.ceil(0.5 * math.log2(n / self.leaf_size)))))
+        size = 1 << depth
+        low, high = np.quantile(pos, [OUTLIER_QUANTILE, 1 - OUTLIER_QUANTILE], axis=0)
+        span = float((high - low).max()) or 1.0
+        cells = np.clip((pos - low) * (size / span), 0, size - 1).astype(np.intp)
+
+        force = self._near_repulsion(pos, cells, size)
+        # The closest far cells matter most, so the leaf level is evaluated
+        # at every node and coarser levels once per cell
+        force += self._far_repulsion(pos, cells, size, at_nodes=True)
+        for level in range(2, depth):
+            level_cells = cells >> (depth - level)
+            level_force = self._far_repulsion(pos, level_cells, 1 << level)
+            force += level_force[_padded_ids(level_cells, 1 << level)]
+        return force
+
+    def _pair_force(self, delta: np.ndarray, mass=1.0) -> np.ndarray:
+        """Inverse-square repulsion for displacement vectors."""
+        distance = np.maximum(1.0, np.hypot(delta[..., 0], delta[..., 1]))
+        return delta * (self.repulsion * mass / distance ** 3)[..., None]
+
+    def _direct_repulsion(self, pos: np.ndarray) -> np.ndarray:
+        """Exact pairwise repulsion; coincident nodes do not push each other."""
+        delta = pos[:, None, :] - pos[None, :, :]
+        return self._pair_force(delta).sum(axis=1)
+
+    def _near_repulsion(self, pos: np.ndarray, cells: np.ndarray, size: int) -> np.ndarray:
+        """Repulsion from nodes in the same and adjacent leaf cells.
+
+        Exact for cells of up to max_occupancy nodes; crowded cells push as
+        their total mass at their centre of mass, leaving out the node itself.
+        """
+        n = len(pos)
+        stride = size + 2 * PADDING
+        cell_ids = _padded_ids(cells, size)
+        order = np.argsort(cell_ids, kind='stable')
+        counts = np.bincount(cell_ids, minlength=stride * stride)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sums = np.zeros((stride * stride, 2))
+        sums[:, 0] = np.bincount(cell_ids, weights=pos[:, 0], minlength=stride * stride)
+        sums[:, 1] = np.bincount(cell_ids, weights=pos[:, 1], minlength=stride * stride)
+        force = np.zeros((n, 2))
+
+        for ox in (-1, 0, 1):
+            for oy in (-1, 0, 1):
+                target = cell_ids + (ox * stride + oy)
+                count = np.where(counts[target] > self.max_occupancy, 0, counts[target])
+                for k in range(int(count.max())):
+                    i = np.nonzero(count > k)[0]
+                    j = order[starts[target[i]] + k]
+                    force[i] += self._pair_force(pos[i] - pos[j])
+
+                i = np.nonzero(counts[target] > self.max_occupancy)[0]
+                if not len(i):
+                    continue
+                mass = counts[target[i]].astype(np.float64)
+                total = sums[target[i]]
+                if ox == oy == 0:
+                    mass -= 1
+                    total = total - pos[i]
+                force[i] += self._pair_force(pos[i] - total / mass[:, None], mass)
+        return force
+
+    def _far_repulsion(self, pos: np.ndarray, cells: np.ndarray, size: int,
+                       at_nodes: bool = False) -> np.ndarray:
+        """Repulsion from the interaction list of each cell on one level.
+
+        The interaction list is the children of the parent's neighbours that
+        are not neighbours themselves, so every pair of distant cells is
+        counted at exactly one level.
+
+        Args:
+            pos: (n, 2) node positions
+            cells: (n, 2) cell of each node on this level
+            size: Cells per side on this level
+            at_nodes: Evaluate at every node instead of once per cell
+
+        Returns:
+            (n, 2) force per node if at_nodes, else the force per padded
+            cell id, evaluated at the cell's centre of mass
+        """
+        stride = size + 2 * PADDING
+        cell_ids = _padded_ids(cells, size)
+        mass = np.bincount(cell_ids, minlength=stride * stride).astype(np.float64)
+        com = np.zeros((stride * stride, 2))
+        com[:, 0] = np.bincount(cell_ids, weights=pos[:, 0], minlength=stride * stride)
+        com[:, 1] = np.bincount(cell_ids, weights=pos[:, 1], minlength=stride * stride)
+        occupied = np.nonzero(mass)[0]
+        com[occupied] /= mass[occupied, None]
+
+        if at_nodes:
+            return self._interaction_list_force(pos, cell_ids, mass, com, stride)
+        force = np.zeros((stride * stride, 2))
+        force[occupied] = self._interaction_list_force(com[occupied], occupied, mass, com, stride)
+        return force
+
+    def _interaction_list_force(self, here: np.ndarray, cell_ids: np.ndarray,
+                                mass: np.ndarray, com: np.ndarray, stride: int) -> np.ndarray:
+        """Sum the push of interaction list cells on points in the given cells."""
+        force = np.zeros((len(here), 2))
+        # Padding keeps the coordinate parity of the unpadded grid
+        cx, cy = np.divmod(cell_ids, stride)
+        parity = ((cx - PADDING) & 1) * 2 + ((cy - PADDING) & 1)
+        for p, offsets in enumerate(_FAR_OFFSETS):
+            group = np.nonzero(parity == p)[0]
+            if not len(group):
+                continue
+            ids, points = cell_ids[group], here[group]
+            total = np.zeros((len(group), 2))
+            for ox, oy in offsets:
+                # Cells outside the grid fall in the empty padding
+                target = ids + (ox * stride + oy)
+                total += self._pair_force(points - com[target], mass[target])
+            force[group] = total
+        return force
+
+
+def _padded_ids(cells: np.ndarray, size: int) -> np.ndarray:
+    """Flat ids of cells in a grid with PADDING empty cells on every side."""
+    stride = size + 2 * PADDING
+    return (cells[:, 0] + PADDING) * stride + cells[:, 1] + PADDING
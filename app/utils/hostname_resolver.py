@@ -0,0 +1,161 @@
+"""
+Reverse DNS resolution for discovered hosts.
+
+Lookups run on a bounded thread pool so a scan never waits on DNS, and
+answers are kept in a cache that is saved to disk between runs.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from app.utils.logger import get_logger
+
+# Module logger
+logger = get_logger('utils.hostname_resolver')
+
+
+class HostnameResolver:
+    """Resolves IP addresses to hostnames in the background with caching."""
+
+    def __init__(self,
+                 cache_path: Optional[str] = None,
+                 max_workers: int = 16,
+                 ttl: float = 24 * 60 * 60,
+                 negative_ttl: float = 10 * 60):
+        """Initialize the resolver.
+
+        Args:
+            cache_path: JSON file the cache is loaded from and saved to;
+                None keeps the cache in memory only
+            max_workers: Lookups running at once
+            ttl: Seconds a resolved hostname stays cached
+            negative_ttl: Seconds a failed lookup stays cached
+        """
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                            thread_name_prefix='hostname-resolver')
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[Optional[str], float]] = {}  # ip -> (hostname or None, resolved at)
+        self._pending: Dict[str, Future] = {}
+        self._dirty = False
+        self._load()
+
+    def get_cached(self, ip: str) -> Tuple[bool, Optional[str]]:
+        """Look an address up in the cache only.
+
+        Args:
+            ip: IP address
+
+        Returns:
+            (found, hostname); hostname is None when the address has no name
+        """
+        with self._lock:
+            entry = self._cache.get(ip)
+        if entry is None:
+            return False, None
+        hostname, resolved_at = entry
+        ttl = self.ttl if hostname else self.negative_ttl
+        if time.time() - resolved_at > ttl:
+            return False, None
+        return True, hostname
+
+    def resolve_async(self, ip: str,
+                      callback: Optional[Callable[[str, Optional[str]], None]] = None) -> Future:
+        """Resolve an address in the background.
+
+        Concurrent requests for the same address share one lookup.
+
+        Args:
+            ip: IP address
+            callback: Called with (ip, hostname or None) once resolved
+
+        Returns:
+            Future holding the hostname or None
+        """
+        found, hostname = self.get_cached(ip)
+        if found:
+            future = Future()
+            future.set_result(hostname)
+        else:
+            with self._lock:
+                future = self._pending.get(ip)
+                if future is None:
+                    future = self._executor.submit(self._lookup, ip)
+                    self._pending[ip] = future
+        if callback:
+            future.add_done_callback(lambda done: callback(ip, done.result()))
+        return future
+
+    def resolve(self, ip: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Resolve an address, waiting at most timeout seconds.
+
+        Args:
+            ip: IP address
+            timeout: Seconds to wait, or None to wait for the lookup
+
+        Returns:
+            Hostname, or None if it has none or the lookup is still running
+        """
+        try:
+            return self.resolve_async(ip).result(timeout)
+        except Exception:
+            return None
+
+    def _lookup(self, ip: str) -> Optional[str]:
+        """Run one blocking reverse lookup and cache the answer."""
+        try:
+            hostname = socket.gethostbyaddr(ip)[0]
+        except (socket.herror, socket.gaierror, OSError) as e:
+            logger.debug(f"No hostname for {ip}: {e}")
+            hostname = None
+        with self._lock:
+            self._cache[ip] = (hostname, time.time())
+            self._pending.pop(ip, None)
+            self._dirty = True
+        return hostname
+
+    def _load(self):
+        """Load unexpired entries from the cache file."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                entries = json.load(f)
+            now = time.time()
+            for ip, (hostname, resolved_at) in entries.items():
+                ttl = self.ttl if hostname else self.negative_ttl
+                if now - resolved_at <= ttl:
+                    self._cache[ip] = (hostname, resolved_at)
+            logger.debug(f"Loaded {len(self._cache)} cached hostnames")
+        except Exception as e:
+            logger.warning(f"Failed to load hostname cache: {e}")
+
+    def save(self):
+        """Write the cache to its file if it has changed."""
+        if not self.cache_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = {ip: list(entry) for ip, entry in self._cache.items()}
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            logger.error(f"Failed to save hostname cache: {e}")
+
+    def shutdown(self):
+        """Save the cache and stop the worker threads."""
+        self.save()
+        self._executor.shutdown(wait=False)
@@ -1,9 +1,11 @@
 import os
 import json
-import re
 import logging
+import threading
 import urllib.request
-from typing import Optional
+from typing import Iterable, List, Optional
+
+from src.core.oui_lookup import VendorResolver, format_mac, get_vendor_resolver, parse_mac
 
 # Default vendors database location
 VENDORS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vendors.json')
@@ -12,16 +14,22 @@ VENDORS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vendors
 VENDORS_URL = "https://macaddress.io/database/macaddress.io-db.json"
 
 class MacVendorDB:
-    """MAC address vendor database utility."""
+    """MAC address vendor database utility.
+    
+    Lookups go through a VendorResolver, by default the one shared with
+    the detection code, which memory-maps a prebuilt binary table kept
+    next to the JSON file.
+    """
     
-    def __init__(self, db_file: str = VENDORS_FILE):
+    def __init__(self, db_file: str = VENDORS_FILE, resolver: Optional[VendorResolver] = None):
         """Initialize the MAC vendor database.
         
         Args:
             db_file: Path to the vendors database file.
+            resolver: Resolver to load the file into; the shared one if None.
         """
         self.db_file = db_file
-        self.vendors = {}
+        self.resolver = resolver or get_vendor_resolver()
         self.load_database()
     
     def load_database(self) -> bool:
@@ -31,13 +39,7 @@ class MacVendorDB:
             bool: True if database was loaded successfully, False otherwise.
         """
         if os.path.exists(self.db_file):
-            try:
-                with open(self.db_file, 'r') as f:
-                    self.vendors = json.load(f)
-                return True
-            except Exception as e:
-                logging.error(f"Failed to load MAC vendor database: {e}")
-                return False
+            return self.resolver.add_source(self.db_file)
         else:
             logging.warning(f"MAC vendor database file not found: {self.db_file}")
             return False
@@ -71,21 +73,18 @@ class MacVendorDB:
         Returns:
             str: The vendor name if found, None otherwise.
         """
-        if not self.vendors:
-            return None
-            
-        # Normalize MAC address format
-        mac = self.normalize_mac(mac_address)
-        if not mac:
-            return None
+        return self.resolver.get_vendor(mac_address)
+    
+    def get_vendors(self, mac_addresses: Iterable[str]) -> List[Optional[str]]:
+        """Get the vendor names for many MAC addresses at once.
+        
+        Args:
+            mac_addresses: The MAC addresses to look up.
             
-        # Check for matches with decreasing prefix length
-        for prefix_len in [9, 8, 7, 6]:  # Try OUI prefixes (first 3 bytes)
-            prefix = mac[:prefix_len]
-            if prefix in self.vendors:
-                return self.vendors[prefix]
-                
-        return None
+        Returns:
+            list: The vendor name, or None, for each address.
+        """
+        return self.resolver.get_vendors(mac_addresses)
     
     @staticmethod
     def normalize_mac(mac_address: str) -> Optional[str]:
@@ -97,21 +96,13 @@ class MacVendorDB:
         Returns:
             str: The normalized MAC address, or None if invalid.
         """
-        if not mac_address:
-            return None
-            
-        # Remove all non-hexadecimal characters
-        mac = re.sub(r'[^0-9a-fA-F]', '', mac_address.upper())
-        
-        # Check if we have a valid MAC address
-        if len(mac) != 12:
-            return None
-            
-        return mac
+        value = parse_mac(mac_address)
+        return format_mac(value) if value is not None else None
 
 
 # Singleton pattern for database access
 _vendor_db_instance = None
+_vendor_db_lock = threading.Lock()
 
 def get_vendor_db() -> MacVendorDB:
     """Get the singleton MAC vendor database instance.
@@ -120,9 +111,10 @@ def get_vendor_db() -> MacVendorDB:
         MacVendorDB: The MAC vendor database instance.
     """
     global _vendor_db_instance
-    if _vendor_db_instance is None:
-        _vendor_db_instance = MacVendorDB()
-    return _vendor_db_instance
+    with _vendor_db_lock:
+        if _vendor_db_instance is None:
+            _vendor_db_instance = MacVendorDB()
+        return _vendor_db_instance
 
 
 def get_vendor_name(mac_address: str) -> str:
@@ -139,6 +131,18 @@ def get_vendor_name(mac_address: str) -> str:
     return vendor if vendor else "Unknown"
 
 
+def get_vendor_for_mac(mac_address: str) -> str:
+    """Get the vendor name for a MAC address.
+    
+    Args:
+        mac_address: The MAC address to look up.
+        
+    Returns:
+        str: The vendor name if found, 'Unknown' otherwise.
+    """
+    return get_vendor_name(mac_address)
+
+
 def update_vendor_database() -> bool:
     """Update the MAC vendor database from the internet.
     
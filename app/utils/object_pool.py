@@ -0,0 +1,235 @@
+"""
+Preallocated object pool and single-producer ingest ring for ARPGuard.
+
+ObjectPool hands out objects created up front and keeps the free ones on a
+stack, so allocating and releasing are O(1) and a steady packet stream
+reuses the same objects instead of creating new ones. SPSCRing moves items
+from one producer thread to one consumer thread through a fixed array of
+slots. The producer only advances the head and the consumer only advances
+the tail, so neither takes a lock. TokenBucket limits how fast the consumer
+takes work, leaving the rest queued.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Slot number returned for objects created because the pool was exhausted
+UNPOOLED = -1
+
+
+class ObjectPool:
+    """Fixed-capacity pool of reusable objects with an O(1) free list.
+
+    Allocate from one thread and release from one thread; list append and
+    pop are atomic, so the two may be different threads.
+    """
+
+    def __init__(self, capacity: int, factory: Callable[[], Any],
+                 reset: Optional[Callable[[Any], None]] = None):
+        """Initialize the pool.
+
+        Args:
+            capacity: Number of objects created up front
+            factory: Creates one object
+            reset: Clears an object when it is released
+        """
+        self.capacity = capacity
+        self.factory = factory
+        self.reset = reset
+        self._objects = [factory() for _ in range(capacity)]
+        self._in_use = bytearray(capacity)
+        # Free slots; the most recently released slot is reused first
+        self._free = list(range(capacity - 1, -1, -1))
+        self.hits = 0
+        self.misses = 0
+        self.releases = 0
+
+    def allocate(self) -> Tuple[int, Any]:
+        """Take an object from the pool.
+
+        Returns:
+            (slot, object); when the pool is exhausted a new object is
+            created and the slot is UNPOOLED
+        """
+        try:
+            slot = self._free.pop()
+        except IndexError:
+            self.misses += 1
+            return UNPOOLED, self.factory()
+        self._in_use[slot] = 1
+        self.hits += 1
+        return slot, self._objects[slot]
+
+    def release(self, slot: int) -> bool:
+        """Return an object to the pool.
+
+        Args:
+            slot: Slot returned by allocate()
+
+        Returns:
+            True if the slot was in use
+        """
+        if not 0 <= slot < self.capacity or not self._in_use[slot]:
+            return False
+        if self.reset is not None:
+            self.reset(self._objects[slot])
+        self._in_use[slot] = 0
+        self._free.append(slot)
+        self.releases += 1
+        return True
+
+    def clear(self):
+        """Release every object and reset the statistics."""
+        for slot in range(self.capacity):
+            if self._in_use[slot]:
+                self.release(slot)
+        self.hits = 0
+        self.misses = 0
+        self.releases = 0
+
+    @property
+    def allocations(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def in_use(self) -> int:
+        return self.capacity - len(self._free)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage statistics."""
+        allocations = self.allocations
+        return {
+            'capacity': self.capacity,
+            'in_use': self.in_use,
+            'allocations': allocations,
+            'releases': self.releases,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / allocations if allocations else 1.0
+        }
+
+
+class SPSCRing:
+    """Bounded single-producer, single-consumer queue without locks."""
+
+    def __init__(self, capacity: int):
+        """Initialize the ring.
+
+        Args:
+            capacity: Number of slots, rounded up to a power of two
+        """
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.capacity = size
+        self._mask = size - 1
+        self._slots: List[Any] = [None] * size
+        # Total items ever pushed and popped; only the producer writes
+        # _head and only the consumer writes _tail
+        self._head = 0
+        self._tail = 0
+        self.rejected = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    def push(self, item: Any) -> bool:
+        """Add an item (producer side).
+
+        Returns:
+            False if the ring is full and the item was not added
+        """
+        head = self._head
+        occupancy = head - self._tail
+        if occupancy >= self.capacity:
+            self.rejected += 1
+            return False
+        self._slots[head & self._mask] = item
+        # Publish the item only once its slot is written
+        self._head = head + 1
+        if occupancy >= self.high_water:
+            self.high_water = occupancy + 1
+        return True
+
+    def pop(self) -> Optional[Any]:
+        """Take the oldest item (consumer side), or None if empty."""
+        tail = self._tail
+        if tail == self._head:
+            return None
+        index = tail & self._mask
+        item = self._slots[index]
+        self._slots[index] = None
+        self._tail = tail + 1
+        return item
+
+    def pop_many(self, limit: int) -> List[Any]:
+        """Take up to limit of the oldest items (consumer side)."""
+        tail = self._tail
+        count = min(limit, self._head - tail)
+        if count <= 0:
+            return []
+        items = []
+        for position in range(tail, tail + count):
+            index = position & self._mask
+            items.append(self._slots[index])
+            self._slots[index] = None
+        self._tail = tail + count
+        return items
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ring occupancy statistics."""
+        occupancy = len(self)
+        return {
+            'capacity': self.capacity,
+            'occupancy': occupancy,
+            'fill_ratio': occupancy / self.capacity,
+            'high_water': self.high_water,
+            'pushed': self._head,
+            'popped': self._tail,
+            'rejected': self.rejected
+        }
+
+
+class TokenBucket:
+    """Token bucket rate limiter."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        """Initialize the bucket, full.
+
+        Args:
+            rate: Tokens added per second
+            burst: Most tokens the bucket holds
+            clock: Time source in seconds
+        """
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def _refill(self) -> float:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return self._tokens
+
+    def take(self, count: int) -> int:
+        """Take up to count whole tokens.
+
+        Returns:
+            Number of tokens taken
+        """
+        taken = min(count, int(self._refill()))
+        self._tokens -= taken
+        return max(taken, 0)
+
+    def time_until(self, count: int = 1) -> float:
+        """Get seconds until count tokens are available."""
+        missing = count - self._refill()
+        return max(missing, 0.0) / self.rate if self.rate > 0 else float('inf')
+
+    def refill(self):
+        """Fill the bucket."""
+        self._tokens = float(self.burst)
+        self._updated = self._clock()
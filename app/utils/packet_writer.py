@@ -0,0 +1,243 @@
+"""
+Batched packet writer for the ARPGuard database.
+
+Captured packets are queued and written by a single writer thread with
+executemany() inside periodic transactions, so capture never waits on
+SQLite and each commit covers many packets.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.logger import get_logger
+
+# Module logger
+logger = get_logger('utils.packet_writer')
+
+INSERT_PACKETS_SQL = '''
+    INSERT INTO packets
+    (session_id, capture_time, protocol, src_ip, dst_ip,
+     src_port, dst_port, src_mac, dst_mac, length, info, data)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def packet_row(session_id: int, packet_info: Dict[str, Any],
+               store_raw: bool = True) -> Tuple:
+    """Convert a packet dictionary to a packets table row.
+
+    Args:
+        session_id: ID of the capture session
+        packet_info: Dictionary containing packet details
+        store_raw: Whether to keep the raw packet bytes
+
+    Returns:
+        Tuple of column values in INSERT_PACKETS_SQL order
+    """
+    capture_time = packet_info.get('time') or datetime.now()
+    if isinstance(capture_time, datetime):
+        capture_time = capture_time.isoformat(' ')
+
+    data = None
+    if store_raw and 'raw_packet' in packet_info:
+        try:
+            data = bytes(packet_info['raw_packet'])
+        except Exception:
+            pass
+
+    return (
+        session_id,
+        capture_time,
+        packet_info.get('protocol', 'UNKNOWN'),
+        packet_info.get('src_ip'),
+        packet_info.get('dst_ip'),
+        packet_info.get('src_port'),
+        packet_info.get('dst_port'),
+        packet_info.get('src_mac'),
+        packet_info.get('dst_mac'),
+        packet_info.get('length', 0),
+        packet_info.get('info', ''),
+        data
+    )
+
+
+class PacketWriter:
+    """Single-threaded batched writer for the packets table.
+
+    Rows go through a bounded queue. When it is full new rows are dropped
+    and counted rather than blocking the caller. The writer thread commits
+    once per batch_size rows or flush_interval seconds, whichever comes
+    first.
+    """
+
+    def __init__(self, connect, max_queue: int = 10000,
+                 batch_size: int = 500, flush_interval: float = 0.5,
+                 store_raw: bool = False):
+        """Initialize the writer.
+
+        Args:
+            connect: Callable returning a new connection for the writer thread
+            max_queue: Maximum number of queued rows
+            batch_size: Maximum number of rows per transaction
+            flush_interval: Maximum seconds a row waits before being committed
+            store_raw: Whether to store raw packet bytes in the data column
+        """
+        self.connect = connect
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.store_raw = store_raw
+
+        self._queue: "queue.Queue[Tuple]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        # Rows taken off the queue (written or failed), signalled for flush()
+        self._processed = 0
+        self._processed_changed = threading.Condition()
+
+        self._stats_lock = threading.Lock()
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.transactions = 0
+        self.high_water_mark = 0
+
+    def start(self):
+        """Start the writer thread."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._write_loop, name="packet-writer", daemon=True)
+        self._thread.start()
+        logger.info(f"Packet writer started (batch_size={self.batch_size}, "
+                    f"flush_interval={self.flush_interval}s)")
+
+    def stop(self, timeout: float = 5.0):
+        """Write out queued rows and stop the writer thread.
+
+        Args:
+            timeout: Time to wait for the thread to exit
+        """
+        if not self._running:
+            return
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info(f"Packet writer stopped ({self.written} written, {self.dropped} dropped)")
+
+    def submit(self, session_id: int, packets: List[Dict[str, Any]]) -> int:
+        """Queue packets for writing without blocking.
+
+        Args:
+            session_id: ID of the capture session
+            packets: Packet dictionaries to store
+
+        Returns:
+            int: Number of packets accepted; the rest were dropped
+        """
+        if not self._running:
+            self.start()
+
+        accepted = 0
+        for packet_info in packets:
+            try:
+                self._queue.put_nowait(packet_row(session_id, packet_info, self.store_raw))
+            except queue.Full:
+                break
+            accepted += 1
+
+        with self._stats_lock:
+            self.queued += accepted
+            self.dropped += len(packets) - accepted
+            self.high_water_mark = max(self.high_water_mark, self._queue.qsize())
+
+        if accepted < len(packets):
+            logger.warning(f"Packet write queue full, dropped {len(packets) - accepted} packets")
+        return accepted
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued row has been committed.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            bool: True if the queue was drained in time
+        """
+        with self._stats_lock:
+            target = self.queued
+        with self._processed_changed:
+            return self._processed_changed.wait_for(lambda: self._processed >= target, timeout)
+
+    def _write_loop(self):
+        """Drain the queue in batches until stopped."""
+        conn = self.connect()
+        try:
+            while self._running or not self._queue.empty():
+                batch = self._collect_batch()
+                if batch:
+                    self._write_batch(conn, batch)
+                    with self._processed_changed:
+                        self._processed += len(batch)
+                        self._processed_changed.notify_all()
+        finally:
+            conn.close()
+
+    def _collect_batch(self) -> List[Tuple]:
+        """Take up to batch_size rows, waiting at most flush_interval."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Tuple]):
+        """Insert one batch in a single transaction."""
+        try:
+            with conn:
+                conn.executemany(INSERT_PACKETS_SQL, batch)
+        except sqlite3.Error as e:
+            logger.error(f"Error writing {len(batch)} packets: {e}")
+            with self._stats_lock:
+                self.errors += 1
+            return
+
+        with self._stats_lock:
+            self.written += len(batch)
+            self.transactions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics.
+
+        Returns:
+            Dict with queue depth and written/dropped counters
+        """
+        with self._stats_lock:
+            return {
+                'running': self._running,
+                'queue_size': self._queue.qsize(),
+                'queue_capacity': self._queue.maxsize,
+                'high_water_mark': self.high_water_mark,
+                'queued': self.queued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'transactions': self.transactions,
+                'average_batch_size': self.written / self.transactions if self.transactions else 0.0
+            }
@@ -7,6 +7,7 @@ from collections import deque, defaultdict
 from datetime import datetime
 import sys
 import tracemalloc
+import traceback
 from typing import Dict, List, Any, Tuple, Optional, Callable
 
 logger = logging.getLogger("arp_guard.performance")
@@ -0,0 +1,267 @@
+"""
+Asynchronous TCP port and banner scanner.
+
+Every (host, port) pair is probed with a non-blocking connect on one
+asyncio event loop. A global limit caps open sockets and a per-host limit
+keeps any single device from being flooded. Connect timeouts adapt to the
+round-trip times observed for each host, and open ports are probed for a
+banner on the connection that found them, while the rest of the scan
+carries on.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.utils.logger import get_logger
+
+# Module logger
+logger = get_logger('utils.port_scanner')
+
+# Bytes sent to each port before reading its banner; b"" just listens
+SERVICE_PROBES = {
+    21: b"",  # FTP
+    22: b"",  # SSH
+    23: b"",  # Telnet
+    25: b"HELO arpguard.local\r\n",  # SMTP
+    80: b"GET / HTTP/1.0\r\nHost: {host}\r\n\r\n",  # HTTP
+    110: b"",  # POP3
+    143: b"",  # IMAP
+    443: b"",  # HTTPS, SSL is handled separately
+    3306: b"",  # MySQL
+    3389: b"",  # RDP
+    5900: b""  # VNC
+}
+
+
+class RttEstimator:
+    """Smoothed round-trip time of one host, as in TCP (RFC 6298)."""
+
+    def __init__(self, initial_timeout: float, min_timeout: float):
+        """Initialize the estimator.
+
+        Args:
+            initial_timeout: Timeout used until a round trip is measured,
+                and the upper bound afterwards
+            min_timeout: Lower bound for the timeout
+        """
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.srtt = None
+        self.rttvar = 0.0
+        self.samples = 0
+
+    def update(self, rtt: float):
+        """Add a measured round-trip time in seconds."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.samples += 1
+
+    @property
+    def timeout(self) -> float:
+        """Connect timeout to use for the next port."""
+        if self.srtt is None:
+            return self.initial_timeout
+        return min(self.initial_timeout, max(self.min_timeout, self.srtt + 4 * self.rttvar))
+
+
+class PortScanner:
+    """Scans many hosts and ports concurrently on an asyncio event loop.
+
+    scan() is blocking and meant to run on a worker thread; cancel() may
+    be called from any other thread. host_complete callbacks run on the
+    loop's thread pool, so they may block without stalling the scan.
+    """
+
+    def __init__(self,
+                 timeout: float = 0.5,
+                 min_timeout: float = 0.05,
+                 banner_timeout: Optional[float] = None,
+                 max_concurrency: int = 256,
+                 per_host_limit: int = 16,
+                 probes: Optional[Dict[int, bytes]] = None):
+        """Initialize the scanner.
+
+        Args:
+            timeout: Connect timeout before a host's RTT is known, and the
+                largest timeout used afterwards
+            min_timeout: Smallest adaptive connect timeout
+            banner_timeout: Time to wait for a banner (defaults to timeout)
+            max_concurrency: Connections open at once across all hosts
+            per_host_limit: Connections open at once to a single host
+            probes: Port -> bytes to send before reading a banner; open
+                ports missing from it are not probed
+        """
+        self.timeout = timeout
+        self.min_timeout = min(min_timeout, timeout)
+        self.banner_timeout = banner_timeout if banner_timeout is not None else timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        self.probes = SERVICE_PROBES if probes is None else probes
+
+        self.stats = {}  # Figures from the last scan
+        self._lock = threading.Lock()
+        self._loop = None
+        self._task = None
+        self._cancelled = False
+
+    def scan(self,
+             hosts: Iterable[str],
+             ports: Iterable[int],
+             progress: Optional[Callable[[int, int], None]] = None,
+             host_complete: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, Dict]:
+        """Scan every port on every host.
+
+        Args:
+            hosts: IP addresses to scan
+            ports: Ports to scan on each host
+            progress: Called with (ports_done, ports_total) after each port
+            host_complete: Called with (host, result) when a host is done
+
+        Returns:
+            Dict mapping each host to a result with 'ports' (port -> open)
+            and 'banners' (port -> bytes) for the probed open ports. After
+            cancel() only the ports scanned so far are included.
+        """
+        loop = asyncio.new_event_loop()
+        with self._lock:
+            self._loop = loop
+        try:
+            return loop.run_until_complete(
+                self._run(list(dict.fromkeys(hosts)), list(dict.fromkeys(ports)), progress, host_complete))
+        finally:
+            with self._lock:
+                self._loop = None
+                self._task = None
+            loop.close()
+
+    def cancel(self):
+        """Stop the running scan and any scan started later.
+
+        Safe to call from any thread.
+        """
+        with self._lock:
+            self._cancelled = True
+            if self._loop is not None and self._task is not None:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the scanner has been cancelled."""
+        return self._cancelled
+
+    async def _run(self, hosts, ports, progress, host_complete) -> Dict[str, Dict]:
+        """Run the scan and record its statistics."""
+        results = {host: {'ports': {}, 'banners': {}} for host in hosts}
+        start = time.perf_counter()
+        with self._lock:
+            self._task = asyncio.current_task()
+            cancelled = self._cancelled
+        try:
+            if not cancelled:
+                await self.scan_async(hosts, ports, progress, host_complete, results)
+        except asyncio.CancelledError:
+            logger.info("Port scan cancelled")
+
+        elapsed = time.perf_counter() - start
+        scanned = sum(len(result['ports']) for result in results.values())
+        self.stats = {
+            'hosts': len(hosts),
+            'ports_scanned': scanned,
+            'open_ports': sum(sum(result['ports'].values()) for result in results.values()),
+            'elapsed': elapsed,
+            'ports_per_second': scanned / elapsed if elapsed > 0 else 0.0
+        }
+        return results
+
+    async def scan_async(self,
+                         hosts: List[str],
+                         ports: List[int],
+                         progress: Optional[Callable[[int, int], None]] = None,
+                         host_complete: Optional[Callable[[str, Dict], None]] = None,
+                         results: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """Scan every port on every host from a running event loop.
+
+        Args:
+            hosts: IP addresses to scan
+            ports: Ports to scan on each host
+            progress: Called with (ports_done, ports_total) after each port
+            host_complete: Called with (host, result) when a host is done
+            results: Dict to fill in, as returned by scan()
+
+        Returns:
+            Dict mapping each host to its result
+        """
+        if results is None:
+            results = {host: {'ports': {}, 'banners': {}} for host in hosts}
+        limit = asyncio.Semaphore(self.max_concurrency)
+        total = len(hosts) * len(ports)
+        done = 0
+
+        def port_done():
+            nonlocal done
+            done += 1
+            if progress:
+                progress(done, total)
+
+        async def scan_host(host):
+            host_limit = asyncio.Semaphore(self.per_host_limit)
+            rtt = RttEstimator(self.timeout, self.min_timeout)
+
+            async def scan_port(port):
+                async with host_limit, limit:
+                    await self._scan_port(host, port, rtt, results[host])
+                port_done()
+
+            await asyncio.gather(*(scan_port(port) for port in ports))
+            if host_complete:
+                await asyncio.get_running_loop().run_in_executor(None, host_complete, host, results[host])
+
+        await asyncio.gather(*(scan_host(host) for host in hosts))
+        return results
+
+    async def _scan_port(self, host: str, port: int, rtt: RttEstimator, result: Dict):
+        """Connect to one port and read its banner if it is open."""
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), rtt.timeout)
+        except ConnectionRefusedError:
+            # A reset is a round trip too
+            rtt.update(time.perf_counter() - start)
+            result['ports'][port] = False
+            return
+        except (asyncio.TimeoutError, OSError) as e:
+            logger.debug(f"No connection to {host}:{port}: {e}")
+            result['ports'][port] = False
+            return
+
+        rtt.update(time.perf_counter() - start)
+        result['ports'][port] = True
+        logger.debug(f"Port {port} is open on {host}")
+        try:
+            if port in self.probes:
+                result['banners'][port] = await self._read_banner(reader, writer, host, port)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _read_banner(self, reader, writer, host: str, port: int) -> bytes:
+        """Send a port's probe and read the reply on an open connection."""
+        probe = self.probes[port]
+        try:
+            if probe:
+                writer.write(probe.replace(b"{host}", host.encode()))
+                await writer.drain()
+            return await asyncio.wait_for(reader.read(1024), self.banner_timeout)
+        except (asyncio.TimeoutError, OSError) as e:
+            logger.debug(f"No banner from {host}:{port}: {e}")
+            return b""
@@ -0,0 +1,393 @@
+"""
+Multi-pattern signature matching for payload inspection.
+
+Literal signatures are compiled into a single Aho-Corasick automaton so a
+payload is scanned once no matter how many signatures there are. Regex
+signatures are combined into one alternation with a named group per
+signature, and only run when the automaton has seen a literal that the
+regex requires.
+"""
+
+import re
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Characters with a special meaning in regular expressions
+REGEX_META = set('.^$*+?{}[]\\|()')
+
+# Cached candidate alternations kept per engine
+MAX_ALTERNATIONS = 256
+
+# Payload signatures for common web application attacks
+WEB_ATTACK_SIGNATURES = {
+    'sql_injection': [
+        r"'--", r"';", r"OR 1=1", r"' OR '1'='1", r" OR 1=1",
+        r"DROP TABLE", r"UNION SELECT", r"' UNION SELECT",
+        r"/*", r"*/", r"@@version", r"admin'--", r"' or 0=0 --",
+        r"INFORMATION_SCHEMA", r"sysobjects", r"xp_cmdshell", r"sp_password"
+    ],
+    'xss': [
+        r"<script>", r"</script>", r"<img src=", r"onerror=",
+        r"javascript:", r"onload=", r"alert\(", r"String.fromCharCode",
+        r"eval\(", r"document.cookie", r"document.location"
+    ],
+    'path_traversal': [
+        r"\.\.\/", r"\.\.\\", r"%2e%2e%2f", r"%252e%252e%255c",
+        r"\.\.%2f", r"\.\.%5c", r"/etc/passwd", r"C:\\Windows\\system32",
+        r"boot.ini", r"win.ini", r"/proc/self/", r"/var/www/"
+    ],
+    'command_injection': [
+        r";\s*\w+", r"\|\s*\w+", r"`\w+`", r"\$\(\w+\)",
+        r"ping ", r"wget ", r"curl ", r"nc ", r"bash ", r"cmd ",
+        r"cat /", r"rm -", r"chmod ", r"; ls", r"& dir"
+    ],
+    'file_inclusion': [
+        r"include=http", r"file=http", r"page=http", r"data=http",
+        r"include=ftp", r"php://input", r"zip://", r"phar://",
+        r"expect://", r"php://filter", r"/proc/self/environ"
+    ],
+}
+
+
+def literal_text(pattern: str) -> Optional[str]:
+    """Get the text a regex matches if it only matches one literal string.
+
+    Args:
+        pattern: Regular expression
+
+    Returns:
+        The literal string, or None if the pattern uses regex features
+    """
+    chars = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 >= len(pattern):
+                return None
+            escaped = pattern[i + 1]
+            if escaped.isalnum():
+                return None
+            chars.append(escaped)
+            i += 2
+        elif char in REGEX_META:
+            return None
+        else:
+            chars.append(char)
+            i += 1
+    return ''.join(chars)
+
+
+def required_literal(pattern: str) -> Optional[str]:
+    """Find the longest literal that every match of a regex contains.
+
+    Only simple patterns are understood. Alternations and groups give up
+    and return None, which means the regex is never prefiltered.
+
+    Args:
+        pattern: Regular expression
+
+    Returns:
+        The literal, or None if none could be found
+    """
+    runs = []
+    current = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 >= len(pattern):
+                return None
+            escaped = pattern[i + 1]
+            i += 2
+            if escaped in 'bBAZ':
+                # Zero-width assertions do not break a literal run
+                continue
+            # Escaped letters and digits are character classes or references
+            atom = None if escaped.isalnum() else escaped
+        elif char == '[':
+            end = pattern.find(']', i + 2)
+            if end < 0:
+                return None
+            atom = None
+            i = end + 1
+        elif char in '()|':
+            return None
+        elif char in '^$':
+            i += 1
+            continue
+        elif char == '.':
+            atom = None
+            i += 1
+        else:
+            atom = char
+            i += 1
+
+        # Quantifiers decide whether the atom is required
+        quantifier = pattern[i] if i < len(pattern) else ''
+        if quantifier in ('*', '?'):
+            required = False
+            i += 1
+        elif quantifier == '+':
+            required = True
+            i += 1
+        elif quantifier == '{':
+            end = pattern.find('}', i)
+            if end < 0:
+                return None
+            minimum = pattern[i + 1:end].split(',')[0].strip()
+            required = minimum.isdigit() and int(minimum) > 0
+            i = end + 1
+        else:
+            quantifier = ''
+            required = True
+        if quantifier and i < len(pattern) and pattern[i] == '?':
+            i += 1  # Lazy quantifier
+
+        if atom is not None and required:
+            current.append(atom)
+        if atom is None or quantifier:
+            runs.append(''.join(current))
+            current = []
+
+    runs.append(''.join(current))
+    longest = max(runs, key=len)
+    return longest or None
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton reporting every keyword found in a text.
+
+    Searches may run on several threads at once. The tables are rebuilt
+    under a lock and swapped in with one assignment, so a search uses
+    either the old tables or the new ones, never a mix.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, Any]] = ()):
+        """Build the automaton.
+
+        Args:
+            keywords: (keyword, value) pairs; value is reported for each match
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Any]] = [[]]  # Values of keywords ending at each state
+        # (transition table per state, outputs merged along failure links)
+        self._tables: Optional[Tuple[List[Dict[str, int]], List[List[Any]]]] = None
+        self._lock = threading.Lock()
+        self.keyword_count = 0
+        for keyword, value in keywords:
+            self.add(keyword, value)
+
+    def add(self, keyword: str, value: Any):
+        """Add a keyword. The automaton is rebuilt by build() or the next search."""
+        if not keyword:
+            raise ValueError("Keywords must not be empty")
+        with self._lock:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(value)
+            self.keyword_count += 1
+            self._tables = None
+
+    def build(self) -> Tuple[List[Dict[str, int]], List[List[Any]]]:
+        """Compute failure links breadth first and fold them into a DFA.
+
+        Every state gets a full transition table, so matching never has to
+        follow failure links and costs one dict lookup per character.
+
+        Returns:
+            The (transitions, outputs) tables now in use
+        """
+        with self._lock:
+            if self._tables is not None:
+                return self._tables
+            matches = [list(values) for values in self._output]
+            delta = [dict(self._goto[0])] + [None] * (len(self._goto) - 1)
+            pending = deque(self._goto[0].values())
+            for state in pending:
+                self._fail[state] = 0
+            while pending:
+                state = pending.popleft()
+                # Failure states are shallower, so their tables already exist
+                fail = self._fail[state]
+                transitions = dict(delta[fail]) if state else {}
+                transitions.update(self._goto[state])
+                delta[state] = transitions
+                for char, next_state in self._goto[state].items():
+                    pending.append(next_state)
+                    self._fail[next_state] = delta[fail].get(char, 0) if state else 0
+                    matches[next_state] += matches[self._fail[next_state]]
+            self._tables = (delta, matches)
+            return self._tables
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, Any]]:
+        """Yield (end_index, value) for every keyword occurrence in text."""
+        delta, output = self._tables or self.build()
+        state = 0
+        for index, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if output[state]:
+                for value in output[state]:
+                    yield index, value
+
+
+class SignatureEngine:
+    """Matches a payload against families of signatures in one pass.
+
+    Each family maps to a list of regex signatures. scan() reports the
+    first signature found for every family that matched.
+    """
+
+    def __init__(self, families: Dict[str, Iterable[str]], ignore_case: bool = True):
+        """Compile the signatures.
+
+        Args:
+            families: Family name -> regex signatures
+            ignore_case: Whether matching ignores case
+        """
+        self.ignore_case = ignore_case
+        self.families = list(families)
+        flags = re.IGNORECASE if ignore_case else 0
+
+        self._automaton = AhoCorasick()
+        self._always: Dict[str, str] = {}  # Families with a signature matching any payload
+        self._regexes: List[Tuple[str, str, Any]] = []  # (family, signature, compiled)
+        self._unfiltered: List[int] = []  # Regexes without a required literal
+        self.literal_count = 0
+
+        for family, signatures in families.items():
+            for signature in signatures:
+                literal = literal_text(signature)
+                if literal is None:
+                    try:
+                        compiled = re.compile(signature, flags)
+                    except re.error:
+                        # Invalid regexes are matched as plain text
+                        literal = signature
+                if literal is not None:
+                    self._automaton.add(self._fold(literal), (family, signature))
+                    self.literal_count += 1
+                    continue
+
+                if compiled.search('') is not None:
+                    self._always.setdefault(family, signature)
+                    continue
+
+                index = len(self._regexes)
+                self._regexes.append((family, signature, compiled))
+                prefilter = required_literal(signature)
+                if prefilter:
+                    self._automaton.add(self._fold(prefilter), index)
+                else:
+                    self._unfiltered.append(index)
+
+        # Alternations over the candidate regexes, keyed by their indexes
+        self._flags = flags
+        self._alternations: Dict[Tuple[int, ...], Any] = {}
+
+        # Built now rather than on the first scan, which may run on any thread
+        self._automaton.build()
+
+    @property
+    def regex_count(self) -> int:
+        """Number of signatures matched as regular expressions."""
+        return len(self._regexes) + len(self._always)
+
+    def _fold(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def scan(self, text: str) -> Dict[str, str]:
+        """Find the families matching a payload.
+
+        Args:
+            text: Payload to inspect
+
+        Returns:
+            Dict mapping each matched family to the first signature found
+        """
+        matches = dict(self._always)
+        candidates: Set[int] = set(self._unfiltered)
+
+        for _, value in self._automaton.iter_matches(self._fold(text)):
+            if isinstance(value, int):
+                candidates.add(value)
+            elif value[0] not in matches:
+                matches[value[0]] = value[1]
+
+        # Regexes whose family already matched need not run
+        candidates = {index for index in candidates if self._regexes[index][0] not in matches}
+        if not candidates:
+            return self._ordered(matches)
+
+        found = False
+        for match in self._alternation(candidates).finditer(text):
+            found = True
+            family, signature, _ = self._regexes[int(match.lastgroup[1:])]
+            if family not in matches:
+                matches[family] = signature
+        if not found:
+            return self._ordered(matches)
+
+        # The alternation reports one signature per position, so check
+        # candidates whose match may have been hidden by an overlapping one
+        for index in sorted(candidates):
+            family, signature, compiled = self._regexes[index]
+            if family not in matches and compiled.search(text):
+                matches[family] = signature
+
+        return self._ordered(matches)
+
+    def _alternation(self, candidates: Set[int]):
+        """Get one regex with a named group for each candidate signature.
+
+        Payloads usually trigger the same few prefilters, so the compiled
+        alternations are cached by candidate set.
+        """
+        key = tuple(sorted(candidates))
+        combined = self._alternations.get(key)
+        if combined is None:
+            if len(self._alternations) >= MAX_ALTERNATIONS:
+                self._alternations.clear()
+            combined = re.compile(
+                '|'.join(f'(?P<s{index}>{self._regexes[index][1]})' for index in key),
+                self._flags
+            )
+            self._alternations[key] = combined
+        return combined
+
+    def _ordered(self, matches: Dict[str, str]) -> Dict[str, str]:
+        """Sort matches by family definition order."""
+        return {family: matches[family] for family in self.families if family in matches}
+
+    def match(self, text: str) -> Optional[Tuple[str, str]]:
+        """Get the first matching (family, signature), if any."""
+        matches = self.scan(text)
+        if not matches:
+            return None
+        family = next(iter(matches))
+        return family, matches[family]
+
+
+_web_engine = None
+
+
+def get_web_signature_engine() -> SignatureEngine:
+    """Get the shared engine for WEB_ATTACK_SIGNATURES.
+
+    Returns:
+        SignatureEngine: Shared engine instance
+    """
+    global _web_engine
+    if _web_engine is None:
+        _web_engine = SignatureEngine(WEB_ATTACK_SIGNATURES)
+    return _web_engine
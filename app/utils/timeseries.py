@@ -0,0 +1,427 @@
+"""
+Multi-resolution time-series store for ARPGuard monitoring.
+
+Counters are rolled up into 1 second, 1 minute and 1 hour buckets kept in
+fixed-size in-memory rings. Closed buckets are appended to fixed-width
+segment files on disk, so a range query touches only the buckets in the
+range, however long the capture history is.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.logger import get_logger
+
+# Module logger
+logger = get_logger('utils.timeseries')
+
+# Counter fields summed per bucket
+COUNTERS = (
+    'packets',
+    'bytes',
+    'arp_requests',
+    'arp_replies',
+    'alerts',
+)
+
+# Protocols with their own byte counter; anything else is counted as "other"
+PROTOCOLS = ('arp', 'ip', 'tcp', 'udp', 'icmp', 'dns', 'http', 'other')
+
+# Gauges are stored as a sum and a sample count and read back as averages;
+# response_time is the API request latency in milliseconds
+GAUGES = ('cpu_usage', 'memory_usage', 'response_time')
+
+FIELDS = (
+    COUNTERS
+    + tuple(f'bytes_{protocol}' for protocol in PROTOCOLS)
+    + tuple(f'{gauge}_sum' for gauge in GAUGES)
+    + tuple(f'{gauge}_count' for gauge in GAUGES)
+)
+FIELD_INDEX = {name: i for i, name in enumerate(FIELDS)}
+
+# On-disk record: bucket number followed by one float64 per field
+RECORD_DTYPE = np.dtype([('bucket', '<i8'), ('values', '<f8', (len(FIELDS),))])
+
+# (name, bucket seconds, buckets kept in memory, seconds per segment file, seconds kept on disk)
+RESOLUTIONS = (
+    ('1s', 1, 3600, 3600, 2 * 86400),
+    ('1m', 60, 1440, 86400, 30 * 86400),
+    ('1h', 3600, 24 * 90, 30 * 86400, 2 * 365 * 86400),
+)
+
+
+class Rollup:
+    """One resolution: an in-memory ring of buckets plus its disk segments."""
+
+    def __init__(self, name: str, seconds: int, capacity: int,
+                 segment_seconds: int, retention_seconds: int,
+                 directory: Optional[str]):
+        """Initialize the rollup.
+
+        Args:
+            name: Resolution name, also the segment sub-directory
+            seconds: Bucket width in seconds
+            capacity: Number of buckets kept in memory
+            segment_seconds: Time span covered by one segment file
+            retention_seconds: How long segment files are kept
+            directory: Segment directory, or None to keep data in memory only
+        """
+        self.name = name
+        self.seconds = seconds
+        self.capacity = capacity
+        self.segment_seconds = segment_seconds
+        self.retention_seconds = retention_seconds
+        self.directory = os.path.join(directory, name) if directory else None
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+        self.buckets = np.full(capacity, -1, dtype=np.int64)
+        self.values = np.zeros((capacity, len(FIELDS)), dtype=np.float64)
+        self.latest = -1
+        # Buckets changed since they were last written to disk
+        self.dirty = set()
+        # Newest bucket written by an earlier run; buckets up to it may be on disk
+        self.disk_latest = self._find_disk_latest()
+
+    def add(self, bucket: int, values: np.ndarray):
+        """Add field values to a bucket."""
+        if self.latest >= 0 and bucket <= self.latest - self.capacity:
+            # Too old for the ring; merge straight into the stored record
+            self._append_records(self._merge_from_disk(bucket, values))
+            return
+
+        slot = bucket % self.capacity
+        if self.buckets[slot] != bucket:
+            if self.buckets[slot] >= 0 and self.buckets[slot] in self.dirty:
+                self._write_slot(slot)
+            self.buckets[slot] = bucket
+            self.values[slot] = 0.0
+            if bucket <= self.disk_latest:
+                # Continue a bucket a previous run had already started
+                self._read_disk(bucket, bucket, self.values[slot:slot + 1])
+        self.values[slot] += values
+
+        self.latest = max(self.latest, bucket)
+        self.dirty.add(bucket)
+
+    def flush(self, include_open: bool = False):
+        """Write dirty buckets to disk.
+
+        Args:
+            include_open: Also write the current (still open) bucket
+        """
+        if not self.directory:
+            self.dirty.clear()
+            return
+
+        closed = sorted(bucket for bucket in self.dirty if include_open or bucket < self.latest)
+        if not closed:
+            return
+
+        records = np.zeros(len(closed), dtype=RECORD_DTYPE)
+        for i, bucket in enumerate(closed):
+            records[i] = (bucket, self.values[bucket % self.capacity])
+            self.dirty.discard(bucket)
+        self._append_records(records)
+
+    def query(self, start_bucket: int, end_bucket: int) -> np.ndarray:
+        """Get field values for a range of buckets.
+
+        Args:
+            start_bucket: First bucket number (inclusive)
+            end_bucket: Last bucket number (inclusive)
+
+        Returns:
+            Array of shape (buckets, fields); empty buckets are zero
+        """
+        ids = np.arange(start_bucket, end_bucket + 1, dtype=np.int64)
+        result = np.zeros((len(ids), len(FIELDS)), dtype=np.float64)
+        if not len(ids):
+            return result
+
+        # Buckets evicted from the ring or written by an earlier run live on disk
+        memory_start = self.disk_latest + 1
+        if self.latest >= 0:
+            memory_start = max(memory_start, self.latest - self.capacity + 1)
+        if start_bucket < memory_start:
+            self._read_disk(start_bucket, min(end_bucket, memory_start - 1), result)
+
+        slots = ids % self.capacity
+        in_memory = self.buckets[slots] == ids
+        result[in_memory] = self.values[slots[in_memory]]
+        return result
+
+    def _find_disk_latest(self) -> int:
+        if not self.directory:
+            return -1
+        segments = []
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.seg') and filename[:-4].isdigit():
+                segments.append(int(filename[:-4]))
+        if not segments:
+            return -1
+        records = self._load_segment(os.path.join(self.directory, f"{max(segments)}.seg"))
+        return int(records['bucket'].max()) if len(records) else -1
+
+    def _segment_path(self, bucket: int) -> str:
+        segment = bucket * self.seconds // self.segment_seconds * self.segment_seconds
+        return os.path.join(self.directory, f"{segment}.seg")
+
+    def _write_slot(self, slot: int):
+        bucket = int(self.buckets[slot])
+        record = np.zeros(1, dtype=RECORD_DTYPE)
+        record[0] = (bucket, self.values[slot])
+        self.dirty.discard(bucket)
+        self._append_records(record)
+
+    def _append_records(self, records: np.ndarray):
+        """Append records to their segment files (records are sorted by bucket)."""
+        if not self.directory or not len(records):
+            return
+        paths = [self._segment_path(int(bucket)) for bucket in records['bucket']]
+        start = 0
+        for i in range(1, len(records) + 1):
+            if i == len(records) or paths[i] != paths[start]:
+                new_file = not os.path.exists(paths[start])
+                with open(paths[start], 'ab') as f:
+                    records[start:i].tofile(f)
+                if new_file:
+                    self._prune()
+                start = i
+
+    def _load_segment(self, path: str) -> np.ndarray:
+        try:
+            return np.fromfile(path, dtype=RECORD_DTYPE)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading time-series segment {path}: {e}")
+            return np.zeros(0, dtype=RECORD_DTYPE)
+
+    def _read_disk(self, start_bucket: int, end_bucket: int, result: np.ndarray):
+        """Fill result rows for a bucket range from the segment files."""
+        if not self.directory:
+            return
+        base = start_bucket
+        first_segment = start_bucket * self.seconds // self.segment_seconds
+        last_segment = end_bucket * self.seconds // self.segment_seconds
+        for segment in range(first_segment, last_segment + 1):
+            path = os.path.join(self.directory, f"{segment * self.segment_seconds}.seg")
+            if not os.path.exists(path):
+                continue
+            records = self._load_segment(path)
+            # Buckets may have been rewritten after late updates; the last record wins
+            records = records[::-1]
+            _, unique = np.unique(records['bucket'], return_index=True)
+            records = records[unique]
+            selected = records[(records['bucket'] >= start_bucket) & (records['bucket'] <= end_bucket)]
+            result[selected['bucket'] - base] = selected['values']
+
+    def _merge_from_disk(self, bucket: int, values: np.ndarray) -> np.ndarray:
+        existing = np.zeros((1, len(FIELDS)), dtype=np.float64)
+        self._read_disk(bucket, bucket, existing)
+        record = np.zeros(1, dtype=RECORD_DTYPE)
+        record[0] = (bucket, existing[0] + values)
+        return record
+
+    def _prune(self):
+        """Delete segment files older than the retention period."""
+        cutoff = self.latest * self.seconds - self.retention_seconds
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.seg'):
+                continue
+            try:
+                segment_start = int(filename[:-4])
+            except ValueError:
+                continue
+            if segment_start + self.segment_seconds <= cutoff:
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError as e:
+                    logger.error(f"Error removing time-series segment {filename}: {e}")
+
+
+class TimeSeriesStore:
+    """Rolled-up traffic, alert and system metrics at 1s, 1m and 1h resolution.
+
+    Every record() adds to the current bucket of each resolution. Dirty
+    buckets are appended to disk every flush_interval seconds; queries read
+    the in-memory rings and fall back to segment files for older ranges.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 5.0):
+        """Initialize the store.
+
+        Args:
+            directory: Directory for segment files, or None to keep data in memory only
+            flush_interval: Seconds between writes of closed buckets
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.rollups = {
+            name: Rollup(name, seconds, capacity, segment_seconds, retention, directory)
+            for name, seconds, capacity, segment_seconds, retention in RESOLUTIONS
+        }
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.last_flush = time.monotonic()
+        self.totals = np.zeros(len(FIELDS), dtype=np.float64)
+
+    def record(self, timestamp: Optional[float] = None, **fields: float):
+        """Add values to the buckets containing a timestamp.
+
+        Args:
+            timestamp: Epoch seconds (defaults to now)
+            **fields: Values to add, keyed by field name (see FIELDS)
+        """
+        values = np.zeros(len(FIELDS), dtype=np.float64)
+        for name, value in fields.items():
+            values[FIELD_INDEX[name]] = value
+        self._add(time.time() if timestamp is None else timestamp, values)
+
+    def record_packet(self, packet_info: Dict, timestamp: Optional[float] = None):
+        """Count one captured packet.
+
+        Args:
+            packet_info: Packet dictionary from the capture pipeline
+            timestamp: Epoch seconds (defaults to the packet's time, then now)
+        """
+        if timestamp is None:
+            packet_time = packet_info.get('time')
+            timestamp = packet_time.timestamp() if hasattr(packet_time, 'timestamp') else time.time()
+
+        length = packet_info.get('length', 0) or 0
+        protocol = str(packet_info.get('protocol', '')).lower()
+        if protocol not in PROTOCOLS:
+            protocol = 'other'
+
+        values = np.zeros(len(FIELDS), dtype=np.float64)
+        values[FIELD_INDEX['packets']] = 1
+        values[FIELD_INDEX['bytes']] = length
+        values[FIELD_INDEX[f'bytes_{protocol}']] = length
+        arp_op = packet_info.get('arp_op')
+        if arp_op == 'request':
+            values[FIELD_INDEX['arp_requests']] = 1
+        elif arp_op == 'reply':
+            values[FIELD_INDEX['arp_replies']] = 1
+        self._add(timestamp, values)
+
+    def record_alert(self, timestamp: Optional[float] = None, count: int = 1):
+        """Count raised alerts."""
+        self.record(timestamp, alerts=count)
+
+    def record_gauges(self, timestamp: Optional[float] = None, **gauges: float):
+        """Add samples of averaged gauges (cpu_usage, memory_usage, response_time)."""
+        fields = {}
+        for name, value in gauges.items():
+            if name in GAUGES and value is not None:
+                fields[f'{name}_sum'] = value
+                fields[f'{name}_count'] = 1
+        if fields:
+            self.record(timestamp, **fields)
+
+    def _add(self, timestamp: float, values: np.ndarray):
+        second = int(timestamp)
+        with self.lock:
+            for rollup in self.rollups.values():
+                rollup.add(second // rollup.seconds, values)
+            self.totals += values
+
+            if time.monotonic() - self.last_flush >= self.flush_interval:
+                self._flush(include_open=False)
+
+    def flush(self):
+        """Write every dirty bucket, including the open ones, to disk."""
+        with self.lock:
+            self._flush(include_open=True)
+
+    def _flush(self, include_open: bool):
+        for rollup in self.rollups.values():
+            try:
+                rollup.flush(include_open)
+            except OSError as e:
+                logger.error(f"Error writing {rollup.name} time-series buckets: {e}")
+        self.last_flush = time.monotonic()
+
+    def query(self, metric: str, start: float, end: float,
+              interval: int = 60, max_points: int = 1000) -> List[Tuple[float, float]]:
+        """Get a metric over a time range.
+
+        Reads the coarsest resolution whose bucket width divides the
+        interval, then sums groups of buckets into interval-sized points.
+        Counters come back as totals per interval and gauges as averages.
+
+        Args:
+            metric: Field name, "<gauge>" for an averaged gauge, or "packet_rate"/"byte_rate"
+            start: Range start in epoch seconds
+            end: Range end in epoch seconds
+            interval: Seconds per data point
+            max_points: Maximum number of data points
+
+        Returns:
+            List of (interval start, value) tuples
+
+        Raises:
+            ValueError: On an unknown metric or a range with too many points
+        """
+        if metric not in FIELD_INDEX and metric not in GAUGES and metric not in ('packet_rate', 'byte_rate'):
+            raise ValueError(f"Unknown metric: {metric}")
+        interval = max(1, int(interval))
+        first_point = int(start) // interval
+        last_point = int(end) // interval
+        if last_point - first_point + 1 > max_points:
+            raise ValueError(f"Range has {last_point - first_point + 1} points, more than {max_points}")
+        if last_point < first_point:
+            return []
+
+        rollup = next(r for r in reversed(list(self.rollups.values())) if interval % r.seconds == 0)
+        per_point = interval // rollup.seconds
+
+        with self.lock:
+            values = rollup.query(first_point * per_point, (last_point + 1) * per_point - 1)
+        points = values.reshape(last_point - first_point + 1, per_point, len(FIELDS)).sum(axis=1)
+
+        if metric in GAUGES:
+            sums = points[:, FIELD_INDEX[f'{metric}_sum']]
+            counts = points[:, FIELD_INDEX[f'{metric}_count']]
+            series = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        elif metric == 'packet_rate':
+            series = points[:, FIELD_INDEX['packets']] / interval
+        elif metric == 'byte_rate':
+            series = points[:, FIELD_INDEX['bytes']] / interval
+        else:
+            series = points[:, FIELD_INDEX[metric]]
+
+        return [((first_point + i) * interval, float(value)) for i, value in enumerate(series)]
+
+    def get_totals(self) -> Dict[str, float]:
+        """Get totals of every counter since the store was created."""
+        with self.lock:
+            totals = {name: float(self.totals[FIELD_INDEX[name]]) for name in COUNTERS}
+        totals['uptime_seconds'] = time.time() - self.started_at
+        return totals
+
+    def close(self):
+        """Write all pending buckets to disk."""
+        self.flush()
+
+
+# Create a singleton instance
+_store_instance = None
+_store_lock = threading.Lock()
+
+
+def get_timeseries_store() -> TimeSeriesStore:
+    """Get the time-series store singleton instance.
+
+    Returns:
+        TimeSeriesStore: The store, persisted under ~/.arpguard/timeseries
+    """
+    global _store_instance
+    with _store_lock:
+        if _store_instance is None:
+            directory = os.path.join(os.path.expanduser("~"), ".arpguard", "timeseries")
+            _store_instance = TimeSeriesStore(directory)
+        return _store_instance
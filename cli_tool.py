@@ -29,6 +29,11 @@ except ImportError:
     print("Warning: netifaces library not found. Some functionality may be limited.")
     netifaces = None
 
+try:
+    from app.utils.mac_vendor import get_vendor_name
+except ImportError:
+    get_vendor_name = None
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -143,9 +148,9 @@ class NetworkScanner:
     
     def get_vendor(self, mac):
         """Get vendor for a MAC address."""
-        # This is a simplified version - in a real implementation you'd
-        # use a MAC vendor database
-        return "Unknown"
+        if get_vendor_name is None:
+            return "Unknown"
+        return get_vendor_name(mac)
 
 class ARPSpooferDetector:
     """ARP spoofing detector component."""
@@ -19,7 +19,8 @@ logger = logging.getLogger("arp_guard.analytics.api")
 class AnalyticsAPI:
     """API for accessing analytics data."""
     
-    def __init__(self, db_path: str, host: str = "0.0.0.0", port: int = 5000):
+    def __init__(self, db_path: str, host: str = "0.0.0.0", port: int = 5000,
+                 alert_manager=None):
         """
         Initialize the analytics API.
         
@@ -27,10 +28,13 @@ class AnalyticsAPI:
             db_path: Path to the SQLite database file
             host: Host to bind the API server to
             port: Port to bind the API server to
+            alert_manager: Optional AlertManager whose alert store backs
+                the live alert endpoint
         """
         self.db_path = db_path
         self.host = host
         self.port = port
+        self.alert_manager = alert_manager
         self.app = Flask(__name__)
         CORS(self.app)  # Enable CORS for all routes
         
@@ -163,7 +167,9 @@ class AnalyticsAPI:
         @self._check_permission("dashboard:view")
         def get_sessions():
             try:
-                limit = int(request.args.get("limit", 100))
+                limit = self._parse_limit(request.args.get("limit"))
+                if limit is None:
+                    return jsonify({"error": "limit must be a positive integer"}), 400
                 
                 sessions = self.schema.get_sessions(limit=limit)
                 
@@ -244,6 +250,52 @@ class AnalyticsAPI:
                 logger.error(f"Error getting dashboard data: {str(e)}")
                 return jsonify({"error": str(e)}), 500
                 
+        # Live alerts endpoint, answered from the alert store's indexes
+        @self.app.route("/api/alerts/live", methods=["GET"])
+        @self._require_auth
+        @self._check_permission("dashboard:view")
+        def get_live_alerts():
+            if self.alert_manager is None:
+                return jsonify({"error": "Live alerts are not available"}), 404
+            limit = self._parse_limit(request.args.get("limit"))
+            if limit is None:
+                return jsonify({"error": "limit must be a positive integer"}), 400
+            try:
+                from src.core.alert import AlertPriority, AlertStatus, AlertType
+                
+                status = request.args.get("status")
+                alert_type = request.args.get("type")
+                priority = request.args.get("priority")
+                start = self._parse_date(request.args.get("start_date"))
+                end = self._parse_date(request.args.get("end_date"))
+                
+                alerts = self.alert_manager.get_alerts(
+                    status=AlertStatus[status.upper()] if status else None,
+                    alert_type=AlertType[alert_type.upper()] if alert_type else None,
+                    priority=AlertPriority[priority.upper()] if priority else None,
+                    source=request.args.get("source"),
+                    start_time=start.timestamp() if start else None,
+                    end_time=end.timestamp() if end else None,
+                    limit=limit
+                )
+                status_info = self.alert_manager.get_status()
+                
+                return jsonify({
+                    "alerts": [alert.to_dict() for alert in alerts],
+                    "count": len(alerts),
+                    "counts": {
+                        "by_status": status_info["status_counts"],
+                        "by_type": status_info["type_counts"],
+                        "by_priority": status_info["priority_counts"]
+                    }
+                })
+            
+            except KeyError as e:
+                return jsonify({"error": f"Unknown filter value: {e}"}), 400
+            except Exception as e:
+                logger.error(f"Error getting live alerts: {str(e)}")
+                return jsonify({"error": str(e)}), 500
+                
         # Export endpoints
         @self.app.route("/api/export/csv", methods=["GET"])
         @self._require_auth
@@ -286,6 +338,26 @@ class AnalyticsAPI:
             logger.warning(f"Invalid date format: {date_str}")
             return None
     
+    def _parse_limit(self, limit_str: Optional[str], default: int = 100) -> Optional[int]:
+        """
+        Parse a result limit query parameter.
+        
+        Args:
+            limit_str: Limit as given in the query string
+            default: Limit to use when none is given
+            
+        Returns:
+            The limit, or None if it is not a positive integer
+        """
+        if limit_str is None:
+            return default
+        
+        try:
+            limit = int(limit_str)
+        except ValueError:
+            return None
+        return limit if limit > 0 else None
+    
     def start(self):
         """Start the API server."""
         logger.info(f"Starting AnalyticsAPI server on {self.host}:{self.port}")
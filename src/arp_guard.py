@@ -32,6 +32,8 @@ from core.module_factory import ModuleFactory
 from core.detection_module import DetectionModule
 from core.lite_detection_module import LiteDetectionModule
 from core.remediation_module import RemediationModule
+from core.arp_batch import ARPBatch
+from core.capture_engine import FrameBatch, CAPTURE_ENGINES, ENGINE_SCAPY, open_capture_engine
 
 # Default configuration
 DEFAULT_CONFIG = {
@@ -46,6 +48,9 @@ DEFAULT_CONFIG = {
     "sampling_rate": 0.5,
     "batch_size": 50,
     "prioritize_packets": True,
+    "capture_engine": "scapy",  # "scapy", "ring" (AF_PACKET mmap ring) or "auto"
+    "execution_mode": "thread",  # "thread" or "process" (worker processes fed by shared memory rings)
+    "worker_processes": 2,
     "remediation_enabled": False,
     "protection_methods": ["notify"],
     "use_lite_version": False,  # Default to full version
@@ -176,9 +181,14 @@ class ARPGuard:
         logger.info("ARP Guard stopped")
         
     def _capture_packets(self) -> None:
-        """Capture packets using scapy"""
+        """Capture packets using the configured capture engine"""
         logger.info(f"Starting packet capture on interface {self.interface}")
         
+        # The lite module only understands scapy packets
+        if self.config.get("capture_engine", ENGINE_SCAPY) != ENGINE_SCAPY and not self.use_lite_version:
+            self._capture_frames()
+            return
+        
         try:
             # Start packet capture with filter for ARP packets
             scapy.sniff(
@@ -193,6 +203,22 @@ class ARPGuard:
             
         logger.info("Packet capture stopped")
         
+    def _capture_frames(self) -> None:
+        """Capture raw frames using a non-scapy capture engine"""
+        try:
+            engine = open_capture_engine(self.config["capture_engine"], interface=self.interface)
+            with engine:
+                engine.capture(self._frames_callback, self.stop_event)
+        except Exception as e:
+            logger.error(f"Error in packet capture: {e}")
+            
+        logger.info("Packet capture stopped")
+        
+    def _frames_callback(self, frames: FrameBatch) -> None:
+        """Callback for frame batches from a capture engine"""
+        for view in ARPBatch.from_frames(frames).views():
+            self._packet_callback(view)
+        
     def _packet_callback(self, packet: scapy.Packet) -> None:
         """Callback for packet capture"""
         try:
@@ -268,6 +294,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--lite", action="store_true", help="Use lite version of detection module")
     parser.add_argument("--auto-protect", action="store_true", help="Enable automatic protection")
     parser.add_argument("--daemon", action="store_true", help="Run as daemon in background")
+    parser.add_argument("--capture-engine", choices=CAPTURE_ENGINES,
+                        help="Packet capture backend (ring = zero-copy AF_PACKET ring, Linux only)")
     
     return parser.parse_args()
 
@@ -329,6 +357,9 @@ def main() -> None:
         
     if args.lite:
         config["use_lite_version"] = True
+        
+    if args.capture_engine:
+        config["capture_engine"] = args.capture_engine
     
     # Create and start ARP Guard
     arp_guard = ARPGuard(config)
@@ -36,6 +36,9 @@ class AlertStatus(Enum):
     IGNORED = auto()      # Alert has been ignored
     CLOSED = auto()        # Alert has been closed
 
+# Statuses of alerts that still need attention
+ACTIVE_STATUSES = (AlertStatus.NEW, AlertStatus.ACKNOWLEDGED)
+
 @dataclass
 class Alert:
     """Represents an alert in the system."""
@@ -75,12 +78,12 @@ class Alert:
         return cls(
             id=data["id"],
             type=AlertType(data["type"]),
-            priority=AlertPriority(data["priority"]),
+            priority=AlertPriority[data["priority"]],
             message=data["message"],
             timestamp=data["timestamp"],
             source=data["source"],
             details=data["details"],
-            status=AlertStatus(data["status"]),
+            status=AlertStatus[data["status"]],
             acknowledged_at=data["acknowledged_at"],
             resolved_at=data["resolved_at"],
             acknowledgement_message=data["acknowledgement_message"],
@@ -126,6 +129,32 @@ class AlertChannel:
             logger.error(f"Error sending alert {alert.id} via {self.name} channel: {e}")
             return False
     
+    def send_batch(self, alerts: List[Alert]) -> bool:
+        """
+        Send several alerts at once, as a digest if there is more than one.
+        
+        Args:
+            alerts: Alerts to send
+            
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        if len(alerts) == 1:
+            return self.send(alerts[0])
+        if not self.enabled:
+            return False
+            
+        try:
+            success = self._send_digest(alerts)
+            if success:
+                logger.info(f"Digest of {len(alerts)} alerts sent via {self.name} channel.")
+            else:
+                logger.warning(f"Failed to send digest of {len(alerts)} alerts via {self.name} channel.")
+            return success
+        except Exception as e:
+            logger.error(f"Error sending digest via {self.name} channel: {e}")
+            return False
+    
     def _send_alert(self, alert: Alert) -> bool:
         """
         Implement this method in subclasses to send alert.
@@ -138,6 +167,22 @@ class AlertChannel:
         """
         raise NotImplementedError("Subclasses must implement this method")
     
+    def _send_digest(self, alerts: List[Alert]) -> bool:
+        """
+        Send several alerts. Subclasses may override this to combine them
+        into one message; by default they are sent one by one.
+        
+        Args:
+            alerts: Alerts to send
+            
+        Returns:
+            True if all were sent successfully, False otherwise
+        """
+        return all([self._send_alert(alert) for alert in alerts])
+    
+    def close(self) -> None:
+        """Release any connection the channel keeps open."""
+    
     def enable(self) -> None:
         """Enable this channel."""
         self.enabled = True
@@ -154,21 +199,28 @@ class AlertManager:
     - Creating and storing alerts
     - Routing alerts to notification channels
     - Managing alert lifecycle (acknowledge, resolve, etc.)
-    - Storing alert history
+    - Storing alert history in an indexed, optionally persistent AlertStore
     """
     
-    def __init__(self, storage_path: Optional[str] = None):
+    def __init__(self, storage_path: Optional[str] = None, dispatcher=None):
         """
         Initialize alert manager.
         
         Args:
-            storage_path: Path to store alerts. If None, alerts will only be kept in memory.
-        """
+            storage_path: Directory to store alerts in; alerts stored there
+                are loaded straight away. If None, alerts will only be kept in memory.
+            dispatcher: NotificationDispatcher delivering alerts to the
+                channels; a default one is created if None
+        """
+        # Imported here, these modules depend on this one
+        from .alert_store import AlertStore
+        from .notification_dispatcher import NotificationDispatcher
+        
         self.storage_path = storage_path
+        self.dispatcher = dispatcher or NotificationDispatcher()
         self.channels: List[AlertChannel] = []
-        self.alerts: Dict[str, Alert] = {}  # id -> Alert
+        self.store = AlertStore(storage_path, max_alerts=1000)
         self.alert_filters: List[Callable[[Alert], bool]] = []
-        self.max_alerts = 1000  # Maximum number of alerts to keep in memory
         
         # Callbacks
         self.on_alert_created: Optional[Callable[[Alert], None]] = None
@@ -176,6 +228,23 @@ class AlertManager:
         
         # Thread safety
         self.lock = threading.Lock()
+        
+        if storage_path:
+            self.load_alerts()
+    
+    @property
+    def alerts(self) -> Dict[str, Alert]:
+        """Stored alerts by ID; change them through the manager."""
+        return self.store.alerts
+    
+    @property
+    def max_alerts(self) -> int:
+        """Maximum number of alerts to keep."""
+        return self.store.max_alerts
+    
+    @max_alerts.setter
+    def max_alerts(self, value: int) -> None:
+        self.store.max_alerts = value
     
     def add_channel(self, channel: AlertChannel) -> None:
         """
@@ -186,6 +255,7 @@ class AlertManager:
         """
         with self.lock:
             self.channels.append(channel)
+        self.dispatcher.add_channel(channel)
         logger.info(f"Added {channel.name} notification channel.")
     
     def remove_channel(self, channel_name: str) -> bool:
@@ -202,9 +272,14 @@ class AlertManager:
             for i, channel in enumerate(self.channels):
                 if channel.name == channel_name:
                     del self.channels[i]
-                    logger.info(f"Removed {channel_name} notification channel.")
-                    return True
-                    
+                    break
+            else:
+                channel = None
+        if channel is not None:
+            self.dispatcher.remove_channel(channel_name)
+            logger.info(f"Removed {channel_name} notification channel.")
+            return True
+            
         logger.warning(f"Channel {channel_name} not found, cannot remove.")
         return False
     
@@ -260,18 +335,7 @@ class AlertManager:
         
         # Store alert
         with self.lock:
-            self.alerts[alert_id] = alert
-            
-            # Trim if too many alerts
-            if len(self.alerts) > self.max_alerts:
-                # Remove oldest alerts
-                oldest_ids = sorted(
-                    self.alerts.keys(), 
-                    key=lambda aid: self.alerts[aid].timestamp
-                )[:len(self.alerts) - self.max_alerts]
-                
-                for old_id in oldest_ids:
-                    del self.alerts[old_id]
+            self.store.add(alert)
         
         # Send notifications
         self._notify_channels(alert)
@@ -297,7 +361,7 @@ class AlertManager:
             The alert if found, None otherwise
         """
         with self.lock:
-            return self.alerts.get(alert_id)
+            return self.store.get(alert_id)
     
     def acknowledge_alert(
         self, 
@@ -315,13 +379,14 @@ class AlertManager:
             True if alert was acknowledged, False if not found
         """
         with self.lock:
-            alert = self.alerts.get(alert_id)
+            alert = self.store.update(
+                alert_id,
+                status=AlertStatus.ACKNOWLEDGED,
+                acknowledged_at=time.time(),
+                acknowledgement_message=message
+            )
             if not alert:
                 return False
-                
-            alert.status = AlertStatus.ACKNOWLEDGED
-            alert.acknowledged_at = time.time()
-            alert.acknowledgement_message = message
         
         # Call callback if set
         if self.on_alert_updated:
@@ -349,13 +414,14 @@ class AlertManager:
             True if alert was resolved, False if not found
         """
         with self.lock:
-            alert = self.alerts.get(alert_id)
+            alert = self.store.update(
+                alert_id,
+                status=AlertStatus.RESOLVED,
+                resolved_at=time.time(),
+                resolution_message=message
+            )
             if not alert:
                 return False
-                
-            alert.status = AlertStatus.RESOLVED
-            alert.resolved_at = time.time()
-            alert.resolution_message = message
         
         # Call callback if set
         if self.on_alert_updated:
@@ -393,59 +459,96 @@ class AlertManager:
             List of alerts matching filters
         """
         with self.lock:
-            # Start with all alerts
-            alerts = list(self.alerts.values())
-            
-            # Apply filters
-            if status:
-                alerts = [a for a in alerts if a.status == status]
-                
-            if alert_type:
-                alerts = [a for a in alerts if a.type == alert_type]
-                
-            if priority:
-                alerts = [a for a in alerts if a.priority == priority]
-                
-            if source:
-                alerts = [a for a in alerts if a.source == source]
-                
-            if start_time:
-                alerts = [a for a in alerts if a.timestamp >= start_time]
-                
-            if end_time:
-                alerts = [a for a in alerts if a.timestamp <= end_time]
-                
-            # Sort by timestamp (newest first)
-            alerts.sort(key=lambda a: a.timestamp, reverse=True)
+            return self.store.query(
+                status=status,
+                alert_type=alert_type,
+                priority=priority,
+                source=source,
+                start_time=start_time,
+                end_time=end_time,
+                limit=limit
+            )
+    
+    def get_active_alerts(
+        self,
+        start_time: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Alert]:
+        """
+        Get alerts that are new or acknowledged, newest first.
+        
+        Args:
+            start_time: Filter by start time
+            limit: Limit number of results
             
-            # Apply limit
-            if limit and limit > 0:
-                alerts = alerts[:limit]
-                
-            return alerts
+        Returns:
+            List of active alerts
+        """
+        with self.lock:
+            return self.store.query(
+                status=ACTIVE_STATUSES,
+                start_time=start_time,
+                limit=limit
+            )
+    
+    def get_all_alerts(self) -> List[Alert]:
+        """
+        Get every stored alert, newest first.
+        
+        Returns:
+            List of alerts
+        """
+        return self.get_alerts()
     
     def _notify_channels(self, alert: Alert) -> None:
         """
-        Send alert to all enabled channels.
+        Queue alert for delivery to all enabled channels.
         
         Args:
             alert: Alert to send
         """
-        for channel in self.channels:
+        self.dispatcher.submit(alert)
+    
+    def flush_notifications(self, timeout: Optional[float] = None) -> bool:
+        """
+        Deliver queued notifications now.
+        
+        Args:
+            timeout: Seconds to wait, or None to wait until done
+            
+        Returns:
+            True if all queued notifications were handled in time
+        """
+        return self.dispatcher.flush(timeout)
+    
+    def close(self) -> None:
+        """Deliver queued notifications, stop the notification workers and close storage."""
+        self.dispatcher.close()
+        with self.lock:
             try:
-                channel.send(alert)
-            except Exception as e:
-                logger.error(f"Error sending alert to channel {channel.name}: {e}")
+                self.store.close()
+            except OSError as e:
+                logger.error(f"Error closing alert storage: {e}")
     
     def save_alerts(self) -> bool:
         """
         Save alerts to storage.
         
+        Changes are logged as they happen; this compacts the log into a
+        fresh snapshot.
+        
         Returns:
             True if successful, False otherwise
         """
-        # To be implemented in a future update
-        return False
+        if not self.storage_path:
+            return False
+        try:
+            with self.lock:
+                self.store.compact()
+            return True
+        except OSError as e:
+            logger.error(f"Error saving alerts: {e}")
+            return False
     
     def load_alerts(self) -> bool:
         """
@@ -454,8 +557,16 @@ class AlertManager:
         Returns:
             True if successful, False otherwise
         """
-        # To be implemented in a future update
-        return False
+        if not self.storage_path:
+            return False
+        try:
+            with self.lock:
+                count = self.store.load()
+            logger.info(f"Loaded {count} alerts from {self.storage_path}")
+            return True
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Error loading alerts: {e}")
+            return False
     
     def get_status(self) -> Dict[str, Any]:
         """
@@ -465,22 +576,15 @@ class AlertManager:
             Dictionary with status information
         """
         with self.lock:
-            total_alerts = len(self.alerts)
+            total_alerts = len(self.store)
             
-            # Count alerts by status
-            status_counts = {}
-            for status in AlertStatus:
-                status_counts[status.name] = sum(1 for a in self.alerts.values() if a.status == status)
-                
-            # Count alerts by type
-            type_counts = {}
-            for atype in AlertType:
-                type_counts[atype.name] = sum(1 for a in self.alerts.values() if a.type == atype)
-                
-            # Count alerts by priority
-            priority_counts = {}
-            for priority in AlertPriority:
-                priority_counts[priority.name] = sum(1 for a in self.alerts.values() if a.priority == priority)
+            # Count alerts by status, type and priority from the indexes
+            counts = self.store.counts("status")
+            status_counts = {status.name: counts.get(status, 0) for status in AlertStatus}
+            counts = self.store.counts("type")
+            type_counts = {atype.name: counts.get(atype, 0) for atype in AlertType}
+            counts = self.store.counts("priority")
+            priority_counts = {priority.name: counts.get(priority, 0) for priority in AlertPriority}
                 
             # Get active channels
             active_channels = [channel.name for channel in self.channels if channel.enabled]
@@ -491,6 +595,7 @@ class AlertManager:
                 "type_counts": type_counts,
                 "priority_counts": priority_counts,
                 "active_channels": active_channels,
+                "notification_metrics": self.dispatcher.get_metrics(),
                 "storage_path": self.storage_path,
                 "max_alerts": self.max_alerts
             } 
\ No newline at end of file
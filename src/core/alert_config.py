@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 from .alert import AlertPriority, AlertType
 from .notification_channels import EmailChannel, SlackChannel, WebhookChannel, ConsoleChannel
+from .notification_dispatcher import NotificationDispatcher
 
 class AlertConfig:
     """Manages alert system configuration."""
@@ -66,6 +67,14 @@ class AlertConfig:
                     "enabled": True
                 }
             },
+            "dispatcher": {
+                "coalesce_window": 5.0,
+                "max_batch": 20,
+                "max_retries": 5,
+                "retry_base_delay": 1.0,
+                "retry_max_delay": 60.0,
+                "dead_letter_path": "logs/notification_dead_letters.jsonl"
+            },
             "thresholds": {
                 "rate_anomaly": {
                     "packets_per_second": 1000,
@@ -234,4 +243,14 @@ class AlertConfig:
         if console_config.get("enabled", True):
             channels.append(ConsoleChannel())
             
-        return channels 
\ No newline at end of file
+        return channels
+        
+    def create_dispatcher(self) -> NotificationDispatcher:
+        """
+        Create the notification dispatcher based on configuration.
+        
+        Returns:
+            Dispatcher with the configured coalescing, retry and
+            dead-letter settings
+        """
+        return NotificationDispatcher(**self.config.get("dispatcher", {})) 
\ No newline at end of file
@@ -271,6 +271,8 @@ class AlertHandler:
         self.stop_event = Event()
         self.processing_thread = None
         self.processed_alerts: List[str] = []
+        # Timestamp of the newest alert handed to process_alert
+        self.processed_until: Optional[float] = None
         
     def add_rule(self, rule: AlertRule) -> None:
         """
@@ -374,12 +376,16 @@ class AlertHandler:
         """
         while not self.stop_event.is_set():
             try:
-                # Get all active alerts
-                active_alerts = self.alert_manager.get_active_alerts()
+                # Get active alerts no older than the last one processed;
+                # the status and time indexes keep this cheap
+                active_alerts = self.alert_manager.get_active_alerts(
+                    start_time=self.processed_until
+                )
                 
-                # Process each alert
-                for alert in active_alerts:
+                # Process each alert, oldest first
+                for alert in reversed(active_alerts):
                     self.process_alert(alert)
+                    self.processed_until = alert.timestamp
                     
             except Exception as e:
                 self.logger.error(f"Error in alert processing loop: {e}")
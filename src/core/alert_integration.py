@@ -330,4 +330,20 @@ class AlertIntegration:
         Args:
             alert_id: ID of the alert to acknowledge
         """
-        self.alert_manager.acknowledge_alert(alert_id) 
\ No newline at end of file
+        self.alert_manager.acknowledge_alert(alert_id)         
+    def create_analytics_api(self, db_path: str, host: str = "0.0.0.0", port: int = 5000):
+        """
+        Create an analytics API whose live alert endpoint reads this
+        integration's alert manager.
+        
+        Args:
+            db_path: Path to the analytics SQLite database file
+            host: Host to bind the API server to
+            port: Port to bind the API server to
+            
+        Returns:
+            AnalyticsAPI instance, not yet started
+        """
+        # Flask is only needed when the API is served
+        from src.analytics.api import AnalyticsAPI
+        return AnalyticsAPI(db_path, host=host, port=port, alert_manager=self.alert_manager)
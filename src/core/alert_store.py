@@ -0,0 +1,375 @@
+"""
+Alert Store for ARP Guard
+Indexed in-memory alert history with an append-only log on disk
+
+Alerts are indexed by type, priority, status and source, and kept in
+timestamp order so time-range queries are a binary search and the oldest
+alert can be evicted without sorting. Every change is appended to a JSON
+lines log; the log is compacted into a snapshot every so often, so a
+restart only reads one snapshot and a short log.
+"""
+
+import heapq
+import json
+import logging
+import os
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .alert import Alert
+
+logger = logging.getLogger(__name__)
+
+# Alert attributes with a secondary index
+INDEXED_FIELDS = ("type", "priority", "status", "source")
+
+SNAPSHOT_FILE = "alerts.json"
+LOG_FILE = "alerts.log"
+
+_EMPTY: Set[str] = frozenset()
+
+
+class AlertStore:
+    """
+    Indexed alert history, optionally persisted to a directory.
+
+    The store is not thread-safe; AlertManager calls it under its lock.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_alerts: int = 1000,
+        compact_every: int = 1000
+    ):
+        """
+        Initialize the store
+
+        Args:
+            path: Directory for the snapshot and log; None keeps alerts in
+                memory only
+            max_alerts: Alerts to keep; the oldest are evicted first
+            compact_every: Log records written before the log is compacted
+                into a new snapshot
+        """
+        self.path = path
+        self.max_alerts = max_alerts
+        self.compact_every = compact_every
+        self.alerts: Dict[str, Alert] = {}
+        self._indexes: Dict[str, Dict[Any, Set[str]]] = {name: {} for name in INDEXED_FIELDS}
+        # Timestamps and ids in timestamp order. Entries before _head have
+        # been evicted; entries whose alert is gone are skipped.
+        self._times: List[float] = []
+        self._ids: List[str] = []
+        self._head = 0
+        self._log = None
+        self._log_records = 0
+
+    def __len__(self) -> int:
+        return len(self.alerts)
+
+    def add(self, alert: Alert) -> None:
+        """
+        Store a new alert, evicting the oldest alerts beyond max_alerts
+
+        Args:
+            alert: Alert to store; replaces an alert with the same id
+        """
+        self._insert(alert)
+        self._evict()
+        self._append({"op": "put", "alert": alert.to_dict()})
+
+    def update(self, alert_id: str, **changes) -> Optional[Alert]:
+        """
+        Change attributes of a stored alert and re-index it
+
+        Args:
+            alert_id: Alert ID
+            **changes: Attribute values to set
+
+        Returns:
+            The updated alert, or None if not found
+        """
+        alert = self.alerts.get(alert_id)
+        if alert is None:
+            return None
+        if "timestamp" in changes:
+            self._remove(alert_id)
+            for name, value in changes.items():
+                setattr(alert, name, value)
+            self._insert(alert)
+            self._evict()
+        else:
+            for name, value in changes.items():
+                if name in INDEXED_FIELDS:
+                    self._unindex(name, getattr(alert, name), alert_id)
+                    self._index(name, value, alert_id)
+                setattr(alert, name, value)
+        self._append({"op": "put", "alert": alert.to_dict()})
+        return alert
+
+    def delete(self, alert_id: str) -> bool:
+        """
+        Remove an alert
+
+        Args:
+            alert_id: Alert ID
+
+        Returns:
+            True if the alert was found
+        """
+        if self._remove(alert_id) is None:
+            return False
+        self._append({"op": "delete", "id": alert_id})
+        return True
+
+    def get(self, alert_id: str) -> Optional[Alert]:
+        """Get an alert by ID."""
+        return self.alerts.get(alert_id)
+
+    def query(
+        self,
+        status=None,
+        alert_type=None,
+        priority=None,
+        source: Optional[str] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Alert]:
+        """
+        Find alerts, newest first
+
+        The most selective index is intersected with the others; the time
+        range is found by binary search. Whichever is smaller is scanned.
+
+        Args:
+            status: Status, or an iterable of statuses to match any of
+            alert_type: Type
+            priority: Priority
+            source: Source
+            start_time: Earliest timestamp, inclusive
+            end_time: Latest timestamp, inclusive
+            limit: Most alerts to return
+
+        Returns:
+            Matching alerts, newest first
+        """
+        sets = []
+        if status is not None:
+            sets.append(self._lookup("status", status))
+        if alert_type is not None:
+            sets.append(self._lookup("type", alert_type))
+        if priority is not None:
+            sets.append(self._lookup("priority", priority))
+        if source is not None:
+            sets.append(self._lookup("source", source))
+
+        lo = self._head if start_time is None else bisect_left(self._times, start_time, self._head)
+        hi = len(self._times) if end_time is None else bisect_right(self._times, end_time, self._head)
+        if limit is not None and limit <= 0:
+            limit = None
+
+        candidates = None
+        if sets:
+            sets.sort(key=len)
+            candidates = sets[0].intersection(*sets[1:]) if len(sets) > 1 else sets[0]
+            if len(candidates) < hi - lo:
+                alerts = [self.alerts[alert_id] for alert_id in candidates]
+                if start_time is not None or end_time is not None:
+                    alerts = [a for a in alerts if self._in_range(a, start_time, end_time)]
+                if limit is not None:
+                    return heapq.nlargest(limit, alerts, key=lambda a: a.timestamp)
+                alerts.sort(key=lambda a: a.timestamp, reverse=True)
+                return alerts
+
+        results = []
+        for i in range(hi - 1, lo - 1, -1):
+            alert_id = self._ids[i]
+            if candidates is not None and alert_id not in candidates:
+                continue
+            alert = self._live(i)
+            if alert is None:
+                continue
+            results.append(alert)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def counts(self, field: str) -> Dict[Any, int]:
+        """
+        Count alerts by an indexed attribute
+
+        Args:
+            field: One of INDEXED_FIELDS
+
+        Returns:
+            Attribute value -> number of alerts
+        """
+        return {value: len(ids) for value, ids in self._indexes[field].items()}
+
+    def load(self) -> int:
+        """
+        Read the snapshot and replay the log
+
+        Returns:
+            Number of alerts loaded
+        """
+        if not self.path:
+            return 0
+        self._close_log()
+        self.alerts.clear()
+        for index in self._indexes.values():
+            index.clear()
+        self._times, self._ids, self._head = [], [], 0
+
+        snapshot_path = os.path.join(self.path, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path) as f:
+                for data in json.load(f):
+                    self._insert(Alert.from_dict(data))
+
+        self._log_records = 0
+        log_path = os.path.join(self.path, LOG_FILE)
+        if os.path.exists(log_path):
+            with open(log_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A write cut short by a crash; nothing follows it
+                        logger.warning(f"Ignoring truncated record in {log_path}")
+                        break
+                    self._log_records += 1
+                    if record["op"] == "put":
+                        self._insert(Alert.from_dict(record["alert"]))
+                    elif record["op"] == "delete":
+                        self._remove(record["id"])
+        self._evict()
+        return len(self.alerts)
+
+    def compact(self) -> None:
+        """Write the alerts to a new snapshot and start an empty log."""
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        self._close_log()
+        snapshot_path = os.path.join(self.path, SNAPSHOT_FILE)
+        temp_path = snapshot_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump([alert.to_dict() for alert in self._in_order()], f, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, snapshot_path)
+        # Replaying the old log over the new snapshot would be harmless,
+        # so a crash before this point loses nothing
+        open(os.path.join(self.path, LOG_FILE), "w").close()
+        self._log_records = 0
+
+    def close(self) -> None:
+        """Compact the log and close it."""
+        if self.path and self._log_records:
+            self.compact()
+        self._close_log()
+
+    def _lookup(self, field: str, value) -> Set[str]:
+        """Get the ids with a value, or with any of several values."""
+        index = self._indexes[field]
+        if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+            return index.get(value, _EMPTY)
+        found: Set[str] = set()
+        for item in value:
+            found |= index.get(item, _EMPTY)
+        return found
+
+    def _index(self, field: str, value, alert_id: str) -> None:
+        self._indexes[field].setdefault(value, set()).add(alert_id)
+
+    def _unindex(self, field: str, value, alert_id: str) -> None:
+        ids = self._indexes[field].get(value)
+        if ids is not None:
+            ids.discard(alert_id)
+            if not ids:
+                del self._indexes[field][value]
+
+    def _insert(self, alert: Alert) -> None:
+        """Add an alert to the dict, the indexes and the time order."""
+        previous = self._remove(alert.id)
+        self.alerts[alert.id] = alert
+        for name in INDEXED_FIELDS:
+            self._index(name, getattr(alert, name), alert.id)
+        if previous is not None and previous.timestamp == alert.timestamp:
+            # Its time entry is still in place
+            return
+        if not self._times or alert.timestamp >= self._times[-1]:
+            self._times.append(alert.timestamp)
+            self._ids.append(alert.id)
+        else:
+            # Out of order, e.g. a clock step; rare enough to insert in place
+            position = bisect_right(self._times, alert.timestamp, self._head)
+            self._times.insert(position, alert.timestamp)
+            self._ids.insert(position, alert.id)
+
+    def _remove(self, alert_id: str) -> Optional[Alert]:
+        """Drop an alert from the dict and indexes; its time entry goes stale."""
+        alert = self.alerts.pop(alert_id, None)
+        if alert is not None:
+            for name in INDEXED_FIELDS:
+                self._unindex(name, getattr(alert, name), alert_id)
+        return alert
+
+    def _live(self, position: int) -> Optional[Alert]:
+        """Get the alert a time entry refers to, unless the entry is stale."""
+        alert = self.alerts.get(self._ids[position])
+        if alert is None or alert.timestamp != self._times[position]:
+            return None
+        return alert
+
+    def _evict(self) -> None:
+        """Drop the oldest alerts beyond max_alerts and stale time entries."""
+        while self._head < len(self._times) and (
+                len(self.alerts) > self.max_alerts or self._live(self._head) is None):
+            if self._live(self._head) is not None:
+                self._remove(self._ids[self._head])
+            self._head += 1
+        # Release evicted entries once they make up half the lists
+        if self._head > 64 and self._head * 2 > len(self._times):
+            del self._times[:self._head]
+            del self._ids[:self._head]
+            self._head = 0
+
+    def _in_order(self) -> List[Alert]:
+        """Alerts oldest first."""
+        alerts = []
+        for i in range(self._head, len(self._times)):
+            alert = self._live(i)
+            if alert is not None:
+                alerts.append(alert)
+        return alerts
+
+    @staticmethod
+    def _in_range(alert: Alert, start_time: Optional[float], end_time: Optional[float]) -> bool:
+        if start_time is not None and alert.timestamp < start_time:
+            return False
+        return end_time is None or alert.timestamp <= end_time
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Write a change to the log, compacting it when it has grown."""
+        if not self.path:
+            return
+        try:
+            if self._log is None:
+                os.makedirs(self.path, exist_ok=True)
+                self._log = open(os.path.join(self.path, LOG_FILE), "a")
+            self._log.write(json.dumps(record, default=str) + "\n")
+            self._log.flush()
+            self._log_records += 1
+            if self._log_records >= max(self.compact_every, len(self.alerts)):
+                self.compact()
+        except OSError as e:
+            logger.error(f"Failed to write alert log: {e}")
+
+    def _close_log(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Batch ARP Frame Decoder for ARP Guard
+Decodes raw Ethernet/ARP frames without scapy dissection
+
+Frames are decoded with struct (single frames) or NumPy (batches) into
+integer fields. MAC and IP strings are only produced when something actually
+reads them, and batches format each distinct address once rather than once
+per packet.
+"""
+
+import time
+import socket
+import struct
+import logging
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ETH_P_ARP = 0x0806
+ETH_HEADER_LEN = 14
+ARP_FRAME_LEN = ETH_HEADER_LEN + 28
+BROADCAST_MAC = 0xFFFFFFFFFFFF
+
+# Ethernet dst/src, ethertype, ARP htype/ptype/hlen/plen/op, sha, spa, tha, tpa.
+# MACs are split into a 16-bit high and 32-bit low half so no bytes objects
+# are created while decoding.
+_ARP_FRAME = struct.Struct("!HIHIHHHBBHHIIHII")
+
+# Compact fixed-size form of an ARPFrameView for shared memory rings:
+# timestamp, op, sender MAC/IP, target MAC/IP, Ethernet src/dst
+_ARP_RECORD = struct.Struct("=dHQIQIQQ")
+ARP_RECORD_SIZE = _ARP_RECORD.size
+
+# Byte offsets of the ARP fields within an Ethernet frame
+_OFF_ETH_DST = 0
+_OFF_ETH_SRC = 6
+_OFF_ETHERTYPE = 12
+_OFF_HW_TYPE = 14
+_OFF_PROTO_TYPE = 16
+_OFF_HW_LEN = 18
+_OFF_PROTO_LEN = 19
+_OFF_OPCODE = 20
+_OFF_SENDER_MAC = 22
+_OFF_SENDER_IP = 28
+_OFF_TARGET_MAC = 32
+_OFF_TARGET_IP = 38
+
+_HEADER_INDEX = np.arange(ARP_FRAME_LEN, dtype=np.int64)
+
+
+@lru_cache(maxsize=65536)
+def format_mac(value: int) -> str:
+    """
+    Format a 48-bit integer as a colon-separated MAC address
+
+    Args:
+        value: MAC address as an integer
+
+    Returns:
+        MAC address string (lowercase)
+    """
+    return int(value).to_bytes(6, "big").hex(":")
+
+
+@lru_cache(maxsize=65536)
+def format_ip(value: int) -> str:
+    """
+    Format a 32-bit integer as a dotted IPv4 address
+
+    Args:
+        value: IPv4 address as an integer
+
+    Returns:
+        IPv4 address string
+    """
+    return socket.inet_ntoa(int(value).to_bytes(4, "big"))
+
+
+class ARPFrameView:
+    """
+    Lightweight view of a single ARP frame.
+
+    Exposes the same attribute names as scapy's ARP layer (psrc, hwsrc, pdst,
+    hwdst, op) so the detection code can treat both the same way. Addresses
+    are held as integers and only formatted as strings when read. Views hold
+    no reference to the capture buffer, so they stay valid after a ring block
+    has been released.
+    """
+
+    __slots__ = ("op", "hwsrc_int", "psrc_int", "hwdst_int", "pdst_int",
+                 "eth_src_int", "eth_dst_int", "timestamp")
+
+    def __init__(self, op: int, hwsrc_int: int, psrc_int: int, hwdst_int: int, pdst_int: int,
+                 eth_src_int: int, eth_dst_int: int, timestamp: float):
+        self.op = op
+        self.hwsrc_int = hwsrc_int
+        self.psrc_int = psrc_int
+        self.hwdst_int = hwdst_int
+        self.pdst_int = pdst_int
+        self.eth_src_int = eth_src_int
+        self.eth_dst_int = eth_dst_int
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_frame(cls, frame, timestamp: Optional[float] = None) -> Optional["ARPFrameView"]:
+        """
+        Decode an Ethernet frame into an ARP view
+
+        Args:
+            frame: Raw frame (bytes, bytearray or memoryview)
+            timestamp: Capture timestamp (defaults to now)
+
+        Returns:
+            ARPFrameView or None if the frame is not an ARP frame
+        """
+        if len(frame) < ARP_FRAME_LEN:
+            return None
+
+        (dst_hi, dst_lo, src_hi, src_lo, ethertype, _, _, _, _, op,
+         sha_hi, sha_lo, spa, tha_hi, tha_lo, tpa) = _ARP_FRAME.unpack_from(frame)
+        if ethertype != ETH_P_ARP:
+            return None
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        return cls(
+            op,
+            (sha_hi << 32) | sha_lo, spa,
+            (tha_hi << 32) | tha_lo, tpa,
+            (src_hi << 32) | src_lo, (dst_hi << 32) | dst_lo,
+            timestamp
+        )
+
+    def pack_into(self, buffer, offset: int) -> None:
+        """
+        Write the view as a compact binary record
+
+        Args:
+            buffer: Writable buffer
+            offset: Byte offset of the record (ARP_RECORD_SIZE bytes)
+        """
+        _ARP_RECORD.pack_into(
+            buffer, offset, self.timestamp, self.op,
+            self.hwsrc_int, self.psrc_int, self.hwdst_int, self.pdst_int,
+            self.eth_src_int, self.eth_dst_int
+        )
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> "ARPFrameView":
+        """
+        Read a view written by pack_into()
+
+        Args:
+            buffer: Buffer holding the record
+            offset: Byte offset of the record
+
+        Returns:
+            ARPFrameView
+        """
+        timestamp, op, hwsrc, psrc, hwdst, pdst, eth_src, eth_dst = _ARP_RECORD.unpack_from(buffer, offset)
+        return cls(op, hwsrc, psrc, hwdst, pdst, eth_src, eth_dst, timestamp)
+
+    @property
+    def hwsrc(self) -> str:
+        return format_mac(self.hwsrc_int)
+
+    @property
+    def psrc(self) -> str:
+        return format_ip(self.psrc_int)
+
+    @property
+    def hwdst(self) -> str:
+        return format_mac(self.hwdst_int)
+
+    @property
+    def pdst(self) -> str:
+        return format_ip(self.pdst_int)
+
+    @property
+    def eth_src(self) -> str:
+        return format_mac(self.eth_src_int)
+
+    @property
+    def eth_dst(self) -> str:
+        return format_mac(self.eth_dst_int)
+
+    def __repr__(self) -> str:
+        return f"ARPFrameView(op={self.op}, {self.hwsrc} ({self.psrc}) -> {self.hwdst} ({self.pdst}))"
+
+
+class ARPBatch:
+    """
+    Columnar batch of decoded ARP frames.
+
+    Every field is a NumPy array with one entry per frame; ``index`` maps each
+    row back to its position in the input that was decoded.
+    """
+
+    COLUMNS = (
+        "index", "timestamp", "opcode", "hw_type", "proto_type", "hw_len", "proto_len",
+        "sender_mac", "sender_ip", "target_mac", "target_ip", "eth_src", "eth_dst"
+    )
+
+    def __init__(self, **columns: np.ndarray):
+        """
+        Initialize the batch
+
+        Args:
+            **columns: One array per name in COLUMNS, all of the same length
+        """
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+
+    @classmethod
+    def empty(cls) -> "ARPBatch":
+        """Create a batch with no rows"""
+        return decode_arp_frames(b"", np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def from_frames(cls, frames: Sequence[Tuple[float, Any]]) -> "ARPBatch":
+        """
+        Decode a capture engine frame batch
+
+        Only the 42-byte Ethernet/ARP header of each frame is copied, so this
+        is safe to call on ring memoryviews inside a capture callback.
+
+        Args:
+            frames: Sequence of (timestamp, frame) pairs
+
+        Returns:
+            ARPBatch of the ARP frames in the input
+        """
+        keep = [i for i, (_, frame) in enumerate(frames) if len(frame) >= ARP_FRAME_LEN]
+        buffer = b"".join(frames[i][1][:ARP_FRAME_LEN] for i in keep)
+        offsets = np.arange(len(keep), dtype=np.int64) * ARP_FRAME_LEN
+        timestamps = np.fromiter((frames[i][0] for i in keep), dtype=np.float64, count=len(keep))
+
+        batch = decode_arp_frames(buffer, offsets, timestamps=timestamps)
+        batch.index = np.asarray(keep, dtype=np.int64)[batch.index]
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.opcode)
+
+    def select(self, mask: np.ndarray) -> "ARPBatch":
+        """
+        Select rows by boolean mask or index array
+
+        Args:
+            mask: Boolean mask or integer indices
+
+        Returns:
+            New ARPBatch with the selected rows
+        """
+        return ARPBatch(**{name: getattr(self, name)[mask] for name in self.COLUMNS})
+
+    def valid_mask(self) -> np.ndarray:
+        """
+        Get a mask of rows with usable addresses
+
+        Rejects rows with an empty sender, and replies whose target is empty
+        or broadcast (the same checks DetectionModule applies per packet).
+
+        Returns:
+            Boolean mask
+        """
+        bad_sender = (self.sender_ip == 0) | (self.sender_mac == 0)
+        bad_reply_target = (self.opcode == 2) & (
+            (self.target_ip == 0) | (self.target_mac == 0) | (self.target_mac == BROADCAST_MAC)
+        )
+        return ~(bad_sender | bad_reply_target)
+
+    def format_column(self, name: str) -> List[str]:
+        """
+        Format an address column as strings
+
+        Each distinct value is formatted once, which matters for captures
+        dominated by a handful of hosts.
+
+        Args:
+            name: One of sender_mac, sender_ip, target_mac, target_ip, eth_src, eth_dst
+
+        Returns:
+            List of address strings, one per row
+        """
+        column = getattr(self, name)
+        formatter = format_ip if name.endswith("_ip") else format_mac
+        if len(column) == 0:
+            return []
+        unique, inverse = np.unique(column, return_inverse=True)
+        formatted = [formatter(int(value)) for value in unique]
+        return [formatted[i] for i in inverse.ravel()]
+
+    def view(self, row: int) -> ARPFrameView:
+        """
+        Get a single row as an ARPFrameView
+
+        Args:
+            row: Row number
+
+        Returns:
+            ARPFrameView for the row
+        """
+        return ARPFrameView(
+            int(self.opcode[row]),
+            int(self.sender_mac[row]), int(self.sender_ip[row]),
+            int(self.target_mac[row]), int(self.target_ip[row]),
+            int(self.eth_src[row]), int(self.eth_dst[row]),
+            float(self.timestamp[row])
+        )
+
+    def views(self) -> List[ARPFrameView]:
+        """Get every row as an ARPFrameView"""
+        columns = zip(
+            self.opcode.tolist(),
+            self.sender_mac.tolist(), self.sender_ip.tolist(),
+            self.target_mac.tolist(), self.target_ip.tolist(),
+            self.eth_src.tolist(), self.eth_dst.tolist(),
+            self.timestamp.tolist()
+        )
+        return [ARPFrameView(*row) for row in columns]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Convert to the packet dictionaries used by PatternRecognizer
+
+        Returns:
+            List of dictionaries with src_mac, src_ip, dst_mac, dst_ip,
+            op_code and timestamp
+        """
+        return [
+            {
+                "src_mac": src_mac,
+                "src_ip": src_ip,
+                "dst_mac": dst_mac,
+                "dst_ip": dst_ip,
+                "op_code": op_code,
+                "timestamp": timestamp
+            }
+            for src_mac, src_ip, dst_mac, dst_ip, op_code, timestamp in zip(
+                self.format_column("sender_mac"), self.format_column("sender_ip"),
+                self.format_column("target_mac"), self.format_column("target_ip"),
+                self.opcode.tolist(), self.timestamp.tolist()
+            )
+        ]
+
+
+def _read_be(rows: np.ndarray, offset: int, width: int, dtype) -> np.ndarray:
+    """Read a big-endian unsigned field of width bytes from every row"""
+    value = rows[:, offset].astype(np.uint64)
+    for i in range(1, width):
+        value = (value << np.uint64(8)) | rows[:, offset + i]
+    return value.astype(dtype)
+
+
+def decode_arp_frames(
+    buffer,
+    offsets: Sequence[int],
+    lengths: Optional[Sequence[int]] = None,
+    timestamps: Optional[Sequence[float]] = None
+) -> ARPBatch:
+    """
+    Decode a batch of raw Ethernet frames into a columnar ARPBatch
+
+    Args:
+        buffer: Bytes-like object holding the frames
+        offsets: Start offset of each frame in buffer
+        lengths: Optional captured length of each frame; short frames are dropped
+        timestamps: Optional capture timestamp of each frame (defaults to 0.0)
+
+    Returns:
+        ARPBatch containing the frames that are ARP, with ``index`` giving
+        each row's position in offsets
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    offsets = np.asarray(offsets, dtype=np.int64)
+
+    valid = (offsets >= 0) & (offsets + ARP_FRAME_LEN <= len(data))
+    if lengths is not None:
+        valid &= np.asarray(lengths, dtype=np.int64) >= ARP_FRAME_LEN
+
+    index = np.flatnonzero(valid)
+    rows = data[offsets[index, None] + _HEADER_INDEX] if len(index) else np.empty((0, ARP_FRAME_LEN), np.uint8)
+
+    is_arp = _read_be(rows, _OFF_ETHERTYPE, 2, np.uint16) == ETH_P_ARP
+    rows = rows[is_arp]
+    index = index[is_arp]
+
+    if timestamps is None:
+        timestamp = np.zeros(len(index), dtype=np.float64)
+    else:
+        timestamp = np.asarray(timestamps, dtype=np.float64)[index]
+
+    return ARPBatch(
+        index=index,
+        timestamp=timestamp,
+        opcode=_read_be(rows, _OFF_OPCODE, 2, np.uint16),
+        hw_type=_read_be(rows, _OFF_HW_TYPE, 2, np.uint16),
+        proto_type=_read_be(rows, _OFF_PROTO_TYPE, 2, np.uint16),
+        hw_len=rows[:, _OFF_HW_LEN].copy(),
+        proto_len=rows[:, _OFF_PROTO_LEN].copy(),
+        sender_mac=_read_be(rows, _OFF_SENDER_MAC, 6, np.uint64),
+        sender_ip=_read_be(rows, _OFF_SENDER_IP, 4, np.uint32),
+        target_mac=_read_be(rows, _OFF_TARGET_MAC, 6, np.uint64),
+        target_ip=_read_be(rows, _OFF_TARGET_IP, 4, np.uint32),
+        eth_src=_read_be(rows, _OFF_ETH_SRC, 6, np.uint64),
+        eth_dst=_read_be(rows, _OFF_ETH_DST, 6, np.uint64),
+    )
@@ -5,6 +5,11 @@ from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+from .arp_batch import ARP_FRAME_LEN
+
+# Ethernet type followed by the ARP header (Ethernet MACs skipped)
+_ARP_HEADER = struct.Struct('!12xHHHBBH6s4s6s4s')
+
 @dataclass
 class ARPPacket:
     """Represents an ARP packet with all relevant fields."""
@@ -63,29 +68,16 @@ class ARPPacketAnalyzer:
             ARPPacket object if valid ARP packet, None otherwise
         """
         try:
-            # Ethernet header is 14 bytes
-            eth_header = packet[:14]
-            eth_protocol = struct.unpack('!H', eth_header[12:14])[0]
+            # Single unpack of the Ethernet type and the whole ARP header
+            if len(packet) < ARP_FRAME_LEN:
+                return None
+                
+            (eth_protocol, hardware_type, protocol_type, hardware_size, protocol_size, opcode,
+             sender_mac, sender_ip, target_mac, target_ip) = _ARP_HEADER.unpack_from(packet)
             
             # Check if it's an ARP packet (0x0806)
             if eth_protocol != 0x0806:
                 return None
-                
-            # ARP packet starts after Ethernet header
-            arp_packet = packet[14:]
-            
-            # Parse ARP header
-            hardware_type = struct.unpack('!H', arp_packet[0:2])[0]
-            protocol_type = struct.unpack('!H', arp_packet[2:4])[0]
-            hardware_size = arp_packet[4]
-            protocol_size = arp_packet[5]
-            opcode = struct.unpack('!H', arp_packet[6:8])[0]
-            
-            # Parse MAC and IP addresses
-            sender_mac = ':'.join(f'{b:02x}' for b in arp_packet[8:14])
-            sender_ip = socket.inet_ntoa(arp_packet[14:18])
-            target_mac = ':'.join(f'{b:02x}' for b in arp_packet[18:24])
-            target_ip = socket.inet_ntoa(arp_packet[24:28])
             
             return ARPPacket(
                 hardware_type=hardware_type,
@@ -93,10 +85,10 @@ class ARPPacketAnalyzer:
                 hardware_size=hardware_size,
                 protocol_size=protocol_size,
                 opcode=opcode,
-                sender_mac=sender_mac,
-                sender_ip=sender_ip,
-                target_mac=target_mac,
-                target_ip=target_ip,
+                sender_mac=sender_mac.hex(':'),
+                sender_ip=socket.inet_ntoa(sender_ip),
+                target_mac=target_mac.hex(':'),
+                target_ip=socket.inet_ntoa(target_ip),
                 timestamp=datetime.now()
             )
             
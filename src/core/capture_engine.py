@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+Capture Engines for ARP Guard
+Selectable packet capture backends that hand out raw Ethernet frames
+
+The ring engine uses a TPACKET_V3 memory-mapped receive ring on an AF_PACKET
+socket with a kernel BPF filter for ARP (ethertype 0x0806), so frames are read
+straight out of the shared ring without a recv() copy or a scapy dissection.
+The scapy engine is the portable fallback for platforms without AF_PACKET.
+"""
+
+import os
+import mmap
+import time
+import select
+import socket
+import struct
+import ctypes
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Callable
+
+from .arp_batch import ARPFrameView, ARP_FRAME_LEN, ETH_P_ARP
+
+logger = logging.getLogger(__name__)
+
+try:
+    import scapy.all as scapy
+    SCAPY_AVAILABLE = True
+except ImportError:
+    scapy = None
+    SCAPY_AVAILABLE = False
+
+# Linux packet socket constants (linux/if_packet.h, linux/if_ether.h)
+SOL_PACKET = 263
+SO_ATTACH_FILTER = 26
+PACKET_ADD_MEMBERSHIP = 1
+PACKET_RX_RING = 5
+PACKET_STATISTICS = 6
+PACKET_VERSION = 10
+PACKET_MR_PROMISC = 1
+TPACKET_V3 = 2
+TP_STATUS_KERNEL = 0
+TP_STATUS_USER = 1
+ETH_P_ALL = 0x0003
+
+# Capture engine names accepted by create_capture_engine()
+ENGINE_AUTO = "auto"
+ENGINE_RING = "ring"
+ENGINE_SCAPY = "scapy"
+CAPTURE_ENGINES = (ENGINE_AUTO, ENGINE_RING, ENGINE_SCAPY)
+
+# Default ring geometry: 64 blocks of 256 KiB, retired after 50 ms
+DEFAULT_BLOCK_SIZE = 1 << 18
+DEFAULT_BLOCK_COUNT = 64
+DEFAULT_FRAME_SIZE = 1 << 11
+DEFAULT_BLOCK_TIMEOUT_MS = 50
+
+# struct tpacket_req3
+_TPACKET_REQ3 = struct.Struct("=7I")
+# struct tpacket_block_desc: version, offset_to_priv, then tpacket_hdr_v1
+# (block_status, num_pkts, offset_to_first_pkt, ...)
+_BLOCK_STATUS = struct.Struct("=I")
+_BLOCK_STATUS_OFFSET = 8
+_BLOCK_PKTS = struct.Struct("=II")
+_BLOCK_PKTS_OFFSET = 12
+# struct tpacket3_hdr: tp_next_offset, tp_sec, tp_nsec, tp_snaplen, tp_len,
+# tp_status, tp_mac
+_TPACKET3_HDR = struct.Struct("=IIIIIIH")
+# struct tpacket_stats_v3: tp_packets, tp_drops, tp_freeze_q_cnt
+_TPACKET_STATS_V3 = struct.Struct("=III")
+# struct sock_filter
+_SOCK_FILTER = struct.Struct("=HBBI")
+
+# Frame batch handed to consumers: (timestamp, frame) pairs. For the ring
+# engine the frames are memoryviews into the ring and are only valid for the
+# duration of the callback. ARPBatch.from_frames() decodes a whole batch at once.
+FrameBatch = List[Tuple[float, memoryview]]
+
+
+def build_arp_filter(snaplen: int = ARP_FRAME_LEN) -> bytes:
+    """
+    Build a classic BPF program accepting only ARP frames
+
+    Args:
+        snaplen: Number of bytes of each matching frame to keep
+
+    Returns:
+        Packed sock_filter instructions
+    """
+    program = [
+        (0x28, 0, 0, 12),          # ldh [12]            ; ethertype
+        (0x15, 0, 1, ETH_P_ARP),   # jeq #0x806, accept, drop
+        (0x06, 0, 0, snaplen),     # ret #snaplen
+        (0x06, 0, 0, 0),           # ret #0
+    ]
+    return b"".join(_SOCK_FILTER.pack(*insn) for insn in program)
+
+
+class CaptureEngine:
+    """Base class for capture engines"""
+
+    name = "base"
+
+    def __init__(self, interface: Optional[str] = None, promisc: bool = True):
+        """
+        Initialize the capture engine
+
+        Args:
+            interface: Network interface to capture on (None for all)
+            promisc: Whether to put the interface into promiscuous mode
+        """
+        self.interface = interface
+        self.promisc = promisc
+        self.running = False
+        self.stats = {
+            "frames_received": 0,
+            "batches_delivered": 0,
+            "kernel_drops": 0,
+            "callback_errors": 0
+        }
+
+    def start(self) -> None:
+        """Open the capture"""
+        self.running = True
+
+    def stop(self) -> None:
+        """Close the capture"""
+        self.running = False
+
+    def capture(self, callback: Callable[[FrameBatch], None],
+                stop_event: Optional[threading.Event] = None) -> None:
+        """
+        Deliver captured frames to callback in batches until stopped
+
+        Args:
+            callback: Function called with each batch of (timestamp, frame) pairs
+            stop_event: Optional event that ends the capture loop when set
+        """
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get capture statistics
+
+        Returns:
+            Dictionary with capture statistics
+        """
+        stats = self.stats.copy()
+        stats["engine"] = self.name
+        stats["interface"] = self.interface
+        stats["running"] = self.running
+        return stats
+
+    def __enter__(self) -> "CaptureEngine":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+class RingCaptureEngine(CaptureEngine):
+    """
+    Zero-copy ARP capture using an AF_PACKET TPACKET_V3 memory-mapped ring.
+
+    The kernel fills whole blocks of the ring and marks them TP_STATUS_USER;
+    each block is handed to the consumer as a list of memoryview slices and
+    returned to the kernel once the callback has finished with it.
+    """
+
+    name = ENGINE_RING
+
+    def __init__(
+        self,
+        interface: Optional[str] = None,
+        promisc: bool = True,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        block_count: int = DEFAULT_BLOCK_COUNT,
+        frame_size: int = DEFAULT_FRAME_SIZE,
+        block_timeout_ms: int = DEFAULT_BLOCK_TIMEOUT_MS,
+        snaplen: int = ARP_FRAME_LEN
+    ):
+        """
+        Initialize the ring capture engine
+
+        Args:
+            interface: Network interface to capture on (None for all)
+            promisc: Whether to put the interface into promiscuous mode
+            block_size: Size of each ring block in bytes (multiple of the page size)
+            block_count: Number of blocks in the ring
+            frame_size: Nominal frame slot size used to size the ring
+            block_timeout_ms: Time after which the kernel retires a partly filled block
+            snaplen: Bytes of each ARP frame kept by the BPF filter
+        """
+        super().__init__(interface, promisc)
+        self.block_size = block_size
+        self.block_count = block_count
+        self.frame_size = frame_size
+        self.block_timeout_ms = block_timeout_ms
+        self.snaplen = snaplen
+
+        self.socket: Optional[socket.socket] = None
+        self.ring: Optional[mmap.mmap] = None
+        self._ring_view: Optional[memoryview] = None
+        self._filter_buffer = None
+        self._block_index = 0
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Check whether the platform supports AF_PACKET rings"""
+        return hasattr(socket, "AF_PACKET") and hasattr(mmap, "MAP_SHARED")
+
+    def start(self) -> None:
+        """Create the socket, attach the ARP filter and map the ring"""
+        if self.running:
+            return
+
+        if not self.is_supported():
+            raise OSError("AF_PACKET ring capture is not supported on this platform")
+
+        if self.block_size % mmap.PAGESIZE:
+            raise ValueError(f"block_size must be a multiple of the page size ({mmap.PAGESIZE})")
+
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ARP))
+        try:
+            self._attach_filter(sock)
+            sock.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V3)
+
+            frame_count = (self.block_size // self.frame_size) * self.block_count
+            sock.setsockopt(SOL_PACKET, PACKET_RX_RING, _TPACKET_REQ3.pack(
+                self.block_size, self.block_count, self.frame_size, frame_count,
+                self.block_timeout_ms, 0, 0
+            ))
+
+            self.ring = mmap.mmap(
+                sock.fileno(), self.block_size * self.block_count,
+                mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE
+            )
+            self._ring_view = memoryview(self.ring)
+
+            if self.interface:
+                sock.bind((self.interface, ETH_P_ARP))
+                if self.promisc:
+                    self._enable_promisc(sock)
+        except Exception:
+            sock.close()
+            self._release_ring()
+            raise
+
+        self.socket = sock
+        self._block_index = 0
+        self.running = True
+        logger.info(
+            f"Started ring capture on interface {self.interface or 'all'} "
+            f"({self.block_count} x {self.block_size // 1024} KiB blocks)"
+        )
+
+    def stop(self) -> None:
+        """Unmap the ring and close the socket"""
+        if not self.running:
+            return
+
+        self.running = False
+        self._update_kernel_stats()
+        self._release_ring()
+
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+
+        logger.info("Stopped ring capture")
+
+    def capture(self, callback: Callable[[FrameBatch], None],
+                stop_event: Optional[threading.Event] = None) -> None:
+        """
+        Deliver ring blocks to callback until stopped
+
+        The memoryviews in each batch point into the shared ring and must not
+        be kept after the callback returns; copy what is needed (for example
+        via ARPFrameView.from_frame) before returning.
+
+        Args:
+            callback: Function called with each batch of (timestamp, frame) pairs
+            stop_event: Optional event that ends the capture loop when set
+        """
+        if not self.running:
+            self.start()
+
+        poller = select.poll()
+        poller.register(self.socket.fileno(), select.POLLIN | select.POLLERR)
+
+        while self.running and not (stop_event and stop_event.is_set()):
+            offset = self._block_index * self.block_size
+            status = _BLOCK_STATUS.unpack_from(self.ring, offset + _BLOCK_STATUS_OFFSET)[0]
+
+            if not status & TP_STATUS_USER:
+                # Block still owned by the kernel, wait for it to be retired
+                poller.poll(self.block_timeout_ms)
+                continue
+
+            frames = self._read_block(offset)
+            try:
+                if frames:
+                    callback(frames)
+                    self.stats["batches_delivered"] += 1
+            except Exception as e:
+                self.stats["callback_errors"] += 1
+                logger.error(f"Error in capture callback: {e}")
+            finally:
+                for _, frame in frames:
+                    frame.release()
+                # Hand the block back to the kernel
+                _BLOCK_STATUS.pack_into(self.ring, offset + _BLOCK_STATUS_OFFSET, TP_STATUS_KERNEL)
+                self._block_index = (self._block_index + 1) % self.block_count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get capture statistics including kernel ring drops
+
+        Returns:
+            Dictionary with capture statistics
+        """
+        self._update_kernel_stats()
+        stats = super().get_stats()
+        stats["block_size"] = self.block_size
+        stats["block_count"] = self.block_count
+        return stats
+
+    def _read_block(self, offset: int) -> FrameBatch:
+        """Build memoryview slices for every frame in the block at offset"""
+        num_pkts, first_offset = _BLOCK_PKTS.unpack_from(self.ring, offset + _BLOCK_PKTS_OFFSET)
+        view = self._ring_view
+        frames = []
+
+        pkt_offset = offset + first_offset
+        for _ in range(num_pkts):
+            next_offset, sec, nsec, snaplen, _, _, mac = _TPACKET3_HDR.unpack_from(self.ring, pkt_offset)
+            start = pkt_offset + mac
+            frames.append((sec + nsec / 1e9, view[start:start + snaplen]))
+            pkt_offset += next_offset
+
+        self.stats["frames_received"] += num_pkts
+        return frames
+
+    def _attach_filter(self, sock: socket.socket) -> None:
+        """Attach the ARP BPF program to the socket"""
+        program = build_arp_filter(self.snaplen)
+        count = len(program) // _SOCK_FILTER.size
+        # The kernel copies the program, but keep the buffer alive with the socket anyway
+        self._filter_buffer = ctypes.create_string_buffer(program)
+        fprog = struct.pack("@HP", count, ctypes.addressof(self._filter_buffer))
+        sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, fprog)
+
+    def _enable_promisc(self, sock: socket.socket) -> None:
+        """Join the interface's promiscuous membership"""
+        try:
+            ifindex = socket.if_nametoindex(self.interface)
+            mreq = struct.pack("@iHH8s", ifindex, PACKET_MR_PROMISC, 0, b"")
+            sock.setsockopt(SOL_PACKET, PACKET_ADD_MEMBERSHIP, mreq)
+        except OSError as e:
+            logger.warning(f"Could not enable promiscuous mode on {self.interface}: {e}")
+
+    def _update_kernel_stats(self) -> None:
+        """Accumulate kernel drop counters (reading them resets them)"""
+        if not self.socket:
+            return
+        try:
+            raw = self.socket.getsockopt(SOL_PACKET, PACKET_STATISTICS, _TPACKET_STATS_V3.size)
+            _, drops, _ = _TPACKET_STATS_V3.unpack(raw)
+            self.stats["kernel_drops"] += drops
+        except OSError:
+            pass
+
+    def _release_ring(self) -> None:
+        """Release the ring mapping"""
+        if self._ring_view is not None:
+            self._ring_view.release()
+            self._ring_view = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+
+class ScapyCaptureEngine(CaptureEngine):
+    """
+    Portable capture engine built on a scapy listening socket.
+
+    The socket is opened, and its BPF filter compiled and attached, once in
+    start() and kept until stop(); frames already queued on it are delivered
+    together as one batch.
+    """
+
+    name = ENGINE_SCAPY
+
+    def __init__(self, interface: Optional[str] = None, promisc: bool = True,
+                 filter_string: str = "arp", poll_timeout: float = 1.0,
+                 max_batch: int = 1024):
+        """
+        Initialize the scapy capture engine
+
+        Args:
+            interface: Network interface to capture on (None for default)
+            promisc: Whether to put the interface into promiscuous mode
+            filter_string: BPF filter string
+            poll_timeout: Seconds between checks of the stop event
+            max_batch: Most frames delivered in one batch
+        """
+        super().__init__(interface, promisc)
+        self.filter_string = filter_string
+        self.poll_timeout = poll_timeout
+        self.max_batch = max_batch
+        self.socket = None
+
+    def start(self) -> None:
+        """Open the listening socket"""
+        if not SCAPY_AVAILABLE:
+            raise RuntimeError("scapy library not available")
+        if self.socket is None:
+            self.socket = scapy.conf.L2listen(
+                iface=self.interface,
+                filter=self.filter_string,
+                promisc=self.promisc
+            )
+        self.running = True
+        logger.info(f"Started scapy capture on {self.interface or 'default interface'}")
+
+    def stop(self) -> None:
+        """Close the listening socket"""
+        self.running = False
+        if self.socket is not None:
+            try:
+                self.socket.close()
+            except Exception:
+                pass
+            self.socket = None
+
+    def capture(self, callback: Callable[[FrameBatch], None],
+                stop_event: Optional[threading.Event] = None) -> None:
+        """
+        Deliver sniffed frames to callback in batches until stopped
+
+        Args:
+            callback: Function called with each batch of (timestamp, frame) pairs
+            stop_event: Optional event that ends the capture loop when set
+        """
+        if not self.running:
+            self.start()
+        sock = self.socket
+
+        while self.running and not (stop_event and stop_event.is_set()):
+            if not sock.select([sock], self.poll_timeout):
+                continue
+
+            # Drain what is already queued without blocking
+            frames = []
+            while len(frames) < self.max_batch:
+                packet = sock.recv()
+                if packet is not None:
+                    frames.append((float(packet.time), memoryview(bytes(packet))))
+                if not sock.select([sock], 0):
+                    break
+            if not frames:
+                continue
+
+            self.stats["frames_received"] += len(frames)
+            try:
+                callback(frames)
+                self.stats["batches_delivered"] += 1
+            except Exception as e:
+                self.stats["callback_errors"] += 1
+                logger.error(f"Error in capture callback: {e}")
+
+
+def create_capture_engine(engine: str = ENGINE_AUTO, interface: Optional[str] = None,
+                          **kwargs) -> CaptureEngine:
+    """
+    Create a capture engine by name
+
+    Args:
+        engine: One of "auto", "ring" or "scapy"; "auto" picks the ring engine
+                when AF_PACKET is available and falls back to scapy otherwise
+        interface: Network interface to capture on
+        **kwargs: Additional engine-specific options
+
+    Returns:
+        CaptureEngine instance
+    """
+    if engine not in CAPTURE_ENGINES:
+        raise ValueError(f"Unknown capture engine '{engine}', expected one of {', '.join(CAPTURE_ENGINES)}")
+
+    if engine == ENGINE_AUTO:
+        engine = ENGINE_RING if RingCaptureEngine.is_supported() and os.name == "posix" else ENGINE_SCAPY
+
+    if engine == ENGINE_RING:
+        return RingCaptureEngine(interface=interface, **kwargs)
+    return ScapyCaptureEngine(interface=interface, **kwargs)
+
+
+def open_capture_engine(engine: str = ENGINE_AUTO, interface: Optional[str] = None,
+                        **kwargs) -> CaptureEngine:
+    """
+    Create a capture engine by name and start it
+
+    With "auto", a ring engine that cannot be opened (usually a
+    PermissionError without root or CAP_NET_RAW) is replaced by the scapy
+    engine. An explicitly requested ring engine is never replaced.
+
+    Args:
+        engine: One of "auto", "ring" or "scapy"
+        interface: Network interface to capture on
+        **kwargs: Additional engine-specific options
+
+    Returns:
+        Started CaptureEngine instance
+
+    Raises:
+        PermissionError: If the chosen engine needs more privileges
+    """
+    capture = create_capture_engine(engine, interface=interface, **kwargs)
+    try:
+        capture.start()
+        return capture
+    except OSError as e:
+        if engine != ENGINE_AUTO or capture.name != ENGINE_RING:
+            if isinstance(e, PermissionError):
+                raise PermissionError(f"{capture.name} capture needs root or CAP_NET_RAW: {e}") from e
+            raise
+        logger.warning(f"Ring capture unavailable ({e}), falling back to scapy")
+
+    capture = ScapyCaptureEngine(interface=interface, promisc=kwargs.get("promisc", True))
+    capture.start()
+    return capture
@@ -43,12 +43,22 @@ except ImportError:
 # Import the base Module class
 from .module import Module
 from .remediation_module import RemediationModule
+from .expiring_map import ExpiringMap
+from .arp_batch import ARPBatch, ARPFrameView, ARP_RECORD_SIZE
+from .capture_engine import CaptureEngine, FrameBatch, ENGINE_SCAPY, create_capture_engine
+from .oui_lookup import get_vendor_resolver
 
 # Constants for optimization
 MAX_WORKER_THREADS = min(4, multiprocessing.cpu_count())
 PACKET_SAMPLING_RATIO = 0.5  # Sample 50% of packets in high traffic scenarios
 HIGH_TRAFFIC_THRESHOLD = 1000  # Packets per second
 
+# Execution modes for detection workers
+EXECUTION_THREAD = "thread"
+EXECUTION_PROCESS = "process"
+EXECUTION_MODES = (EXECUTION_THREAD, EXECUTION_PROCESS)
+DEFAULT_RING_CAPACITY = 65536  # Records per worker process ring
+
 # Constants for packet prioritization
 PRIORITY_HIGH = 0
 PRIORITY_MEDIUM = 1
@@ -60,93 +70,18 @@ DEFAULT_ARP_ENTRY_TTL = 3600  # 1 hour
 DEFAULT_SUSPICIOUS_SOURCE_TTL = 1800  # 30 minutes
 DEFAULT_PACKET_CACHE_TTL = 180  # 3 minutes
 
-# Type variables for generic classes
-K = TypeVar('K')
-V = TypeVar('V')
-
 # Import the pattern recognition module
 from src.core.pattern_recognition import PatternRecognizer
+from src.core.parallel.process_pool import ProcessPoolManager, SharedRingBuffer
 
 
-class TTLDict(Generic[K]):
-    """A dictionary with TTL (time-to-live) for entries."""
-    
-    def __init__(self, ttl: int = 3600):
-        """
-        Initialize TTLDict
-        
-        Args:
-            ttl: Default TTL in seconds
-        """
-        self._data: Dict[str, Tuple[K, float]] = {}
-        self._ttl = ttl
-        self._last_cleanup = time.time()
-        self._cleanup_interval = 60  # Clean up once per minute
-        
-    def __contains__(self, key: str) -> bool:
-        """Check if key exists and is not expired."""
-        if key not in self._data:
-            return False
-            
-        _, expire_time = self._data[key]
-        if time.time() > expire_time:
-            # Expired, remove it
-            del self._data[key]
-            return False
-            
-        return True
-        
-    def __getitem__(self, key: str) -> K:
-        """Get value if exists and not expired."""
-        if key not in self:
-            raise KeyError(key)
-            
-        value, _ = self._data[key]
-        return value
-        
-    def get(self, key: str, default: K = None) -> K:
-        """Get value with default if not exists or expired."""
-        try:
-            return self[key]
-        except KeyError:
-            return default
-            
-    def __setitem__(self, key: str, value: K) -> None:
-        """Set value with default TTL."""
-        self._data[key] = (value, time.time() + self._ttl)
-        
-        # Occasionally clean up expired entries
-        if time.time() - self._last_cleanup > self._cleanup_interval:
-            self._cleanup()
-            
-    def set_with_ttl(self, key: str, value: K, ttl: int) -> None:
-        """Set value with custom TTL."""
-        self._data[key] = (value, time.time() + ttl)
-        
-    def _cleanup(self) -> None:
-        """Remove all expired entries."""
-        now = time.time()
-        self._data = {k: v for k, v in self._data.items() if v[1] > now}
-        self._last_cleanup = now
-        
-    def items(self):
-        """Get (key, value) pairs for non-expired entries."""
-        self._cleanup()
-        return [(k, v[0]) for k, v in self._data.items()]
-        
-    def keys(self):
-        """Get keys for non-expired entries."""
-        self._cleanup()
-        return [k for k in self._data.keys() if self.__contains__(k)]
-        
-    def values(self):
-        """Get values for non-expired entries."""
-        self._cleanup()
-        return [v[0] for k, v in self._data.items() if self.__contains__(k)]
-        
-    def __len__(self) -> int:
-        """Get count of non-expired entries."""
-        return len(self.keys())
+# ARP state used to live in a dict rebuilt on cleanup; keep the old name
+TTLDict = ExpiringMap
+
+
+def _log_expired_binding(ip: str, entry: Dict[str, Any]) -> None:
+    """Log an ARP table entry that expired without being seen again"""
+    logger.info(f"ARP binding expired: {ip} -> {entry.get('mac')} (seen {entry.get('count', 0)} times)")
 
 
 class DetectionResult:
@@ -208,7 +143,14 @@ class DetectionModuleConfig:
         prioritize_packets: bool = True,
         high_priority_ratio: float = 0.8,
         medium_priority_ratio: float = 0.5,
-        low_priority_ratio: float = 0.2
+        low_priority_ratio: float = 0.2,
+        capture_engine: str = ENGINE_SCAPY,
+        detection_threshold: int = 3,
+        execution_mode: str = EXECUTION_THREAD,
+        worker_processes: int = multiprocessing.cpu_count(),
+        ring_capacity: int = DEFAULT_RING_CAPACITY,
+        default_gateway_ip: Optional[str] = None,
+        default_gateway_mac: Optional[str] = None
     ):
         """
         Initialize configuration
@@ -228,6 +170,13 @@ class DetectionModuleConfig:
             high_priority_ratio: Ratio of high priority packets to process
             medium_priority_ratio: Ratio of medium priority packets to process
             low_priority_ratio: Ratio of low priority packets to process
+            capture_engine: Capture backend to use ("scapy", "ring" or "auto")
+            detection_threshold: Number of suspicious events from a source before alerting
+            execution_mode: Run detection in worker threads ("thread") or worker processes ("process")
+            worker_processes: Number of worker processes in process mode
+            ring_capacity: Number of packets each worker process ring can hold
+            default_gateway_ip: Gateway IP used when no gateway info file exists
+            default_gateway_mac: Gateway MAC used when no gateway info file exists
         """
         self.detection_interval = detection_interval
         self.enabled_features = enabled_features or ["basic", "fingerprint"]
@@ -243,6 +192,15 @@ class DetectionModuleConfig:
         self.high_priority_ratio = max(0.1, min(1.0, high_priority_ratio))
         self.medium_priority_ratio = max(0.1, min(1.0, medium_priority_ratio))
         self.low_priority_ratio = max(0.1, min(1.0, low_priority_ratio))
+        self.capture_engine = capture_engine
+        self.detection_threshold = max(1, detection_threshold)
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{execution_mode}', expected one of {', '.join(EXECUTION_MODES)}")
+        self.execution_mode = execution_mode
+        self.worker_processes = max(1, worker_processes)
+        self.ring_capacity = max(1, ring_capacity)
+        self.default_gateway_ip = default_gateway_ip
+        self.default_gateway_mac = default_gateway_mac
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -265,155 +223,221 @@ class DetectionModuleConfig:
             "prioritize_packets": self.prioritize_packets,
             "high_priority_ratio": self.high_priority_ratio,
             "medium_priority_ratio": self.medium_priority_ratio,
-            "low_priority_ratio": self.low_priority_ratio
+            "low_priority_ratio": self.low_priority_ratio,
+            "capture_engine": self.capture_engine,
+            "detection_threshold": self.detection_threshold,
+            "execution_mode": self.execution_mode,
+            "worker_processes": self.worker_processes,
+            "ring_capacity": self.ring_capacity,
+            "default_gateway_ip": self.default_gateway_ip,
+            "default_gateway_mac": self.default_gateway_mac
         }
 
 
 class PriorityQueue:
     """
-    A priority queue implementation for packet processing
-    with support for weighted dequeuing based on priority levels
+    A multi-level priority queue for packet processing.
+    
+    Each priority level is a deque. Dequeuing uses deficit-weighted round
+    robin across the levels, so the configured priority ratios control the
+    share of throughput each level gets without starving the low levels.
+    Consumers block on a condition variable instead of polling.
     """
     
-    def __init__(self, maxsize=100):
+    def __init__(self, maxsize=100, priority_ratios=None):
         """
         Initialize the priority queue
         
         Args:
             maxsize: Maximum size of the queue (default: 100)
+            priority_ratios: Ratios for each priority level [high, medium, low]
+                             If None, uses [0.6, 0.3, 0.1]
         """
-        self.queues = [[] for _ in range(PRIORITY_LEVELS)]
+        self.queues = [deque() for _ in range(PRIORITY_LEVELS)]
         self.maxsize = maxsize
         self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
         self.total_items = 0
-        self.stats = {
-            "high_priority": 0,
-            "medium_priority": 0,
-            "low_priority": 0,
-            "total_size": 0
-        }
+        
+        # Deficit round robin state
+        self._ratios = None
+        self._quanta = [1.0] * PRIORITY_LEVELS
+        self._deficits = [0.0] * PRIORITY_LEVELS
+        self._current_level = 0
+        self.set_ratios(priority_ratios or [0.6, 0.3, 0.1])
+        
+        # Per-level metrics
+        self._enqueued = [0] * PRIORITY_LEVELS
+        self._dequeued = [0] * PRIORITY_LEVELS
+        self._rejected = [0] * PRIORITY_LEVELS
+        self._total_wait = [0.0] * PRIORITY_LEVELS
+        self._max_wait = [0.0] * PRIORITY_LEVELS
     
-    def put(self, item, priority=PRIORITY_LOW):
+    def set_ratios(self, priority_ratios):
+        """
+        Set the dequeue ratios for each priority level
+        
+        Args:
+            priority_ratios: List of ratios for each priority level [high, medium, low]
+        """
+        ratios = [max(0.01, float(r)) for r in priority_ratios[:PRIORITY_LEVELS]]
+        smallest = min(ratios)
+        
+        with self.lock:
+            self._ratios = list(priority_ratios)
+            # Scale so the lowest level gets one item per round
+            self._quanta = [r / smallest for r in ratios]
+    
+    def put(self, item, priority=PRIORITY_LOW, block=False, timeout=None):
         """
         Add an item to the queue with given priority
         
         Args:
             item: The item to add
             priority: Priority level (0=high, 1=medium, 2=low)
+            block: Whether to wait for space if the queue is full
+            timeout: Maximum time to wait in seconds when blocking
         
         Raises:
             queue.Full: If the queue is full
         """
-        with self.lock:
+        with self.not_full:
             if self.total_items >= self.maxsize:
-                raise queue.Full("Priority queue is full")
+                if not block:
+                    self._rejected[priority] += 1
+                    raise queue.Full("Priority queue is full")
+                if not self.not_full.wait_for(lambda: self.total_items < self.maxsize, timeout):
+                    self._rejected[priority] += 1
+                    raise queue.Full("Priority queue is full")
             
-            # Add the item to the appropriate queue
-            self.queues[priority].append((item, priority))
+            self.queues[priority].append((item, priority, time.monotonic()))
             self.total_items += 1
-            
-            # Update stats
-            if priority == PRIORITY_HIGH:
-                self.stats["high_priority"] += 1
-            elif priority == PRIORITY_MEDIUM:
-                self.stats["medium_priority"] += 1
-            else:
-                self.stats["low_priority"] += 1
-            
-            self.stats["total_size"] = self.total_items
+            self._enqueued[priority] += 1
+            self.not_empty.notify()
     
-    def get(self, priority_ratios=None):
+    def get(self, block=True, timeout=None, priority_ratios=None):
         """
-        Get an item from the queue based on priority ratios
+        Get the next item from the queue
         
         Args:
-            priority_ratios: List of ratios for each priority level [high, medium, low]
-                             If None, uses [0.6, 0.3, 0.1]
+            block: Whether to wait for an item if the queue is empty
+            timeout: Maximum time to wait in seconds when blocking
+            priority_ratios: Optional new ratios [high, medium, low]
         
         Returns:
-            Tuple of (item, priority) or None if queue is empty
-        """
-        if priority_ratios is None:
-            priority_ratios = [0.6, 0.3, 0.1]  # Default ratios
-            
-        with self.lock:
-            if self.total_items == 0:
-                return None
+            Tuple of (item, priority)
             
-            # Determine which queue to pull from based on ratios and current queue state
-            # Use weighted random selection based on ratios and queue sizes
-            queue_weights = []
-            for i, ratio in enumerate(priority_ratios):
-                # Weight is ratio * queue size
-                if len(self.queues[i]) > 0:
-                    queue_weights.append(ratio * len(self.queues[i]))
-                else:
-                    queue_weights.append(0)
-            
-            # If all queues are empty, return None
-            if sum(queue_weights) == 0:
-                return None
-            
-            # Normalize weights
-            total_weight = sum(queue_weights)
-            normalized_weights = [w / total_weight for w in queue_weights]
+        Raises:
+            queue.Empty: If no item is available
+        """
+        if priority_ratios is not None and priority_ratios != self._ratios:
+            self.set_ratios(priority_ratios)
             
-            # Choose queue based on weights
-            r = random.random()
-            cumulative = 0
-            selected_queue = len(normalized_weights) - 1  # Default to lowest priority
+        with self.not_empty:
+            self._wait_for_items(block, timeout)
+            item = self._dequeue()
+            self.not_full.notify()
+            return item
+    
+    def get_many(self, max_items, block=True, timeout=None):
+        """
+        Get up to max_items items in deficit round robin order
+        
+        Waits for at least one item, then returns whatever is available up to
+        max_items without waiting further.
+        
+        Args:
+            max_items: Maximum number of items to return
+            block: Whether to wait for an item if the queue is empty
+            timeout: Maximum time to wait in seconds when blocking
+        
+        Returns:
+            List of (item, priority) tuples
             
-            for i, weight in enumerate(normalized_weights):
-                cumulative += weight
-                if r <= cumulative:
-                    selected_queue = i
-                    break
+        Raises:
+            queue.Empty: If no item is available
+        """
+        with self.not_empty:
+            self._wait_for_items(block, timeout)
+            count = min(max_items, self.total_items)
+            items = [self._dequeue() for _ in range(count)]
+            self.not_full.notify(count)
+            return items
+    
+    def _wait_for_items(self, block, timeout):
+        """Wait until the queue has items (lock must be held)"""
+        if self.total_items:
+            return
+        if not block or not self.not_empty.wait_for(lambda: self.total_items > 0, timeout):
+            raise queue.Empty
+    
+    def _dequeue(self):
+        """Pop the next item by deficit round robin (lock must be held, queue non-empty)"""
+        while True:
+            level = self._current_level
+            level_queue = self.queues[level]
             
-            # Get item from selected queue
-            if len(self.queues[selected_queue]) > 0:
-                item = self.queues[selected_queue].pop(0)
+            if level_queue and self._deficits[level] >= 1.0:
+                self._deficits[level] -= 1.0
+                item, priority, enqueued_at = level_queue.popleft()
                 self.total_items -= 1
                 
-                # Update stats
-                if selected_queue == PRIORITY_HIGH:
-                    self.stats["high_priority"] -= 1
-                elif selected_queue == PRIORITY_MEDIUM:
-                    self.stats["medium_priority"] -= 1
-                else:
-                    self.stats["low_priority"] -= 1
-                
-                self.stats["total_size"] = self.total_items
-                return item
-            
-            # If selected queue is empty, try other queues
-            for i in range(PRIORITY_LEVELS):
-                if len(self.queues[i]) > 0:
-                    item = self.queues[i].pop(0)
-                    self.total_items -= 1
-                    
-                    # Update stats
-                    if i == PRIORITY_HIGH:
-                        self.stats["high_priority"] -= 1
-                    elif i == PRIORITY_MEDIUM:
-                        self.stats["medium_priority"] -= 1
-                    else:
-                        self.stats["low_priority"] -= 1
-                    
-                    self.stats["total_size"] = self.total_items
-                    return item
+                # Record wait time
+                wait = time.monotonic() - enqueued_at
+                self._dequeued[level] += 1
+                self._total_wait[level] += wait
+                if wait > self._max_wait[level]:
+                    self._max_wait[level] = wait
+                return item, priority
             
-            return None
+            # An idle level does not bank credit
+            if not level_queue:
+                self._deficits[level] = 0.0
+                
+            # Move to the next level and grant it its quantum
+            self._current_level = (level + 1) % PRIORITY_LEVELS
+            if self.queues[self._current_level]:
+                self._deficits[self._current_level] += self._quanta[self._current_level]
     
     def get_stats(self):
         """Get statistics about the queue"""
         with self.lock:
-            return self.stats.copy()
+            levels = {}
+            for level, name in enumerate(("high", "medium", "low")):
+                dequeued = self._dequeued[level]
+                levels[name] = {
+                    "depth": len(self.queues[level]),
+                    "enqueued": self._enqueued[level],
+                    "dequeued": dequeued,
+                    "rejected": self._rejected[level],
+                    "avg_wait_ms": (self._total_wait[level] / dequeued * 1000) if dequeued else 0.0,
+                    "max_wait_ms": self._max_wait[level] * 1000
+                }
+            
+            return {
+                "high_priority": len(self.queues[PRIORITY_HIGH]),
+                "medium_priority": len(self.queues[PRIORITY_MEDIUM]),
+                "low_priority": len(self.queues[PRIORITY_LOW]),
+                "total_size": self.total_items,
+                "levels": levels
+            }
     
     def qsize(self):
         """Get the total size of the queue"""
         with self.lock:
             return self.total_items
     
+    def empty(self):
+        """Return True if the queue is empty"""
+        with self.lock:
+            return self.total_items == 0
+    
+    def full(self):
+        """Return True if the queue is full"""
+        with self.lock:
+            return self.total_items >= self.maxsize
+    
     def task_done(self):
         """
         Mark a task as done (compatibility with queue.Queue)
@@ -422,12 +446,127 @@ class PriorityQueue:
         pass
 
 
+class DetectionShard:
+    """
+    ARP state owned by a single detection worker.
+    
+    Packets are routed to a shard by a hash of the sender IP, so the ARP
+    table entry, suspicious source record, pattern recognizer state and
+    counters for any given IP are only ever written by the worker thread that
+    owns its shard. Other threads read shard state but never write it, which
+    keeps the hot path lock-free.
+    
+    Each shard's PatternRecognizer only sees the IPs routed to it, so
+    patterns that span IPs (one MAC claiming many addresses) are counted per
+    shard.
+    """
+    
+    # Counters written by the owning worker, summed by DetectionModule.get_stats()
+    COUNTERS = (
+        "arp_packets_processed",
+        "suspicious_packets",
+        "fast_path_hits",
+        "pattern_recognition_hits",
+        "mac_changes"
+    )
+    
+    def __init__(self, index: int, maxsize: int, priority_ratios: List[float],
+                 gateway_detector: Any = None):
+        """
+        Initialize the shard
+        
+        Args:
+            index: Shard number
+            maxsize: Maximum size of the shard's work queue
+            priority_ratios: Dequeue ratios for the shard's work queue
+            gateway_detector: Gateway lookup passed to the shard's PatternRecognizer
+        """
+        self.index = index
+        self.arp_table = ExpiringMap(ttl=DEFAULT_ARP_ENTRY_TTL, on_expire=_log_expired_binding)
+        self.suspicious_sources = ExpiringMap(ttl=86400)  # Expire after 24 hours
+        self.pattern_recognizer = PatternRecognizer(gateway_detector=gateway_detector)
+        self.work_queue = PriorityQueue(maxsize=maxsize, priority_ratios=priority_ratios)
+        self.reset_counters()
+        
+    def reset_counters(self) -> None:
+        """Reset the shard's counters"""
+        stats = dict.fromkeys(self.COUNTERS, 0)
+        stats["detection_latency"] = 0.0
+        self.stats = stats
+
+
+# Counters each worker process publishes in ProcessPoolManager's shared array
+PROCESS_COUNTERS = DetectionShard.COUNTERS + ("packets_received", "alerts", "busy_time")
+
+
+def _detection_process(index: int, ring_name: str, ring_capacity: int, results, counters,
+                       stop_event, config_dict: Dict[str, Any]) -> None:
+    """
+    Entry point of a detection worker process
+    
+    Runs the detection rules of a single-shard DetectionModule over the ARP
+    records pushed to this process's ring, puts alerts on the results queue
+    and publishes its counters in its slot of the shared counter array.
+    
+    Args:
+        index: Worker process index
+        ring_name: Name of the shared memory ring to read
+        ring_capacity: Number of records in the ring
+        results: Queue for alerts
+        counters: Shared counter array
+        stop_event: Event that ends the process when set
+        config_dict: DetectionModuleConfig as a dictionary
+    """
+    config = DetectionModuleConfig(**config_dict)
+    config.worker_threads = 1
+    config.execution_mode = EXECUTION_THREAD
+    module = DetectionModule(config)
+    shard = module.shards[0]
+    
+    ring = SharedRingBuffer.attach(ring_name, ARP_RECORD_SIZE, ring_capacity)
+    slots = {name: index * len(PROCESS_COUNTERS) + i for i, name in enumerate(PROCESS_COUNTERS)}
+    
+    try:
+        while not stop_event.is_set():
+            views = ring.get_many(config.batch_size, ARPFrameView.unpack_from, timeout=0.1)
+            if not views:
+                continue
+                
+            started = time.perf_counter()
+            alerts = 0
+            for view in views:
+                try:
+                    if module._is_fast_path_eligible(view, shard):
+                        continue
+                        
+                    priority = module._determine_packet_priority(view)
+                    result = module._analyze_packet(view, priority, view.timestamp, shard)
+                    if result:
+                        alert = module._record_suspicious(result, shard)
+                        if alert:
+                            results.put(alert)
+                            alerts += 1
+                except Exception as e:
+                    logger.error(f"Error in detection process {index}: {e}")
+                    
+            counters[slots["packets_received"]] += len(views)
+            counters[slots["alerts"]] += alerts
+            counters[slots["busy_time"]] += time.perf_counter() - started
+            for name in DetectionShard.COUNTERS:
+                counters[slots[name]] = shard.stats[name]
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.close()
+
+
 class DetectionModule(Module):
     """
     ARP spoofing detection module for network protection.
     
     This module analyzes network packets to detect potential ARP spoofing attacks,
     using a multi-threaded approach with priority-based packet processing.
+    ARP state is sharded by sender IP with one shard per worker thread.
     """
     
     def __init__(self, config: DetectionModuleConfig, remediation: Optional[RemediationModule] = None):
@@ -453,17 +592,11 @@ class DetectionModule(Module):
         # Network state - with optimized data structures
         self.packet_cache = deque(maxlen=self.config.max_packet_cache)
         
-        # Use more memory-efficient data structures with TTL support
-        self.arp_table = TTLDict(ttl=3600)  # Expire entries after 1 hour
-        self.mac_vendors = {}  # Lazy loaded
+        self.vendor_resolver = get_vendor_resolver()
         self._mac_vendors_loaded = False  # Track if we've loaded MAC vendors
-        self.suspicious_sources = TTLDict(ttl=86400)  # Expire after 24 hours
         self.gateway_info = {}  # Lazy loaded
         self._gateway_info_loaded = False  # Track if we've loaded gateway info
         
-        # Initialize pattern recognition
-        self.pattern_recognizer = PatternRecognizer(gateway_detector=self)
-        
         # Cache for frequently accessed data
         self._known_safe_sources = set()  # Known safe sources that don't need constant checking
         self._known_safe_ttl = {}
@@ -497,10 +630,6 @@ class DetectionModule(Module):
         
         # Processing state
         self.worker_threads: List[threading.Thread] = []
-        self.work_queue = PriorityQueue(maxsize=config.max_packet_cache)
-        self.result_queue: queue.Queue = queue.Queue()
-        self.stop_event = threading.Event()
-        
         # Priority thresholds and ratios
         self.priority_ratios = [
             self.config.high_priority_ratio,
@@ -508,6 +637,15 @@ class DetectionModule(Module):
             self.config.low_priority_ratio
         ]
         
+        # One ARP state shard (and work queue) per worker thread
+        self.shards: List[DetectionShard] = []
+        self._build_shards(config.worker_threads)
+        self.result_queue: queue.Queue = queue.Queue()
+        self.stop_event = threading.Event()
+        
+        # Worker processes in process execution mode
+        self.process_pool: Optional[ProcessPoolManager] = None
+        
         # Don't load vendor/gateway data immediately - lazy load
         # This improves startup time
         logger.info(f"Detection module initialized with {config.worker_threads} workers and pattern recognition")
@@ -522,11 +660,19 @@ class DetectionModule(Module):
         self.started_at = time.time()
         self.stop_event.clear()
         
-        # Start worker threads
-        for i in range(self.config.worker_threads):
+        # Pick up a changed worker count before any worker owns a shard
+        if len(self.shards) != max(1, self.config.worker_threads):
+            self._build_shards(self.config.worker_threads)
+        
+        if self.config.execution_mode == EXECUTION_PROCESS:
+            self._start_process_pool()
+            
+        # Start one worker thread per shard
+        for shard in (self.shards if self.process_pool is None else []):
             worker = threading.Thread(
                 target=self._worker_thread,
-                name=f"detection-worker-{i}",
+                args=(shard,),
+                name=f"detection-worker-{shard.index}",
                 daemon=True
             )
             worker.start()
@@ -541,7 +687,7 @@ class DetectionModule(Module):
         )
         self.collector_thread.start()
         
-        logger.info(f"Detection module started with {self.active_workers} workers")
+        logger.info(f"Detection module started with {self.active_workers} {self.config.execution_mode} workers")
     
     def stop(self) -> None:
         """Stop the detection module and worker threads"""
@@ -558,13 +704,17 @@ class DetectionModule(Module):
             if worker.is_alive():
                 worker.join(timeout=1.0)
                 
+        if self.process_pool is not None:
+            self._stop_process_pool()
+                
         # Clear queues
-        while not self.work_queue.empty():
-            try:
-                self.work_queue.get(block=False)
-                self.work_queue.task_done()
-            except queue.Empty:
-                break
+        for shard in self.shards:
+            while not shard.work_queue.empty():
+                try:
+                    shard.work_queue.get(block=False)
+                    shard.work_queue.task_done()
+                except queue.Empty:
+                    break
                 
         while not self.result_queue.empty():
             try:
@@ -618,40 +768,36 @@ class DetectionModule(Module):
             self.stats["last_packet_count"] = self.stats["packets_received"]
             self.stats["last_rate_update"] = current_time
             
-            # Adjust worker threads based on load if needed
+            # Review resource usage based on load if needed
             if PSUTIL_AVAILABLE and current_time - self.stats.get("last_thread_adjustment", 0) >= 30:
-                self._adjust_worker_threads()
+                self._adjust_response_system()
                 self.stats["last_thread_adjustment"] = current_time
         
         # Quick reject check
         if self._should_quick_reject(packet):
             return
-        
-        # Fast path for common packet patterns
-        if self._is_fast_path_eligible(packet):
-            # Update last seen timestamp but skip detailed analysis
-            if packet.haslayer(scapy.ARP):
-                arp = packet.getlayer(scapy.ARP)
-                if arp.psrc in self.arp_table:
-                    self.arp_table[arp.psrc]["last_seen"] = current_time
-                    self.arp_table[arp.psrc]["count"] += 1
+            
+        # In process mode the worker processes own all ARP state
+        if self.process_pool is not None:
+            self._submit_to_process(packet)
             return
             
+        # Route to the shard that owns the sender IP. The fast path and all
+        # state updates happen on that shard's worker thread.
+        arp = self._get_arp_layer(packet)
+        shard = self._get_shard(arp.psrc)
+        
         # Determine packet priority
         priority = self._determine_packet_priority(packet)
         self.stats["priority_distribution"][priority] += 1
         
-        # Add packet to appropriate queue with timestamp
+        # Add packet to the owning shard's queue with timestamp
         if self.running:
             try:
-                self.work_queue.put((packet, current_time), priority=priority)
+                shard.work_queue.put((packet, current_time), priority=priority)
             except queue.Full:
-                logger.warning(f"Queue {priority} is full, dropping packet")
+                logger.warning(f"Shard {shard.index} queue is full, dropping priority {priority} packet")
                 self.stats["dropped_packets"] += 1
-                
-                # If high priority queue is full, this is serious - adjust worker threads
-                if priority == PRIORITY_HIGH:
-                    self._adjust_worker_threads(force_increase=True)
                     
     def process_packet_batch(self, packets: List[scapy.Packet]) -> None:
         """
@@ -676,6 +822,94 @@ class DetectionModule(Module):
         for packet, priority in prioritized_packets:
             self.process_packet(packet)
     
+    def process_frames(self, frames: FrameBatch) -> None:
+        """
+        Process a batch of raw Ethernet frames delivered by a capture engine
+        
+        Only the Ethernet/ARP header of each frame is copied, so this can be
+        used directly as a ring engine callback without holding on to ring memory.
+        
+        Args:
+            frames: List of (timestamp, frame) pairs
+        """
+        batch = ARPBatch.from_frames(frames)
+        self.stats["quick_reject_hits"] += len(frames) - len(batch)
+        self.process_arp_batch(batch)
+    
+    def process_arp_batch(self, batch: ARPBatch) -> None:
+        """
+        Process a columnar batch of decoded ARP frames
+        
+        Address sanity checks run over the whole batch at once; only the
+        surviving rows go through the per-packet pipeline.
+        
+        Args:
+            batch: Decoded ARP batch
+        """
+        if not len(batch):
+            return
+            
+        valid = batch.valid_mask()
+        self.stats["quick_reject_hits"] += int(len(batch) - valid.sum())
+        
+        for view in batch.select(valid).views():
+            self.process_packet(view)
+    
+    def _start_process_pool(self) -> None:
+        """Start the worker processes and route alerts from them to the collector"""
+        self.process_pool = ProcessPoolManager(
+            self.config.worker_processes,
+            _detection_process,
+            ARP_RECORD_SIZE,
+            PROCESS_COUNTERS,
+            ring_capacity=self.config.ring_capacity,
+            args=(self.config.to_dict(),)
+        )
+        self.process_pool.start()
+        self.result_queue = self.process_pool.results
+        self.active_workers = self.process_pool.num_processes
+    
+    def _stop_process_pool(self) -> None:
+        """Stop the worker processes"""
+        if self.collector_thread.is_alive():
+            self.collector_thread.join(timeout=1.0)
+        self.process_pool.stop()
+        self.process_pool = None
+        
+        # Alerts that arrived after the collector stopped are dropped with the queue
+        self.result_queue = queue.Queue()
+    
+    def _submit_to_process(self, packet: Any) -> None:
+        """
+        Push a packet to the worker process owning its sender IP
+        
+        Args:
+            packet: Scapy packet or ARPFrameView
+        """
+        if isinstance(packet, ARPFrameView):
+            view = packet
+        else:
+            view = ARPFrameView.from_frame(bytes(packet), float(packet.time))
+            if view is None:
+                return
+                
+        index = view.psrc_int % self.process_pool.num_processes
+        if not self.process_pool.submit(index, (view,), ARPFrameView.pack_into):
+            self.stats["dropped_packets"] += 1
+    
+    def create_capture_engine(self, interface: Optional[str] = None, **kwargs) -> CaptureEngine:
+        """
+        Create the capture engine selected in the configuration
+        
+        Args:
+            interface: Network interface to capture on
+            **kwargs: Additional engine-specific options
+            
+        Returns:
+            CaptureEngine whose frames can be passed to process_frames()
+        """
+        return create_capture_engine(self.config.capture_engine, interface=interface, **kwargs)
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Get detection module statistics and status
@@ -696,31 +930,147 @@ class DetectionModule(Module):
             except:
                 pass
         
-        # Add pattern recognition stats if available
-        if hasattr(self, 'pattern_recognizer'):
-            pattern_stats = self.pattern_recognizer.get_stats()
-            for key, value in pattern_stats.items():
-                self.stats[f"pattern_{key}"] = value
+        # Work queue depth and wait times per priority level
+        self.stats["queue"] = self._get_queue_stats()
+        
+        # Pattern recognition stats summed over the shards' recognizers
+        pattern_stats = Counter()
+        for shard in self.shards:
+            pattern_stats.update(shard.pattern_recognizer.get_stats())
+        for key, value in pattern_stats.items():
+            self.stats[f"pattern_{key}"] = value
+        
+        # Merge the per-shard counters into the result
+        stats = self.stats.copy()
+        for name in DetectionShard.COUNTERS:
+            stats[name] = stats.get(name, 0) + sum(shard.stats[name] for shard in self.shards)
+        stats["detection_latency"] = sum(shard.stats["detection_latency"] for shard in self.shards) / len(self.shards)
+        
+        # Counters published by worker processes
+        if self.process_pool is not None:
+            process_stats = self.process_pool.get_stats()
+            for name in DetectionShard.COUNTERS:
+                stats[name] += sum(process[name] for process in process_stats)
+            stats["processes"] = process_stats
+            
+        stats["shards"] = [
+            {
+                "index": shard.index,
+                "arp_entries": len(shard.arp_table),
+                "suspicious_sources": len(shard.suspicious_sources),
+                "queue_size": shard.work_queue.qsize()
+            }
+            for shard in self.shards
+        ]
         
-        return self.stats.copy()
+        return stats
+    
+    @property
+    def pattern_recognizers(self) -> List[PatternRecognizer]:
+        """Pattern recognizers of all shards, in shard order"""
+        return [shard.pattern_recognizer for shard in self.shards]
+    
+    @property
+    def pattern_recognizer(self) -> PatternRecognizer:
+        """Pattern recognizer of the first shard (the only one with a single worker)"""
+        return self.shards[0].pattern_recognizer
     
     def get_suspicious_sources(self) -> Dict[str, Dict[str, Any]]:
         """
         Get all suspicious sources detected
         
         Returns:
-            Dictionary of suspicious sources with metadata
+            Read-only snapshot of suspicious sources with metadata, merged across shards
         """
-        return self.suspicious_sources.copy()
+        return self._merge_shards("suspicious_sources")
     
     def get_arp_table(self) -> Dict[str, Dict[str, Any]]:
         """
         Get the current ARP table
         
+        In process execution mode the ARP table is held by the worker
+        processes and this only covers packets handled in this process.
+        
         Returns:
-            Dictionary of IP to MAC mappings with metadata
+            Read-only snapshot of IP to MAC mappings with metadata, merged across shards
         """
-        return self.arp_table.copy()
+        return self._merge_shards("arp_table")
+    
+    def _merge_shards(self, name: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Merge one ExpiringMap from every shard into a plain dictionary
+        
+        Entries are copied so callers cannot modify worker-owned state.
+        
+        Args:
+            name: Shard attribute to merge ("arp_table" or "suspicious_sources")
+            
+        Returns:
+            Dictionary of IP to entry copies
+        """
+        merged = {}
+        for shard in self.shards:
+            for ip, entry in getattr(shard, name).snapshot().items():
+                entry = dict(entry)
+                for key, value in entry.items():
+                    if isinstance(value, (list, Counter)):
+                        entry[key] = value.copy()
+                merged[ip] = entry
+        return merged
+    
+    def _build_shards(self, count: int) -> None:
+        """
+        Create the ARP state shards, rehashing any existing entries
+        
+        Only called while no workers are running.
+        
+        Args:
+            count: Number of shards (one per worker thread)
+        """
+        count = max(1, count)
+        queue_size = max(1, self.config.max_packet_cache // count)
+        old_shards = self.shards
+        self.shards = [DetectionShard(i, queue_size, self.priority_ratios, gateway_detector=self)
+                       for i in range(count)]
+        
+        # Move entries over with their remaining time-to-live
+        for old_shard in old_shards:
+            for name in ("arp_table", "suspicious_sources"):
+                old_map = getattr(old_shard, name)
+                for ip, entry in old_map.items():
+                    ttl = old_map.ttl_remaining(ip)
+                    if ttl:
+                        getattr(self._get_shard(ip), name).set(ip, entry, ttl=ttl)
+        
+        if old_shards:
+            logger.info(f"Resharded ARP state from {len(old_shards)} to {count} shards")
+    
+    def _get_shard(self, ip: str) -> DetectionShard:
+        """
+        Get the shard that owns an IP address
+        
+        Args:
+            ip: Sender IP address
+            
+        Returns:
+            Owning DetectionShard
+        """
+        return self.shards[hash(ip) % len(self.shards)]
+    
+    def _get_queue_stats(self) -> Dict[str, Any]:
+        """
+        Get work queue statistics summed over all shards
+        
+        Returns:
+            Dictionary with total and per-level queue depths and per-shard details
+        """
+        shard_stats = [shard.work_queue.get_stats() for shard in self.shards]
+        totals = {
+            key: sum(stats[key] for stats in shard_stats)
+            for key in ("high_priority", "medium_priority", "low_priority", "total_size")
+        }
+        totals["shards"] = shard_stats
+        return totals
     
     def reset_stats(self) -> None:
         """Reset all module statistics"""
@@ -745,6 +1095,8 @@ class DetectionModule(Module):
             "quick_reject_hits": 0,
             "pattern_recognition_hits": 0
         }
+        for shard in self.shards:
+            shard.reset_counters()
         self.packet_count_history.clear()
         self.last_packet_time = current_time
         
@@ -755,18 +1107,13 @@ class DetectionModule(Module):
             return
             
         vendor_file = os.path.join(self.config.storage_path, "mac_vendors.json")
-        try:
-            if os.path.exists(vendor_file):
-                with open(vendor_file, "r") as f:
-                    self.mac_vendors = json.load(f)
-                logger.info(f"Loaded {len(self.mac_vendors)} MAC vendors from {vendor_file}")
-            else:
-                logger.warning(f"MAC vendor file not found: {vendor_file}")
-                
-            # Mark as loaded
-            self._mac_vendors_loaded = True
-        except Exception as e:
-            logger.error(f"Error loading MAC vendors: {e}")
+        if os.path.exists(vendor_file):
+            self.vendor_resolver.add_source(vendor_file)
+        else:
+            logger.warning(f"MAC vendor file not found: {vendor_file}")
+            
+        # Mark as loaded
+        self._mac_vendors_loaded = True
     
     def _load_gateway_info(self) -> None:
         """Load gateway information from configuration (lazy loading)"""
@@ -815,39 +1162,44 @@ class DetectionModule(Module):
         except Exception as e:
             logger.error(f"Error saving gateway info: {e}")
     
-    def _worker_thread(self) -> None:
-        """Worker thread for processing packets from the queue"""
+    def _worker_thread(self, shard: DetectionShard) -> None:
+        """
+        Worker thread for processing packets from its shard's queue
+        
+        Args:
+            shard: Shard owned by this worker
+        """
         logger.debug(f"Worker thread {threading.current_thread().name} started")
         
         while not self.stop_event.is_set():
             try:
-                # Get work item from queue with priority weighting
-                work_item = self.work_queue.get(priority_ratios=self.priority_ratios)
-                if work_item is None:
-                    # Sleep briefly if no work available
-                    time.sleep(0.01)
-                    continue
-                    
-                packet, timestamp = work_item[0]
-                priority = work_item[1]
-                
-                # Process the packet
-                result = self._analyze_packet(packet, priority, timestamp)
-                
-                # Put result in result queue if meaningful
-                if result:
-                    self.result_queue.put(result)
-                    
+                # Block until work is available, then take a batch in priority-weighted order
+                work_items = shard.work_queue.get_many(self.config.batch_size, timeout=0.1)
             except queue.Empty:
-                # Sleep briefly if no work available
-                time.sleep(0.01)
+                continue
                 
-            except Exception as e:
-                logger.error(f"Error in worker thread: {e}")
+            for (packet, timestamp), priority in work_items:
+                try:
+                    # Fast path for common packet patterns
+                    if self._is_fast_path_eligible(packet, shard):
+                        continue
+                        
+                    # Process the packet
+                    result = self._analyze_packet(packet, priority, timestamp, shard)
+                    
+                    # Record suspicious activity and pass on any alert
+                    if result:
+                        alert = self._record_suspicious(result, shard)
+                        if alert:
+                            self.result_queue.put(alert)
+                        
+                except Exception as e:
+                    logger.error(f"Error in worker thread: {e}")
     
         logger.debug(f"Worker thread {threading.current_thread().name} stopped")
         
-    def _analyze_packet(self, packet: scapy.Packet, priority: int, timestamp: float) -> Optional[Dict[str, Any]]:
+    def _analyze_packet(self, packet: scapy.Packet, priority: int, timestamp: float,
+                        shard: DetectionShard) -> Optional[Dict[str, Any]]:
         """
         Analyze a packet for ARP spoofing detection
         
@@ -855,27 +1207,27 @@ class DetectionModule(Module):
             packet: Scapy packet to analyze
             priority: Priority level of the packet
             timestamp: Time when packet was received
+            shard: Shard owning the packet's sender IP
             
         Returns:
             Detection result or None if no issue detected
         """
+        stats = shard.stats
+        arp_table = shard.arp_table
+        
         # Calculate processing latency
         latency = time.time() - timestamp
-        self.stats["detection_latency"] = (self.stats["detection_latency"] + latency) / 2
+        stats["detection_latency"] = (stats["detection_latency"] + latency) / 2
         
-        # Quick rejection filter - bail out early for packets that are clearly not interesting
-        if self._should_quick_reject(packet):
-            return None
-            
         # Check if packet contains ARP layer
-        if not packet.haslayer(scapy.ARP):
+        arp = self._get_arp_layer(packet)
+        if arp is None:
             return None
             
         # Increment ARP packet counter
-        self.stats["arp_packets_processed"] += 1
+        stats["arp_packets_processed"] += 1
         
         # Extract ARP fields
-        arp = packet.getlayer(scapy.ARP)
         src_ip = arp.psrc
         src_mac = arp.hwsrc
         dst_ip = arp.pdst
@@ -893,8 +1245,8 @@ class DetectionModule(Module):
         is_gateway = (src_ip == self.gateway_info.get("ip")) or (src_mac == self.gateway_info.get("mac"))
         
         # Update ARP table
-        if src_ip not in self.arp_table:
-            self.arp_table[src_ip] = {
+        if src_ip not in arp_table:
+            arp_table[src_ip] = {
                 "mac": src_mac,
                 "first_seen": time.time(),
                 "last_seen": time.time(),
@@ -904,7 +1256,8 @@ class DetectionModule(Module):
             }
         else:
             # Existing IP in table
-            existing_entry = self.arp_table[src_ip]
+            existing_entry = arp_table[src_ip]
+            arp_table.touch(src_ip)
             existing_entry["last_seen"] = time.time()
             existing_entry["count"] += 1
             existing_entry["op_codes"][op_code] += 1
@@ -926,6 +1279,7 @@ class DetectionModule(Module):
                 # Update ARP table with new MAC
                 existing_entry["mac"] = src_mac
                 existing_entry["changes"] = existing_entry.get("changes", 0) + 1
+                stats["mac_changes"] += 1
                 
                 # Return suspicious activity
                 return suspicious
@@ -941,11 +1295,11 @@ class DetectionModule(Module):
             "priority": priority
         }
         
-        pattern_result = self.pattern_recognizer.process_packet(pattern_packet)
+        pattern_result = shard.pattern_recognizer.process_packet(pattern_packet)
         
         if pattern_result:
-                    # Update statistics
-            self.stats["pattern_recognition_hits"] += 1
+            # Update statistics
+            stats["pattern_recognition_hits"] += 1
             
             # Convert to our result format
             suspicious = {
@@ -965,6 +1319,23 @@ class DetectionModule(Module):
                 
         return None
     
+    @staticmethod
+    def _get_arp_layer(packet: Any) -> Optional[Any]:
+        """
+        Get the ARP fields of a packet
+        
+        Args:
+            packet: Scapy packet or ARPFrameView from a capture engine
+            
+        Returns:
+            Object with psrc/hwsrc/pdst/hwdst/op attributes, or None if not ARP
+        """
+        if isinstance(packet, ARPFrameView):
+            return packet
+        if packet.haslayer(scapy.ARP):
+            return packet.getlayer(scapy.ARP)
+        return None
+        
     def _should_quick_reject(self, packet: scapy.Packet) -> bool:
         """
         Quick rejection filter to bail out early for packets that are clearly not interesting.
@@ -979,11 +1350,10 @@ class DetectionModule(Module):
         rejected = False
         
         # Not an ARP packet
-        if not packet.haslayer(scapy.ARP):
+        arp = self._get_arp_layer(packet)
+        if arp is None:
             rejected = True
         else:
-            arp = packet.getlayer(scapy.ARP)
-            
             # Invalid source addresses
             if (not arp.psrc or 
                 arp.psrc == "0.0.0.0" or 
@@ -1009,105 +1379,126 @@ class DetectionModule(Module):
             
         return rejected
         
-    def _is_fast_path_eligible(self, packet: scapy.Packet) -> bool:
+    def _is_fast_path_eligible(self, packet: scapy.Packet, shard: DetectionShard) -> bool:
         """
         Check if packet is eligible for fast path processing
         
+        Eligible packets only refresh their ARP table entry's last seen time
+        and count; must be called from the worker thread owning the shard.
+        
         Args:
             packet: Packet to check
+            shard: Shard owning the packet's sender IP
             
         Returns:
-            True if packet can be processed via fast path
+            True if packet was handled via fast path
         """
-        if not packet.haslayer(scapy.ARP):
+        arp = self._get_arp_layer(packet)
+        if arp is None:
             return False
             
-        arp = packet.getlayer(scapy.ARP)
         src_ip = arp.psrc
+        entry = shard.arp_table.get(src_ip)
+        if entry is None or src_ip in shard.suspicious_sources:
+            return False
+            
+        eligible = (
+            # ARP request (who-has) from non-suspicious source
+            (arp.op == 1 and entry.get("count", 0) > 5) or
+            # Recent ARP reply with consistent data
+            (arp.op == 2 and entry.get("mac") == arp.hwsrc and entry.get("count", 0) > 10)
+        )
+        if not eligible:
+            return False
+            
+        # Update last seen timestamp but skip detailed analysis
+        shard.arp_table.touch(src_ip)
+        entry["last_seen"] = time.time()
+        entry["count"] += 1
+        shard.stats["fast_path_hits"] += 1
+        return True
+    
+    def _record_suspicious(self, result: Dict[str, Any], shard: DetectionShard) -> Optional[Dict[str, Any]]:
+        """
+        Record suspicious activity in the owning shard
         
-        # ARP request (who-has) from non-suspicious source
-        if (arp.op == 1 and 
-            src_ip not in self.suspicious_sources and
-            src_ip in self.arp_table and
-            self.arp_table.get(src_ip, {}).get("count", 0) > 5):
-            self.stats["fast_path_hits"] += 1
-            return True
+        Must be called from the worker thread owning the shard.
+        
+        Args:
+            result: Detection result from _analyze_packet()
+            shard: Shard owning the result's source IP
             
-        # Recent ARP reply with consistent data
-        if (arp.op == 2 and 
-            src_ip in self.arp_table and
-            self.arp_table[src_ip].get("mac") == arp.hwsrc and
-            self.arp_table[src_ip].get("count", 0) > 10 and
-            src_ip not in self.suspicious_sources):
-            self.stats["fast_path_hits"] += 1
-            return True
+        Returns:
+            Alert dictionary once the source crosses the detection threshold, otherwise None
+        """
+        src_ip = result["src_ip"]
+        new_mac = result["new_mac"]
+        old_mac = result["old_mac"]
+        confidence = result["confidence"]
+        
+        # Mark as suspicious
+        shard.stats["suspicious_packets"] += 1
+        
+        # Check if this is a known suspicious source
+        entry = shard.suspicious_sources.get(src_ip)
+        if entry is None:
+            # New suspicious source
+            shard.suspicious_sources[src_ip] = {
+                "first_seen": time.time(),
+                "last_seen": time.time(),
+                "count": 1,
+                "mac_history": [old_mac, new_mac],
+                "confidence": confidence,
+                "alerted": False
+            }
+            
+            logger.info(f"New suspicious source: {src_ip} changed MAC from {old_mac} to {new_mac}")
+            return None
             
-        return False
+        # Update existing entry
+        shard.suspicious_sources.touch(src_ip)
+        entry["last_seen"] = time.time()
+        entry["count"] += 1
+        entry["confidence"] = min(0.99, entry["confidence"] + 0.1)  # Increase confidence
+        
+        # Add to MAC history if not already there
+        if new_mac not in entry["mac_history"]:
+            entry["mac_history"].append(new_mac)
+            
+        # Check alert threshold
+        if entry["count"] < self.config.detection_threshold or entry["alerted"]:
+            return None
+            
+        entry["alerted"] = True
+        
+        # Create alert with high confidence
+        return {
+            "timestamp": time.time(),
+            "src_ip": src_ip,
+            "mac_addresses": list(entry["mac_history"]),
+            "count": entry["count"],
+            "confidence": entry["confidence"],
+            "message": f"ARP spoofing detected - IP {src_ip} using multiple MAC addresses"
+        }
     
     def _collect_results(self) -> None:
-        """Collect and process results from worker threads"""
+        """Collect alerts from worker threads and hand them to remediation"""
         logger.debug("Result collector thread started")
         
         while not self.stop_event.is_set():
             try:
-                # Get result from queue with 0.1s timeout
-                result = self.result_queue.get(timeout=0.1)
+                # Get alert from queue with 0.1s timeout
+                alert = self.result_queue.get(timeout=0.1)
                 
-                # Process the suspicious activity
-                src_ip = result["src_ip"]
-                new_mac = result["new_mac"]
-                old_mac = result["old_mac"]
-                confidence = result["confidence"]
+                self.stats["attack_alerts"] += 1
+                self.stats["last_attack_time"] = alert["timestamp"]
                 
-                # Mark as suspicious
-                self.stats["suspicious_packets"] += 1
+                # Log alert
+                logger.warning(f"ARP SPOOF ALERT: {alert['message']} (confidence: {alert['confidence']:.2f})")
                 
-                # Check if this is a known suspicious source
-                if src_ip in self.suspicious_sources:
-                    # Update existing entry
-                    entry = self.suspicious_sources[src_ip]
-                    entry["last_seen"] = time.time()
-                    entry["count"] += 1
-                    entry["confidence"] = min(0.99, entry["confidence"] + 0.1)  # Increase confidence
-                    
-                    # Add to MAC history if not already there
-                    if new_mac not in entry["mac_history"]:
-                        entry["mac_history"].append(new_mac)
-                        
-                    # Check alert threshold
-                    if entry["count"] >= self.config.detection_threshold and not entry["alerted"]:
-                        entry["alerted"] = True
-                        self.stats["attack_alerts"] += 1
-                        self.stats["last_attack_time"] = time.time()
-                        
-                        # Create alert with high confidence
-                        alert = {
-                            "timestamp": time.time(),
-                            "src_ip": src_ip,
-                            "mac_addresses": entry["mac_history"],
-                            "count": entry["count"],
-                            "confidence": entry["confidence"],
-                            "message": f"ARP spoofing detected - IP {src_ip} using multiple MAC addresses"
-                        }
-                        
-                        # Log alert
-                        logger.warning(f"ARP SPOOF ALERT: {alert['message']} (confidence: {alert['confidence']:.2f})")
-                        
-                        # Send to remediation if available
-                        if self.remediation:
-                            self.remediation.handle_detection(alert)
-                else:
-                    # New suspicious source
-                    self.suspicious_sources[src_ip] = {
-                        "first_seen": time.time(),
-                        "last_seen": time.time(),
-                        "count": 1,
-                        "mac_history": [old_mac, new_mac],
-                        "confidence": confidence,
-                        "alerted": False
-                    }
-                    
-                    logger.info(f"New suspicious source: {src_ip} changed MAC from {old_mac} to {new_mac}")
+                # Send to remediation if available
+                if self.remediation:
+                    self.remediation.handle_detection(alert)
                     
                 # Mark task as done
                 self.result_queue.task_done()
@@ -1130,10 +1521,13 @@ class DetectionModule(Module):
         Returns:
             Priority level (PRIORITY_HIGH, PRIORITY_MEDIUM, PRIORITY_LOW)
         """
-        if not packet.haslayer(scapy.ARP):
+        arp = self._get_arp_layer(packet)
+        if arp is None:
             return PRIORITY_LOW
             
-        arp = packet.getlayer(scapy.ARP)
+        # Read-only lookups in the shards owning the sender and target
+        shard = self._get_shard(arp.psrc)
+        entry = shard.arp_table.get(arp.psrc)
         
         # High priority cases
         if any([
@@ -1144,10 +1538,10 @@ class DetectionModule(Module):
             arp.psrc in self._get_gateway_ips() or arp.pdst in self._get_gateway_ips(),
             
             # Known suspicious source
-            arp.psrc in self.suspicious_sources,
+            arp.psrc in shard.suspicious_sources,
             
             # IP conflict with different MAC
-            arp.psrc in self.arp_table and self.arp_table[arp.psrc]["mac"] != arp.hwsrc
+            entry is not None and entry["mac"] != arp.hwsrc
         ]):
             return PRIORITY_HIGH
             
@@ -1157,10 +1551,10 @@ class DetectionModule(Module):
             arp.op == 2,
             
             # New IP not in ARP table
-            arp.psrc not in self.arp_table,
+            entry is None,
             
             # Target is in our suspicious list
-            arp.pdst in self.suspicious_sources
+            arp.pdst in self._get_shard(arp.pdst).suspicious_sources
         ]):
             return PRIORITY_MEDIUM
             
@@ -1206,7 +1600,7 @@ class DetectionModule(Module):
                 pass
                 
         # Get current detection latency
-        current_latency = self.stats["detection_latency"]
+        current_latency = max(shard.stats["detection_latency"] for shard in self.shards)
         
         # Adjust worker threads based on system load
         target_workers = self.config.worker_threads
@@ -1222,23 +1616,10 @@ class DetectionModule(Module):
             target_workers = min(multiprocessing.cpu_count(), int(target_workers * 1.25))
             logger.info(f"Low system load ({system_load:.2f}) and low latency ({current_latency:.2f}ms), increasing workers to {target_workers}")
         
-        # Adjust worker threads if needed
-        current_workers = len(self.worker_threads)
-        if target_workers > current_workers:
-            # Add workers
-            for i in range(current_workers, target_workers):
-                worker = threading.Thread(
-                    target=self._worker_thread,
-                    name=f"detection-worker-{i}",
-                    daemon=True
-                )
-                worker.start()
-                self.worker_threads.append(worker)
-                self.active_workers += 1
-                logger.info(f"Added worker thread: {worker.name}")
-                
-        # We don't remove workers dynamically as that would be complex
-        # Instead, we'll just let the system stabilize by itself 
+        # Each worker owns an ARP state shard, so the worker count is fixed
+        # while running; the target applies the next time the module starts
+        if target_workers != len(self.worker_threads):
+            self.config.worker_threads = max(1, min(target_workers, MAX_WORKER_THREADS))
 
     def _get_gateway_ips(self) -> List[str]:
         """
@@ -1285,9 +1666,5 @@ class DetectionModule(Module):
         if not mac_address:
             return "Unknown"
             
-        # Try to normalize the MAC address format
-        mac_prefix = mac_address.replace(':', '').replace('-', '').upper()[0:6]
-        
-        # Look up the vendor
-        return self.mac_vendors.get(mac_prefix, "Unknown") 
+        return self.vendor_resolver.get_vendor(mac_address) or "Unknown"
 
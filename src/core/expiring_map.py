@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Expiring Map for ARP Guard
+Dictionary whose entries expire after a time-to-live
+
+Expiry is scheduled on a hierarchical timing wheel: every entry sits in one
+slot of one wheel level, so setting, refreshing and deleting an entry are
+O(1), and advancing time only visits the slots that come due. Entries are
+cascaded from coarse to fine levels as their deadline approaches.
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# 4 levels of 64 slots cover 64**4 ticks (about 194 days at 1 s resolution)
+WHEEL_BITS = 6
+WHEEL_SLOTS = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SLOTS - 1
+WHEEL_LEVELS = 4
+
+# Entry fields: [value, expires_at, expiry tick, slot holding the key, wheel level]
+_VALUE = 0
+_EXPIRES = 1
+_TICK = 2
+_SLOT = 3
+_LEVEL = 4
+
+
+class ExpiringMap(Generic[K, V]):
+    """
+    Mapping with per-entry time-to-live and eviction callbacks.
+
+    Reads (get, ``in``, ``[]``) never modify the map and treat entries past
+    their deadline as missing, so they are safe from threads other than the
+    writer. Mutations and expiry run under an internal lock; eviction
+    callbacks run after the lock is released.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600,
+        resolution: float = 1.0,
+        on_expire: Optional[Callable[[K, V], None]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the map
+
+        Args:
+            ttl: Default time-to-live in seconds
+            resolution: Length of one wheel tick in seconds
+            on_expire: Optional callback called with (key, value) for each expired entry
+            clock: Time source in seconds
+        """
+        self.ttl = ttl
+        self.resolution = resolution
+        self.on_expire = on_expire
+        self._clock = clock
+
+        self._data: Dict[K, list] = {}
+        self._wheels: List[List[Dict[K, None]]] = [
+            [{} for _ in range(WHEEL_SLOTS)] for _ in range(WHEEL_LEVELS)
+        ]
+        self._overflow: Dict[K, None] = {}
+        # Entries per level (the last one counts the overflow slot)
+        self._level_counts = [0] * (WHEEL_LEVELS + 1)
+        self._pending: List[K] = []
+        self._lock = threading.Lock()
+        self._tick = self._to_tick(clock())
+        self.expired_count = 0
+
+    # Reads
+
+    def __contains__(self, key: K) -> bool:
+        """Check if key exists and is not expired."""
+        entry = self._data.get(key)
+        return entry is not None and entry[_EXPIRES] > self._clock()
+
+    def __getitem__(self, key: K) -> V:
+        """Get value if exists and not expired."""
+        entry = self._data.get(key)
+        if entry is None or entry[_EXPIRES] <= self._clock():
+            raise KeyError(key)
+        return entry[_VALUE]
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Get value with default if not exists or expired."""
+        entry = self._data.get(key)
+        if entry is None or entry[_EXPIRES] <= self._clock():
+            return default
+        return entry[_VALUE]
+
+    def ttl_remaining(self, key: K) -> Optional[float]:
+        """
+        Get the time left before an entry expires
+
+        Args:
+            key: Entry key
+
+        Returns:
+            Seconds until expiry, or None if the key is not present
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        remaining = entry[_EXPIRES] - self._clock()
+        return remaining if remaining > 0 else None
+
+    def __len__(self) -> int:
+        """
+        Get count of stored entries in O(1) without modifying the map
+
+        Entries past their deadline are counted until they are evicted by a
+        write or expire(); call expire() first for a count of live entries.
+        Even then, entries are evicted on the wheel tick after their
+        deadline, so the count can include entries up to one resolution
+        past expiry.
+        """
+        return len(self._data)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[K]:
+        """Iterate over non-expired keys (from the writer thread)."""
+        return self.keys()
+
+    def keys(self) -> Iterator[K]:
+        """Iterate over non-expired keys."""
+        now = self._clock()
+        return (k for k, entry in self._data.items() if entry[_EXPIRES] > now)
+
+    def values(self) -> Iterator[V]:
+        """Iterate over non-expired values."""
+        now = self._clock()
+        return (entry[_VALUE] for entry in self._data.values() if entry[_EXPIRES] > now)
+
+    def items(self) -> Iterator[Tuple[K, V]]:
+        """Iterate over non-expired (key, value) pairs."""
+        now = self._clock()
+        return ((k, entry[_VALUE]) for k, entry in self._data.items() if entry[_EXPIRES] > now)
+
+    def snapshot(self) -> Dict[K, V]:
+        """
+        Get a plain dict of non-expired entries without modifying the map
+
+        Safe to call from a thread other than the one writing to the map.
+
+        Returns:
+            Dictionary of key to value
+        """
+        now = self._clock()
+        return {k: entry[_VALUE] for k, entry in list(self._data.items()) if entry[_EXPIRES] > now}
+
+    copy = snapshot
+
+    # Writes
+
+    def __setitem__(self, key: K, value: V) -> None:
+        """Set value with the default TTL."""
+        self.set(key, value)
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Set a value
+
+        Args:
+            key: Entry key
+            value: Entry value
+            ttl: Time-to-live in seconds (defaults to the map's TTL)
+        """
+        now = self._clock()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._advance(now)
+            entry = self._data.get(key)
+            if entry is None:
+                self._data[key] = entry = [value, expires_at, 0, None, 0]
+            else:
+                entry[_VALUE] = value
+                entry[_EXPIRES] = expires_at
+            self._schedule(key, entry)
+            expired = self._drain()
+        self._notify(expired)
+
+    def set_with_ttl(self, key: K, value: V, ttl: float) -> None:
+        """Set value with custom TTL."""
+        self.set(key, value, ttl)
+
+    def setdefault(self, key: K, default: V) -> V:
+        """Get a value, setting it to default (with the default TTL) if missing."""
+        entry = self._data.get(key)
+        if entry is not None and entry[_EXPIRES] > self._clock():
+            return entry[_VALUE]
+        self.set(key, default)
+        return default
+
+    def touch(self, key: K, ttl: Optional[float] = None) -> bool:
+        """
+        Refresh an entry's time-to-live
+
+        Args:
+            key: Entry key
+            ttl: New time-to-live in seconds (defaults to the map's TTL)
+
+        Returns:
+            True if the entry existed and was refreshed
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[_EXPIRES] <= now:
+                return False
+            entry[_EXPIRES] = now + (self.ttl if ttl is None else ttl)
+            self._schedule(key, entry)
+            return True
+
+    def pop(self, key: K, *default: Any) -> V:
+        """Remove an entry and return its value (no eviction callback)."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self._unlink(key, entry)
+        if entry is None or entry[_EXPIRES] <= self._clock():
+            if default:
+                return default[0]
+            raise KeyError(key)
+        return entry[_VALUE]
+
+    def __delitem__(self, key: K) -> None:
+        """Remove an entry (no eviction callback)."""
+        self.pop(key)
+
+    def clear(self) -> None:
+        """Remove all entries (no eviction callbacks)."""
+        with self._lock:
+            self._data.clear()
+            self._overflow.clear()
+            self._pending.clear()
+            self._level_counts = [0] * (WHEEL_LEVELS + 1)
+            for wheel in self._wheels:
+                for slot in wheel:
+                    slot.clear()
+
+    def expire(self) -> int:
+        """
+        Evict every entry whose deadline has passed
+
+        Returns:
+            Number of entries evicted
+        """
+        with self._lock:
+            self._advance(self._clock())
+            expired = self._drain()
+        self._notify(expired)
+        return len(expired)
+
+    # Timing wheel
+
+    def _to_tick(self, when: float) -> int:
+        return int(when / self.resolution)
+
+    def _unlink(self, key: K, entry: list) -> None:
+        """Remove an entry from its wheel slot (lock must be held)."""
+        if entry[_SLOT] is not None:
+            entry[_SLOT].pop(key, None)
+            entry[_SLOT] = None
+            self._level_counts[entry[_LEVEL]] -= 1
+
+    def _schedule(self, key: K, entry: list) -> None:
+        """Place an entry in the wheel slot for its deadline (lock must be held)."""
+        self._unlink(key, entry)
+
+        tick = max(self._to_tick(entry[_EXPIRES]) + 1, self._tick + 1)
+        delta = tick - self._tick
+
+        level = 0
+        while level < WHEEL_LEVELS and delta >= 1 << (WHEEL_BITS * (level + 1)):
+            level += 1
+
+        if level < WHEEL_LEVELS:
+            slot = self._wheels[level][(tick >> (WHEEL_BITS * level)) & WHEEL_MASK]
+        else:
+            slot = self._overflow
+
+        slot[key] = None
+        entry[_TICK] = tick
+        entry[_SLOT] = slot
+        entry[_LEVEL] = level
+        self._level_counts[level] += 1
+
+    def _advance(self, now: float) -> None:
+        """Move the wheel forward to now, collecting due entries (lock must be held)."""
+        target = self._to_tick(now)
+        counts = self._level_counts
+        due = self._pending
+
+        while self._tick < target:
+            # Skip ticks where nothing can happen: entries on level n only
+            # move at multiples of 64**n ticks
+            level = next((n for n, count in enumerate(counts) if count), None)
+            if level is None:
+                self._tick = target
+                break
+            if level:
+                step = 1 << (WHEEL_BITS * min(level, WHEEL_LEVELS - 1))
+                boundary = (self._tick // step + 1) * step
+                if boundary > target:
+                    self._tick = target
+                    break
+                self._tick = boundary - 1
+
+            self._tick += 1
+            tick = self._tick
+
+            # Cascade coarser levels whose slot boundary was reached
+            for level in range(WHEEL_LEVELS - 1, 0, -1):
+                if tick & ((1 << (WHEEL_BITS * level)) - 1):
+                    continue
+                if level == WHEEL_LEVELS - 1 and self._overflow:
+                    self._reschedule(self._overflow, due)
+                self._reschedule(self._wheels[level][(tick >> (WHEEL_BITS * level)) & WHEEL_MASK], due)
+
+            slot = self._wheels[0][tick & WHEEL_MASK]
+            if slot:
+                self._reschedule(slot, due)
+
+    def _reschedule(self, slot: Dict[K, None], due: list) -> None:
+        """Move the entries of a slot down the wheel or onto the due list (lock must be held)."""
+        for key in list(slot):
+            entry = self._data[key]
+            self._unlink(key, entry)
+            if entry[_TICK] <= self._tick:
+                due.append(key)
+            else:
+                self._schedule(key, entry)
+
+    def _drain(self) -> List[Tuple[K, V]]:
+        """Remove collected due entries from the map (lock must be held)."""
+        pending = self._pending
+        if not pending:
+            return []
+
+        now = self._clock()
+        expired = []
+        for key in pending:
+            entry = self._data.get(key)
+            if entry is None or entry[_SLOT] is not None:
+                # Deleted or rescheduled since it came due
+                continue
+            if entry[_EXPIRES] > now:
+                self._schedule(key, entry)
+                continue
+            del self._data[key]
+            expired.append((key, entry[_VALUE]))
+        pending.clear()
+        self.expired_count += len(expired)
+        return expired
+
+    def _notify(self, expired: List[Tuple[K, V]]) -> None:
+        """Run eviction callbacks outside the lock."""
+        if not expired or self.on_expire is None:
+            return
+        for key, value in expired:
+            try:
+                self.on_expire(key, value)
+            except Exception as e:
+                logger.error(f"Error in expiry callback for {key}: {e}")
+
+    def __repr__(self) -> str:
+        return f"ExpiringMap(ttl={self.ttl}, entries={len(self._data)})"
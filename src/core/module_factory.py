@@ -47,7 +47,10 @@ class ModuleFactory:
             enable_sampling=config.get("enable_sampling", True),
             sampling_rate=config.get("sampling_rate", 0.5),
             batch_size=config.get("batch_size", 50),
-            prioritize_packets=config.get("prioritize_packets", True)
+            prioritize_packets=config.get("prioritize_packets", True),
+            capture_engine=config.get("capture_engine", "scapy"),
+            execution_mode=config.get("execution_mode", "thread"),
+            worker_processes=config.get("worker_processes", 2)
         )
         
         # Create lite or full detection module based on setting
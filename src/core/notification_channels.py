@@ -1,4 +1,6 @@
 import smtplib
+import ssl
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import requests
@@ -8,6 +10,14 @@ from .alert import Alert, AlertChannel, AlertPriority, AlertType, AlertStatus
 
 logger = logging.getLogger(__name__)
 
+# Alerts listed individually in a Slack digest; Slack allows 50 blocks
+MAX_SLACK_DIGEST_ALERTS = 40
+
+
+def _highest_priority(alerts: List[Alert]) -> AlertPriority:
+    """Get the most urgent priority among alerts (CRITICAL sorts first)."""
+    return min((alert.priority for alert in alerts), key=lambda priority: priority.value)
+
 class EmailChannel(AlertChannel):
     """Email notification channel"""
     
@@ -45,6 +55,11 @@ class EmailChannel(AlertChannel):
         self.sender_email = sender_email
         self.recipient_emails = recipient_emails
         self.use_tls = use_tls
+        self.timeout = self.config.get("timeout", 30)
+        
+        # Logged-in SMTP connection reused between messages
+        self._server: Optional[smtplib.SMTP] = None
+        self._server_lock = threading.Lock()
     
     def _send_alert(self, alert: Alert) -> bool:
         """
@@ -56,31 +71,88 @@ class EmailChannel(AlertChannel):
         Returns:
             True if sent successfully, False otherwise
         """
-        try:
-            # Create message
-            msg = MIMEMultipart()
-            msg["Subject"] = f"[{alert.priority.name}] ARP Guard Alert: {alert.type.name}"
-            msg["From"] = self.sender_email
-            msg["To"] = ", ".join(self.recipient_emails)
+        return self._send_email(
+            f"[{alert.priority.name}] ARP Guard Alert: {alert.type.name}",
+            self._format_alert_email(alert)
+        )
+    
+    def _send_digest(self, alerts: List[Alert]) -> bool:
+        """
+        Send several alerts in one email.
+        
+        Args:
+            alerts: Alerts to send
             
-            # Email body
-            body = self._format_alert_email(alert)
-            msg.attach(MIMEText(body, "plain"))
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        separator = "\n" + "-" * 60 + "\n"
+        body = separator.join(self._format_alert_email(alert) for alert in alerts)
+        return self._send_email(
+            f"[{_highest_priority(alerts).name}] ARP Guard: {len(alerts)} alerts",
+            f"{len(alerts)} alerts were raised:\n\n{body}"
+        )
+    
+    def _send_email(self, subject: str, body: str) -> bool:
+        """
+        Send an email over the persistent SMTP connection.
+        
+        Args:
+            subject: Email subject
+            body: Plain text body
             
-            # Connect to SMTP server
-            context = ssl.create_default_context()
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        msg = MIMEMultipart()
+        msg["Subject"] = subject
+        msg["From"] = self.sender_email
+        msg["To"] = ", ".join(self.recipient_emails)
+        msg.attach(MIMEText(body, "plain"))
+        
+        with self._server_lock:
+            # The server may have dropped an idle connection; reconnect once
+            for attempt in range(2):
+                try:
+                    self._connect().send_message(msg)
+                    return True
+                except (smtplib.SMTPServerDisconnected, OSError) as e:
+                    self._disconnect()
+                    if attempt:
+                        logger.error(f"Error sending email alert: {e}")
+                except Exception as e:
+                    logger.error(f"Error sending email alert: {e}")
+                    self._disconnect()
+                    break
+        return False
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Get the SMTP connection, connecting and logging in if needed."""
+        if self._server is None:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+            try:
                 if self.use_tls:
-                    server.starttls(context=context)
-                
+                    server.starttls(context=ssl.create_default_context())
                 server.login(self.username, self.password)
-                server.send_message(msg)
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error sending email alert: {e}")
-            return False
+            except Exception:
+                server.close()
+                raise
+            self._server = server
+        return self._server
+    
+    def _disconnect(self) -> None:
+        """Drop the SMTP connection."""
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+    
+    def close(self) -> None:
+        """Log out and close the SMTP connection."""
+        with self._server_lock:
+            self._disconnect()
     
     def _format_alert_email(self, alert: Alert) -> str:
         """
@@ -158,6 +230,11 @@ class SlackChannel(AlertChannel):
         self.channel = channel
         self.username = username
         self.icon_emoji = icon_emoji
+        self.timeout = self.config.get("timeout", 10)
+        
+        # Keep-alive connection pool reused between messages
+        self.session = requests.Session()
+        self.session.headers["Content-Type"] = "application/json"
     
     def _send_alert(self, alert: Alert) -> bool:
         """
@@ -166,6 +243,54 @@ class SlackChannel(AlertChannel):
         Args:
             alert: Alert to send
             
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        return self._post_blocks(self._format_slack_blocks(alert))
+    
+    def _send_digest(self, alerts: List[Alert]) -> bool:
+        """
+        Send several alerts as one Slack message.
+        
+        Args:
+            alerts: Alerts to send
+            
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        blocks = [{
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f":bell: {len(alerts)} ARP Guard alerts ({_highest_priority(alerts).name})"
+            }
+        }]
+        for alert in alerts[:MAX_SLACK_DIGEST_ALERTS]:
+            blocks.append({
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"{self._get_emoji(alert)} *[{alert.priority.name}] {alert.type.name}* "
+                            f"{alert.message} (source: {alert.source}, id: {alert.id})"
+                }
+            })
+        if len(alerts) > MAX_SLACK_DIGEST_ALERTS:
+            blocks.append({
+                "type": "context",
+                "elements": [{
+                    "type": "mrkdwn",
+                    "text": f"...and {len(alerts) - MAX_SLACK_DIGEST_ALERTS} more"
+                }]
+            })
+        return self._post_blocks(blocks)
+    
+    def _post_blocks(self, blocks: List[Dict[str, Any]]) -> bool:
+        """
+        Post a message to the Slack webhook.
+        
+        Args:
+            blocks: Slack blocks of the message
+            
         Returns:
             True if sent successfully, False otherwise
         """
@@ -173,21 +298,15 @@ class SlackChannel(AlertChannel):
             # Create payload
             payload = {
                 "username": self.username,
-                "icon_emoji": self.icon_emoji
+                "icon_emoji": self.icon_emoji,
+                "blocks": blocks
             }
             
             if self.channel:
                 payload["channel"] = self.channel
             
-            # Add blocks for prettier formatting
-            payload["blocks"] = self._format_slack_blocks(alert)
-            
             # Send to webhook
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
+            response = self.session.post(self.webhook_url, json=payload, timeout=self.timeout)
             
             if response.status_code == 200:
                 return True
@@ -199,6 +318,10 @@ class SlackChannel(AlertChannel):
             logger.error(f"Error sending Slack alert: {e}")
             return False
     
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self.session.close()
+    
     def _format_slack_blocks(self, alert: Alert) -> List[Dict[str, Any]]:
         """
         Format alert as Slack blocks.
@@ -345,6 +468,10 @@ class WebhookChannel(AlertChannel):
         self.headers = headers or {
             "Content-Type": "application/json"
         }
+        self.timeout = self.config.get("timeout", 10)
+        
+        # Keep-alive connection pool reused between requests
+        self.session = requests.Session()
     
     def _send_alert(self, alert: Alert) -> bool:
         """
@@ -356,15 +483,39 @@ class WebhookChannel(AlertChannel):
         Returns:
             True if sent successfully, False otherwise
         """
-        try:
-            # Convert alert to JSON payload
-            payload = self._alert_to_dict(alert)
+        return self._send_payload(self._alert_to_dict(alert))
+    
+    def _send_digest(self, alerts: List[Alert]) -> bool:
+        """
+        Send several alerts in one request.
+        
+        Args:
+            alerts: Alerts to send
             
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        return self._send_payload({
+            "digest": True,
+            "count": len(alerts),
+            "alerts": [self._alert_to_dict(alert) for alert in alerts]
+        })
+    
+    def _send_payload(self, payload: Dict[str, Any]) -> bool:
+        """
+        Send a JSON payload to the webhook.
+        
+        Args:
+            payload: Payload to send
+            
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        try:
             # Send request
-            if self.method == "POST":
-                response = requests.post(self.url, json=payload, headers=self.headers)
-            else:  # PUT
-                response = requests.put(self.url, json=payload, headers=self.headers)
+            response = self.session.request(
+                self.method, self.url, json=payload, headers=self.headers, timeout=self.timeout
+            )
             
             if response.status_code >= 200 and response.status_code < 300:
                 return True
@@ -376,6 +527,10 @@ class WebhookChannel(AlertChannel):
             logger.error(f"Error sending webhook alert: {e}")
             return False
     
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self.session.close()
+    
     def _alert_to_dict(self, alert: Alert) -> Dict[str, Any]:
         """
         Convert alert to dictionary format.
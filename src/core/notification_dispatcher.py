@@ -0,0 +1,343 @@
+"""
+Notification Dispatcher for ARP Guard
+Delivers alerts to notification channels off the detection path
+
+Every channel gets its own queue and worker thread, so a slow or failing
+channel never holds up alert creation or the other channels. An isolated
+alert is sent straight away; alerts arriving within the coalescing window
+of the previous delivery are combined into one digest. Failed deliveries
+are retried with exponential backoff and finally written to a dead-letter
+file.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .alert import Alert, AlertChannel
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept per channel for the percentiles
+LATENCY_SAMPLES = 1000
+
+
+class _ChannelWorker:
+    """Queue and delivery thread for one channel."""
+
+    def __init__(self, channel: AlertChannel, dispatcher: 'NotificationDispatcher'):
+        self.channel = channel
+        self.dispatcher = dispatcher
+        self.queue: queue.Queue = queue.Queue(maxsize=dispatcher.queue_size)
+        self.stop_event = threading.Event()
+        self.flush_event = threading.Event()
+        self.last_delivery = 0.0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.metrics = {
+            "queued": 0,
+            "sent": 0,
+            "batches": 0,
+            "digests": 0,
+            "retries": 0,
+            "failed": 0,
+            "dropped": 0,
+            "dead_lettered": 0,
+            "last_error": None
+        }
+        self.thread = threading.Thread(
+            target=self._run, name=f"notify-{channel.name}", daemon=True
+        )
+        self.thread.start()
+
+    def submit(self, alert: Alert) -> bool:
+        """Queue an alert without blocking."""
+        try:
+            self.queue.put_nowait((alert, time.time()))
+            self.metrics["queued"] += 1
+            return True
+        except queue.Full:
+            self.metrics["dropped"] += 1
+            logger.warning(f"Notification queue for {self.channel.name} is full, alert {alert.id} dropped")
+            return False
+
+    def _run(self) -> None:
+        """Collect alerts into batches and deliver them until stopped."""
+        while not self.stop_event.is_set():
+            try:
+                first = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            batch = [first]
+            self._collect(batch)
+            self._deliver(batch)
+            for _ in batch:
+                self.queue.task_done()
+            self.last_delivery = time.monotonic()
+
+        # Whatever is still queued is not going to be delivered
+        leftover = []
+        while True:
+            try:
+                leftover.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if leftover:
+            self.dispatcher._dead_letter(self.channel, leftover, "dispatcher stopped", 0)
+            self.metrics["dead_lettered"] += len(leftover)
+            for _ in leftover:
+                self.queue.task_done()
+
+    def wait_empty(self, timeout: Optional[float]) -> bool:
+        """Wait until every queued alert has been delivered or given up on."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _collect(self, batch: List) -> None:
+        """Add queued alerts to the batch until the coalescing window closes."""
+        max_batch = self.dispatcher.max_batch
+        window_end = self.last_delivery + self.dispatcher.coalesce_window
+        while len(batch) < max_batch:
+            try:
+                batch.append(self.queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            remaining = window_end - time.monotonic()
+            if remaining <= 0 or self.flush_event.is_set() or self.stop_event.is_set():
+                break
+            try:
+                batch.append(self.queue.get(timeout=min(remaining, 0.1)))
+            except queue.Empty:
+                pass
+
+    def _deliver(self, batch: List) -> None:
+        """Send a batch, retrying with exponential backoff."""
+        alerts = [alert for alert, _ in batch]
+        dispatcher = self.dispatcher
+        attempt = 0
+        while True:
+            try:
+                success = self.channel.send_batch(alerts)
+                error = None if success else "channel reported failure"
+            except Exception as e:
+                success, error = False, str(e)
+            now = time.time()
+            if success:
+                self.metrics["sent"] += len(alerts)
+                self.metrics["batches"] += 1
+                if len(alerts) > 1:
+                    self.metrics["digests"] += 1
+                self.latencies.extend(now - queued_at for _, queued_at in batch)
+                return
+
+            self.metrics["failed"] += 1
+            self.metrics["last_error"] = error
+            if attempt >= dispatcher.max_retries or not self.channel.enabled:
+                dispatcher._dead_letter(self.channel, batch, error, attempt + 1)
+                self.metrics["dead_lettered"] += len(alerts)
+                return
+            delay = min(dispatcher.retry_max_delay, dispatcher.retry_base_delay * (2 ** attempt))
+            logger.warning(f"Delivery via {self.channel.name} failed ({error}), "
+                           f"retrying in {delay:.1f}s")
+            attempt += 1
+            self.metrics["retries"] += 1
+            if self.stop_event.wait(delay):
+                dispatcher._dead_letter(self.channel, batch, "dispatcher stopped", attempt)
+                self.metrics["dead_lettered"] += len(alerts)
+                return
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get delivery counters and latency figures for the channel."""
+        metrics = dict(self.metrics)
+        metrics["queue_depth"] = self.queue.qsize()
+        latencies = sorted(self.latencies)
+        if latencies:
+            metrics["latency_avg"] = sum(latencies) / len(latencies)
+            metrics["latency_p95"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            metrics["latency_max"] = latencies[-1]
+        else:
+            metrics["latency_avg"] = metrics["latency_p95"] = metrics["latency_max"] = None
+        return metrics
+
+
+class NotificationDispatcher:
+    """
+    Delivers alerts to channels asynchronously.
+
+    submit() only queues the alert, so it is cheap enough to call from the
+    detection path. Each channel is served by its own worker thread.
+    """
+
+    def __init__(
+        self,
+        coalesce_window: float = 5.0,
+        max_batch: int = 20,
+        max_retries: int = 5,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 60.0,
+        queue_size: int = 10000,
+        dead_letter_path: Optional[str] = None
+    ):
+        """
+        Initialize the dispatcher
+
+        Args:
+            coalesce_window: Seconds after a delivery during which further
+                alerts for the channel are combined into one digest
+            max_batch: Most alerts in one digest
+            max_retries: Retries before a batch goes to the dead-letter file
+            retry_base_delay: Delay before the first retry in seconds; it
+                doubles with every retry
+            retry_max_delay: Longest delay between retries in seconds
+            queue_size: Alerts that may wait per channel before new ones are dropped
+            dead_letter_path: JSON lines file for undeliverable alerts; None
+                only logs them
+        """
+        self.coalesce_window = coalesce_window
+        self.max_batch = max(1, max_batch)
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.queue_size = queue_size
+        self.dead_letter_path = dead_letter_path
+        self._workers: Dict[str, _ChannelWorker] = {}
+        self._lock = threading.Lock()
+        self._dead_letter_lock = threading.Lock()
+
+    def add_channel(self, channel: AlertChannel) -> None:
+        """
+        Start delivering to a channel
+
+        Args:
+            channel: Channel to add; replaces a channel with the same name
+        """
+        self.remove_channel(channel.name)
+        with self._lock:
+            self._workers[channel.name] = _ChannelWorker(channel, self)
+
+    def remove_channel(self, channel_name: str, timeout: float = 5.0) -> bool:
+        """
+        Stop delivering to a channel after sending what is queued for it
+
+        Args:
+            channel_name: Name of the channel
+            timeout: Seconds to wait for queued alerts to be sent
+
+        Returns:
+            True if the channel was found
+        """
+        with self._lock:
+            worker = self._workers.pop(channel_name, None)
+        if worker is None:
+            return False
+        self._stop_worker(worker, timeout)
+        return True
+
+    def submit(self, alert: Alert) -> int:
+        """
+        Queue an alert for every enabled channel
+
+        Args:
+            alert: Alert to deliver
+
+        Returns:
+            Number of channels the alert was queued for
+        """
+        with self._lock:
+            workers = list(self._workers.values())
+        return sum(1 for worker in workers if worker.channel.enabled and worker.submit(alert))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send queued alerts now, without waiting for coalescing windows
+
+        Args:
+            timeout: Seconds to wait, or None to wait until done
+
+        Returns:
+            True if every queue was emptied in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.flush_event.set()
+        try:
+            for worker in workers:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not worker.wait_empty(remaining):
+                    return False
+            return True
+        finally:
+            for worker in workers:
+                worker.flush_event.clear()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Send what is queued, stop the workers and close channel connections
+
+        Args:
+            timeout: Seconds to wait for queued alerts to be sent
+        """
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            self._stop_worker(worker, timeout)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-channel delivery metrics
+
+        Returns:
+            Channel name -> counters, queue depth and delivery latency in
+            seconds (average, 95th percentile and maximum)
+        """
+        with self._lock:
+            workers = dict(self._workers)
+        return {name: worker.get_metrics() for name, worker in workers.items()}
+
+    def _stop_worker(self, worker: _ChannelWorker, timeout: float) -> None:
+        """Drain a worker, stop its thread and close its channel."""
+        worker.flush_event.set()
+        worker.wait_empty(timeout)
+        worker.stop_event.set()
+        worker.thread.join(timeout)
+        try:
+            worker.channel.close()
+        except Exception as e:
+            logger.error(f"Error closing {worker.channel.name} channel: {e}")
+
+    def _dead_letter(self, channel: AlertChannel, batch: List, error: Optional[str],
+                     attempts: int) -> None:
+        """Record alerts that could not be delivered."""
+        logger.error(f"Giving up on {len(batch)} alert(s) for {channel.name} "
+                     f"after {attempts} attempt(s): {error}")
+        if not self.dead_letter_path:
+            return
+        record = {
+            "channel": channel.name,
+            "failed_at": time.time(),
+            "attempts": attempts,
+            "error": error,
+            "alerts": [alert.to_dict() for alert, _ in batch]
+        }
+        try:
+            with self._dead_letter_lock:
+                directory = os.path.dirname(os.path.abspath(self.dead_letter_path))
+                os.makedirs(directory, exist_ok=True)
+                with open(self.dead_letter_path, "a") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to write dead letter: {e}")
@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+OUI Lookup for ARP Guard
+Resolves MAC addresses to hardware vendors
+
+Registry blocks (MA-L /24, MA-M /28, MA-S /36 and any other prefix
+length) are kept as one sorted array of integer prefixes per length, and a
+MAC address is matched longest prefix first with a binary search in each.
+Tables are stored in a compact binary file that is memory-mapped, so
+startup does not parse the vendor JSON; the file is rebuilt whenever the
+JSON is newer. A small LRU cache serves repeated lookups.
+
+Binary table layout (little-endian):
+    header        magic "OUIT", version (H), level count (H), name count (I)
+    levels        per level: prefix bits (I), entry count (I); padded to 8
+    prefixes      per level: sorted prefixes (Q)
+    vendor ids    per level: name index of each prefix (I)
+    name offsets  name count + 1 offsets into the name data (I)
+    name data     UTF-8 vendor names
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"OUIT"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+LEVEL = struct.Struct("<II")
+
+# Extension of the prebuilt table written next to a vendor JSON file
+TABLE_EXTENSION = ".oui"
+
+MAC_BITS = 48
+
+_SEPARATORS = str.maketrans("", "", ":-. ")
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+MacLike = Union[str, bytes, int]
+
+
+def parse_mac(mac: MacLike) -> Optional[int]:
+    """
+    Convert a MAC address to a 48-bit integer
+
+    Args:
+        mac: Address with or without ':', '-' or '.' separators, 6 raw
+            bytes, or an integer
+
+    Returns:
+        The address as an integer, or None if it is not a MAC address
+    """
+    if isinstance(mac, str):
+        digits = mac.replace(":", "").replace("-", "").replace(".", "").strip()
+        # int() would also take "0x", "_", "+" and non-ASCII digits
+        if (len(digits) != 12 or not digits.isalnum() or not digits.isascii()
+                or "x" in digits or "X" in digits):
+            return None
+        try:
+            return int(digits, 16)
+        except ValueError:
+            return None
+    if isinstance(mac, int):
+        return mac if 0 <= mac < 1 << MAC_BITS else None
+    if isinstance(mac, (bytes, bytearray)):
+        return int.from_bytes(mac, "big") if len(mac) == 6 else None
+    return None
+
+
+def format_mac(value: int) -> str:
+    """Format a 48-bit integer as twelve upper-case hex digits."""
+    return f"{value:012X}"
+
+
+def parse_prefix(key: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse a registry block
+
+    Args:
+        key: Hex prefix such as "001A2B", "70B3D5F" or "70:B3:D5:F0:00",
+            optionally followed by "/bits" to give the block size
+
+    Returns:
+        (prefix, bits), or None if the key is not a prefix
+    """
+    bits = None
+    if "/" in key:
+        key, _, size = key.partition("/")
+        try:
+            bits = int(size)
+        except ValueError:
+            return None
+    digits = key.translate(_SEPARATORS)
+    if not digits or len(digits) > 12 or not all(c in _HEX_DIGITS for c in digits):
+        return None
+    value = int(digits, 16)
+    given = len(digits) * 4
+    if bits is None:
+        bits = given
+    if not 0 < bits <= MAC_BITS:
+        return None
+    if given > bits:
+        value >>= given - bits
+    elif given < bits:
+        value <<= bits - given
+    return value, bits
+
+
+def load_entries(path: str) -> Dict[Tuple[int, int], str]:
+    """
+    Read a vendor JSON file
+
+    Args:
+        path: JSON object of prefix -> vendor, or a list of records with an
+            "oui" (or "prefix") and a "companyName" (or "vendor") field
+
+    Returns:
+        (prefix, bits) -> vendor name
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        items = data.items()
+    else:
+        items = ((record.get("oui") or record.get("prefix") or record.get("assignment"),
+                  record.get("companyName") or record.get("vendor") or record.get("organization"))
+                 for record in data if isinstance(record, dict))
+    entries = {}
+    for key, vendor in items:
+        if not key or not vendor:
+            continue
+        block = parse_prefix(str(key))
+        if block is not None:
+            entries[block] = str(vendor)
+    return entries
+
+
+def build_table(entries: Dict[Tuple[int, int], str], path: str) -> None:
+    """
+    Write entries as a binary table
+
+    Args:
+        entries: (prefix, bits) -> vendor name
+        path: File to write; replaced atomically
+    """
+    with open(path + ".tmp", "wb") as f:
+        f.write(_encode(entries))
+    os.replace(path + ".tmp", path)
+
+
+def _encode(entries: Dict[Tuple[int, int], str]) -> bytes:
+    """Serialise entries in the binary table layout."""
+    names: Dict[str, int] = {}
+    levels: Dict[int, List[Tuple[int, int]]] = {}
+    for (prefix, bits), vendor in entries.items():
+        name_id = names.setdefault(vendor, len(names))
+        levels.setdefault(bits, []).append((prefix, name_id))
+    ordered = sorted(levels.items(), reverse=True)
+
+    parts = [HEADER.pack(MAGIC, VERSION, len(ordered), len(names))]
+    parts.extend(LEVEL.pack(bits, len(items)) for bits, items in ordered)
+    size = HEADER.size + LEVEL.size * len(ordered)
+    parts.append(b"\0" * (-size % 8))
+    for _, items in ordered:
+        items.sort()
+        parts.append(_pack("Q", [prefix for prefix, _ in items]))
+    for _, items in ordered:
+        parts.append(_pack("I", [name_id for _, name_id in items]))
+    blob = [name.encode("utf-8") for name in names]
+    offsets = [0]
+    for encoded in blob:
+        offsets.append(offsets[-1] + len(encoded))
+    parts.append(_pack("I", offsets))
+    parts.extend(blob)
+    return b"".join(parts)
+
+
+def _pack(typecode: str, values: List[int]) -> bytes:
+    """Pack integers little-endian."""
+    packed = array(typecode, values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+class OuiTable:
+    """Longest-prefix vendor table over sorted integer arrays."""
+
+    def __init__(self, data: Union[bytes, mmap.mmap], source: Optional[str] = None):
+        """
+        Initialize the table
+
+        Args:
+            data: Table in the binary layout; an mmap is used in place
+            source: Where the table came from, for logging
+        """
+        self.source = source
+        self._data = data
+        view = memoryview(data)
+        if len(view) < HEADER.size:
+            raise ValueError("vendor table is truncated")
+        magic, version, level_count, name_count = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a vendor table")
+
+        position = HEADER.size
+        level_info = []
+        for _ in range(level_count):
+            level_info.append(LEVEL.unpack_from(view, position))
+            position += LEVEL.size
+        position += -position % 8
+
+        self._levels: List[Tuple[int, Sequence[int], Sequence[int]]] = []
+        prefixes = []
+        for _, count in level_info:
+            prefixes.append(self._array(view, position, count, "Q"))
+            position += count * 8
+        for (bits, count), level_prefixes in zip(level_info, prefixes):
+            self._levels.append((MAC_BITS - bits, level_prefixes, self._array(view, position, count, "I")))
+            position += count * 4
+        self._offsets = self._array(view, position, name_count + 1, "I")
+        position += (name_count + 1) * 4
+        self._names = view[position:]
+        self._decoded: Dict[int, str] = {}
+        self.entry_count = sum(count for _, count in level_info)
+
+    @classmethod
+    def open(cls, path: str) -> 'OuiTable':
+        """
+        Memory-map a binary table
+
+        Args:
+            path: Table file
+
+        Returns:
+            The table
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("vendor table is empty")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, path)
+
+    @classmethod
+    def from_entries(cls, entries: Dict[Tuple[int, int], str], source: Optional[str] = None) -> 'OuiTable':
+        """Build a table in memory."""
+        return cls(_encode(entries), source)
+
+    @staticmethod
+    def _array(view: memoryview, position: int, count: int, typecode: str) -> Sequence[int]:
+        """View part of the table as integers without copying it."""
+        part = view[position:position + count * array(typecode).itemsize]
+        if sys.byteorder == "little":
+            return part.cast(typecode)
+        values = array(typecode, part.tobytes())
+        values.byteswap()
+        return values
+
+    def __len__(self) -> int:
+        return self.entry_count
+
+    def name(self, name_id: int) -> str:
+        """Get a vendor name by index."""
+        name = self._decoded.get(name_id)
+        if name is None:
+            name = bytes(self._names[self._offsets[name_id]:self._offsets[name_id + 1]]).decode("utf-8")
+            self._decoded[name_id] = name
+        return name
+
+    def lookup(self, mac: int) -> Optional[str]:
+        """
+        Find the vendor of the most specific block containing an address
+
+        Args:
+            mac: 48-bit address
+
+        Returns:
+            Vendor name, or None
+        """
+        for shift, prefixes, ids in self._levels:
+            key = mac >> shift
+            i = bisect_left(prefixes, key)
+            if i < len(prefixes) and prefixes[i] == key:
+                return self.name(ids[i])
+        return None
+
+    def lookup_many(self, macs: Sequence[int]) -> List[Optional[str]]:
+        """
+        Look up many addresses at once
+
+        Uses vectorised binary search when NumPy is available.
+
+        Args:
+            macs: 48-bit addresses
+
+        Returns:
+            Vendor name or None for each address
+        """
+        if np is None or not self._levels:
+            return [self.lookup(mac) for mac in macs]
+        values = np.asarray(macs, dtype=np.uint64)
+        found = np.full(len(values), -1, dtype=np.int64)
+        for shift, prefixes, ids in self._levels:
+            if not len(prefixes):
+                continue
+            pending = np.flatnonzero(found < 0)
+            if not len(pending):
+                break
+            keys = values[pending] >> np.uint64(shift)
+            table = np.frombuffer(prefixes, dtype=np.uint64)
+            positions = np.minimum(np.searchsorted(table, keys), len(table) - 1)
+            hit = table[positions] == keys
+            found[pending[hit]] = np.frombuffer(ids, dtype=np.uint32)[positions[hit]]
+        return [None if name_id < 0 else self.name(name_id) for name_id in found.tolist()]
+
+    def close(self) -> None:
+        """Release the mapping."""
+        self._levels = []
+        self._offsets = self._names = None
+        if isinstance(self._data, mmap.mmap):
+            try:
+                self._data.close()
+            except BufferError:
+                # Views handed out elsewhere keep it open until collected
+                pass
+
+
+def table_path_for(source: str) -> str:
+    """Get the prebuilt table path for a vendor JSON file."""
+    return os.path.splitext(source)[0] + TABLE_EXTENSION
+
+
+def load_table(source: str) -> OuiTable:
+    """
+    Load a vendor table, building the binary file if it is missing or stale
+
+    Args:
+        source: Vendor JSON file, or a binary table
+
+    Returns:
+        The table
+    """
+    if source.endswith(TABLE_EXTENSION):
+        return OuiTable.open(source)
+    table_path = table_path_for(source)
+    try:
+        if not os.path.exists(source) or os.path.getmtime(table_path) >= os.path.getmtime(source):
+            return OuiTable.open(table_path)
+    except (OSError, ValueError):
+        pass
+    entries = load_entries(source)
+    try:
+        build_table(entries, table_path)
+        return OuiTable.open(table_path)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not write vendor table {table_path}: {e}")
+        return OuiTable.from_entries(entries, source)
+
+
+class VendorResolver:
+    """
+    Resolves MAC addresses against one or more vendor tables.
+
+    Later sources take precedence over earlier ones. Results for recently
+    seen addresses are cached.
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialize the resolver
+
+        Args:
+            cache_size: Addresses whose vendor is remembered
+        """
+        self.cache_size = cache_size
+        self._tables: List[Tuple[str, OuiTable]] = []
+        self._lock = threading.Lock()
+        self._cached = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def add_source(self, source: str) -> bool:
+        """
+        Load a vendor file, replacing it if it was loaded before
+
+        Args:
+            source: Vendor JSON file, or a binary table
+
+        Returns:
+            True if the file was loaded
+        """
+        try:
+            table = load_table(source)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load MAC vendors from {source}: {e}")
+            return False
+        self._install(source, table)
+        logger.info(f"Loaded {len(table)} MAC vendor blocks from {source}")
+        return True
+
+    def add_entries(self, entries: Dict[str, str], name: str = "<memory>") -> None:
+        """
+        Add vendors given as prefix -> vendor name
+
+        Args:
+            entries: Prefixes as accepted by parse_prefix
+            name: Name to replace the entries by later
+        """
+        blocks = {}
+        for key, vendor in entries.items():
+            block = parse_prefix(key)
+            if block is not None:
+                blocks[block] = vendor
+        self._install(name, OuiTable.from_entries(blocks, name))
+
+    def remove_source(self, source: str) -> bool:
+        """Forget a source; returns True if it was loaded."""
+        with self._lock:
+            kept = [(name, table) for name, table in self._tables if name != source]
+            removed = len(kept) != len(self._tables)
+            self._tables = kept
+        self._cached.cache_clear()
+        return removed
+
+    def reload(self) -> None:
+        """Load every file source again."""
+        for source, _ in list(self._tables):
+            if os.path.exists(source):
+                self.add_source(source)
+
+    @property
+    def sources(self) -> List[str]:
+        """Loaded sources, lowest precedence first."""
+        return [name for name, _ in self._tables]
+
+    def __len__(self) -> int:
+        return sum(len(table) for _, table in self._tables)
+
+    def get_vendor(self, mac: MacLike) -> Optional[str]:
+        """
+        Get the vendor of a MAC address
+
+        Args:
+            mac: Address in any form parse_mac accepts
+
+        Returns:
+            Vendor name, or None if unknown or invalid
+        """
+        try:
+            return self._cached(mac)
+        except TypeError:
+            # Unhashable, e.g. a bytearray
+            return self._resolve(mac)
+
+    def get_vendors(self, macs: Iterable[MacLike]) -> List[Optional[str]]:
+        """
+        Get the vendors of many MAC addresses
+
+        Args:
+            macs: Addresses in any form parse_mac accepts
+
+        Returns:
+            Vendor name or None for each address
+        """
+        macs = list(macs)
+        # Captures repeat the same few addresses; resolve each one once
+        values = {}
+        for mac in set(macs):
+            value = parse_mac(mac)
+            if value is not None:
+                values[mac] = value
+        vendors: Dict[MacLike, Optional[str]] = {}
+        pending = list(values)
+        for _, table in reversed(self._tables):
+            if not pending:
+                break
+            found = table.lookup_many([values[mac] for mac in pending])
+            still = []
+            for mac, vendor in zip(pending, found):
+                if vendor is None:
+                    still.append(mac)
+                else:
+                    vendors[mac] = vendor
+            pending = still
+        return [vendors.get(mac) for mac in macs]
+
+    def cache_info(self):
+        """Get hit and miss counts of the lookup cache."""
+        return self._cached.cache_info()
+
+    def _install(self, name: str, table: OuiTable) -> None:
+        with self._lock:
+            tables = [(source, old) for source, old in self._tables if source != name]
+            tables.append((name, table))
+            self._tables = tables
+        self._cached.cache_clear()
+
+    def _resolve(self, mac: MacLike) -> Optional[str]:
+        value = parse_mac(mac)
+        if value is None:
+            return None
+        for _, table in reversed(self._tables):
+            vendor = table.lookup(value)
+            if vendor is not None:
+                return vendor
+        return None
+
+
+# Shared resolver instance
+_resolver_instance = None
+_resolver_lock = threading.Lock()
+
+
+def get_vendor_resolver() -> VendorResolver:
+    """
+    Get the vendor resolver shared by every MAC-to-vendor lookup
+
+    Returns:
+        VendorResolver: The shared resolver
+    """
+    global _resolver_instance
+    with _resolver_lock:
+        if _resolver_instance is None:
+            _resolver_instance = VendorResolver()
+        return _resolver_instance
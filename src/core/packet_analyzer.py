@@ -30,6 +30,10 @@ try:
 except ImportError:
     SCAPY_AVAILABLE = False
 
+from .arp_batch import ARPBatch, ARPFrameView
+from .capture_engine import FrameBatch, ENGINE_SCAPY, open_capture_engine
+from .oui_lookup import get_vendor_resolver
+
 logger = logging.getLogger(__name__)
 
 # Constants for optimization
@@ -87,7 +91,8 @@ class PacketAnalyzerConfig:
                 batch_processing: bool = True,
                 worker_threads: int = MAX_WORKER_THREADS,
                 memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
-                dynamic_batch_size: bool = True):
+                dynamic_batch_size: bool = True,
+                capture_engine: str = ENGINE_SCAPY):
         """
         Initialize packet analyzer configuration
         
@@ -102,6 +107,7 @@ class PacketAnalyzerConfig:
             worker_threads: Number of worker threads for processing
             memory_limit_mb: Memory limit in MB
             dynamic_batch_size: Whether to dynamically adjust batch size based on memory usage
+            capture_engine: Capture backend to use ("scapy", "ring" or "auto")
         """
         self.interface = interface
         self.packet_buffer_size = packet_buffer_size
@@ -113,9 +119,10 @@ class PacketAnalyzerConfig:
         self.worker_threads = min(worker_threads, MAX_WORKER_THREADS)
         self.memory_limit_mb = memory_limit_mb
         self.dynamic_batch_size = dynamic_batch_size
+        self.capture_engine = capture_engine
         
         # Loaded data
-        self.mac_vendors: Dict[str, str] = {}
+        self.vendor_resolver = get_vendor_resolver()
         self.known_subnets: List[str] = []
         
         # Load data if files exist
@@ -123,14 +130,9 @@ class PacketAnalyzerConfig:
         self._load_known_subnets()
         
     def _load_mac_vendors(self) -> None:
-        """Load MAC vendor database if file exists"""
+        """Load MAC vendor database into the shared resolver if file exists"""
         if os.path.exists(self.mac_vendor_file):
-            try:
-                with open(self.mac_vendor_file, 'r') as f:
-                    self.mac_vendors = json.load(f)
-                logger.info(f"Loaded {len(self.mac_vendors)} MAC vendors from {self.mac_vendor_file}")
-            except Exception as e:
-                logger.error(f"Failed to load MAC vendors: {e}")
+            self.vendor_resolver.add_source(self.mac_vendor_file)
         else:
             logger.warning(f"MAC vendor file not found: {self.mac_vendor_file}")
             
@@ -147,21 +149,10 @@ class PacketAnalyzerConfig:
             logger.warning(f"Known subnets file not found: {self.subnet_file}")
             
     def get_vendor_for_mac(self, mac: str) -> Optional[str]:
-        """Get vendor for a MAC address"""
+        """Get vendor for a MAC address, matching the longest registered prefix"""
         if not mac:
             return None
-            
-        # Normalize MAC address format
-        mac = mac.replace(':', '').replace('-', '').replace('.', '').upper()
-        
-        # Try different prefix lengths (common are OUI-24, OUI-28, OUI-36)
-        for prefix_len in [6, 7, 9]:
-            if len(mac) >= prefix_len:
-                prefix = mac[:prefix_len]
-                if prefix in self.mac_vendors:
-                    return self.mac_vendors[prefix]
-        
-        return None
+        return self.vendor_resolver.get_vendor(mac)
         
     def is_ip_in_known_subnet(self, ip: str) -> bool:
         """Check if IP is within a known subnet"""
@@ -231,7 +222,7 @@ class PacketAnalyzer:
         Returns:
             bool: True if started successfully
         """
-        if not SCAPY_AVAILABLE:
+        if not SCAPY_AVAILABLE and self.config.capture_engine == ENGINE_SCAPY:
             logger.error("Cannot start capture: Scapy library not available")
             return False
             
@@ -302,6 +293,10 @@ class PacketAnalyzer:
         
     def _capture_packets(self) -> None:
         """Internal method for packet capture thread"""
+        if self.config.capture_engine != ENGINE_SCAPY:
+            self._capture_frames()
+            return
+            
         try:
             # Start sniffing
             sniff(
@@ -315,6 +310,25 @@ class PacketAnalyzer:
             logger.error(f"Error in packet capture: {e}")
             self.is_running = False
             
+    def _capture_frames(self) -> None:
+        """Capture raw frames using a non-scapy capture engine"""
+        try:
+            engine = open_capture_engine(
+                self.config.capture_engine,
+                interface=self.config.interface,
+                promisc=self.config.promisc_mode
+            )
+            with engine:
+                engine.capture(self._process_frames, self.stop_event)
+        except Exception as e:
+            logger.error(f"Error in packet capture: {e}")
+            self.is_running = False
+            
+    def _process_frames(self, frames: FrameBatch) -> None:
+        """Decode a batch of raw frames from a capture engine and process them"""
+        for view in ARPBatch.from_frames(frames).views():
+            self._process_packet(view)
+            
     def _monitor_memory_usage(self) -> None:
         """Monitor memory usage and adjust batch size accordingly"""
         if not PSUTIL_AVAILABLE:
@@ -424,16 +438,23 @@ class PacketAnalyzer:
         Process a captured packet
         
         Args:
-            packet: Raw scapy packet
+            packet: Raw scapy packet or ARPFrameView from a capture engine
         """
         try:
-            # Check if it's an ARP packet
-            if ARP in packet:
+            # Frames from a capture engine are already decoded
+            if isinstance(packet, ARPFrameView):
+                arp_packet = packet
+                src_mac = packet.eth_src
+                dst_mac = packet.eth_dst
+            elif ARP in packet:
                 arp_packet = packet[ARP]
-                
-                # Extract fields
                 src_mac = packet[Ether].src
                 dst_mac = packet[Ether].dst
+            else:
+                arp_packet = None
+                
+            if arp_packet is not None:
+                # Extract fields
                 src_ip = arp_packet.psrc
                 dst_ip = arp_packet.pdst
                 op_code = arp_packet.op
@@ -501,12 +522,12 @@ class PacketAnalyzer:
         Determine the type of ARP packet
         
         Args:
-            packet: Raw scapy packet
+            packet: Raw scapy packet or ARPFrameView
             
         Returns:
             PacketType: The type of ARP packet
         """
-        arp = packet[ARP]
+        arp = packet if isinstance(packet, ARPFrameView) else packet[ARP]
         
         # Check op code
         if arp.op == 1:  # who-has (request)
@@ -6,6 +6,7 @@ This module provides functionality for executing tasks in parallel, with support
 - Task prioritization
 - Batch processing
 - Worker thread interface
+- Worker processes fed through shared memory rings
 """
 
 import logging
@@ -13,6 +14,7 @@ import logging
 from src.core.parallel.thread_pool import ThreadPoolManager, Task, Worker
 from src.core.parallel.worker_interface import WorkerTask, RuleCheckTask, BatchProcessingTask, TaskPrioritizer
 from src.core.parallel.task_queue import PriorityTaskQueue, BatchTaskQueue, TaskScheduler
+from src.core.parallel.process_pool import SharedRingBuffer, ProcessPoolManager
 
 # Setup logging
 logger = logging.getLogger("arp_guard.parallel")
@@ -30,4 +32,6 @@ __all__ = [
     'PriorityTaskQueue',
     'BatchTaskQueue',
     'TaskScheduler',
+    'SharedRingBuffer',
+    'ProcessPoolManager',
 ] 
\ No newline at end of file
@@ -0,0 +1,288 @@
+import time
+import logging
+import struct
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Callable, Any, List, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger("arp_guard.parallel")
+
+# Ring header: producer (head) and consumer (tail) counters on separate cache lines
+_COUNTER = struct.Struct("=Q")
+_HEAD_OFFSET = 0
+_TAIL_OFFSET = 64
+_HEADER_SIZE = 128
+
+
+class SharedRingBuffer:
+    """
+    Single-producer single-consumer ring of fixed-size records in shared memory.
+
+    The producer only writes the head counter and the consumer only writes the
+    tail counter, so no lock is needed between the two processes. Records are
+    written before the head is advanced, and read before the tail is advanced.
+    """
+
+    def __init__(self, record_size: int, capacity: int = 65536, name: Optional[str] = None,
+                 create: bool = True):
+        """
+        Create or attach to a ring buffer.
+
+        Args:
+            record_size: Size of each record in bytes
+            capacity: Number of record slots
+            name: Shared memory block name (required when attaching)
+            create: Whether to create the shared memory block
+        """
+        self.record_size = record_size
+        self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=create, size=_HEADER_SIZE + record_size * capacity
+        )
+        self.buffer = self.shm.buf
+        self.owner = create
+        if create:
+            self.buffer[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+
+    @classmethod
+    def attach(cls, name: str, record_size: int, capacity: int) -> "SharedRingBuffer":
+        """
+        Attach to a ring buffer created by another process.
+
+        Args:
+            name: Shared memory block name
+            record_size: Size of each record in bytes
+            capacity: Number of record slots
+
+        Returns:
+            SharedRingBuffer attached to the existing block
+        """
+        return cls(record_size, capacity, name=name, create=False)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block"""
+        return self.shm.name
+
+    def _head(self) -> int:
+        return _COUNTER.unpack_from(self.buffer, _HEAD_OFFSET)[0]
+
+    def _tail(self) -> int:
+        return _COUNTER.unpack_from(self.buffer, _TAIL_OFFSET)[0]
+
+    def qsize(self) -> int:
+        """Get the number of records waiting in the ring"""
+        return self._head() - self._tail()
+
+    def put_many(self, items: Sequence[Any], pack: Callable[[Any, memoryview, int], None]) -> int:
+        """
+        Write items into the ring (producer side).
+
+        Args:
+            items: Items to write
+            pack: Function writing one item into the buffer at an offset
+
+        Returns:
+            Number of items written; the rest did not fit
+        """
+        head = self._head()
+        free = self.capacity - (head - self._tail())
+        count = min(free, len(items))
+
+        for i in range(count):
+            offset = _HEADER_SIZE + ((head + i) % self.capacity) * self.record_size
+            pack(items[i], self.buffer, offset)
+
+        if count:
+            _COUNTER.pack_into(self.buffer, _HEAD_OFFSET, head + count)
+        return count
+
+    def get_many(self, max_items: int, unpack: Callable[[memoryview, int], Any],
+                 timeout: Optional[float] = None) -> List[Any]:
+        """
+        Read up to max_items items from the ring (consumer side).
+
+        Polls with a short backoff until at least one item is available or
+        the timeout expires.
+
+        Args:
+            max_items: Maximum number of items to return
+            unpack: Function reading one item from the buffer at an offset
+            timeout: Maximum time to wait in seconds (None to return immediately)
+
+        Returns:
+            List of items, empty if none arrived in time
+        """
+        tail = self._tail()
+        available = self._head() - tail
+
+        if not available and timeout:
+            deadline = time.monotonic() + timeout
+            delay = 0.0005
+            while not available and time.monotonic() < deadline:
+                time.sleep(delay)
+                delay = min(delay * 2, 0.01)
+                available = self._head() - tail
+
+        count = min(max_items, available)
+        items = [
+            unpack(self.buffer, _HEADER_SIZE + ((tail + i) % self.capacity) * self.record_size)
+            for i in range(count)
+        ]
+
+        if count:
+            _COUNTER.pack_into(self.buffer, _TAIL_OFFSET, tail + count)
+        return items
+
+    def close(self) -> None:
+        """Detach from the ring, removing it if this process created it"""
+        self.buffer = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class ProcessPoolManager:
+    """
+    Manages worker processes fed through per-process shared memory rings.
+
+    Each worker process owns one ring and one slot of a shared counter array.
+    The target function is called in the child as
+    ``target(index, ring_name, ring_capacity, results, counters, stop_event, *args)``
+    and must read its ring until stop_event is set, putting results on the
+    results queue and updating only its own counters.
+    """
+
+    def __init__(self, num_processes: int, target: Callable, record_size: int,
+                 counter_names: Sequence[str], ring_capacity: int = 65536, args: Tuple = ()):
+        """
+        Initialize the process pool.
+
+        Args:
+            num_processes: Number of worker processes
+            target: Worker process entry point
+            record_size: Size of each ring record in bytes
+            counter_names: Names of the per-process counters
+            ring_capacity: Number of record slots per ring
+            args: Extra arguments passed to target
+        """
+        self.num_processes = max(1, num_processes)
+        self.target = target
+        self.record_size = record_size
+        self.counter_names = tuple(counter_names)
+        self.ring_capacity = ring_capacity
+        self.args = args
+
+        self.rings: List[SharedRingBuffer] = []
+        self.processes: List[multiprocessing.Process] = []
+        self.results = None
+        self.counters = None
+        self.stop_event = None
+        self.dropped = [0] * self.num_processes
+        self.started_at = None
+        self.running = False
+
+    def start(self):
+        """Create the rings and start the worker processes."""
+        if self.running:
+            return
+
+        self.rings = [SharedRingBuffer(self.record_size, self.ring_capacity) for _ in range(self.num_processes)]
+        self.results = multiprocessing.JoinableQueue()
+        self.counters = multiprocessing.Array("d", self.num_processes * len(self.counter_names), lock=False)
+        self.stop_event = multiprocessing.Event()
+        self.dropped = [0] * self.num_processes
+
+        for index, ring in enumerate(self.rings):
+            process = multiprocessing.Process(
+                target=self.target,
+                args=(index, ring.name, self.ring_capacity, self.results, self.counters,
+                      self.stop_event) + tuple(self.args),
+                name=f"detection-process-{index}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+
+        self.started_at = time.time()
+        self.running = True
+        logger.info(f"Process pool started with {self.num_processes} worker processes")
+
+    def stop(self, timeout: float = 2.0):
+        """
+        Stop the worker processes and release the rings.
+
+        Args:
+            timeout: Time to wait for each process before terminating it
+        """
+        if not self.running:
+            return
+
+        self.running = False
+        self.stop_event.set()
+
+        for process in self.processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                logger.warning(f"Terminating unresponsive worker process {process.name}")
+                process.terminate()
+                process.join(timeout=timeout)
+
+        for ring in self.rings:
+            ring.close()
+
+        self.processes = []
+        self.rings = []
+        logger.info("Process pool stopped")
+
+    def submit(self, index: int, items: Sequence[Any], pack: Callable[[Any, memoryview, int], None]) -> int:
+        """
+        Push items to one worker's ring.
+
+        Args:
+            index: Worker process index
+            items: Items to push
+            pack: Function writing one item into the ring buffer at an offset
+
+        Returns:
+            Number of items accepted; items that did not fit are counted as dropped
+        """
+        written = self.rings[index].put_many(items, pack)
+        self.dropped[index] += len(items) - written
+        return written
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get per-process statistics.
+
+        Returns:
+            List with one dictionary of counters, ring depth and throughput per process
+        """
+        if not self.running:
+            return []
+
+        elapsed = max(time.time() - self.started_at, 1e-6)
+        width = len(self.counter_names)
+        stats = []
+        for index, process in enumerate(self.processes):
+            values = self.counters[index * width:(index + 1) * width]
+            counters = {
+                name: value if name == "busy_time" else int(value)
+                for name, value in zip(self.counter_names, values)
+            }
+            busy = counters.get("busy_time", 0.0)
+            received = counters.get("packets_received", 0.0)
+            stats.append({
+                "index": index,
+                "pid": process.pid,
+                "alive": process.is_alive(),
+                "ring_depth": self.rings[index].qsize(),
+                "dropped": self.dropped[index],
+                "packets_per_second": received / elapsed,
+                "busy_packets_per_second": received / busy if busy else 0.0,
+                **counters
+            })
+        return stats
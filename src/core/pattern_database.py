@@ -104,6 +104,129 @@ class Pattern:
         )
 
 
+class FeatureIndex:
+    """
+    Inverted index of pattern features for matching.
+    
+    EXACT features with hashable values are keyed by (feature name, value),
+    so a packet's extracted features look up the patterns they satisfy
+    directly. Other match types are kept per feature name and evaluated by
+    the matcher. Per-pattern weight totals are precomputed.
+    
+    Patterns are indexed as they are added; a pattern modified in place
+    after being added must be added again (or rebuild() called).
+    """
+    
+    def __init__(self):
+        """Initialize an empty index"""
+        self.patterns: Dict[str, Pattern] = {}  # id -> Pattern, in database order
+        self.order: Dict[str, int] = {}  # pattern ID -> sort key for database order
+        self._next_order = 0
+        self.exact: Dict[Tuple[str, Any], List[Tuple[str, int]]] = {}  # (name, value) -> [(pattern ID, feature index)]
+        self.generic: Dict[str, List[Tuple[str, int, PatternFeature]]] = {}  # name -> [(pattern ID, feature index, feature)]
+        self.feature_patterns: Dict[str, Set[str]] = {}  # name -> set of pattern IDs using it
+        self.total_weights: Dict[str, float] = {}  # pattern ID -> sum of feature weights
+        self.always_candidates: Set[str] = set()  # pattern IDs that match with a zero score
+    
+    def add(self, pattern: Pattern) -> None:
+        """
+        Index a pattern, replacing any previous version with the same ID.
+        
+        Args:
+            pattern: The pattern to index
+        """
+        if pattern.id in self.patterns:
+            self._unindex(self.patterns[pattern.id])
+        else:
+            self.order[pattern.id] = self._next_order
+            self._next_order += 1
+        self.patterns[pattern.id] = pattern
+        
+        total_weight = 0
+        for index, feature in enumerate(pattern.features):
+            total_weight += feature.weight
+            self.feature_patterns.setdefault(feature.name, set()).add(pattern.id)
+            
+            key = self._exact_key(feature)
+            if key is not None:
+                self.exact.setdefault(key, []).append((pattern.id, index))
+            else:
+                self.generic.setdefault(feature.name, []).append((pattern.id, index, feature))
+        
+        self.total_weights[pattern.id] = total_weight
+        if pattern.confidence <= 0:
+            self.always_candidates.add(pattern.id)
+    
+    def remove(self, pattern_id: str) -> None:
+        """
+        Remove a pattern from the index.
+        
+        Args:
+            pattern_id: ID of the pattern to remove
+        """
+        pattern = self.patterns.pop(pattern_id, None)
+        if pattern is not None:
+            self._unindex(pattern)
+            del self.order[pattern_id]
+    
+    def rebuild(self, patterns: List[Pattern]) -> None:
+        """
+        Rebuild the index from scratch.
+        
+        Args:
+            patterns: Patterns to index, in database order
+        """
+        self.clear()
+        for pattern in patterns:
+            self.add(pattern)
+    
+    def clear(self) -> None:
+        """Remove all patterns from the index"""
+        self.patterns.clear()
+        self.order.clear()
+        self._next_order = 0
+        self.exact.clear()
+        self.generic.clear()
+        self.feature_patterns.clear()
+        self.total_weights.clear()
+        self.always_candidates.clear()
+    
+    def _unindex(self, pattern: Pattern) -> None:
+        """Remove a pattern's entries, keeping its position in patterns"""
+        for feature in pattern.features:
+            key = self._exact_key(feature)
+            if key is not None:
+                entries = self.exact.get(key, [])
+                entries[:] = [entry for entry in entries if entry[0] != pattern.id]
+                if not entries:
+                    self.exact.pop(key, None)
+            else:
+                entries = self.generic.get(feature.name, [])
+                entries[:] = [entry for entry in entries if entry[0] != pattern.id]
+                if not entries:
+                    self.generic.pop(feature.name, None)
+            
+            pattern_ids = self.feature_patterns.get(feature.name)
+            if pattern_ids is not None:
+                pattern_ids.discard(pattern.id)
+                if not pattern_ids:
+                    del self.feature_patterns[feature.name]
+        
+        self.total_weights.pop(pattern.id, None)
+        self.always_candidates.discard(pattern.id)
+    
+    @staticmethod
+    def _exact_key(feature: PatternFeature) -> Optional[Tuple[str, Any]]:
+        """Get the inverted index key for an EXACT feature, None if it cannot be hashed"""
+        if feature.match_type != PatternMatchType.EXACT:
+            return None
+        try:
+            hash(feature.value)
+        except TypeError:
+            return None
+        return (feature.name, feature.value)
+
+
 class PatternDatabase:
     """
     Database for storing, retrieving, and matching ARP attack patterns.
@@ -121,6 +244,7 @@ class PatternDatabase:
         self.patterns: Dict[str, Pattern] = {}  # id -> Pattern
         self.pattern_by_tag: Dict[str, Set[str]] = {}  # tag -> set of pattern IDs
         self.pattern_by_category: Dict[PatternCategory, Set[str]] = {}  # category -> set of pattern IDs
+        self.feature_index = FeatureIndex()  # compiled feature lookup for matching
         
         # Load patterns if database path provided
         if database_path and os.path.exists(database_path):
@@ -208,6 +332,9 @@ class PatternDatabase:
             self.pattern_by_category[pattern.category] = set()
         self.pattern_by_category[pattern.category].add(pattern.id)
         
+        # Add to feature index
+        self.feature_index.add(pattern)
+        
         logger.info(f"Added pattern: {pattern.id} - {pattern.name}")
         
         # Save to disk if database path provided
@@ -251,6 +378,9 @@ class PatternDatabase:
             if not self.pattern_by_category[pattern.category]:
                 del self.pattern_by_category[pattern.category]
         
+        # Remove from feature index
+        self.feature_index.remove(pattern_id)
+        
         logger.info(f"Removed pattern: {pattern_id}")
         
         # Save to disk if database path provided
@@ -358,6 +488,7 @@ class PatternDatabase:
             self.patterns = {}
             self.pattern_by_tag = {}
             self.pattern_by_category = {}
+            self.feature_index.clear()
             
             # Read from file
             with open(self.database_path, "r") as f:
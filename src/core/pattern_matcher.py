@@ -2,12 +2,18 @@ import logging
 import time
 from typing import Dict, List, Optional, Set, Any, Tuple, Callable
 from dataclasses import dataclass, field
+from collections import OrderedDict, deque
 import re
 
 from src.core.pattern_database import Pattern, PatternDatabase, PatternFeature, PatternMatchType
 
 logger = logging.getLogger(__name__)
 
+# Sizes of the recent-activity buffers kept in the matcher context
+MAX_RECENT_PACKETS = 100
+MAX_RECENT_TARGETS = 100
+MAX_RECENT_OUIS = 50
+
 @dataclass
 class MatchResult:
     """Result of a pattern match"""
@@ -164,9 +170,9 @@ class PatternMatcher:
         self.context: Dict[str, Any] = {
             "gateway_ip": None,
             "gateway_mac": None,
-            "recent_packets": [],
-            "recent_targets": set(),
-            "recent_ouis": set(),
+            "recent_packets": deque(maxlen=MAX_RECENT_PACKETS),
+            "recent_targets": OrderedDict(),
+            "recent_ouis": OrderedDict(),
             "mapping_changes": 0,
             "packet_rate": 0,
             "high_rate_threshold": 100,
@@ -232,35 +238,21 @@ class PatternMatcher:
         Args:
             packet_data: Packet data dictionary
         """
-        # Add to recent packets (keep last 100)
-        self.context["recent_packets"] = (
-            self.context["recent_packets"][-99:] + [packet_data]
-            if "recent_packets" in self.context
-            else [packet_data]
-        )
+        # Add to recent packets (ring buffer of the last 100)
+        recent_packets = self.context.get("recent_packets")
+        if not isinstance(recent_packets, deque) or recent_packets.maxlen != MAX_RECENT_PACKETS:
+            recent_packets = self.context["recent_packets"] = deque(recent_packets or (), maxlen=MAX_RECENT_PACKETS)
+        recent_packets.append(packet_data)
         
         # Update recent targets
         if "target_ip" in packet_data:
-            if "recent_targets" not in self.context:
-                self.context["recent_targets"] = set()
-            self.context["recent_targets"].add(packet_data["target_ip"])
-            
-            # Keep set size manageable
-            if len(self.context["recent_targets"]) > 100:
-                self.context["recent_targets"] = set(list(self.context["recent_targets"])[-100:])
+            self._remember("recent_targets", packet_data["target_ip"], MAX_RECENT_TARGETS)
         
         # Update recent OUIs (first 6 chars of MAC)
         if "sender_mac" in packet_data:
             sender_mac = packet_data["sender_mac"]
             if sender_mac and len(sender_mac) >= 8:  # xx:xx:xx format
-                oui = sender_mac[:8]
-                if "recent_ouis" not in self.context:
-                    self.context["recent_ouis"] = set()
-                self.context["recent_ouis"].add(oui)
-                
-                # Keep set size manageable
-                if len(self.context["recent_ouis"]) > 50:
-                    self.context["recent_ouis"] = set(list(self.context["recent_ouis"])[-50:])
+                self._remember("recent_ouis", sender_mac[:8], MAX_RECENT_OUIS)
         
         # Track MAC-IP mapping changes
         if "sender_ip" in packet_data and "sender_mac" in packet_data:
@@ -279,29 +271,99 @@ class PatternMatcher:
             # Update mapping
             self.context["ip_to_mac"][ip] = mac
     
+    def _remember(self, key: str, value: Any, limit: int) -> None:
+        """
+        Add a value to an insertion-ordered context set, evicting the oldest.
+        
+        Args:
+            key: Context key
+            value: Value to add
+            limit: Maximum number of values kept
+        """
+        recent = self.context.get(key)
+        if not isinstance(recent, OrderedDict):
+            recent = self.context[key] = OrderedDict.fromkeys(recent or ())
+        
+        recent[value] = None
+        recent.move_to_end(value)
+        while len(recent) > limit:
+            recent.popitem(last=False)
+    
     def _match_features(self, features: Dict[str, Any]) -> List[MatchResult]:
         """
         Match features against patterns.
         
+        Uses the database's feature index so only patterns with at least one
+        satisfied feature are scored.
+        
         Args:
             features: Dictionary of extracted features
             
         Returns:
             List of MatchResult objects for matching patterns
         """
-        match_results = []
+        index = self.pattern_database.feature_index
+        hits: Dict[str, List[int]] = {}
         
-        # Get all patterns
-        patterns = self.pattern_database.get_all_patterns()
+        # Collect the pattern features satisfied by each extracted value
+        for feature_name, actual_value in features.items():
+            if actual_value is None:
+                continue
+            
+            try:
+                entries = index.exact.get((feature_name, actual_value), ())
+            except TypeError:
+                # Unhashable value: compare it against the EXACT features by hand
+                entries = self._unhashable_exact_hits(index, feature_name, actual_value)
+            for pattern_id, position in entries:
+                hits.setdefault(pattern_id, []).append(position)
+            
+            for pattern_id, position, feature in index.generic.get(feature_name, ()):
+                if self._match_feature_value(actual_value, feature.value, feature.match_type):
+                    hits.setdefault(pattern_id, []).append(position)
+        
+        # Patterns using features that were not extracted need their totals recomputed
+        missing = {
+            feature_name for feature_name in index.feature_patterns
+            if features.get(feature_name) is None
+        }
+        
+        candidates = hits.keys() | index.always_candidates
+        if not candidates:
+            return []
         
-        # Match each pattern
-        for pattern in patterns:
-            match_result = self._match_pattern(pattern, features)
-            if match_result:
-                match_results.append(match_result)
+        match_results = []
+        for pattern_id in sorted(candidates, key=index.order.__getitem__):
+            pattern = index.patterns[pattern_id]
+            positions = sorted(hits.get(pattern_id, ()))
+            matched_features = [pattern.features[position].name for position in positions]
+            matched_weight = 0
+            for position in positions:
+                matched_weight += pattern.features[position].weight
+            
+            if missing and any(pattern_id in index.feature_patterns[name] for name in missing):
+                total_weight = 0
+                for feature in pattern.features:
+                    if feature.name not in missing:
+                        total_weight += feature.weight
+            else:
+                total_weight = index.total_weights[pattern_id]
+            
+            score = matched_weight / total_weight if total_weight > 0 else 0
+            if score >= pattern.confidence:
+                match_results.append(self._build_result(pattern, score, matched_features))
         
         return match_results
     
+    def _unhashable_exact_hits(self, index, feature_name: str, actual_value: Any) -> List[Tuple[str, int]]:
+        """Find EXACT features equal to an unhashable extracted value."""
+        return [
+            (pattern_id, position)
+            for (name, expected_value), entries in index.exact.items()
+            if name == feature_name and expected_value == actual_value
+            for pattern_id, position in entries
+        ]
+    
     def _match_pattern(self, pattern: Pattern, features: Dict[str, Any]) -> Optional[MatchResult]:
         """
         Match a pattern against features.
@@ -341,21 +403,25 @@ class PatternMatcher:
         
         # Check if score exceeds confidence threshold
         if score >= pattern.confidence:
-            return MatchResult(
-                pattern_id=pattern.id,
-                pattern_name=pattern.name,
-                score=score,
-                matched_features=matched_features,
-                total_features=len(pattern.features),
-                details={
-                    "category": pattern.category.name,
-                    "severity": pattern.severity,
-                    "confidence_threshold": pattern.confidence
-                }
-            )
+            return self._build_result(pattern, score, matched_features)
         
         return None
     
+    def _build_result(self, pattern: Pattern, score: float, matched_features: List[str]) -> MatchResult:
+        """Create the MatchResult for a pattern that reached its threshold."""
+        return MatchResult(
+            pattern_id=pattern.id,
+            pattern_name=pattern.name,
+            score=score,
+            matched_features=matched_features,
+            total_features=len(pattern.features),
+            details={
+                "category": pattern.category.name,
+                "severity": pattern.severity,
+                "confidence_threshold": pattern.confidence
+            }
+        )
+    
     def _match_feature_value(self, actual_value: Any, expected_value: Any, match_type: PatternMatchType) -> bool:
         """
         Match a feature value based on match type.
@@ -12,6 +12,8 @@ from typing import Dict, List, Set, Tuple, Optional, Any
 from collections import defaultdict, Counter, deque
 from datetime import datetime
 
+from .window_stats import WindowStats
+
 # Configure logging
 logger = logging.getLogger("arpguard.pattern")
 
@@ -46,8 +48,7 @@ class PatternRecognizer:
         self.arp_history = deque(maxlen=MAX_HISTORY_SIZE)
         self.mac_ip_bindings = defaultdict(set)  # MAC → set of IPs
         self.ip_mac_bindings = defaultdict(set)  # IP → set of MACs
-        self.mac_activity = defaultdict(list)  # MAC → list of (timestamp, activity_type)
-        self.ip_activity = defaultdict(list)  # IP → list of (timestamp, activity_type)
+        self.windows = WindowStats()  # Running per-MAC/per-IP window aggregates
         
         # Statistical counters
         self.packet_count = 0
@@ -97,9 +98,7 @@ class PatternRecognizer:
         self.ip_mac_bindings[src_ip].add(src_mac)
         
         # Record activity
-        activity_type = "reply" if op_code == 2 else "request"
-        self.mac_activity[src_mac].append((timestamp, activity_type))
-        self.ip_activity[src_ip].append((timestamp, activity_type))
+        self.windows.update(timestamp, src_mac, src_ip, dst_ip, op_code == 2)
         
         # Add to history
         self.arp_history.append({
@@ -121,6 +120,26 @@ class PatternRecognizer:
             
         return None
     
+    def process_batch(self, batch) -> List[Dict[str, Any]]:
+        """
+        Process a columnar batch of ARP packets.
+        
+        Args:
+            batch: ARPBatch from src.core.arp_batch (decoded raw frames)
+                
+        Returns:
+            List of detection results for the packets that triggered one
+        """
+        results = []
+        
+        # to_dicts() formats each distinct address once for the whole batch
+        for packet in batch.to_dicts():
+            result = self.process_packet(packet)
+            if result:
+                results.append(result)
+                
+        return results
+    
     def analyze_patterns(self) -> Optional[Dict[str, Any]]:
         """
         Run comprehensive pattern analysis on collected data.
@@ -130,6 +149,7 @@ class PatternRecognizer:
             suspicious pattern is found, None otherwise
         """
         self.last_analysis_time = time.time()
+        self.windows.expire(self.last_analysis_time)
         detection_results = []
         
         # Run all pattern detection algorithms
@@ -175,51 +195,31 @@ class PatternRecognizer:
             if len(mac_set) <= 1:
                 continue
                 
-            # Get recent history for this IP
-            recent_entries = [
-                entry for entry in self.arp_history
-                if entry["src_ip"] == ip and current_time - entry["timestamp"] < TIME_WINDOW_MEDIUM
-            ]
-            
-            if len(recent_entries) < 3:
+            # MAC changes are tracked as packets arrive
+            window = self.windows.ips.get(ip)
+            if window is None or len(window) < 3 or not window.changes:
                 continue
-                
-            # Sort by timestamp
-            recent_entries.sort(key=lambda x: x["timestamp"])
             
-            # Look for changes in MAC address
-            mac_changes = []
-            previous_mac = recent_entries[0]["src_mac"]
+            mac_changes = list(window.changes)
             
-            for entry in recent_entries[1:]:
-                if entry["src_mac"] != previous_mac:
-                    mac_changes.append({
-                        "timestamp": entry["timestamp"],
-                        "old_mac": previous_mac,
-                        "new_mac": entry["src_mac"]
-                    })
-                    previous_mac = entry["src_mac"]
+            # Calculate confidence based on number and frequency of changes
+            confidence = min(0.95, 0.65 + (len(mac_changes) * 0.05))
             
-            # If we found MAC changes, report them
-            if mac_changes:
-                # Calculate confidence based on number and frequency of changes
-                confidence = min(0.95, 0.65 + (len(mac_changes) * 0.05))
-                
-                # Increase confidence if gateway IP is involved
-                if self.gateway_detector and ip in self.gateway_detector._get_gateway_ips():
-                    confidence = min(0.99, confidence + 0.2)
-                
-                # Create detection result
-                results.append({
-                    "type": "ip_mac_flapping",
-                    "description": f"IP {ip} is using multiple MAC addresses",
-                    "ip": ip,
-                    "mac_addresses": list(mac_set),
-                    "confidence": confidence,
-                    "changes": mac_changes,
-                    "timestamp": current_time,
-                    "timespan": current_time - recent_entries[0]["timestamp"]
-                })
+            # Increase confidence if gateway IP is involved
+            if self.gateway_detector and ip in self.gateway_detector._get_gateway_ips():
+                confidence = min(0.99, confidence + 0.2)
+            
+            # Create detection result
+            results.append({
+                "type": "ip_mac_flapping",
+                "description": f"IP {ip} is using multiple MAC addresses",
+                "ip": ip,
+                "mac_addresses": list(mac_set),
+                "confidence": confidence,
+                "changes": mac_changes,
+                "timestamp": current_time,
+                "timespan": current_time - window.first_timestamp
+            })
         
         return results
     
@@ -247,47 +247,40 @@ class PatternRecognizer:
         if not gateway_ips or not gateway_macs:
             return results
             
-        # Check for gateway impersonation in recent packets
-        recent_entries = [
-            entry for entry in self.arp_history
-            if current_time - entry["timestamp"] < TIME_WINDOW_MEDIUM
-        ]
-        
-        # Group suspicious entries by MAC address
-        suspicious_macs = defaultdict(list)
-        
-        for entry in recent_entries:
-            # Check if packet claims to be from a gateway IP
-            if entry["src_ip"] in gateway_ips:
-                # Check if MAC doesn't match known gateway MACs
-                if entry["src_mac"] not in gateway_macs:
-                    suspicious_macs[entry["src_mac"]].append(entry)
-        
-        # Analyze suspicious MAC addresses
-        for mac, entries in suspicious_macs.items():
-            if len(entries) < 2:
+        # Look up per-MAC packet counts for each gateway IP's recent window
+        for gateway_ip in gateway_ips:
+            window = self.windows.ips.get(gateway_ip)
+            if window is None:
                 continue
                 
-            # Calculate confidence based on number of suspicious packets
-            base_confidence = 0.75  # Gateway impersonation is serious
-            num_packets_factor = min(0.2, len(entries) * 0.01)  # Up to 0.2 more confidence
-            time_factor = min(0.1, (entries[-1]["timestamp"] - entries[0]["timestamp"]) / 300)  # Up to 0.1 more for persistent attacks
-            
-            confidence = base_confidence + num_packets_factor + time_factor
-            
-            # Create detection result
-            results.append({
-                "type": "gateway_impersonation",
-                "description": f"Potential gateway impersonation by MAC {mac}",
-                "gateway_ip": entries[0]["src_ip"],
-                "legitimate_macs": gateway_macs,
-                "impersonating_mac": mac,
-                "confidence": confidence,
-                "packet_count": len(entries),
-                "first_seen": entries[0]["timestamp"],
-                "last_seen": entries[-1]["timestamp"],
-                "timestamp": current_time
-            })
+            for mac, packet_count in window.counts.items():
+                # Packets claiming the gateway IP from an unknown MAC
+                if mac in gateway_macs or packet_count < 2:
+                    continue
+                    
+                first_seen = window.mac_first_seen(mac)
+                last_seen = window.mac_last_seen(mac)
+                
+                # Calculate confidence based on number of suspicious packets
+                base_confidence = 0.75  # Gateway impersonation is serious
+                num_packets_factor = min(0.2, packet_count * 0.01)  # Up to 0.2 more confidence
+                time_factor = min(0.1, (last_seen - first_seen) / 300)  # Up to 0.1 more for persistent attacks
+                
+                confidence = base_confidence + num_packets_factor + time_factor
+                
+                # Create detection result
+                results.append({
+                    "type": "gateway_impersonation",
+                    "description": f"Potential gateway impersonation by MAC {mac}",
+                    "gateway_ip": gateway_ip,
+                    "legitimate_macs": gateway_macs,
+                    "impersonating_mac": mac,
+                    "confidence": confidence,
+                    "packet_count": packet_count,
+                    "first_seen": first_seen,
+                    "last_seen": last_seen,
+                    "timestamp": current_time
+                })
         
         return results
     
@@ -304,24 +297,24 @@ class PatternRecognizer:
         results = []
         current_time = time.time()
         
-        # Get recent history
-        recent_entries = [
-            entry for entry in self.arp_history
-            if current_time - entry["timestamp"] < TIME_WINDOW_SMALL
-        ]
-        
-        if len(recent_entries) < 10:
+        # Packets seen in the short window across all sources
+        total_packets = self.windows.short_total
+        if total_packets < 10:
             return results
             
         # Count packets by source MAC
-        mac_counts = Counter([entry["src_mac"] for entry in recent_entries])
+        mac_counts = {
+            mac: len(window.claimed_ips)
+            for mac, window in self.windows.macs.items()
+            if window.claimed_ips
+        }
         
         # Calculate average packets per MAC
         total_macs = len(mac_counts)
         if total_macs == 0:
             return results
             
-        avg_packets_per_mac = len(recent_entries) / total_macs
+        avg_packets_per_mac = total_packets / total_macs
         
         # Check for MACs with abnormally high packet counts
         for mac, count in mac_counts.items():
@@ -331,11 +324,8 @@ class PatternRecognizer:
                 ratio = count / avg_packets_per_mac
                 confidence = min(0.95, 0.6 + (ratio / 20))
                 
-                # Get the specific entries for this MAC
-                mac_entries = [entry for entry in recent_entries if entry["src_mac"] == mac]
-                
                 # Check unique IPs claimed by this MAC
-                claimed_ips = set(entry["src_ip"] for entry in mac_entries)
+                claimed_ips = list(self.windows.macs[mac].claimed_ips.counts)
                 
                 # If multiple IPs are claimed, increase confidence
                 if len(claimed_ips) > 1:
@@ -347,7 +337,7 @@ class PatternRecognizer:
                     "description": f"Abnormally high ARP traffic from MAC {mac}",
                     "mac": mac,
                     "packet_count": count,
-                    "claimed_ips": list(claimed_ips),
+                    "claimed_ips": claimed_ips,
                     "average_packets_per_mac": avg_packets_per_mac,
                     "ratio_above_average": ratio,
                     "confidence": confidence,
@@ -362,7 +352,8 @@ class PatternRecognizer:
         Detect unsolicited ARP replies which may indicate poisoning attempts.
         
         This algorithm looks for ARP replies that weren't preceded by 
-        corresponding requests.
+        corresponding requests. Each reply is matched against the latest
+        request for its sender IP when it arrives.
         
         Returns:
             List of detection results
@@ -370,50 +361,18 @@ class PatternRecognizer:
         results = []
         current_time = time.time()
         
-        # Get recent history, focusing on replies (op_code == 2)
-        recent_replies = [
-            entry for entry in self.arp_history
-            if entry["op_code"] == 2 and current_time - entry["timestamp"] < TIME_WINDOW_MEDIUM
-        ]
-        
         # Skip if not enough data
-        if len(recent_replies) < 5:
+        if self.windows.medium_replies < 5:
             return results
             
-        # Group replies by source
-        mac_replies = defaultdict(list)
-        for entry in recent_replies:
-            mac_replies[entry["src_mac"]].append(entry)
-        
         # For each source, check for unsolicited replies
-        for mac, replies in mac_replies.items():
+        for mac, window in self.windows.macs.items():
+            replies = window.replies
             if len(replies) < 3:
                 continue
                 
             # Count potentially unsolicited replies
-            unsolicited_count = 0
-            unsolicited_details = []
-            
-            for reply in replies:
-                # Look for a matching request in the recent history
-                found_request = False
-                
-                # A request should be for this IP and slightly earlier
-                for entry in self.arp_history:
-                    if (entry["op_code"] == 1 and 
-                        entry["dst_ip"] == reply["src_ip"] and
-                        entry["timestamp"] < reply["timestamp"] and
-                        reply["timestamp"] - entry["timestamp"] < 2):  # Within 2 seconds
-                        found_request = True
-                        break
-                
-                if not found_request:
-                    unsolicited_count += 1
-                    unsolicited_details.append({
-                        "timestamp": reply["timestamp"],
-                        "ip": reply["src_ip"],
-                        "mac": reply["src_mac"]
-                    })
+            unsolicited_count = replies.count(False)
             
             # If we found unsolicited replies
             if unsolicited_count >= 3 and unsolicited_count / len(replies) > 0.5:
@@ -421,6 +380,12 @@ class PatternRecognizer:
                 ratio = unsolicited_count / len(replies)
                 confidence = min(0.9, 0.7 + (ratio * 0.2))
                 
+                unsolicited_details = [
+                    {"timestamp": timestamp, "ip": ip, "mac": mac}
+                    for timestamp, solicited, ip in replies
+                    if not solicited
+                ]
+                
                 # Create detection result
                 results.append({
                     "type": "unsolicited_replies",
@@ -476,11 +441,8 @@ class PatternRecognizer:
                     # Calculate confidence based on number of claimed IPs
                     confidence = min(0.98, 0.85 + (len(other_ips) * 0.02))
                     
-                    # Get recent entries for this MAC
-                    mac_entries = [
-                        entry for entry in self.arp_history
-                        if entry["src_mac"] == mac and current_time - entry["timestamp"] < TIME_WINDOW_MEDIUM
-                    ]
+                    # Recent packet count for this MAC
+                    window = self.windows.macs.get(mac)
                     
                     # Create detection result
                     results.append({
@@ -490,7 +452,7 @@ class PatternRecognizer:
                         "gateway_ips": [ip for ip in ip_set if ip in gateway_ips],
                         "other_ips": other_ips,
                         "confidence": confidence,
-                        "packet_count": len(mac_entries),
+                        "packet_count": len(window.activity) if window else 0,
                         "timestamp": current_time
                     })
         
@@ -501,7 +463,8 @@ class PatternRecognizer:
         Detect subnet scanning activity that may precede attacks.
         
         This algorithm identifies patterns of ARP requests that systematically
-        scan through IP ranges.
+        scan through IP ranges. Targets are kept as per-/24 last-octet
+        bitmaps, so sequential pairs and coverage are maintained per packet.
         
         Returns:
             List of detection results
@@ -509,67 +472,31 @@ class PatternRecognizer:
         results = []
         current_time = time.time()
         
-        # Get recent ARP requests
-        recent_requests = [
-            entry for entry in self.arp_history
-            if entry["op_code"] == 1 and current_time - entry["timestamp"] < TIME_WINDOW_MEDIUM
-        ]
-        
-        if len(recent_requests) < 10:
+        # Skip if there were few recent ARP requests
+        if self.windows.medium_requests < 10:
             return results
             
-        # Group requests by source MAC
-        mac_requests = defaultdict(list)
-        for entry in recent_requests:
-            mac_requests[entry["src_mac"]].append(entry)
-        
         # Analyze each source's request patterns
-        for mac, requests in mac_requests.items():
-            if len(requests) < 10:
+        for mac, window in self.windows.macs.items():
+            request_count = window.activity.count("request")
+            if request_count < 10:
                 continue
                 
-            # Extract target IPs
-            target_ips = [request["dst_ip"] for request in requests]
-            
             # Simple check: are there many unique IPs?
-            unique_ips = set(target_ips)
-            if len(unique_ips) < 8:
+            targets = window.targets
+            if targets.unique_targets < 8:
                 continue
                 
-            # Try to detect sequential scanning
-            ip_octets = []
-            for ip in unique_ips:
-                try:
-                    octets = [int(o) for o in ip.split('.')]
-                    if len(octets) == 4:
-                        ip_octets.append(octets)
-                except:
-                    continue
+            # Find subnet with most IPs
+            most_scanned_subnet, scanned_count = targets.most_scanned_subnet()
             
-            # Skip if parsing failed
-            if len(ip_octets) < 8:
+            # Skip if too few targets were IPv4 addresses
+            if most_scanned_subnet is None:
                 continue
                 
-            # Check for sequential patterns in the last octet
-            sequential_count = 0
-            for i in range(len(ip_octets) - 1):
-                for j in range(i + 1, len(ip_octets)):
-                    # If first 3 octets match and last differs by 1
-                    if (ip_octets[i][0] == ip_octets[j][0] and
-                        ip_octets[i][1] == ip_octets[j][1] and
-                        ip_octets[i][2] == ip_octets[j][2] and
-                        abs(ip_octets[i][3] - ip_octets[j][3]) == 1):
-                        sequential_count += 1
-            
-            # Calculate scan coverage (how much of a subnet is scanned)
-            subnet_ips = defaultdict(set)
-            for octets in ip_octets:
-                subnet = f"{octets[0]}.{octets[1]}.{octets[2]}"
-                subnet_ips[subnet].add(octets[3])
-            
-            # Find subnet with most IPs
-            most_scanned_subnet = max(subnet_ips.items(), key=lambda x: len(x[1]))
-            subnet_coverage = len(most_scanned_subnet[1]) / 254  # Approximate coverage
+            # Sequential pairs: targets in one /24 whose last octets differ by 1
+            sequential_count = targets.sequential_pairs
+            subnet_coverage = scanned_count / 254  # Approximate coverage
             
             # If we found sequential patterns or high subnet coverage
             if sequential_count >= 5 or subnet_coverage > 0.2:
@@ -581,10 +508,10 @@ class PatternRecognizer:
                     "type": "subnet_scan",
                     "description": f"Potential subnet scanning from MAC {mac}",
                     "mac": mac,
-                    "request_count": len(requests),
-                    "unique_targets": len(unique_ips),
+                    "request_count": request_count,
+                    "unique_targets": targets.unique_targets,
                     "sequential_pairs": sequential_count,
-                    "most_scanned_subnet": most_scanned_subnet[0],
+                    "most_scanned_subnet": most_scanned_subnet,
                     "subnet_coverage": subnet_coverage,
                     "confidence": confidence,
                     "timestamp": current_time
@@ -641,8 +568,10 @@ class PatternRecognizer:
             "anomaly_count": self.anomaly_count,
             "mac_ip_bindings": len(self.mac_ip_bindings),
             "ip_mac_bindings": len(self.ip_mac_bindings),
-            "unique_macs": len(self.mac_activity),
-            "unique_ips": len(self.ip_activity),
+            "unique_macs": len(self.mac_ip_bindings),
+            "unique_ips": len(self.ip_mac_bindings),
+            "active_macs": len(self.windows.macs),
+            "active_ips": len(self.windows.ips),
             "detected_patterns": len(self.detected_patterns)
         }
     
@@ -669,8 +598,7 @@ class PatternRecognizer:
         self.arp_history.clear()
         self.mac_ip_bindings.clear()
         self.ip_mac_bindings.clear()
-        self.mac_activity.clear()
-        self.ip_activity.clear()
+        self.windows.clear()
         self.packet_count = 0
         self.anomaly_count = 0
         self.detected_patterns.clear()
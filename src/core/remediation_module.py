@@ -16,6 +16,7 @@ from dataclasses import dataclass, field
 import time
 import threading
 from .module_interface import Module, ModuleConfig
+from .expiring_map import ExpiringMap
 import json
 import os
 from datetime import datetime, timedelta
@@ -50,6 +51,12 @@ class RemediationModule(Module):
         """
         super().__init__("remediation", "ARP Spoofing Remediation", config or RemediationConfig())
         self.os_platform = platform.system().lower()
+        
+        # Pending unblocks, keyed by MAC; expiry unblocks the host
+        self._block_expiry = ExpiringMap(ttl=self.config.block_duration, on_expire=self._on_block_expired)
+        self._expiry_stop = threading.Event()
+        self._expiry_thread = None
+        
         self._load_config()
         self._cleanup_expired_blocks()
         
@@ -77,14 +84,16 @@ class RemediationModule(Module):
             logger.error(f"Error saving remediation config: {e}")
             
     def _cleanup_expired_blocks(self) -> None:
-        """Remove expired blocked hosts."""
-        current_time = datetime.now()
+        """Remove expired blocked hosts and schedule unblocking for the rest."""
+        current_time = time.time()
         expired = []
         
         for mac, info in self.config.blocked_hosts.items():
-            block_time = datetime.fromtimestamp(info['timestamp'])
-            if current_time - block_time > timedelta(seconds=self.config.block_duration):
+            remaining = info['timestamp'] + self.config.block_duration - current_time
+            if remaining <= 0:
                 expired.append(mac)
+            elif self.config.block_duration > 0:
+                self._schedule_unblock(mac, remaining)
                 
         for mac in expired:
             del self.config.blocked_hosts[mac]
@@ -103,6 +112,7 @@ class RemediationModule(Module):
         """Shutdown the remediation module."""
         try:
             logger.info("Shutting down remediation module")
+            self._expiry_stop.set()
             # Unblock all blocked hosts
             self._unblock_all_hosts()
             return True
@@ -466,26 +476,40 @@ class RemediationModule(Module):
         self._save_config()
         self._save_timer = None
         
-    def _schedule_unblock(self, mac_address: str, duration: int) -> None:
-        """Schedule host unblocking with optimized timer management.
+    def _schedule_unblock(self, mac_address: str, duration: float) -> None:
+        """Schedule host unblocking on the shared expiry map.
         
         Args:
             mac_address: MAC address to unblock
             duration: Duration in seconds
         """
-        # Only create a new timer if needed
-        if not hasattr(self, '_unblock_timers'):
-            self._unblock_timers = {}
-            
-        # Cancel existing timer if any
-        if mac_address in self._unblock_timers and self._unblock_timers[mac_address]:
-            self._unblock_timers[mac_address].cancel()
-            
-        # Schedule new timer
-        timer = threading.Timer(duration, self.unblock_host, args=[mac_address])
-        timer.daemon = True
-        timer.start()
-        self._unblock_timers[mac_address] = timer
+        # Replaces any earlier schedule for the same host
+        self._block_expiry.set(mac_address, True, ttl=duration)
+        
+        # One thread drives all pending unblocks instead of a timer per host
+        if self._expiry_thread is None or not self._expiry_thread.is_alive():
+            self._expiry_stop.clear()
+            self._expiry_thread = threading.Thread(
+                target=self._expiry_loop,
+                name="remediation-unblock",
+                daemon=True
+            )
+            self._expiry_thread.start()
+            
+    def _expiry_loop(self) -> None:
+        """Expire pending blocks until the module shuts down."""
+        while not self._expiry_stop.wait(self._block_expiry.resolution):
+            self._block_expiry.expire()
+            
+    def _on_block_expired(self, mac_address: str, _) -> None:
+        """Unblock a host whose block duration has elapsed.
+        
+        Args:
+            mac_address: MAC address to unblock
+        """
+        if mac_address in self.config.blocked_hosts:
+            logger.info(f"Block expired for {mac_address}")
+            self.unblock_host(mac_address)
         
     def unblock_host(self, mac_address: str) -> bool:
         """Unblock a host from the network.
@@ -516,6 +540,7 @@ class RemediationModule(Module):
                 return False
                 
             del self.config.blocked_hosts[mac_address]
+            self._block_expiry.pop(mac_address, None)
             self._save_config()
             return True
             
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Sliding Window Statistics for ARP Guard
+Incrementally maintained per-MAC and per-IP traffic aggregates
+
+Every packet updates a handful of bounded windows in O(1) (amortized over
+evictions), so pattern detectors can read running counts instead of
+rescanning the packet history.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Iterator, List, Optional, Tuple
+
+# Window lengths in seconds (match the pattern recognizer's windows)
+SHORT_WINDOW = 30
+MEDIUM_WINDOW = 300
+
+# Cap on events kept per window so one chatty host cannot grow memory
+MAX_WINDOW_EVENTS = 1000
+
+# Seconds a request stays eligible to explain a reply for its target
+REQUEST_REPLY_WINDOW = 2
+
+
+class SlidingCounter:
+    """
+    Time window of (timestamp, key, data) events with running per-key counts.
+
+    Events are expected in roughly ascending timestamp order; eviction pops
+    from the left until the oldest event is inside the window.
+    """
+
+    __slots__ = ("span", "max_events", "events", "counts")
+
+    def __init__(self, span: float, max_events: int = MAX_WINDOW_EVENTS):
+        """
+        Initialize the window
+
+        Args:
+            span: Window length in seconds
+            max_events: Maximum number of events kept
+        """
+        self.span = span
+        self.max_events = max_events
+        self.events: Deque[Tuple[float, Hashable, Any]] = deque()
+        self.counts: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __iter__(self) -> Iterator[Tuple[float, Hashable, Any]]:
+        return iter(self.events)
+
+    def add(self, timestamp: float, key: Hashable, data: Any = None) -> None:
+        """Record an event."""
+        if len(self.events) >= self.max_events:
+            self._pop()
+        self.events.append((timestamp, key, data))
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def count(self, key: Hashable) -> int:
+        """Get the number of events with a key inside the window."""
+        return self.counts.get(key, 0)
+
+    @property
+    def first_timestamp(self) -> Optional[float]:
+        return self.events[0][0] if self.events else None
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        return self.events[-1][0] if self.events else None
+
+    def expire(self, now: float) -> List[Tuple[float, Hashable, Any]]:
+        """
+        Evict events older than the window
+
+        Args:
+            now: Current time in seconds
+
+        Returns:
+            Evicted events, oldest first
+        """
+        cutoff = now - self.span
+        events = self.events
+        evicted = []
+        while events and events[0][0] <= cutoff:
+            evicted.append(self._pop())
+        return evicted
+
+    def _pop(self) -> Tuple[float, Hashable, Any]:
+        event = self.events.popleft()
+        key = event[1]
+        remaining = self.counts[key] - 1
+        if remaining:
+            self.counts[key] = remaining
+        else:
+            del self.counts[key]
+        return event
+
+
+class BindingWindow(SlidingCounter):
+    """
+    Window of the MACs seen for one IP, tracking MAC changes incrementally.
+
+    A change is recorded when a packet's MAC differs from the previous
+    packet's; it leaves the window together with the packet before it.
+    """
+
+    __slots__ = ("changes",)
+
+    def __init__(self, span: float = MEDIUM_WINDOW, max_events: int = MAX_WINDOW_EVENTS):
+        super().__init__(span, max_events)
+        self.changes: Deque[Dict[str, Any]] = deque()
+
+    def add(self, timestamp: float, key: Hashable, data: Any = None) -> None:
+        previous = self.events[-1][1] if self.events else None
+        super().add(timestamp, key, data)
+        if previous is not None and previous != key:
+            self.changes.append({"timestamp": timestamp, "old_mac": previous, "new_mac": key})
+
+    def _pop(self) -> Tuple[float, Hashable, Any]:
+        event = super()._pop()
+        if self.events and self.events[0][1] != event[1] and self.changes:
+            self.changes.popleft()
+        elif not self.events:
+            self.changes.clear()
+        return event
+
+    def mac_first_seen(self, mac: str) -> Optional[float]:
+        """Get the timestamp of the oldest event for a MAC in the window."""
+        return next((timestamp for timestamp, key, _ in self.events if key == mac), None)
+
+    def mac_last_seen(self, mac: str) -> Optional[float]:
+        """Get the timestamp of the newest event for a MAC in the window."""
+        return next((timestamp for timestamp, key, _ in reversed(self.events) if key == mac), None)
+
+
+class TargetScanTracker:
+    """
+    Window of ARP request targets with per-/24 last-octet bitmaps.
+
+    Each /24 keeps a 256-bit integer of the last octets requested; adding or
+    removing an octet updates the count of adjacent (sequential) pairs by
+    looking at its two neighbour bits, so scan metrics are O(1) per packet.
+    """
+
+    __slots__ = ("span", "events", "target_counts", "bitmaps", "sequential_pairs")
+
+    def __init__(self, span: float = MEDIUM_WINDOW):
+        """
+        Initialize the tracker
+
+        Args:
+            span: Window length in seconds
+        """
+        self.span = span
+        self.events: Deque[Tuple[float, str]] = deque()
+        self.target_counts: Dict[str, int] = {}
+        self.bitmaps: Dict[str, int] = {}
+        self.sequential_pairs = 0
+
+    @property
+    def unique_targets(self) -> int:
+        return len(self.target_counts)
+
+    def add(self, timestamp: float, target_ip: str) -> None:
+        """Record a request for a target IP."""
+        count = self.target_counts.get(target_ip, 0)
+        if not count:
+            self._set_bit(target_ip, True)
+        self.target_counts[target_ip] = count + 1
+        self.events.append((timestamp, target_ip))
+        if len(self.events) > MAX_WINDOW_EVENTS:
+            self._evict_oldest()
+
+    def expire(self, now: float) -> None:
+        """Evict targets not requested within the window."""
+        cutoff = now - self.span
+        while self.events and self.events[0][0] <= cutoff:
+            self._evict_oldest()
+
+    def most_scanned_subnet(self) -> Tuple[Optional[str], int]:
+        """
+        Get the /24 with the most distinct targets
+
+        Returns:
+            Tuple of (subnet prefix, number of distinct last octets)
+        """
+        best, best_count = None, 0
+        for subnet, bitmap in self.bitmaps.items():
+            count = bin(bitmap).count("1")
+            if count > best_count:
+                best, best_count = subnet, count
+        return best, best_count
+
+    def _evict_oldest(self) -> None:
+        _, target_ip = self.events.popleft()
+        count = self.target_counts[target_ip] - 1
+        if count:
+            self.target_counts[target_ip] = count
+        else:
+            del self.target_counts[target_ip]
+            self._set_bit(target_ip, False)
+
+    def _set_bit(self, target_ip: str, present: bool) -> None:
+        subnet, _, octet = target_ip.rpartition(".")
+        if not subnet or subnet.count(".") != 2 or not octet.isdigit() or int(octet) > 255:
+            return
+        octet = int(octet)
+        bitmap = self.bitmaps.get(subnet, 0)
+        neighbours = ((bitmap >> (octet - 1)) & 1 if octet else 0) + ((bitmap >> (octet + 1)) & 1)
+
+        if present:
+            self.sequential_pairs += neighbours
+            self.bitmaps[subnet] = bitmap | (1 << octet)
+        else:
+            self.sequential_pairs -= neighbours
+            bitmap &= ~(1 << octet)
+            if bitmap:
+                self.bitmaps[subnet] = bitmap
+            else:
+                del self.bitmaps[subnet]
+
+
+class MacWindow:
+    """Windows kept for one source MAC."""
+
+    __slots__ = ("claimed_ips", "activity", "replies", "targets")
+
+    def __init__(self):
+        # Source IPs claimed in the short window (storm detection)
+        self.claimed_ips = SlidingCounter(SHORT_WINDOW)
+        # "request"/"reply" counts in the medium window
+        self.activity = SlidingCounter(MEDIUM_WINDOW)
+        # Replies keyed by whether a matching request preceded them
+        self.replies = SlidingCounter(MEDIUM_WINDOW)
+        self.targets = TargetScanTracker(MEDIUM_WINDOW)
+
+    def expire(self, now: float) -> None:
+        self.claimed_ips.expire(now)
+        self.activity.expire(now)
+        self.replies.expire(now)
+        self.targets.expire(now)
+
+    def __bool__(self) -> bool:
+        return bool(self.claimed_ips or self.activity or self.replies)
+
+
+class WindowStats:
+    """
+    Incremental per-MAC and per-IP window aggregates for pattern detection.
+
+    update() folds one packet into the windows of its source MAC and IP;
+    expire() evicts old events everywhere and forgets idle hosts.
+    """
+
+    def __init__(self):
+        """Initialize empty windows."""
+        self.macs: Dict[str, MacWindow] = {}
+        self.ips: Dict[str, BindingWindow] = {}
+        # Latest request timestamp per requested IP, used to match replies
+        self.last_request: Dict[str, float] = {}
+        self.short_total = 0
+        self.medium_requests = 0
+        self.medium_replies = 0
+
+    def update(self, timestamp: float, src_mac: str, src_ip: str,
+               dst_ip: Optional[str], is_reply: bool) -> None:
+        """
+        Add one packet to the windows
+
+        Args:
+            timestamp: Packet timestamp
+            src_mac: Sender MAC address
+            src_ip: Sender IP address
+            dst_ip: Target IP address
+            is_reply: Whether the packet is an ARP reply
+        """
+        mac_window = self.macs.get(src_mac)
+        if mac_window is None:
+            mac_window = self.macs[src_mac] = MacWindow()
+        else:
+            self._expire_mac(mac_window, timestamp)
+
+        ip_window = self.ips.get(src_ip)
+        if ip_window is None:
+            ip_window = self.ips[src_ip] = BindingWindow()
+        else:
+            ip_window.expire(timestamp)
+
+        self._add_short(mac_window, timestamp, src_ip)
+        self._add_activity(mac_window, timestamp, "reply" if is_reply else "request")
+        ip_window.add(timestamp, src_mac)
+
+        if is_reply:
+            requested_at = self.last_request.get(src_ip)
+            solicited = (requested_at is not None and requested_at < timestamp and
+                         timestamp - requested_at < REQUEST_REPLY_WINDOW)
+            mac_window.replies.add(timestamp, solicited, src_ip)
+        elif dst_ip:
+            self.last_request[dst_ip] = timestamp
+            mac_window.targets.add(timestamp, dst_ip)
+
+    def expire(self, now: float) -> None:
+        """
+        Evict events outside their windows and drop hosts with no recent events
+
+        Args:
+            now: Current time in seconds
+        """
+        for mac in list(self.macs):
+            window = self.macs[mac]
+            self._expire_mac(window, now)
+            if not window:
+                del self.macs[mac]
+
+        for ip in list(self.ips):
+            window = self.ips[ip]
+            window.expire(now)
+            if not window:
+                del self.ips[ip]
+
+        cutoff = now - REQUEST_REPLY_WINDOW
+        self.last_request = {ip: ts for ip, ts in self.last_request.items() if ts > cutoff}
+
+    def clear(self) -> None:
+        """Forget all windows."""
+        self.macs.clear()
+        self.ips.clear()
+        self.last_request.clear()
+        self.short_total = 0
+        self.medium_requests = 0
+        self.medium_replies = 0
+
+    def _add_short(self, window: MacWindow, timestamp: float, src_ip: str) -> None:
+        before = len(window.claimed_ips)
+        window.claimed_ips.add(timestamp, src_ip)
+        self.short_total += len(window.claimed_ips) - before
+
+    def _add_activity(self, window: MacWindow, timestamp: float, activity_type: str) -> None:
+        requests, replies = window.activity.count("request"), window.activity.count("reply")
+        window.activity.add(timestamp, activity_type)
+        self.medium_requests += window.activity.count("request") - requests
+        self.medium_replies += window.activity.count("reply") - replies
+
+    def _expire_mac(self, window: MacWindow, now: float) -> None:
+        self.short_total -= len(window.claimed_ips.expire(now))
+        for _, activity_type, _ in window.activity.expire(now):
+            if activity_type == "request":
+                self.medium_requests -= 1
+            else:
+                self.medium_replies -= 1
+        window.replies.expire(now)
+        window.targets.expire(now)
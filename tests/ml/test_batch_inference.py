@@ -0,0 +1,117 @@
+import unittest
+import threading
+import tempfile
+import shutil
+import numpy as np
+
+from app.ml.batch_inference import MicroBatcher
+from app.ml.engine import MLEngine
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Test class for the micro-batching inference service."""
+
+    def setUp(self):
+        """Set up the test environment before each test."""
+        self.batch_sizes = []
+        self.batcher = MicroBatcher(self._double, max_batch_size=8, max_wait_ms=20)
+
+    def tearDown(self):
+        """Stop the dispatch thread."""
+        self.batcher.stop()
+
+    def _double(self, items):
+        self.batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    def test_submit_resolves_futures(self):
+        """Test that submitted items are batched and resolved in order."""
+        futures = [self.batcher.submit(i) for i in range(20)]
+        self.assertEqual([future.result(timeout=2) for future in futures], [i * 2 for i in range(20)])
+        self.assertLessEqual(max(self.batch_sizes), 8)
+        self.assertLess(len(self.batch_sizes), 20)
+
+        stats = self.batcher.get_stats()
+        self.assertEqual(stats["items"], 20)
+        self.assertEqual(sum(stats["latency_histogram"].values()), 20)
+        self.assertEqual(sum(stats["batch_size_histogram"].values()), stats["batches"])
+
+    def test_partial_batch_flushed_after_wait(self):
+        """Test that a lone item is dispatched once max_wait_ms passes."""
+        future = self.batcher.submit(21)
+        self.assertEqual(future.result(timeout=2), 42)
+        self.assertEqual(self.batch_sizes, [1])
+
+    def test_concurrent_submitters(self):
+        """Test that items from many threads all get their own result."""
+        results = {}
+
+        def submit_range(start):
+            for i in range(start, start + 50):
+                results[i] = self.batcher.submit(i)
+
+        threads = [threading.Thread(target=submit_range, args=(n * 50,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({i: future.result(timeout=2) for i, future in results.items()},
+                         {i: i * 2 for i in range(200)})
+
+    def test_batch_errors_propagate(self):
+        """Test that a failing batch fails every future in it."""
+        batcher = MicroBatcher(lambda items: 1 / 0, max_batch_size=4, max_wait_ms=1)
+        try:
+            future = batcher.submit(1)
+            with self.assertRaises(ZeroDivisionError):
+                future.result(timeout=2)
+            self.assertEqual(batcher.get_stats()["errors"], 1)
+        finally:
+            batcher.stop()
+
+    def test_run_chunks(self):
+        """Test synchronous batches are split at max_batch_size."""
+        self.assertEqual(self.batcher.run(list(range(20))), [i * 2 for i in range(20)])
+        self.assertEqual(self.batch_sizes, [8, 8, 4])
+        self.assertEqual(self.batcher.get_stats()["batch_size_histogram"], {"4": 1, "8": 2})
+
+
+class TestMLEngineBatch(unittest.TestCase):
+    """Test class for batched MLEngine scoring."""
+
+    def setUp(self):
+        """Train a small engine."""
+        self.model_dir = tempfile.mkdtemp()
+        self.engine = MLEngine(model_dir=self.model_dir)
+        self.engine.min_confidence = 0.3
+
+        rng = np.random.RandomState(0)
+        X, y = [], []
+        for label, offset in (("benign", 0.0), ("spoofing", 5.0)):
+            for _ in range(60):
+                X.append({"a": rng.normal(offset), "b": rng.normal(offset), "c": rng.normal()})
+                y.append(label)
+        self.assertTrue(self.engine.train(X, y)["success"])
+        self.samples = X
+
+    def tearDown(self):
+        """Remove the model directory."""
+        shutil.rmtree(self.model_dir, ignore_errors=True)
+
+    def test_batch_matches_single(self):
+        """Test that batched results equal per-packet results."""
+        packets = [{"src_ip": f"10.0.0.{i}", "src_mac": "aa:bb:cc:dd:ee:ff"} for i in range(len(self.samples))]
+
+        single = [self.engine.process(packet, features) for packet, features in zip(packets, self.samples)]
+        batched = self.engine.process_batch(packets, self.samples)
+
+        self.assertEqual(len(batched), len(single))
+        for one, many in zip(single, batched):
+            self.assertEqual([(d["confidence"], d["evidence"]["detection_type"]) for d in one["detections"]],
+                             [(d["confidence"], d["evidence"]["detection_type"]) for d in many["detections"]])
+        self.assertTrue(any(result["detections"] for result in batched))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import unittest
+import random
+from datetime import datetime, timedelta
+
+from app.ml.feature_store import TemporalFeatureStore, encode_packet, ip_to_int, int_to_ip, mac_to_int, int_to_mac
+from app.ml.feature_extraction import FeatureExtractor
+from app.ml.context_tracker import ContextTracker
+
+
+def list_window_features(window, packet):
+    """Temporal features computed by rescanning a list of packets."""
+    now = packet["timestamp"]
+    src_mac = packet.get("src_mac", "").lower()
+    src_ip = packet.get("src_ip", "")
+    n = len(window)
+    time_window = max(now - min(p["timestamp"] for p in window), 1.0)
+    requests = sum(1 for p in window if p.get("op") == 1)
+    replies = sum(1 for p in window if p.get("op") == 2)
+    return {
+        "packet_rate": n / time_window,
+        "request_rate": requests / time_window,
+        "reply_rate": replies / time_window,
+        "request_reply_ratio": requests / (requests + replies) if requests + replies else 0.5,
+        "src_mac_freq": sum(1 for p in window if p.get("src_mac", "").lower() == src_mac) / n if src_mac else 0.0,
+        "src_ip_freq": sum(1 for p in window if p.get("src_ip") == src_ip) / n if src_ip else 0.0,
+        "unique_ip_count": len({p["src_ip"] for p in window if p.get("src_ip")}) / n,
+        "unique_mac_count": len({p["src_mac"].lower() for p in window if p.get("src_mac")}) / n,
+    }
+
+
+class TestTemporalFeatureStore(unittest.TestCase):
+    """Test cases for the columnar temporal feature store."""
+
+    def setUp(self):
+        """Generate an in-order packet stream."""
+        rng = random.Random(3)
+        self.packets = []
+        timestamp = 1000.0
+        for _ in range(400):
+            timestamp += rng.choice([0.0, 0.05, 0.5, 2.0, 12.0])
+            self.packets.append({
+                "op": rng.choice([1, 2, 2, 3]),
+                "src_ip": rng.choice(["10.0.0.1", "10.0.0.2", "10.0.0.3", "", "bogus"]),
+                "src_mac": rng.choice(["AA:BB:CC:00:00:01", "aa:bb:cc:00:00:01", "aa:bb:cc:00:00:02", ""]),
+                "timestamp": timestamp,
+            })
+
+    def test_matches_list_window(self):
+        """Test that running aggregates equal a rescan of the same window."""
+        store = TemporalFeatureStore(capacity=50, window=30)
+        window = []
+        for packet in self.packets:
+            self.assertTrue(store.add_packet(packet))
+            window = [p for p in window + [packet] if packet["timestamp"] - p["timestamp"] <= 30][-50:]
+
+            now, _, src_ip, src_mac = encode_packet(packet)
+            features = store.features(now, src_ip, src_mac)
+            expected = list_window_features(window, packet)
+            for name, value in expected.items():
+                self.assertAlmostEqual(features[name], value, msg=name)
+            self.assertEqual(len(store), len(window))
+
+    def test_batch_matches_single(self):
+        """Test that the vectorised batch path equals per-packet inserts."""
+        single = TemporalFeatureStore(capacity=50, window=30)
+        expected = []
+        for packet in self.packets:
+            row = encode_packet(packet)
+            single.add(*row)
+            expected.append(single.features(row[0], row[2], row[3]))
+
+        batched = TemporalFeatureStore(capacity=50, window=30)
+        columns = batched.add_batch([encode_packet(packet) for packet in self.packets[:150]])
+        rest = batched.add_batch([encode_packet(packet) for packet in self.packets[150:]])
+        for name in columns:
+            values = list(columns[name]) + list(rest[name])
+            for value, features in zip(values, expected):
+                self.assertAlmostEqual(value, features[name], msg=name)
+
+    def test_out_of_window_and_resize(self):
+        """Test late packets are dropped and resizing keeps the newest packets."""
+        store = TemporalFeatureStore(capacity=10, window=30)
+        for i in range(8):
+            store.add(100.0 + i, 1, ip_to_int(f"10.0.0.{i}"), mac_to_int("aa:bb:cc:dd:ee:ff"))
+        self.assertFalse(store.add(60.0, 2, ip_to_int("10.0.0.1"), -1))
+        self.assertEqual(store.reply_count, 0)
+
+        store.resize(4)
+        self.assertEqual([row["src_ip"] for row in store.rows()], ["10.0.0.4", "10.0.0.5", "10.0.0.6", "10.0.0.7"])
+        self.assertEqual(store.oldest, 104.0)
+        self.assertEqual(store.mac_count("AA:BB:CC:DD:EE:FF"), 4)
+        self.assertEqual(store.request_count, 4)
+
+    def test_address_encoding(self):
+        """Test IP and MAC keys round-trip."""
+        self.assertEqual(int_to_ip(ip_to_int("192.168.1.254")), "192.168.1.254")
+        self.assertEqual(int_to_mac(mac_to_int("AA-BB-CC-00-11-22")), "aa:bb:cc:00:11:22")
+        self.assertLess(ip_to_int("300.1.1.1"), -1)
+        self.assertIsNone(int_to_ip(ip_to_int("")))
+
+
+class TestSharedFeatureStore(unittest.TestCase):
+    """Test cases for the store shared by the extractor and context tracker."""
+
+    def test_extractor_batch_matches_single(self):
+        """Test that extract_features_batch equals extract_features per packet."""
+        now = datetime.now()
+        packets = [{
+            "op": 1 + i % 2,
+            "src_mac": f"00:11:22:33:44:{i % 5:02x}",
+            "dst_mac": "ff:ff:ff:ff:ff:ff",
+            "src_ip": f"192.168.1.{i % 7}",
+            "dst_ip": "192.168.1.1",
+            "timestamp": now + timedelta(seconds=i),
+        } for i in range(60)]
+
+        single = FeatureExtractor()
+        expected = [single.extract_features(packet) for packet in packets]
+        batched = FeatureExtractor().extract_features_batch(packets)
+
+        self.assertEqual([list(features) for features in batched], [list(features) for features in expected])
+        for one, many in zip(expected, batched):
+            for name in one:
+                self.assertAlmostEqual(one[name], many[name], msg=name)
+
+    def test_tracker_reads_extractor_store(self):
+        """Test that a tracker sharing the store does not record packets twice."""
+        extractor = FeatureExtractor()
+        tracker = ContextTracker(feature_store=extractor.feature_store)
+        packet = {"op": 2, "src_ip": "192.168.1.1", "dst_ip": "192.168.1.1",
+                  "src_mac": "00:11:22:33:44:55", "timestamp": datetime.now()}
+
+        for _ in range(5):
+            extractor.extract_features(packet)
+            tracker.update(packet)
+
+        self.assertEqual(len(extractor.feature_store), 5)
+        self.assertIsNone(tracker.get_context()["gateway_ip"])
+
+        extractor.extract_features(packet)
+        tracker.update(packet)
+        self.assertEqual(len(extractor.feature_store), 6)
+        self.assertEqual(tracker.gateway_ip, "192.168.1.1")
+
+    def test_tracker_window_outlasts_extractor(self):
+        """Test that a tracker with its own store counts over its history window."""
+        extractor = FeatureExtractor()
+        tracker = ContextTracker(history_window=300)
+        start = datetime.now()
+        for i in range(5):
+            packet = {"op": 2, "src_ip": "192.168.1.1", "dst_ip": "192.168.1.1",
+                      "src_mac": "00:11:22:33:44:55", "timestamp": start + timedelta(seconds=60 * i)}
+            extractor.extract_features(packet)
+            tracker.update(packet)
+
+        self.assertEqual(extractor.feature_store.mac_count("00:11:22:33:44:55"), 1)
+        self.assertEqual(tracker.feature_store.mac_count("00:11:22:33:44:55"), 5)
+        self.assertEqual(tracker.feature_store.window, 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
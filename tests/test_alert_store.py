@@ -0,0 +1,140 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add src directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.core.alert import Alert, AlertManager, AlertPriority, AlertStatus, AlertType
+from src.core.alert_store import AlertStore, LOG_FILE
+
+
+def make_alert(n, timestamp=None, alert_type=AlertType.ARP_SPOOFING,
+               priority=AlertPriority.MEDIUM, source="test"):
+    return Alert(id=f"alert-{n}", type=alert_type, priority=priority, message=f"Alert {n}",
+                 timestamp=float(n) if timestamp is None else timestamp, source=source)
+
+
+class TestAlertStore(unittest.TestCase):
+    """Test the indexed alert store."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "alerts")
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.temp_dir.cleanup()
+
+    def test_queries_match_linear_scan(self):
+        """Test that indexed queries return what filtering every alert would."""
+        store = AlertStore()
+        types = [AlertType.ARP_SPOOFING, AlertType.RATE_ANOMALY, AlertType.SYSTEM]
+        priorities = list(AlertPriority)
+        alerts = []
+        for n in range(300):
+            alert = make_alert(n, alert_type=types[n % 3], priority=priorities[n % 5],
+                               source=f"sensor-{n % 7}")
+            store.add(alert)
+            alerts.append(alert)
+        for n in range(0, 300, 4):
+            store.update(f"alert-{n}", status=AlertStatus.RESOLVED)
+
+        queries = [
+            {},
+            {"status": AlertStatus.NEW},
+            {"alert_type": AlertType.SYSTEM, "priority": AlertPriority.HIGH},
+            {"source": "sensor-3", "start_time": 50, "end_time": 200},
+            {"status": AlertStatus.RESOLVED, "start_time": 280},
+            {"alert_type": AlertType.RATE_ANOMALY, "limit": 5},
+            {"start_time": 10, "end_time": 20, "limit": 3},
+            {"source": "nobody"},
+        ]
+        for query in queries:
+            expected = [a for a in reversed(alerts)
+                        if query.get("status", a.status) == a.status
+                        and query.get("alert_type", a.type) == a.type
+                        and query.get("priority", a.priority) == a.priority
+                        and query.get("source", a.source) == a.source
+                        and query.get("start_time", 0) <= a.timestamp <= query.get("end_time", 1e9)]
+            expected = expected[:query.get("limit", len(expected))]
+            self.assertEqual([a.id for a in store.query(**query)], [a.id for a in expected], query)
+
+        self.assertEqual(store.counts("status"), {AlertStatus.NEW: 225, AlertStatus.RESOLVED: 75})
+        self.assertEqual(len(store.query(status=[AlertStatus.NEW, AlertStatus.RESOLVED])), 300)
+
+    def test_eviction_keeps_newest(self):
+        """Test that the oldest alerts are evicted, even if added out of order."""
+        store = AlertStore(max_alerts=100)
+        for n in range(1000):
+            store.add(make_alert(n))
+        store.add(make_alert(1000, timestamp=950.5))
+        store.delete("alert-990")
+
+        self.assertEqual(len(store), 99)
+        ids = [a.id for a in store.query()]
+        self.assertEqual(ids[0], "alert-999")
+        self.assertNotIn("alert-990", ids)
+        self.assertEqual(ids.index("alert-1000"), 48)
+        self.assertIsNone(store.get("alert-900"))
+        # Evicted alerts are gone from the indexes too
+        self.assertEqual(store.counts("source"), {"test": 99})
+
+    def test_persistence_and_compaction(self):
+        """Test that alerts survive a restart and the log is compacted."""
+        store = AlertStore(self.path, compact_every=50)
+        for n in range(120):
+            store.add(make_alert(n))
+        store.update("alert-5", status=AlertStatus.ACKNOWLEDGED, acknowledgement_message="seen")
+        store.delete("alert-6")
+        with open(os.path.join(self.path, LOG_FILE)) as f:
+            self.assertLess(len(f.readlines()), 120)
+
+        reloaded = AlertStore(self.path)
+        self.assertEqual(reloaded.load(), 119)
+        self.assertEqual(reloaded.get("alert-5").status, AlertStatus.ACKNOWLEDGED)
+        self.assertEqual(reloaded.get("alert-5").acknowledgement_message, "seen")
+        self.assertIsNone(reloaded.get("alert-6"))
+        self.assertEqual([a.id for a in reloaded.query(limit=2)], ["alert-119", "alert-118"])
+
+        # A record cut short by a crash is ignored
+        store.close()
+        with open(os.path.join(self.path, LOG_FILE), "a") as f:
+            f.write('{"op": "put", "alert": {"id"')
+        self.assertEqual(AlertStore(self.path).load(), 119)
+
+    def test_manager_persists_alerts(self):
+        """Test that AlertManager reloads its alerts from storage_path."""
+        manager = AlertManager(storage_path=self.path)
+        first = manager.create_alert(AlertType.GATEWAY_CHANGE, AlertPriority.CRITICAL,
+                                     "Gateway changed", "detector")
+        second = manager.create_alert(AlertType.SYSTEM, AlertPriority.LOW, "Started", "system")
+        manager.resolve_alert(second.id, "fine")
+        manager.close()
+
+        manager = AlertManager(storage_path=self.path)
+        self.assertEqual([a.id for a in manager.get_active_alerts()], [first.id])
+        self.assertEqual(manager.get_alert(second.id).status, AlertStatus.RESOLVED)
+        self.assertEqual(manager.get_status()["status_counts"]["RESOLVED"], 1)
+        manager.close()
+
+    def test_reload_many(self):
+        """Test that a full store of 10k alerts reloads with its indexes."""
+        store = AlertStore(self.path, max_alerts=10000)
+        for n in range(10000):
+            store.add(make_alert(n, source=f"sensor-{n % 50}"))
+        store.close()
+
+        reloaded = AlertStore(self.path, max_alerts=10000)
+        self.assertEqual(reloaded.load(), 10000)
+        self.assertEqual(reloaded.counts("source")["sensor-7"], 200)
+        self.assertEqual([a.id for a in reloaded.query(source="sensor-7", limit=2)],
+                         ["alert-9957", "alert-9907"])
+        reloaded.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -65,6 +65,10 @@ class TestAlertManager(unittest.TestCase):
         self.mock_channel = MockChannel()
         self.manager.add_channel(self.mock_channel)
     
+    def tearDown(self):
+        """Stop the notification workers"""
+        self.manager.close()
+    
     def test_create_alert(self):
         """Test creating an alert"""
         alert = self.manager.create_alert(
@@ -83,6 +87,7 @@ class TestAlertManager(unittest.TestCase):
         self.assertEqual(alert.details, {"detail1": "value1"})
         
         # Check if alert was sent to channel
+        self.manager.flush_notifications()
         self.assertEqual(len(self.mock_channel.alerts), 1)
         self.assertEqual(self.mock_channel.alerts[0].id, alert.id)
     
@@ -258,6 +263,7 @@ class TestAlertManager(unittest.TestCase):
         )
         
         # Check if only medium alert was sent to channel
+        self.manager.flush_notifications()
         self.assertEqual(len(self.mock_channel.alerts), 1)
         self.assertEqual(self.mock_channel.alerts[0].id, medium_alert.id)
     
@@ -275,6 +281,7 @@ class TestAlertManager(unittest.TestCase):
             "test"
         )
         
+        self.manager.flush_notifications()
         self.assertEqual(len(self.mock_channel.alerts), 1)
         self.assertEqual(len(second_channel.alerts), 1)
         
@@ -290,6 +297,7 @@ class TestAlertManager(unittest.TestCase):
             "test"
         )
         
+        self.manager.flush_notifications()
         self.assertEqual(len(self.mock_channel.alerts), 1)  # No change
         self.assertEqual(len(second_channel.alerts), 2)
         
@@ -331,8 +339,7 @@ class TestEmailChannel(unittest.TestCase):
     def test_send_alert(self, mock_smtp):
         """Test sending alert via email"""
         # Configure mock
-        mock_server = MagicMock()
-        mock_smtp.return_value.__enter__.return_value = mock_server
+        mock_server = mock_smtp.return_value
         
         # Create channel
         channel = EmailChannel(
@@ -376,7 +383,7 @@ class TestEmailChannel(unittest.TestCase):
 class TestSlackChannel(unittest.TestCase):
     """Test SlackChannel"""
     
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_alert(self, mock_post):
         """Test sending alert via Slack"""
         # Configure mock
@@ -432,18 +439,16 @@ class TestSlackChannel(unittest.TestCase):
 class TestWebhookChannel(unittest.TestCase):
     """Test WebhookChannel"""
     
-    @patch("requests.post")
-    @patch("requests.put")
-    def test_send_alert(self, mock_put, mock_post):
+    @patch("requests.Session.request")
+    def test_send_alert(self, mock_request):
         """Test sending alert via webhook"""
         # Configure mocks
         mock_post_response = MagicMock()
         mock_post_response.status_code = 200
-        mock_post.return_value = mock_post_response
         
         mock_put_response = MagicMock()
         mock_put_response.status_code = 201
-        mock_put.return_value = mock_put_response
+        mock_request.side_effect = [mock_post_response, mock_put_response]
         
         # Create POST channel
         post_channel = WebhookChannel(
@@ -475,11 +480,12 @@ class TestWebhookChannel(unittest.TestCase):
         self.assertTrue(post_result)
         
         # Verify POST request
-        mock_post.assert_called_once()
-        post_url = mock_post.call_args[0][0]
-        post_json = mock_post.call_args[1]["json"]
-        post_headers = mock_post.call_args[1]["headers"]
+        mock_request.assert_called_once()
+        post_method, post_url = mock_request.call_args[0]
+        post_json = mock_request.call_args[1]["json"]
+        post_headers = mock_request.call_args[1]["headers"]
         
+        self.assertEqual(post_method, "POST")
         self.assertEqual(post_url, "https://example.com/webhook")
         self.assertEqual(post_json["id"], "test-id")
         self.assertEqual(post_json["type"], "GATEWAY_CHANGE")
@@ -490,11 +496,12 @@ class TestWebhookChannel(unittest.TestCase):
         self.assertTrue(put_result)
         
         # Verify PUT request
-        mock_put.assert_called_once()
-        put_url = mock_put.call_args[0][0]
-        put_json = mock_put.call_args[1]["json"]
-        put_headers = mock_put.call_args[1]["headers"]
+        self.assertEqual(mock_request.call_count, 2)
+        put_method, put_url = mock_request.call_args[0]
+        put_json = mock_request.call_args[1]["json"]
+        put_headers = mock_request.call_args[1]["headers"]
         
+        self.assertEqual(put_method, "PUT")
         self.assertEqual(put_url, "https://example.com/webhook")
         self.assertEqual(put_json["id"], "test-id")
         self.assertEqual(put_json["type"], "GATEWAY_CHANGE")
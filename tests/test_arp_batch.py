@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+from src.core.arp_batch import ARPBatch, ARPFrameView, decode_arp_frames, format_ip, format_mac
+from src.core.pattern_recognition import PatternRecognizer
+from tests.test_capture_engine import build_arp_frame
+
+
+class TestARPBatch(unittest.TestCase):
+    """Test cases for the batch ARP decoder."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.frames = [
+            (1.0, build_arp_frame(op=1, sender_ip='10.0.0.1', target_ip='10.0.0.254')),
+            (2.0, b'\xff' * 12 + b'\x08\x00' + b'\x00' * 40),
+            (3.0, build_arp_frame(op=2, sender_mac='aa:bb:cc:dd:ee:ff', sender_ip='10.0.0.254',
+                                  target_mac='00:11:22:33:44:55', target_ip='10.0.0.1')),
+            (4.0, build_arp_frame()[:20]),
+            (5.0, build_arp_frame(op=2, sender_ip='0.0.0.0')),
+        ]
+
+    def test_decode_columns(self):
+        """Test that a batch decodes to integer columns."""
+        batch = ARPBatch.from_frames(self.frames)
+
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.index.tolist(), [0, 2, 4])
+        self.assertEqual(batch.timestamp.tolist(), [1.0, 3.0, 5.0])
+        self.assertEqual(batch.opcode.tolist(), [1, 2, 2])
+        self.assertEqual(batch.hw_type.tolist(), [1, 1, 1])
+        self.assertEqual(batch.proto_type.tolist(), [0x0800] * 3)
+        self.assertEqual(int(batch.sender_mac[1]), 0xaabbccddeeff)
+        self.assertEqual(int(batch.sender_ip[0]), 0x0a000001)
+        self.assertEqual(int(batch.target_ip[1]), 0x0a000001)
+
+    def test_decode_buffer_offsets(self):
+        """Test decoding frames packed in one buffer at arbitrary offsets."""
+        first = build_arp_frame(sender_ip='192.168.0.10')
+        second = build_arp_frame(sender_ip='192.168.0.20')
+        buffer = b'\x00' * 7 + first + b'\x00' * 3 + second
+        batch = decode_arp_frames(buffer, [7, 7 + len(first) + 3, len(buffer) - 10])
+
+        self.assertEqual(batch.index.tolist(), [0, 1])
+        self.assertEqual(batch.format_column('sender_ip'), ['192.168.0.10', '192.168.0.20'])
+
+    def test_lazy_views(self):
+        """Test that row views format addresses like scapy's ARP layer."""
+        batch = ARPBatch.from_frames(self.frames)
+        view = batch.view(1)
+
+        self.assertIsInstance(view, ARPFrameView)
+        self.assertEqual(view.op, 2)
+        self.assertEqual(view.hwsrc, 'aa:bb:cc:dd:ee:ff')
+        self.assertEqual(view.psrc, '10.0.0.254')
+        self.assertEqual(view.hwdst, '00:11:22:33:44:55')
+        self.assertEqual(view.pdst, '10.0.0.1')
+        self.assertEqual([v.psrc for v in batch.views()], ['10.0.0.1', '10.0.0.254', '0.0.0.0'])
+
+        single = ARPFrameView.from_frame(self.frames[2][1], 3.0)
+        self.assertEqual((single.hwsrc, single.psrc, single.pdst), (view.hwsrc, view.psrc, view.pdst))
+
+    def test_valid_mask(self):
+        """Test vectorised rejection of unusable addresses."""
+        batch = ARPBatch.from_frames(self.frames)
+        self.assertEqual(batch.valid_mask().tolist(), [True, True, False])
+        self.assertEqual(len(batch.select(batch.valid_mask())), 2)
+
+    def test_to_dicts(self):
+        """Test conversion to pattern recognition packet dictionaries."""
+        packets = ARPBatch.from_frames(self.frames).to_dicts()
+        self.assertEqual(packets[0]['src_ip'], '10.0.0.1')
+        self.assertEqual(packets[0]['dst_ip'], '10.0.0.254')
+        self.assertEqual(packets[1]['src_mac'], 'aa:bb:cc:dd:ee:ff')
+        self.assertEqual(packets[1]['op_code'], 2)
+        self.assertEqual(ARPBatch.empty().to_dicts(), [])
+
+    def test_formatters(self):
+        """Test integer address formatting."""
+        self.assertEqual(format_mac(0x001122334455), '00:11:22:33:44:55')
+        self.assertEqual(format_ip(np.uint32(0xc0a80101)), '192.168.1.1')
+
+    def test_pattern_recognizer_batch(self):
+        """Test that PatternRecognizer consumes batches directly."""
+        recognizer = PatternRecognizer()
+        frames = [
+            (1.0, build_arp_frame(op=2, sender_mac='00:00:00:00:00:01', sender_ip='10.0.0.1')),
+            (1.1, build_arp_frame(op=2, sender_mac='00:00:00:00:00:02', sender_ip='10.0.0.1')),
+        ]
+        results = recognizer.process_batch(ARPBatch.from_frames(frames))
+
+        self.assertEqual(recognizer.packet_count, 2)
+        self.assertEqual(recognizer.ip_mac_bindings['10.0.0.1'], {'00:00:00:00:00:01', '00:00:00:00:00:02'})
+        self.assertIsInstance(results, list)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import socket
+import threading
+import time
+import unittest
+
+from app.components.arp_cache_monitor import ARPCacheMonitor
+from src.core.capture_engine import RingCaptureEngine
+from src.core.expiring_map import ExpiringMap
+from tests.test_capture_engine import build_arp_frame
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def frames_from(ips, start=0.0, step=0.001, mac='00:11:22:33:44:55'):
+    return [(start + i * step, memoryview(build_arp_frame(sender_mac=mac, sender_ip=ip)))
+            for i, ip in enumerate(ips)]
+
+
+class TestARPCacheMonitor(unittest.TestCase):
+    """Test cases for the batched ARP cache monitor."""
+
+    def setUp(self):
+        """Set up a monitor that records its alerts."""
+        self.monitor = ARPCacheMonitor()
+        self.alerts = []
+        self.monitor._alert_callback = self.alerts.append
+        self.monitor._alert_level = 'medium'
+        self.monitor.rate_window = 10
+
+    def test_rate_alert_once_per_burst(self):
+        """Test that a burst raises one alert and a quiet sender none."""
+        # 250 packets in a quarter second is about 25 pps over the window
+        self.monitor._process_frames(frames_from(['10.0.0.5'] * 250 + ['10.0.0.6'] * 5))
+        self.assertEqual(self.alerts, [{'severity': 'MEDIUM', 'message': 'Suspicious ARP activity detected',
+                                        'sources': ['10.0.0.5']}])
+        entry = self.monitor._cache.get('10.0.0.5')
+        self.assertEqual(entry['count'], 250)
+        self.assertGreater(self.monitor.get_rate(entry), 20)
+        self.assertLess(self.monitor.get_rate(entry, now=60.0), 1)
+
+        # Still flooding: no repeat alert
+        self.monitor._process_frames(frames_from(['10.0.0.5'] * 100, start=0.3))
+        self.assertEqual(len(self.alerts), 1)
+
+        # The rate decays, then a new burst alerts again
+        self.monitor._process_frames(frames_from(['10.0.0.5'], start=60.0))
+        self.monitor._process_frames(frames_from(['10.0.0.5'] * 250, start=61.0))
+        self.assertEqual(len(self.alerts), 2)
+
+    def test_mac_change_and_invalid_frames(self):
+        """Test MAC change alerts and that unusable frames are skipped."""
+        self.monitor._process_frames(frames_from(['10.0.0.1']))
+        self.monitor._process_frames(frames_from(['10.0.0.1'], start=1.0, mac='aa:bb:cc:dd:ee:ff')
+                                     + [(2.0, memoryview(b'\x00' * 20)),
+                                        (2.0, memoryview(build_arp_frame(sender_ip='0.0.0.0')))])
+        self.assertEqual(len(self.alerts), 1)
+        self.assertEqual(self.alerts[0]['old_mac'], '00:11:22:33:44:55')
+        self.assertEqual(self.alerts[0]['new_mac'], 'aa:bb:cc:dd:ee:ff')
+        self.assertEqual(len(self.monitor._cache), 1)
+
+    def test_idle_entries_expire(self):
+        """Test that IPs without packets are dropped after the TTL."""
+        clock = FakeClock()
+        self.monitor._cache = ExpiringMap(ttl=60, clock=clock)
+        self.monitor._process_frames(frames_from(['10.0.0.1', '10.0.0.2']))
+        clock.now += 45
+        self.monitor._process_frames(frames_from(['10.0.0.2'], start=45.0))
+        clock.now += 30
+        self.monitor._cache.expire()
+        self.assertIsNone(self.monitor._cache.get('10.0.0.1'))
+        self.assertEqual(self.monitor._cache.get('10.0.0.2')['count'], 2)
+
+    def test_idle_entries_swept_without_packets(self):
+        """Test that idle entries expire even when no more packets arrive."""
+        clock = FakeClock()
+        self.monitor._cache = ExpiringMap(ttl=60, clock=clock)
+        self.monitor.check_interval = 0.01
+        self.monitor._process_frames(frames_from(['10.0.0.1']))
+        sweeper = threading.Thread(target=self.monitor._sweep_idle_entries)
+        sweeper.start()
+        try:
+            clock.now += 61
+            deadline = time.time() + 2.0
+            # expired_count only moves when something calls expire()
+            while not self.monitor._cache.expired_count and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.monitor._cache.expired_count, 1)
+        finally:
+            self.monitor._stop_event.set()
+            sweeper.join()
+
+    @unittest.skipUnless(RingCaptureEngine.is_supported(), "AF_PACKET not available")
+    def test_persistent_capture_loopback(self):
+        """Test monitoring frames sent on the loopback interface."""
+        try:
+            sender = socket.socket(socket.AF_PACKET, socket.SOCK_RAW)
+            sender.bind(('lo', 0))
+        except PermissionError:
+            self.skipTest("raw sockets require CAP_NET_RAW")
+        self.monitor.capture_engine = 'ring'
+        statuses = []
+        self.monitor.start_monitoring(interface='lo', duration=5, alert_callback=self.alerts.append,
+                                      status_callback=lambda ok, message: statuses.append(ok))
+        try:
+            time.sleep(0.2)
+            frame = build_arp_frame(sender_ip='10.9.9.9')
+            for _ in range(400):
+                sender.send(frame)
+            deadline = time.time() + 2.0
+            while not self.alerts and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            self.monitor.stop_monitoring()
+            sender.close()
+
+        self.assertEqual(self.alerts[0]['sources'], ['10.9.9.9'])
+        stats = self.monitor.get_capture_stats()
+        self.assertGreaterEqual(stats['frames_received'], 400)
+        self.assertLess(stats['batches_delivered'], 400)
+        self.assertEqual(statuses, [True])
+        self.assertFalse(self.monitor.is_monitoring())
+
+    def test_many_batches(self):
+        """Test that repeated batches update one entry per IP."""
+        ips = [f"10.0.{i // 250}.{i % 250}" for i in range(1000)]
+        for n in range(50):
+            self.monitor._process_frames(frames_from(ips * 2, start=n * 0.1, step=0.00005))
+        self.assertEqual(len(self.monitor._cache), 1000)
+        self.assertTrue(all(self.monitor._cache.get(ip)['count'] == 100 for ip in ips))
+        self.assertAlmostEqual(self.monitor._cache.get('10.0.3.249')['last_seen'], 49 * 0.1 + 1999 * 0.00005)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import os
+import queue
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from app.utils.arp_sweep import ArpSweeper, build_request_template, parse_reply, mac_to_bytes
+from app.utils.hostname_resolver import HostnameResolver
+
+SRC_MAC = "02:00:00:00:00:01"
+SRC_IP = "10.0.0.1"
+
+
+def reply_frame(ip, mac):
+    """Build an ARP reply from ip/mac to the sweeping interface."""
+    return (mac_to_bytes(SRC_MAC) + mac_to_bytes(mac) + b"\x08\x06"
+            + b"\x00\x01\x08\x00\x06\x04\x00\x02" + mac_to_bytes(mac) + socket.inet_aton(ip)
+            + mac_to_bytes(SRC_MAC) + socket.inet_aton(SRC_IP))
+
+
+class FakeNetwork:
+    """Frame socket where some addresses answer ARP requests."""
+
+    def __init__(self, hosts, delay=0.0):
+        self.hosts = hosts  # ip -> mac
+        self.delay = delay
+        self.frames = queue.Queue()
+        self.sent = []
+        self.closed = False
+
+    def __call__(self, interface):
+        return self
+
+    def send(self, frame):
+        frame = bytes(frame)
+        self.sent.append(frame)
+        ip = socket.inet_ntoa(frame[38:42])
+        # Our own requests are seen by the receiver too
+        self.frames.put((0, frame))
+        if ip in self.hosts:
+            self.frames.put((time.perf_counter() + self.delay, reply_frame(ip, self.hosts[ip])))
+
+    def recv(self):
+        try:
+            due, frame = self.frames.get(timeout=0.05)
+        except queue.Empty:
+            return None
+        wait = due - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        return frame
+
+    def close(self):
+        self.closed = True
+
+
+class TestArpSweep(unittest.TestCase):
+    """Test cases for the raw-socket ARP sweep."""
+
+    def test_request_template(self):
+        """Test that requests are broadcast ARP who-has frames."""
+        frame = build_request_template(SRC_MAC, SRC_IP)
+        self.assertEqual(len(frame), 42)
+        self.assertEqual(frame[:6], b"\xff" * 6)
+        self.assertEqual(frame[12:14], b"\x08\x06")
+        self.assertEqual(frame[20:22], b"\x00\x01")
+        self.assertEqual(frame[28:32], socket.inet_aton(SRC_IP))
+        self.assertIsNone(parse_reply(bytes(frame)))
+        self.assertEqual(parse_reply(reply_frame("10.0.0.7", "aa:bb:cc:dd:ee:ff")),
+                         (socket.inet_aton("10.0.0.7"), "aa:bb:cc:dd:ee:ff"))
+
+    def test_sweep_streams_replies(self):
+        """Test that replies are matched to targets and reported as they arrive."""
+        network = FakeNetwork({"10.0.0.7": "aa:bb:cc:dd:ee:07", "10.0.0.9": "aa:bb:cc:dd:ee:09",
+                               "10.0.9.9": "aa:bb:cc:dd:ee:99"})
+        sweeper = ArpSweeper("eth0", SRC_MAC, SRC_IP, rate=100000, timeout=0.2, socket_factory=network)
+        streamed = []
+        targets = [f"10.0.0.{i}" for i in range(2, 255)]
+        replies = sweeper.sweep(targets + ["10.0.0.7"], on_reply=lambda ip, mac: streamed.append(ip))
+
+        self.assertEqual(replies, {"10.0.0.7": "aa:bb:cc:dd:ee:07", "10.0.0.9": "aa:bb:cc:dd:ee:09"})
+        self.assertEqual(sorted(streamed), ["10.0.0.7", "10.0.0.9"])
+        self.assertEqual(len(network.sent), 253)
+        self.assertEqual(network.sent[5][38:42], socket.inet_aton("10.0.0.7"))
+        self.assertTrue(network.closed)
+        self.assertEqual(sweeper.stats['replies'], 2)
+
+    def test_full_sweep_waits_one_timeout(self):
+        """Test that a /16 sweep waits one reply window, not one per target."""
+        hosts = {f"10.1.{i}.1": "aa:bb:cc:dd:ee:01" for i in range(0, 256, 16)}
+        network = FakeNetwork(hosts, delay=0.1)
+        sweeper = ArpSweeper("eth0", SRC_MAC, SRC_IP, rate=1000000, timeout=0.3, socket_factory=network)
+        targets = [f"10.1.{i >> 8}.{i & 255}" for i in range(1, 65535)]
+        with patch.object(sweeper._stop, 'wait', wraps=sweeper._stop.wait) as wait:
+            replies = sweeper.sweep(targets)
+
+        self.assertEqual(set(replies), set(hosts))
+        wait.assert_called_once_with(0.3)
+        self.assertEqual((sweeper.stats['targets'], sweeper.stats['sent'], sweeper.stats['replies']),
+                         (65534, 65534, len(hosts)))
+
+    def test_send_rate(self):
+        """Test that requests are paced to the configured rate."""
+        network = FakeNetwork({})
+        sweeper = ArpSweeper("eth0", SRC_MAC, SRC_IP, rate=2000, timeout=0.0, socket_factory=network)
+        sweeper.sweep([f"10.0.{i >> 8}.{i & 255}" for i in range(640)])
+        self.assertGreaterEqual(sweeper.stats['send_time'], 0.3)
+
+    def test_stop(self):
+        """Test that a sweep can be stopped from another thread."""
+        network = FakeNetwork({})
+        sweeper = ArpSweeper("eth0", SRC_MAC, SRC_IP, rate=1000, timeout=5.0, socket_factory=network)
+        threading.Timer(0.2, sweeper.stop).start()
+        sweeper.sweep([f"10.0.{i >> 8}.{i & 255}" for i in range(5000)])
+        self.assertLess(sweeper.stats['sent'], 5000)
+
+
+class TestHostnameResolver(unittest.TestCase):
+    """Test cases for background reverse DNS with a persistent cache."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, 'hostnames.json')
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.temp_dir.cleanup()
+
+    @patch('app.utils.hostname_resolver.socket.gethostbyaddr')
+    def test_cache_persists(self, mock_lookup):
+        """Test that answers are cached, shared and saved between runs."""
+        started = threading.Event()
+
+        def lookup(ip):
+            started.wait(1.0)
+            if ip == "10.0.0.2":
+                raise socket.herror("not found")
+            return ("host-" + ip, [], [ip])
+
+        mock_lookup.side_effect = lookup
+        resolver = HostnameResolver(self.cache_path, max_workers=2)
+        results = []
+        first = resolver.resolve_async("10.0.0.1", lambda ip, name: results.append(name))
+        second = resolver.resolve_async("10.0.0.1")
+        self.assertIs(first, second)
+        started.set()
+
+        self.assertEqual(first.result(1.0), "host-10.0.0.1")
+        self.assertIsNone(resolver.resolve("10.0.0.2", 1.0))
+        self.assertEqual(results, ["host-10.0.0.1"])
+        self.assertEqual(mock_lookup.call_count, 2)
+        resolver.shutdown()
+
+        # A new resolver answers from the saved cache
+        mock_lookup.reset_mock()
+        resolver = HostnameResolver(self.cache_path)
+        self.assertEqual(resolver.get_cached("10.0.0.1"), (True, "host-10.0.0.1"))
+        self.assertEqual(resolver.get_cached("10.0.0.2"), (True, None))
+        self.assertEqual(resolver.resolve("10.0.0.1"), "host-10.0.0.1")
+        mock_lookup.assert_not_called()
+        resolver.shutdown()
+
+    @patch('app.utils.hostname_resolver.socket.gethostbyaddr')
+    def test_expired_entries(self, mock_lookup):
+        """Test that expired answers are looked up again."""
+        mock_lookup.return_value = ("fresh", [], [])
+        resolver = HostnameResolver(self.cache_path, negative_ttl=0.0)
+        resolver._cache["10.0.0.3"] = (None, time.time() - 1)
+        self.assertEqual(resolver.get_cached("10.0.0.3"), (False, None))
+        self.assertEqual(resolver.resolve("10.0.0.3", 1.0), "fresh")
+        resolver.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
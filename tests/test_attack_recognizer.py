@@ -0,0 +1,190 @@
+import sys
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from PyQt5.QtWidgets import QApplication
+from scapy.all import IP, TCP, Ether
+
+from app.components.attack_recognizer import (
+    AttackRecognizer, DDoSPattern, PortScanPattern, SlidingWindow, tcp_flags
+)
+from app.components.attack_view import AttackView
+from app.components.packet_view import PacketView
+
+BASE = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def syn(src_ip, dst_port, seconds, dst_ip="192.168.1.10", packet_id=None):
+    return {
+        'id': packet_id,
+        'timestamp': BASE + timedelta(seconds=seconds),
+        'protocol': 'TCP',
+        'flags': 'SYN',
+        'src_ip': src_ip,
+        'dst_ip': dst_ip,
+        'dst_port': dst_port
+    }
+
+
+class TestStreamingPatterns(unittest.TestCase):
+    """Test cases for incremental pattern detection."""
+
+    def test_update_detects_on_threshold_packet(self):
+        """Test that a port scan is reported by the packet that completes it."""
+        pattern = PortScanPattern()
+        results = [pattern.update(syn("10.0.0.5", 1000 + i, i * 0.1, packet_id=i)) for i in range(15)]
+
+        self.assertEqual([i for i, result in enumerate(results) if result], [9])
+        self.assertEqual(results[9]['most_active']['src_ip'], "10.0.0.5")
+        self.assertEqual(results[9]['most_active']['unique_port_count'], 10)
+
+    def test_analyze_matches_stream(self):
+        """Test that batch analysis leaves the live window untouched."""
+        pattern = PortScanPattern()
+        packets = [syn("10.0.0.5", 1000 + i, i) for i in range(12)]
+
+        result = pattern.analyze(packets)
+        self.assertEqual(result['scanners'][0]['unique_port_count'], 12)
+        self.assertEqual(result['scanners'][0]['packet_count'], 12)
+        self.assertEqual(len(pattern.state), 0)
+
+    def test_expiry(self):
+        """Test that events leave the window and counters follow."""
+        window = SlidingWindow(window=10)
+        window.add('a', 0.0, 1, (('src', 'x'),))
+        window.add('a', 5.0, 2, (('src', 'y'),))
+        window.add('b', 12.0, 3, ())
+
+        self.assertEqual(window.expire(), [])
+        self.assertEqual(window.get('a').values('src'), ['y'])
+        window.add('b', 16.0, 4, ())
+        self.assertEqual(window.expire(), ['a'])
+        self.assertEqual(len(window), 1)
+
+    def test_old_traffic_does_not_count(self):
+        """Test that probes older than the window do not add up to a scan."""
+        pattern = PortScanPattern()
+        pattern.window = 30
+        pattern.reset()
+        for i in range(9):
+            pattern.update(syn("10.0.0.5", 1000 + i, i * 10))
+        self.assertEqual(pattern.state.get("10.0.0.5").unique('port'), 4)
+
+    def test_cooldown(self):
+        """Test that an ongoing attack is reported once per cooldown."""
+        pattern = DDoSPattern()
+        pattern.cooldown = 2
+        results = []
+        for i in range(600):
+            packet = {'timestamp': BASE + timedelta(seconds=i * 0.005), 'protocol': 'UDP',
+                      'src_ip': f"10.0.0.{i % 4}", 'dst_ip': "192.168.1.1", 'src_port': 53}
+            results.append(pattern.update(packet))
+
+        detections = [i for i, result in enumerate(results) if result]
+        self.assertEqual(detections, [99, 499])
+        self.assertEqual(results[99]['targets'][0]['unique_sources'], 4)
+
+        stats = pattern.get_stats()
+        self.assertEqual(stats['packets_processed'], 600)
+        self.assertEqual(stats['detections'], 2)
+        self.assertGreater(stats['cpu_time'], 0)
+
+
+class TestAttackRecognizerStream(unittest.TestCase):
+    """Test cases for the live packet stream."""
+
+    def setUp(self):
+        """Create a recognizer."""
+        self.recognizer = AttackRecognizer()
+        self.callback = MagicMock()
+
+    def tearDown(self):
+        """Stop detection if a test left it running."""
+        if self.recognizer.running:
+            self.recognizer.stop_detection()
+
+    def test_detection_from_subscribed_source(self):
+        """Test that packets published by a source are detected within a second."""
+        source = MagicMock()
+        self.recognizer.start_detection(callback=self.callback, packet_source=source)
+        listener = source.add_packet_listener.call_args[0][0]
+
+        now = datetime.now()
+        for i in range(12):
+            listener({'timestamp': now, 'protocol': 'TCP', 'flags': 'SYN', 'src_ip': "10.0.0.9",
+                      'dst_ip': "192.168.1.10", 'dst_port': 20 + i})
+
+        deadline = time.monotonic() + 1.0
+        while not self.callback.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.callback.assert_called_once()
+        success, message, details = self.callback.call_args[0]
+        self.assertTrue(success)
+        self.assertIn("10.0.0.9", message)
+        self.assertEqual(details['type'], 'port_scanning')
+
+        self.recognizer.stop_detection()
+        source.remove_packet_listener.assert_called_once_with(listener)
+        self.assertFalse(self.recognizer.process_packet({}))
+
+        stats = {s['name']: s for s in self.recognizer.get_detector_stats()}
+        self.assertEqual(stats['Port Scanning']['packets_processed'], 12)
+
+
+class TestLivePackets(unittest.TestCase):
+    """Test cases for packets flowing from the packets tab to the attacks tab."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        """Wire the views the way MainWindow.create_attacks_tab does."""
+        self.packet_view = PacketView()
+        self.analyzer = self.packet_view.analyzer
+        self.attack_view = AttackView(packet_source=self.analyzer)
+
+    def tearDown(self):
+        """Stop detection and the analyzer's memory monitor."""
+        if self.attack_view.recognizer.running:
+            self.attack_view.toggle_detection()
+        self.analyzer.memory_manager.stop_monitoring()
+        self.attack_view.deleteLater()
+        self.packet_view.deleteLater()
+
+    def test_tcp_flag_forms(self):
+        """Test that flag names and PacketAnalyzer's letters read the same."""
+        self.assertEqual(tcp_flags({'flags': 'SA'}), {'SYN', 'ACK'})
+        self.assertEqual(tcp_flags({'flags': 'SYN, ACK'}), {'SYN', 'ACK'})
+        self.assertEqual(tcp_flags({'flags': 'S'}), {'SYN'})
+        self.assertEqual(tcp_flags({}), set())
+
+    def test_captured_scan_reaches_attack_table(self):
+        """Test that a scan captured by the analyzer shows up in the attacks tab."""
+        self.attack_view.toggle_detection()
+        self.assertIs(self.analyzer.packet_listeners[0].__self__, self.attack_view.recognizer)
+
+        for port in range(20, 32):
+            packet = Ether() / IP(src="10.0.0.9", dst="192.168.1.10") / TCP(dport=port, flags="S")
+            self.analyzer._process_packet(Ether(bytes(packet)))
+        self.analyzer._process_packet_buffer()
+
+        deadline = time.monotonic() + 2.0
+        while not self.attack_view.attack_table.rowCount() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.01)
+
+        self.assertEqual(self.attack_view.attack_table.rowCount(), 1)
+        attack = self.attack_view.get_detected_attacks()[0]
+        self.assertEqual(attack['type'], 'port_scanning')
+        self.assertEqual(attack['most_active']['src_ip'], "10.0.0.9")
+
+        self.attack_view.toggle_detection()
+        self.assertEqual(self.analyzer.packet_listeners, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
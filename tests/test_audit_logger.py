@@ -0,0 +1,148 @@
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from app.components.audit_logger import AuditEventType, AuditLogger
+from app.utils.audit_store import INDEX_SUFFIX, AuditStore
+
+EVENT_TYPES = list(AuditEventType)
+
+
+def make_events(count, start, step=timedelta(minutes=1), rng=random):
+    return [{
+        'type': rng.choice(EVENT_TYPES).value,
+        'username': f"user{rng.randint(0, 9)}",
+        'details': {'n': n},
+        'site_id': rng.choice([None, "site-a", "site-b"]),
+        'timestamp': (start + step * n).isoformat()
+    } for n in range(count)]
+
+
+class TestAuditLogger(unittest.TestCase):
+    """Test cases for the segmented, indexed audit log."""
+
+    def setUp(self):
+        """Create a log directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.audit = AuditLogger(self.temp_dir, flush_interval=0.05)
+        self.rng = random.Random(5)
+
+    def tearDown(self):
+        """Close the logger and remove its files."""
+        self.audit.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def expected(self, events, start_time=None, end_time=None, event_type=None, username=None, site_id=None):
+        return [e for e in events
+                if (start_time is None or datetime.fromisoformat(e['timestamp']) >= start_time)
+                and (end_time is None or datetime.fromisoformat(e['timestamp']) <= end_time)
+                and (event_type is None or e['type'] == event_type.value)
+                and (username is None or e['username'] == username)
+                and (site_id is None or e['site_id'] == site_id)]
+
+    def test_log_and_query(self):
+        """Test that logged events are buffered, written and found."""
+        self.audit.log_event(AuditEventType.LOGIN, "admin", site_id="site-a")
+        self.audit.log_event(AuditEventType.CONFIG_CHANGED, "operator", {"key": "value"})
+
+        # Queries see buffered events
+        events = self.audit.get_events(username="admin")
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['type'], "login")
+        self.assertEqual(self.audit.get_events(event_type="config_changed")[0]['details'], {"key": "value"})
+
+        # The periodic flush writes the file and its index
+        time.sleep(0.2)
+        self.assertTrue(self.audit.current_log.exists())
+        self.assertTrue(os.path.exists(str(self.audit.current_log) + INDEX_SUFFIX))
+
+    def test_queries_across_month_end(self):
+        """Test time ranges spanning months against a linear filter."""
+        events = make_events(5000, datetime(2024, 1, 29), rng=self.rng)
+        for event in events:
+            self.audit._write_log(dict(event))
+        self.audit.flush()
+        self.assertEqual(len(self.audit.store.segments()), 4)
+
+        queries = [
+            {},
+            {'start_time': datetime(2024, 1, 30, 23, 59, 30), 'end_time': datetime(2024, 2, 1, 0, 30)},
+            {'start_time': datetime(2024, 1, 31, 12, 0), 'username': "user3"},
+            {'end_time': datetime(2024, 1, 29, 5, 0, 0), 'event_type': AuditEventType.LOGIN},
+            {'site_id': "site-b", 'event_type': AuditEventType.THREAT_DETECTED},
+            {'username': "nobody"},
+            {'start_time': datetime(2024, 3, 1)},
+        ]
+        for query in queries:
+            self.assertEqual(self.audit.get_events(**query), self.expected(events, **query), query)
+
+    def test_index_rebuilt_from_segments(self):
+        """Test that missing or stale indexes are caught up from the files."""
+        events = make_events(300, datetime(2024, 5, 1), rng=self.rng)
+        for event in events[:200]:
+            self.audit._write_log(dict(event))
+        self.audit.close()
+        for filename in os.listdir(self.temp_dir):
+            if filename.endswith(INDEX_SUFFIX):
+                os.remove(os.path.join(self.temp_dir, filename))
+
+        # Lines appended by another writer, and one cut short
+        path = os.path.join(self.temp_dir, "audit_2024-05-01.log")
+        with open(path, 'a') as f:
+            for event in events[200:]:
+                f.write(json.dumps(event) + '\n')
+            f.write('{"type": "lo')
+
+        store = AuditStore(self.temp_dir)
+        query = {'start_time': datetime(2024, 5, 1, 3), 'username': "user1"}
+        found = store.query(query['start_time'], username="user1")
+        self.assertEqual(found, self.expected(events, **query))
+        store.close()
+
+        # Out-of-order timestamps fall back to checking every event
+        self.audit = AuditLogger(self.temp_dir)
+        late = dict(events[0], timestamp=datetime(2024, 5, 1, 0, 0, 30).isoformat(), username="late")
+        with open(path, 'a') as f:
+            f.write('\n' + json.dumps(late) + '\n')
+        self.assertEqual(self.audit.get_events(start_time=datetime(2024, 5, 1, 0, 0, 15),
+                                               end_time=datetime(2024, 5, 1, 0, 0, 45)), [late])
+
+    def test_clear_events(self):
+        """Test that whole days before a date are deleted."""
+        for event in make_events(300, datetime(2024, 6, 1), step=timedelta(hours=1), rng=self.rng):
+            self.audit._write_log(event)
+        self.audit.clear_events(before=datetime(2024, 6, 10, 12))
+        days = self.audit.store.segments()
+        self.assertEqual(days[0].isoformat(), "2024-06-10")
+        self.assertFalse(any(name.startswith("audit_2024-06-09") for name in os.listdir(self.temp_dir)))
+        self.audit.clear_events()
+        self.assertEqual(self.audit.get_events(), [])
+
+    def test_month_queries(self):
+        """Test narrow queries over a reopened month of audit history."""
+        events = make_events(43200, datetime(2024, 7, 1), rng=self.rng)
+        for event in events:
+            self.audit._write_log(event)
+        self.audit.close()
+        audit = AuditLogger(self.temp_dir)
+
+        hour = audit.get_events(datetime(2024, 7, 15, 10), datetime(2024, 7, 15, 11))
+        missing = audit.get_events(username="nobody")
+        query = dict(start_time=datetime(2024, 7, 10), end_time=datetime(2024, 7, 12),
+                     username="user4", site_id="site-a")
+        user = audit.get_events(**query)
+        audit.close()
+
+        self.assertEqual(len(hour), 61)
+        self.assertEqual(missing, [])
+        self.assertTrue(user)
+        self.assertEqual(user, self.expected(events, **query))
+
+
+if __name__ == '__main__':
+    unittest.main()
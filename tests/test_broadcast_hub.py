@@ -0,0 +1,146 @@
+import asyncio
+import json
+import threading
+import unittest
+
+from app.utils.broadcast_hub import BroadcastHub, SLOW_CONSUMER_CLOSE_CODE, diff_items
+from app.components.network_topology import NetworkTopologyWebSocketHandler
+
+
+class FakeWebSocket:
+    """Websocket that records what is sent, optionally blocking on send."""
+
+    def __init__(self, blocked=False):
+        self.messages = []
+        self.closed_with = None
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def send_text(self, text):
+        await self.unblocked.wait()
+        self.messages.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+async def settle():
+    """Let sender tasks drain their queues."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestBroadcastHub(unittest.TestCase):
+    """Test cases for the websocket broadcast hub."""
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_diff_items(self):
+        """Test that diffs list added, changed and removed items."""
+        previous = {"a": {"id": "a", "ip": "1"}, "b": {"id": "b"}, "c": {"id": "c"}}
+        current = {"a": {"id": "a", "ip": "2"}, "c": {"id": "c"}, "d": {"id": "d"}}
+        diff = diff_items(previous, current, ["a", "b", "c", "d", "e"])
+        self.assertEqual(diff, {"added": [{"id": "d"}], "changed": [{"id": "a", "ip": "2"}],
+                                "removed": ["b"]})
+
+    def test_topics_and_snapshots(self):
+        """Test that clients get a snapshot and then only their topics."""
+        async def scenario():
+            hub = BroadcastHub()
+            hub.register_topic("stats", lambda: (3, {"cpu": 1}))
+            stats_socket, alerts_socket = FakeWebSocket(), FakeWebSocket()
+            stats_client = await hub.connect(stats_socket, ["stats"])
+            await hub.connect(alerts_socket, ["alerts"])
+
+            hub.publish("stats", {"version": 3}, version=3)  # Already in the snapshot
+            hub.publish("stats", {"version": 4}, version=4)
+            hub.publish("alerts", {"alert": 1})
+            # Publishing from another thread is handed to the loop
+            thread = threading.Thread(target=hub.publish, args=("alerts", {"alert": 2}))
+            thread.start()
+            thread.join()
+            await settle()
+
+            self.assertEqual(stats_socket.messages[0]["type"], "snapshot")
+            self.assertEqual(stats_socket.messages[0]["data"], {"cpu": 1})
+            self.assertEqual(stats_socket.messages[1:], [{"version": 4}])
+            self.assertEqual(alerts_socket.messages, [{"alert": 1}, {"alert": 2}])
+
+            hub.unsubscribe(stats_client, "stats")
+            hub.publish("stats", {"version": 5}, version=5)
+            await settle()
+            self.assertEqual(len(stats_socket.messages), 2)
+            await hub.close()
+            self.assertEqual(hub.client_count, 0)
+
+        self.run_async(scenario())
+
+    def test_slow_consumer_is_dropped(self):
+        """Test that a client that stops reading is dropped, not waited for."""
+        async def scenario():
+            hub = BroadcastHub(max_queue=4)
+            slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+            await hub.connect(slow, ["stats"])
+            await hub.connect(fast, ["stats"])
+            for i in range(20):
+                hub.publish("stats", {"n": i})
+                await settle()
+
+            self.assertEqual([m["n"] for m in fast.messages], list(range(20)))
+            self.assertEqual(slow.closed_with, SLOW_CONSUMER_CLOSE_CODE)
+            self.assertEqual(hub.stats['clients_dropped'], 1)
+            self.assertEqual(hub.client_count, 1)
+            await hub.close()
+
+        self.run_async(scenario())
+
+
+class TestTopologyStream(unittest.TestCase):
+    """Test cases for versioned topology diffs."""
+
+    def test_snapshot_then_diffs(self):
+        """Test that subscribers get a snapshot and then versioned diffs."""
+        async def scenario():
+            hub = BroadcastHub()
+            handler = NetworkTopologyWebSocketHandler(hub)
+            handler.update_topology(
+                [{"id": "1", "ip": "10.0.0.1"}, {"id": "2", "ip": "10.0.0.2"}],
+                [{"id": "1-2", "source": "1", "target": "2"}]
+            )
+            socket = FakeWebSocket()
+            await hub.connect(socket, ["topology"])
+
+            handler.add_device({"id": "3", "ip": "10.0.0.3"})
+            handler.update_device("1", {"ip": "10.0.0.9"})
+            handler.update_device("2", {"ip": "10.0.0.2"})  # No change
+            self.assertEqual(handler.flush(), 2)
+            handler.remove_device("2")
+            self.assertEqual(handler.flush(), 3)
+            self.assertEqual(handler.flush(), 3)  # Nothing changed
+            await settle()
+
+            snapshot, first, second = socket.messages
+            self.assertEqual(snapshot["version"], 1)
+            self.assertEqual(len(snapshot["data"]["devices"]), 2)
+            self.assertEqual(first["base_version"], 1)
+            self.assertEqual(first["devices"]["added"], [{"id": "3", "ip": "10.0.0.3"}])
+            self.assertEqual(first["devices"]["changed"], [{"id": "1", "ip": "10.0.0.9"}])
+            self.assertEqual(second["version"], 3)
+            self.assertEqual(second["devices"]["removed"], ["2"])
+            self.assertEqual(second["connections"]["removed"], ["1-2"])
+
+            # A late subscriber starts from the current version
+            late = FakeWebSocket()
+            await hub.connect(late, ["topology"])
+            await settle()
+            self.assertEqual(late.messages[0]["version"], 3)
+            self.assertEqual(sorted(d["id"] for d in late.messages[0]["data"]["devices"]), ["1", "3"])
+            await hub.close()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
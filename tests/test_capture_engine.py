@@ -0,0 +1,116 @@
+import unittest
+import socket
+import struct
+import threading
+import time
+from unittest import mock
+from src.core.capture_engine import (
+    ARPFrameView, RingCaptureEngine, ScapyCaptureEngine, build_arp_filter, create_capture_engine,
+    open_capture_engine
+)
+
+
+def build_arp_frame(op=2, sender_mac='00:11:22:33:44:55', sender_ip='192.168.1.1',
+                    target_mac='00:00:00:00:00:00', target_ip='192.168.1.2'):
+    """Build a raw Ethernet/ARP frame."""
+    eth_header = struct.pack('!6s6sH', b'\xff' * 6, bytes.fromhex(sender_mac.replace(':', '')), 0x0806)
+    arp_packet = struct.pack('!HHBBH6s4s6s4s',
+                             1, 0x0800, 6, 4, op,
+                             bytes.fromhex(sender_mac.replace(':', '')),
+                             socket.inet_aton(sender_ip),
+                             bytes.fromhex(target_mac.replace(':', '')),
+                             socket.inet_aton(target_ip))
+    return eth_header + arp_packet
+
+
+class TestCaptureEngine(unittest.TestCase):
+    """Test cases for capture engines."""
+
+    def test_frame_view_decode(self):
+        """Test decoding a raw ARP frame into a view."""
+        frame = memoryview(build_arp_frame())
+        view = ARPFrameView.from_frame(frame, 12.5)
+
+        self.assertIsNotNone(view)
+        self.assertEqual(view.op, 2)
+        self.assertEqual(view.hwsrc, '00:11:22:33:44:55')
+        self.assertEqual(view.psrc, '192.168.1.1')
+        self.assertEqual(view.hwdst, '00:00:00:00:00:00')
+        self.assertEqual(view.pdst, '192.168.1.2')
+        self.assertEqual(view.eth_dst, 'ff:ff:ff:ff:ff:ff')
+        self.assertEqual(view.timestamp, 12.5)
+
+    def test_frame_view_rejects_non_arp(self):
+        """Test that non-ARP and truncated frames are rejected."""
+        ipv4_frame = b'\xff' * 12 + b'\x08\x00' + b'\x00' * 40
+        self.assertIsNone(ARPFrameView.from_frame(ipv4_frame))
+        self.assertIsNone(ARPFrameView.from_frame(build_arp_frame()[:30]))
+
+    def test_arp_filter_program(self):
+        """Test the BPF program layout."""
+        program = build_arp_filter(64)
+        self.assertEqual(len(program), 4 * 8)
+        self.assertEqual(struct.unpack_from('=HBBI', program, 8)[3], 0x0806)
+        self.assertEqual(struct.unpack_from('=HBBI', program, 16)[3], 64)
+
+    def test_create_capture_engine(self):
+        """Test engine selection by name."""
+        self.assertIsInstance(create_capture_engine('scapy'), ScapyCaptureEngine)
+        self.assertIsInstance(create_capture_engine('ring', block_count=4), RingCaptureEngine)
+        with self.assertRaises(ValueError):
+            create_capture_engine('pcap')
+
+    def test_open_falls_back_to_scapy(self):
+        """Test that auto falls back to scapy when the ring needs root."""
+        denied = PermissionError(1, "Operation not permitted")
+        with mock.patch.object(RingCaptureEngine, "is_supported", return_value=True), \
+                mock.patch.object(RingCaptureEngine, "start", side_effect=denied), \
+                mock.patch.object(ScapyCaptureEngine, "start") as scapy_start:
+            engine = open_capture_engine("auto", interface="lo", promisc=False)
+            self.assertIsInstance(engine, ScapyCaptureEngine)
+            self.assertFalse(engine.promisc)
+            scapy_start.assert_called_once()
+
+            # An explicitly chosen ring engine says why it failed instead
+            with self.assertRaisesRegex(PermissionError, "root or CAP_NET_RAW"):
+                open_capture_engine("ring", interface="lo")
+
+    @unittest.skipUnless(RingCaptureEngine.is_supported(), "AF_PACKET not available")
+    def test_ring_capture_loopback(self):
+        """Test capturing ARP frames from the ring on the loopback interface."""
+        engine = RingCaptureEngine(interface='lo', block_size=1 << 14, block_count=4, block_timeout_ms=10)
+        try:
+            engine.start()
+            sender = socket.socket(socket.AF_PACKET, socket.SOCK_RAW)
+            sender.bind(('lo', 0))
+        except PermissionError:
+            self.skipTest("raw sockets require CAP_NET_RAW")
+
+        received = []
+        stop_event = threading.Event()
+
+        def on_frames(frames):
+            for timestamp, frame in frames:
+                received.append(ARPFrameView.from_frame(frame, timestamp))
+
+        thread = threading.Thread(target=engine.capture, args=(on_frames, stop_event))
+        thread.start()
+        try:
+            sender.send(b'\xff' * 12 + b'\x08\x00' + b'\x00' * 40)
+            for _ in range(10):
+                sender.send(build_arp_frame(sender_ip='10.0.0.1'))
+            deadline = time.time() + 2.0
+            while not received and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            stop_event.set()
+            thread.join(timeout=2.0)
+            sender.close()
+            engine.stop()
+
+        self.assertTrue(received)
+        self.assertTrue(all(view is not None and view.psrc == '10.0.0.1' for view in received))
+
+
+if __name__ == '__main__':
+    unittest.main()
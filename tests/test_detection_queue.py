@@ -0,0 +1,95 @@
+import unittest
+import queue
+import threading
+import time
+from src.core.detection_module import PriorityQueue, PRIORITY_HIGH, PRIORITY_MEDIUM, PRIORITY_LOW
+
+
+class TestDetectionPriorityQueue(unittest.TestCase):
+    """Test cases for the detection module's multi-level work queue."""
+
+    def test_fifo_within_level(self):
+        """Test that items of one level come out in insertion order."""
+        work_queue = PriorityQueue(maxsize=10)
+        for i in range(5):
+            work_queue.put(i, priority=PRIORITY_MEDIUM)
+
+        self.assertEqual([work_queue.get(block=False) for _ in range(5)],
+                         [(i, PRIORITY_MEDIUM) for i in range(5)])
+
+    def test_weighted_round_robin(self):
+        """Test that dequeue shares follow the configured ratios."""
+        work_queue = PriorityQueue(maxsize=3000, priority_ratios=[0.8, 0.4, 0.2])
+        for level in (PRIORITY_HIGH, PRIORITY_MEDIUM, PRIORITY_LOW):
+            for i in range(1000):
+                work_queue.put(i, priority=level)
+
+        counts = {PRIORITY_HIGH: 0, PRIORITY_MEDIUM: 0, PRIORITY_LOW: 0}
+        for _, priority in work_queue.get_many(700):
+            counts[priority] += 1
+
+        self.assertEqual(counts, {PRIORITY_HIGH: 400, PRIORITY_MEDIUM: 200, PRIORITY_LOW: 100})
+
+    def test_low_priority_not_starved(self):
+        """Test that low priority items are served while high priority is busy."""
+        work_queue = PriorityQueue(maxsize=100, priority_ratios=[0.8, 0.5, 0.2])
+        for i in range(50):
+            work_queue.put(i, priority=PRIORITY_HIGH)
+        work_queue.put('low', priority=PRIORITY_LOW)
+
+        priorities = [priority for _, priority in work_queue.get_many(10)]
+        self.assertIn(PRIORITY_LOW, priorities)
+
+    def test_full_and_empty(self):
+        """Test queue.Queue compatible full/empty behaviour."""
+        work_queue = PriorityQueue(maxsize=2)
+        self.assertTrue(work_queue.empty())
+        work_queue.put('a')
+        work_queue.put('b', priority=PRIORITY_HIGH)
+        self.assertTrue(work_queue.full())
+        with self.assertRaises(queue.Full):
+            work_queue.put('c')
+
+        while not work_queue.empty():
+            work_queue.get(block=False)
+            work_queue.task_done()
+
+        with self.assertRaises(queue.Empty):
+            work_queue.get(block=False)
+        with self.assertRaises(queue.Empty):
+            work_queue.get_many(5, timeout=0.01)
+
+    def test_blocking_get(self):
+        """Test that a blocked consumer wakes up when an item arrives."""
+        work_queue = PriorityQueue(maxsize=10)
+        results = []
+
+        consumer = threading.Thread(target=lambda: results.append(work_queue.get(timeout=2.0)))
+        consumer.start()
+        time.sleep(0.05)
+        work_queue.put('packet', priority=PRIORITY_HIGH)
+        consumer.join(timeout=2.0)
+
+        self.assertEqual(results, [('packet', PRIORITY_HIGH)])
+
+    def test_stats(self):
+        """Test per-level depth and wait-time metrics."""
+        work_queue = PriorityQueue(maxsize=1)
+        work_queue.put('a', priority=PRIORITY_HIGH)
+        with self.assertRaises(queue.Full):
+            work_queue.put('b', priority=PRIORITY_LOW)
+
+        stats = work_queue.get_stats()
+        self.assertEqual(stats['total_size'], 1)
+        self.assertEqual(stats['high_priority'], 1)
+        self.assertEqual(stats['levels']['low']['rejected'], 1)
+
+        work_queue.get()
+        stats = work_queue.get_stats()
+        self.assertEqual(stats['levels']['high']['dequeued'], 1)
+        self.assertEqual(stats['levels']['high']['depth'], 0)
+        self.assertGreaterEqual(stats['levels']['high']['max_wait_ms'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
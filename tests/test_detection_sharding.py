@@ -0,0 +1,145 @@
+import unittest
+import tempfile
+import shutil
+import time
+from src.core.arp_batch import ARPFrameView
+from src.core.detection_module import DetectionModule, DetectionModuleConfig
+from tests.test_capture_engine import build_arp_frame
+
+
+def make_view(op=1, sender_mac='00:11:22:33:44:55', sender_ip='10.0.0.1', target_ip='10.0.0.254'):
+    """Build an ARPFrameView for the given fields."""
+    frame = build_arp_frame(op=op, sender_mac=sender_mac, sender_ip=sender_ip,
+                            target_mac='00:00:00:00:00:00' if op == 1 else '66:77:88:99:aa:bb',
+                            target_ip=target_ip)
+    return ARPFrameView.from_frame(frame, 0.0)
+
+
+class TestDetectionSharding(unittest.TestCase):
+    """Test cases for the detection module's per-worker ARP state shards."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.storage_path = tempfile.mkdtemp()
+        self.config = DetectionModuleConfig(storage_path=self.storage_path, worker_threads=4,
+                                            max_packet_cache=100000, detection_threshold=2)
+        self.module = DetectionModule(self.config)
+        self.module.gateway_info = {"ip": "10.0.0.254", "mac": "66:77:88:99:aa:bb"}
+        self.module._gateway_info_loaded = True
+        # Worker threads are capped at the CPU count; force several shards
+        self.module.config.worker_threads = 4
+        self.module._build_shards(4)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        if self.module.running:
+            self.module.stop()
+        shutil.rmtree(self.storage_path, ignore_errors=True)
+
+    def _process_directly(self, packet):
+        """Run a packet through its owning shard on the calling thread."""
+        shard = self.module._get_shard(packet.psrc)
+        if self.module._is_fast_path_eligible(packet, shard):
+            return None
+        result = self.module._analyze_packet(packet, 1, 0.0, shard)
+        return self.module._record_suspicious(result, shard) if result else None
+
+    def test_shard_routing(self):
+        """Test that packets are queued on the shard owning their sender IP."""
+        self.assertEqual(len(self.module.shards), 4)
+        self.module.running = True
+        for i in range(20):
+            self.module.process_packet(make_view(sender_ip=f'10.0.1.{i}'))
+
+        self.module.running = False
+
+        queued = 0
+        for shard in self.module.shards:
+            while not shard.work_queue.empty():
+                (packet, _), _ = shard.work_queue.get(block=False)
+                self.assertIs(self.module._get_shard(packet.psrc), shard)
+                queued += 1
+        self.assertEqual(queued, 20)
+
+    def test_merged_snapshots(self):
+        """Test that the ARP table and suspicious sources merge every shard."""
+        for i in range(16):
+            self._process_directly(make_view(sender_ip=f'10.0.2.{i}'))
+
+        arp_table = self.module.get_arp_table()
+        self.assertEqual(len(arp_table), 16)
+        self.assertGreater(sum(1 for shard in self.module.shards if shard.arp_table.snapshot()), 1)
+
+        # Snapshots are copies and do not affect worker-owned state
+        arp_table['10.0.2.0']['count'] = 1000
+        self.assertEqual(self.module.get_arp_table()['10.0.2.0']['count'], 1)
+
+        self._process_directly(make_view(sender_mac='de:ad:be:ef:00:01', sender_ip='10.0.2.3'))
+        suspicious = self.module.get_suspicious_sources()
+        self.assertEqual(list(suspicious), ['10.0.2.3'])
+        self.assertEqual(suspicious['10.0.2.3']['mac_history'], ['00:11:22:33:44:55', 'de:ad:be:ef:00:01'])
+
+    def test_pattern_recognizer_per_shard(self):
+        """Test that each shard's recognizer only sees the IPs its shard owns."""
+        recognizers = self.module.pattern_recognizers
+        self.assertEqual(len(set(map(id, recognizers))), 4)
+        for i in range(16):
+            self._process_directly(make_view(sender_ip=f'10.0.5.{i}'))
+
+        for shard in self.module.shards:
+            ips = set(shard.pattern_recognizer.ip_mac_bindings)
+            self.assertEqual(ips, set(shard.arp_table.snapshot()))
+        stats = self.module.get_stats()
+        self.assertEqual(stats['pattern_packet_count'],
+                         sum(r.packet_count for r in recognizers))
+        self.assertEqual(stats['pattern_unique_ips'], 16)
+
+    def test_alert_threshold(self):
+        """Test that alerts are raised once the detection threshold is reached."""
+        self._process_directly(make_view(sender_ip='10.0.3.1'))
+        self.assertIsNone(self._process_directly(make_view(sender_mac='de:ad:be:ef:00:01', sender_ip='10.0.3.1')))
+        alert = self._process_directly(make_view(sender_mac='de:ad:be:ef:00:02', sender_ip='10.0.3.1'))
+
+        self.assertIsNotNone(alert)
+        self.assertEqual(alert['src_ip'], '10.0.3.1')
+        self.assertEqual(alert['count'], 2)
+
+    def test_concurrent_counters(self):
+        """Test that counters stay exact when every worker processes packets at once."""
+        self.module.start()
+        hosts = 64
+        rounds = 20
+        for _ in range(rounds):
+            for i in range(hosts):
+                self.module.process_packet(make_view(sender_ip=f'10.1.{i // 256}.{i % 256}'))
+
+        # Wait for the workers to finish every packet
+        total = hosts * rounds
+        for _ in range(200):
+            stats = self.module.get_stats()
+            if stats['arp_packets_processed'] + stats['fast_path_hits'] >= total:
+                break
+            time.sleep(0.05)
+        self.module.stop()
+
+        stats = self.module.get_stats()
+        arp_table = self.module.get_arp_table()
+        self.assertEqual(stats['dropped_packets'], 0)
+        self.assertEqual(len(arp_table), hosts)
+        self.assertEqual(sum(entry['count'] for entry in arp_table.values()), total)
+        self.assertEqual(stats['arp_packets_processed'] + stats['fast_path_hits'], total)
+        self.assertEqual(len(stats['shards']), len(self.module.shards))
+
+    def test_reshard_on_start(self):
+        """Test that a changed worker count reshards existing state."""
+        for i in range(10):
+            self._process_directly(make_view(sender_ip=f'10.0.4.{i}'))
+
+        self.module.config.worker_threads = 1
+        self.module.start()
+        self.assertEqual(len(self.module.shards), 1)
+        self.assertEqual(len(self.module.get_arp_table()), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from src.core.expiring_map import ExpiringMap
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestExpiringMap(unittest.TestCase):
+    """Test cases for the timing wheel expiring map."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.expired = []
+        self.map = ExpiringMap(ttl=10, clock=self.clock,
+                               on_expire=lambda key, value: self.expired.append((key, value, self.clock.now)))
+
+    def test_get_and_expiry(self):
+        """Test that entries disappear after their TTL."""
+        self.map['a'] = 1
+        self.map.set('b', 2, ttl=100)
+        self.assertEqual(self.map['a'], 1)
+        self.assertEqual(len(self.map), 2)
+
+        self.clock.now += 10.5
+        self.assertNotIn('a', self.map)
+        self.clock.now += 1
+        self.assertIsNone(self.map.get('a'))
+        with self.assertRaises(KeyError):
+            self.map['a']
+
+        # The count includes stale entries until they are evicted
+        self.assertEqual(len(self.map), 2)
+        self.assertEqual(self.map.expire(), 1)
+        self.assertEqual(len(self.map), 1)
+        self.assertEqual(self.expired, [('a', 1, self.clock.now)])
+
+    def test_touch_refreshes_ttl(self):
+        """Test that touching an entry pushes back its expiry."""
+        self.map['a'] = 1
+        self.clock.now += 8
+        self.assertTrue(self.map.touch('a'))
+        self.clock.now += 8
+        self.assertEqual(self.map.expire(), 0)
+        self.assertIn('a', self.map)
+        self.assertAlmostEqual(self.map.ttl_remaining('a'), 2.0)
+        self.assertFalse(self.map.touch('missing'))
+
+    def test_long_ttls_cascade(self):
+        """Test that entries on coarse wheel levels expire on time."""
+        ttls = [5, 70, 5000, 300000, 20000000]
+        for ttl in ttls:
+            self.map.set(ttl, ttl, ttl=ttl)
+
+        start = self.clock.now
+        while len(self.map):
+            self.clock.now += 3600 if self.clock.now - start > 6000 else 1
+            self.map.expire()
+
+        for key, _, when in self.expired:
+            self.assertGreaterEqual(when - start, key)
+            self.assertLess(when - start, key + 3602)
+        self.assertEqual(sorted(key for key, _, _ in self.expired), ttls)
+
+    def test_delete_has_no_callback(self):
+        """Test that explicit removal does not fire eviction callbacks."""
+        self.map['a'] = 1
+        self.map['b'] = 2
+        self.assertEqual(self.map.pop('a'), 1)
+        del self.map['b']
+        self.assertEqual(self.map.pop('a', None), None)
+        self.clock.now += 100
+        self.assertEqual(self.map.expire(), 0)
+        self.assertEqual(self.expired, [])
+
+    def test_iteration_and_snapshot(self):
+        """Test lazy iteration and copies."""
+        for i in range(5):
+            self.map.set(i, i * i, ttl=i + 1)
+        self.clock.now += 2.5
+
+        self.assertEqual(sorted(self.map.keys()), [2, 3, 4])
+        self.assertEqual(sorted(self.map.values()), [4, 9, 16])
+        snapshot = self.map.copy()
+        self.assertEqual(snapshot, {2: 4, 3: 9, 4: 16})
+        snapshot[2] = 0
+        self.assertEqual(self.map[2], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
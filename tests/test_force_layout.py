@@ -0,0 +1,97 @@
+import unittest
+
+import numpy as np
+
+from app.utils.force_layout import ForceLayout
+
+
+def random_graph(n, seed=0):
+    """Positions and a random tree of edges, in both directions."""
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-2000, 2000, (n, 2))
+    parents = rng.integers(0, np.arange(1, n))
+    children = np.arange(1, n)
+    edges = np.concatenate([np.stack([children, parents], axis=1),
+                            np.stack([parents, children], axis=1)])
+    return positions, edges
+
+
+class TestForceLayout(unittest.TestCase):
+    """Test cases for the NumPy force-directed layout."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.layout = ForceLayout()
+
+    def test_tree_matches_direct_sum(self):
+        """Test that the approximate repulsion is close to the exact one."""
+        rng = np.random.default_rng(1)
+        # Clusters of nodes, as in a real topology
+        centres = rng.uniform(-3000, 3000, (20, 2))
+        positions = centres[rng.integers(0, 20, 2000)] + rng.normal(0, 150, (2000, 2))
+
+        approximate = self.layout.repulsion_forces(positions)
+        exact = self.layout._direct_repulsion(positions)
+        error = np.hypot(*(approximate - exact).T)
+        scale = np.hypot(*exact.T).mean()
+        self.assertLess(np.median(error) / scale, 0.01)
+        self.assertLess(np.percentile(error, 95) / scale, 0.05)
+
+    def test_outlier_does_not_collapse_grid(self):
+        """Test that one far node does not squash the others into one cell."""
+        rng = np.random.default_rng(2)
+        positions = np.concatenate([rng.uniform(-2000, 2000, (10000, 2)),
+                                    rng.normal(0, 5, (2000, 2)),
+                                    [[1e6, 1e6]]])
+
+        approximate = self.layout.repulsion_forces(positions)
+
+        sample = rng.choice(len(positions), 200, replace=False)
+        exact = np.array([
+            self.layout._pair_force(positions[i] - positions).sum(axis=0) for i in sample])
+        error = np.hypot(*(approximate[sample] - exact).T)
+        scale = np.hypot(*exact.T).mean()
+        self.assertLess(np.median(error) / scale, 0.05)
+
+    def test_small_graphs_are_exact(self):
+        """Test that small graphs use the exact pairwise sum."""
+        positions = np.array([[0.0, 0.0], [10.0, 0.0]])
+        force = self.layout.repulsion_forces(positions)
+        np.testing.assert_allclose(force, [[-100.0, 0.0], [100.0, 0.0]])
+
+    def test_converges_and_stops_early(self):
+        """Test that a layout stops once nodes no longer move."""
+        start, edges = random_graph(300)
+        positions, done = self.layout.run(start, edges, iterations=2000, cooling=0.999)
+        self.assertLess(done, 2000)
+
+        # Springs have pulled connected nodes together
+        def edge_lengths(pos):
+            return np.median(np.hypot(*(pos[edges[:, 0]] - pos[edges[:, 1]]).T))
+        self.assertLess(edge_lengths(positions), edge_lengths(start) / 2)
+
+        # A warm start from the settled layout finishes in a few iterations
+        _, done = self.layout.run(positions, edges, temperature=0.01)
+        self.assertLess(done, 20)
+
+    def test_should_stop(self):
+        """Test that a layout can be cancelled."""
+        positions, edges = random_graph(100)
+        calls = []
+        _, done = self.layout.run(positions, edges,
+                                  should_stop=lambda: calls.append(1) or len(calls) > 3)
+        self.assertEqual(done, 3)
+
+    def test_large_graph(self):
+        """Test that a 10k node layout steps every node by a bounded amount."""
+        positions, edges = random_graph(10000)
+        moved, done = self.layout.run(positions, edges, iterations=10, cooling=1.0)
+        self.assertEqual(done, 10)
+        self.assertTrue(np.isfinite(moved).all())
+        step = np.hypot(*(moved - positions).T)
+        self.assertGreater(np.count_nonzero(step), 9990)
+        self.assertLessEqual(step.max(), 10 * self.layout.edge_length + 1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
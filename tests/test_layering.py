@@ -0,0 +1,63 @@
+import ast
+import re
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# src/ modules that app/ may import; see "Package Layering" in CONTRIBUTING.md
+SHARED_MODULES = {
+    "src.core.expiring_map",
+    "src.core.arp_batch",
+    "src.core.capture_engine",
+    "src.core.oui_lookup",
+}
+
+# Absolute imports of src modules, matched line by line so that files which
+# do not parse are still checked
+SRC_IMPORT = re.compile(r"^\s*(?:from\s+(src(?:\.\w+)*)\s+import|import\s+(src(?:\.\w+)*))")
+
+
+def imported_modules(path):
+    """Get the absolute module names imported by a Python file."""
+    package = ".".join(path.relative_to(ROOT).parent.parts)
+    tree = ast.parse(path.read_text(encoding="utf-8"), str(path))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield node.lineno, alias.name
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            if node.level:
+                base = package.split(".")[:len(package.split(".")) - node.level + 1]
+                module = ".".join(base + ([module] if module else []))
+            yield node.lineno, module
+
+
+class TestLayering(unittest.TestCase):
+    """Test the import boundary between app/ and src/."""
+
+    def test_app_imports_only_shared_src_modules(self):
+        """Test that app/ imports nothing from src/ outside the shared modules."""
+        violations = []
+        for path in sorted((ROOT / "app").rglob("*.py")):
+            for lineno, line in enumerate(path.read_text(encoding="utf-8").splitlines(), 1):
+                match = SRC_IMPORT.match(line)
+                module = match and (match.group(1) or match.group(2))
+                if module and module not in SHARED_MODULES:
+                    violations.append(f"{path.relative_to(ROOT)}:{lineno} imports {module}")
+        self.assertEqual(violations, [])
+
+    def test_shared_modules_are_self_contained(self):
+        """Test that the shared modules import only each other from the project."""
+        violations = []
+        for name in sorted(SHARED_MODULES):
+            path = ROOT / (name.replace(".", "/") + ".py")
+            for lineno, module in imported_modules(path):
+                if module.split(".")[0] in ("src", "app") and module not in SHARED_MODULES:
+                    violations.append(f"{name}:{lineno} imports {module}")
+        self.assertEqual(violations, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.components.network_scanner import NetworkScanner
+from app.utils.arp_sweep import ArpSweeper
 
 class TestNetworkScanner(unittest.TestCase):
     
@@ -95,5 +96,32 @@ class TestNetworkScanner(unittest.TestCase):
         # Verify the result
         self.assertEqual(hostname, 'Device (192.168.1.10)')
 
+    def test_sweep_permission_error_falls_back(self):
+        # A raw socket that cannot be opened without root
+        def no_socket(interface):
+            raise PermissionError("Operation not permitted")
+        
+        self.scanner.get_default_gateway = MagicMock(return_value=('10.0.0.1', 'eth0'))
+        self.scanner._create_sweeper = MagicMock(
+            return_value=ArpSweeper('eth0', '00:11:22:33:44:55', '10.0.0.9', socket_factory=no_socket))
+        self.scanner._batch_scan = MagicMock(return_value=[('10.0.0.1', 'aa:bb:cc:dd:ee:01')])
+        self.scanner._save_scan_results = MagicMock()
+        self.scanner.dns_timeout = 0
+        results = []
+        
+        self.scanner.scanning = True
+        self.scanner._scan_thread('10.0.0.0/30', lambda devices, message: results.append((devices, message)))
+        
+        # The batched srp scan ran instead of the scan failing
+        self.assertTrue(self.scanner._batch_scan.called)
+        devices, message = results[-1]
+        self.assertTrue(message.startswith("Scan completed"))
+        self.assertEqual([device['ip'] for device in devices], ['10.0.0.1'])
+    
+    def test_close_shuts_down_resolver(self):
+        self.scanner.resolver = MagicMock()
+        self.scanner.close()
+        self.scanner.resolver.shutdown.assert_called_once_with()
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,252 @@
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.core.alert import Alert, AlertChannel, AlertManager, AlertPriority, AlertType
+from src.core.notification_channels import EmailChannel, WebhookChannel
+from src.core.notification_dispatcher import NotificationDispatcher
+
+
+def make_alert(n, priority=AlertPriority.MEDIUM):
+    return Alert(id=f"alert-{n}", type=AlertType.ARP_SPOOFING, priority=priority,
+                 message=f"Alert {n}", timestamp=time.time(), source="test")
+
+
+class RecordingChannel(AlertChannel):
+    """Channel that records batches and can fail or stall."""
+
+    def __init__(self, name="recording", failures=0, delay=0.0):
+        super().__init__(name)
+        self.batches = []
+        self.failures = failures
+        self.delay = delay
+
+    def send_batch(self, alerts):
+        time.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            return False
+        self.batches.append([alert.id for alert in alerts])
+        return True
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to log in and accept messages."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 stub ESMTP")
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            command = line.split(" ", 1)[0].upper()
+            if command == "EHLO":
+                self.wfile.write(b"250-stub\r\n250 AUTH PLAIN\r\n")
+            elif command == "AUTH":
+                server.logins += 1
+                self.reply("235 Authenticated")
+            elif command in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 Go ahead")
+                lines = []
+                while True:
+                    data = self.rfile.readline().decode()
+                    if data.rstrip("\r\n") == ".":
+                        break
+                    lines.append(data)
+                server.messages.append("".join(lines))
+                self.reply("250 Queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Not implemented")
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubSMTPHandler)
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+
+
+class StubHTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((self.client_address, json.loads(body)))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHTTPHandler)
+        self.requests = []
+
+
+def serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+class TestNotificationDispatcher(unittest.TestCase):
+    """Test the asynchronous notification dispatcher."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dead_letters = os.path.join(self.temp_dir.name, "dead_letters.jsonl")
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.temp_dir.cleanup()
+
+    def test_bursts_are_coalesced(self):
+        """Test that the first alert goes out alone and a burst becomes a digest."""
+        dispatcher = NotificationDispatcher(coalesce_window=0.3)
+        channel = RecordingChannel()
+        dispatcher.add_channel(channel)
+
+        dispatcher.submit(make_alert(0))
+        time.sleep(0.1)
+        for i in range(1, 6):
+            dispatcher.submit(make_alert(i))
+        self.assertTrue(dispatcher.flush(2.0))
+
+        self.assertEqual(channel.batches, [["alert-0"], [f"alert-{i}" for i in range(1, 6)]])
+        metrics = dispatcher.get_metrics()["recording"]
+        self.assertEqual(metrics["sent"], 6)
+        self.assertEqual(metrics["digests"], 1)
+        self.assertIsNotNone(metrics["latency_p95"])
+        dispatcher.close()
+
+    def test_retries_then_dead_letter(self):
+        """Test exponential-backoff retries and the dead-letter file."""
+        dispatcher = NotificationDispatcher(coalesce_window=0, max_retries=2, retry_base_delay=0.05,
+                                            dead_letter_path=self.dead_letters)
+        flaky = RecordingChannel("flaky", failures=2)
+        broken = RecordingChannel("broken", failures=100)
+        dispatcher.add_channel(flaky)
+        dispatcher.add_channel(broken)
+
+        start = time.monotonic()
+        dispatcher.submit(make_alert(1))
+        self.assertTrue(dispatcher.flush(5.0))
+        # Two retries waited 0.05 and 0.1 seconds
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+        self.assertEqual(flaky.batches, [["alert-1"]])
+        self.assertEqual(dispatcher.get_metrics()["flaky"]["retries"], 2)
+        with open(self.dead_letters) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["channel"], "broken")
+        self.assertEqual(records[0]["attempts"], 3)
+        self.assertEqual(records[0]["alerts"][0]["id"], "alert-1")
+        self.assertEqual(dispatcher.get_metrics()["broken"]["dead_lettered"], 1)
+        dispatcher.close()
+
+    def test_slow_channel_does_not_block(self):
+        """Test that creating alerts does not wait for a slow channel."""
+        manager = AlertManager(dispatcher=NotificationDispatcher(coalesce_window=0))
+        slow = RecordingChannel("slow", delay=0.5)
+        fast = RecordingChannel("fast")
+        manager.add_channel(slow)
+        manager.add_channel(fast)
+
+        start = time.monotonic()
+        alert = manager.create_alert(AlertType.SYSTEM, AlertPriority.HIGH, "Slow webhook", "test")
+        self.assertLess(time.monotonic() - start, 0.1)
+        time.sleep(0.1)
+        self.assertEqual(fast.batches, [[alert.id]])
+        self.assertEqual(slow.batches, [])
+
+        manager.flush_notifications()
+        self.assertEqual(slow.batches, [[alert.id]])
+        self.assertIn("slow", manager.get_status()["notification_metrics"])
+        manager.close()
+
+
+class TestPersistentConnections(unittest.TestCase):
+    """Test the channels against local stub servers."""
+
+    def test_email_reuses_connection(self):
+        """Test that emails share one logged-in SMTP connection and bursts form a digest."""
+        server = serve(StubSMTPServer())
+        channel = EmailChannel("127.0.0.1", server.server_address[1], "user", "pass",
+                               "arpguard@example.com", ["admin@example.com"], use_tls=False)
+        for i in range(3):
+            self.assertTrue(channel.send(make_alert(i)))
+        self.assertTrue(channel.send_batch([make_alert(i, AlertPriority.CRITICAL) for i in range(3, 8)]))
+        channel.close()
+        server.shutdown()
+        server.server_close()
+
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(server.logins, 1)
+        self.assertEqual(len(server.messages), 4)
+        self.assertIn("[CRITICAL] ARP Guard: 5 alerts", server.messages[3])
+
+    def test_email_reconnects(self):
+        """Test that a dropped SMTP connection is reopened."""
+        server = serve(StubSMTPServer())
+        channel = EmailChannel("127.0.0.1", server.server_address[1], "user", "pass",
+                               "arpguard@example.com", ["admin@example.com"], use_tls=False)
+        self.assertTrue(channel.send(make_alert(1)))
+        # As if the server had timed the idle connection out
+        channel._server.sock.shutdown(socket.SHUT_RDWR)
+        self.assertTrue(channel.send(make_alert(2)))
+        channel.close()
+        server.shutdown()
+        server.server_close()
+        self.assertEqual(server.connections, 2)
+        self.assertEqual(len(server.messages), 2)
+
+    def test_webhook_reuses_connection(self):
+        """Test that webhook requests share one keep-alive connection."""
+        server = serve(StubHTTPServer())
+        channel = WebhookChannel(f"http://127.0.0.1:{server.server_address[1]}/hook")
+        for i in range(5):
+            self.assertTrue(channel.send(make_alert(i)))
+        self.assertTrue(channel.send_batch([make_alert(5), make_alert(6)]))
+        channel.close()
+        server.shutdown()
+        server.server_close()
+
+        self.assertEqual(len(server.requests), 6)
+        self.assertEqual(len({address for address, _ in server.requests}), 1)
+        self.assertEqual(server.requests[-1][1]["count"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
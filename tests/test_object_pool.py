@@ -0,0 +1,182 @@
+import sys
+import threading
+import time
+import unittest
+
+from PyQt5.QtWidgets import QApplication
+
+from app.components.network_monitor import NetworkMonitor
+from app.utils.object_pool import UNPOOLED, ObjectPool, SPSCRing, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestObjectPool(unittest.TestCase):
+    """Test cases for the preallocated object pool."""
+
+    def test_allocate_and_release(self):
+        """Test that released objects are reset and reused."""
+        pool = ObjectPool(2, dict, reset=dict.clear)
+        slot_a, obj_a = pool.allocate()
+        obj_a['src_ip'] = "10.0.0.1"
+        slot_b, obj_b = pool.allocate()
+        self.assertNotEqual(slot_a, slot_b)
+        self.assertIsNot(obj_a, obj_b)
+
+        # Exhausted: a new object outside the pool
+        slot_c, obj_c = pool.allocate()
+        self.assertEqual(slot_c, UNPOOLED)
+        self.assertFalse(pool.release(slot_c))
+
+        self.assertTrue(pool.release(slot_a))
+        self.assertFalse(pool.release(slot_a))
+        self.assertEqual(obj_a, {})
+        slot, obj = pool.allocate()
+        self.assertEqual(slot, slot_a)
+        self.assertIs(obj, obj_a)
+
+        stats = pool.get_stats()
+        self.assertEqual((stats['allocations'], stats['hits'], stats['misses'], stats['releases']),
+                         (4, 3, 1, 1))
+        self.assertEqual(stats['in_use'], 2)
+        pool.clear()
+        self.assertEqual(pool.in_use, 0)
+        self.assertEqual(pool.allocations, 0)
+
+    def test_full_pool_cycles(self):
+        """Test that cycling a full pool reuses its objects without misses."""
+        pool = ObjectPool(10000, dict, reset=dict.clear)
+        allocated = [pool.allocate() for _ in range(10000)]
+        objects = {id(obj) for _, obj in allocated}
+        for _ in range(10):
+            for slot, obj in allocated:
+                obj['seen'] = True
+                pool.release(slot)
+            allocated = [pool.allocate() for _ in range(10000)]
+        self.assertEqual(pool.misses, 0)
+        self.assertEqual({id(obj) for _, obj in allocated}, objects)
+        self.assertFalse(any(obj for _, obj in allocated))
+
+
+class TestSPSCRing(unittest.TestCase):
+    """Test cases for the single-producer, single-consumer ring."""
+
+    def test_push_and_pop(self):
+        """Test ordering, wraparound and a full ring."""
+        ring = SPSCRing(3)
+        self.assertEqual(ring.capacity, 4)
+        self.assertIsNone(ring.pop())
+        for n in range(4):
+            self.assertTrue(ring.push(n))
+        self.assertFalse(ring.push(4))
+        self.assertEqual(ring.pop(), 0)
+        self.assertTrue(ring.push(5))
+        self.assertEqual(ring.pop_many(2), [1, 2])
+        self.assertEqual(ring.pop_many(10), [3, 5])
+        self.assertEqual(len(ring), 0)
+
+        stats = ring.get_stats()
+        self.assertEqual((stats['pushed'], stats['popped'], stats['rejected'], stats['high_water']),
+                         (5, 5, 1, 4))
+
+    def test_producer_and_consumer_threads(self):
+        """Test that items cross threads in order and none are lost."""
+        ring = SPSCRing(64)
+        count = 50000
+        received = []
+
+        def produce():
+            n = 0
+            while n < count:
+                if ring.push(n):
+                    n += 1
+                else:
+                    time.sleep(0)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        while len(received) < count:
+            items = ring.pop_many(64)
+            if items:
+                received.extend(items)
+            else:
+                time.sleep(0)
+        producer.join()
+
+        self.assertEqual(received, list(range(count)))
+        self.assertLessEqual(ring.get_stats()['high_water'], ring.capacity)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the token bucket throttle."""
+
+    def test_take_and_refill(self):
+        """Test bursts, refill over time and the wait estimate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=100, burst=50, clock=clock)
+        self.assertEqual(bucket.take(80), 50)
+        self.assertEqual(bucket.take(1), 0)
+        self.assertAlmostEqual(bucket.time_until(10), 0.1)
+
+        clock.now += 0.25
+        self.assertEqual(bucket.take(80), 25)
+        clock.now += 10
+        self.assertEqual(bucket.take(80), 50)
+
+        bucket.refill()
+        self.assertEqual(bucket.take(20), 20)
+        self.assertEqual(bucket.time_until(30), 0.0)
+
+
+class TestNetworkMonitorPool(unittest.TestCase):
+    """Test cases for the pooled records of the network monitor."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def make_packet(self, i):
+        return {"timestamp": i, "src_mac": "00:11:22:33:44:55", "dst_mac": "aa:bb:cc:dd:ee:ff",
+                "src_ip": f"10.0.{i // 250}.{i % 250}", "dst_ip": "10.0.0.1",
+                "protocol": "ARP", "length": 64, "info": f"Packet {i}"}
+
+    def test_pool_covers_buffer_and_ring(self):
+        """Test that the default pool holds a full buffer and a full ring."""
+        # The ring rounds 50 up to 64 slots
+        monitor = NetworkMonitor(ring_capacity=50, buffer_size=100)
+        self.assertEqual(monitor.object_pool.capacity, 164)
+        for i in range(100):
+            monitor.enqueue_packet(self.make_packet(i))
+        monitor.drain()
+        for i in range(100, 164):
+            monitor.enqueue_packet(self.make_packet(i))
+        self.assertEqual(monitor.object_pool.misses, 0)
+
+    def test_packets_are_copied_out(self):
+        """Test that get_packets() copies survive eviction."""
+        monitor = NetworkMonitor(ring_capacity=8, buffer_size=2)
+        monitor.process_packet_batch([self.make_packet(i) for i in range(2)])
+        packets = monitor.get_packets()
+        monitor.process_packet_batch([self.make_packet(i) for i in range(2, 4)])
+        self.assertEqual([p["info"] for p in packets], ["Packet 0", "Packet 1"])
+        self.assertEqual([p["info"] for p in monitor.get_packets()], ["Packet 2", "Packet 3"])
+
+    def test_pool_not_replaced_while_queued(self):
+        """Test that the pool is only swapped once the ring is empty."""
+        monitor = NetworkMonitor(ring_capacity=8, buffer_size=4)
+        monitor.enqueue_packet(self.make_packet(0))
+        with self.assertRaises(RuntimeError):
+            monitor.initialize_object_pool(32)
+        monitor.drain()
+        monitor.initialize_object_pool(32)
+        self.assertEqual(monitor.object_pool.capacity, 32)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add src directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.core.oui_lookup import (
+    OuiTable, VendorResolver, format_mac, load_table, parse_mac, parse_prefix, table_path_for
+)
+
+VENDORS = {
+    "001A2B": "Ayecom Technology",
+    "70B3D5": "IEEE Registration Authority",
+    "70B3D5F2": "Sub Block Systems",
+    "70:B3:D5:F2:A": "Tiny Block Labs",
+    "FCFBFB": "Cisco Systems",
+}
+
+
+class TestOuiLookup(unittest.TestCase):
+    """Test the OUI vendor lookup service."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.temp_dir.name, "vendors.json")
+        self.write_source(VENDORS)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.temp_dir.cleanup()
+
+    def write_source(self, vendors):
+        with open(self.source, "w") as f:
+            json.dump(vendors, f)
+
+    def test_parse_mac(self):
+        """Test the accepted MAC address forms."""
+        expected = 0x001A2B3C4D5E
+        for mac in ("00:1a:2b:3c:4d:5e", "00-1A-2B-3C-4D-5E", "001a.2b3c.4d5e",
+                    "001A2B3C4D5E", b"\x00\x1a\x2b\x3c\x4d\x5e", expected):
+            self.assertEqual(parse_mac(mac), expected, mac)
+        for mac in ("", "00:1a:2b:3c:4d", "0x1a2b3c4d5e6f", "00:1a:2b:3c:4d:5g",
+                    "00_1a_2b_3c_4d_5e", 1 << 48, -1, None):
+            self.assertIsNone(parse_mac(mac), mac)
+        self.assertEqual(format_mac(expected), "001A2B3C4D5E")
+        self.assertEqual(parse_prefix("70B3D5F2A"), (0x70B3D5F2A, 36))
+        self.assertEqual(parse_prefix("70B3D5F2/28"), (0x70B3D5F, 28))
+
+    def test_longest_prefix_wins(self):
+        """Test that the most specific registry block is returned."""
+        table = load_table(self.source)
+        self.assertTrue(os.path.exists(table_path_for(self.source)))
+        self.assertEqual(table.lookup(parse_mac("70:B3:D5:F2:A1:23")), "Tiny Block Labs")
+        self.assertEqual(table.lookup(parse_mac("70:B3:D5:F2:B1:23")), "Sub Block Systems")
+        self.assertEqual(table.lookup(parse_mac("70:B3:D5:01:00:00")), "IEEE Registration Authority")
+        self.assertEqual(table.lookup(parse_mac("00:1A:2B:00:00:01")), "Ayecom Technology")
+        self.assertIsNone(table.lookup(parse_mac("00:1A:2C:00:00:01")))
+        table.close()
+
+    def test_table_rebuilt_when_source_changes(self):
+        """Test that a stale binary table is rebuilt from the JSON file."""
+        load_table(self.source).close()
+        table_path = table_path_for(self.source)
+        built = os.path.getmtime(table_path)
+
+        self.write_source({"001A2B": "Renamed Vendor"})
+        os.utime(self.source, (built + 10, built + 10))
+        table = load_table(self.source)
+        self.assertEqual(table.lookup(0x001A2B000000), "Renamed Vendor")
+        self.assertIsNone(table.lookup(0xFCFBFB000000))
+        table.close()
+
+        # A corrupt table is rebuilt too
+        with open(table_path, "wb") as f:
+            f.write(b"junk")
+        os.utime(table_path, (built + 20, built + 20))
+        table = load_table(self.source)
+        self.assertEqual(table.lookup(0x001A2B000000), "Renamed Vendor")
+        table.close()
+
+    def test_resolver_sources_and_batches(self):
+        """Test source precedence and that batch lookups match single ones."""
+        resolver = VendorResolver(cache_size=16)
+        self.assertTrue(resolver.add_source(self.source))
+        self.assertFalse(resolver.add_source(os.path.join(self.temp_dir.name, "missing.json")))
+        resolver.add_entries({"FCFBFB": "Local Override"}, "local")
+        self.assertEqual(resolver.get_vendor("fc:fb:fb:01:02:03"), "Local Override")
+        self.assertEqual(resolver.get_vendor("70b3d5f2a000"), "Tiny Block Labs")
+        self.assertIsNone(resolver.get_vendor("not a mac"))
+
+        rng = random.Random(3)
+        prefixes = [0x001A2B, 0x70B3D5, 0xFCFBFB, 0x123456]
+        macs = [format_mac(rng.choice(prefixes) << 24 | rng.getrandbits(24)) for _ in range(500)]
+        macs += ["bogus", None]
+        self.assertEqual(resolver.get_vendors(macs), [resolver.get_vendor(mac) for mac in macs])
+        self.assertGreater(resolver.cache_info().hits + resolver.cache_info().misses, 0)
+
+        self.assertTrue(resolver.remove_source("local"))
+        self.assertEqual(resolver.get_vendor("fc:fb:fb:01:02:03"), "Cisco Systems")
+        self.assertEqual(resolver.sources, [self.source])
+
+    def test_large_table(self):
+        """Test resolving addresses from a large cached table."""
+        rng = random.Random(4)
+        vendors = {f"{rng.getrandbits(24):06X}": f"Vendor {n}" for n in range(30000)}
+        vendors.update({f"{rng.getrandbits(28):07X}": f"Block {n}" for n in range(5000)})
+        self.write_source(vendors)
+        load_table(self.source).close()
+
+        resolver = VendorResolver()
+        resolver.add_source(self.source)
+        self.assertIsInstance(resolver._tables[0][1], OuiTable)
+
+        keys = rng.sample(list(vendors), 2000)
+        macs = [format_mac(int(key, 16) << (48 - len(key) * 4)) for key in keys]
+        # The longest registered prefix wins
+        expected = []
+        for mac in macs:
+            digits = mac.replace(":", "").upper()
+            expected.append(vendors.get(digits[:7]) or vendors[digits[:6]])
+        self.assertEqual([resolver.get_vendor(mac) for mac in macs], expected)
+        self.assertEqual(resolver.get_vendors(macs * 10), expected * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
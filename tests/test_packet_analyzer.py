@@ -0,0 +1,55 @@
+import shutil
+import tempfile
+import unittest
+
+from scapy.all import ARP, IP, TCP, Ether, Raw
+
+from app.components.packet_analyzer import PacketAnalyzer
+from app.utils.timeseries import TimeSeriesStore
+
+
+class TestPacketAnalyzer(unittest.TestCase):
+    """Test cases for what the packet analyzer feeds downstream."""
+
+    def setUp(self):
+        """Create an analyzer whose rollups go to a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.analyzer = PacketAnalyzer()
+        self.analyzer.timeseries = TimeSeriesStore(self.temp_dir)
+
+    def tearDown(self):
+        """Stop the memory monitor and remove the segment files."""
+        self.analyzer.memory_manager.stop_monitoring()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def process(self, *packets):
+        """Run packets through the analyzer as if captured off the wire."""
+        for packet in packets:
+            self.analyzer._process_packet(Ether(bytes(packet)))
+        self.analyzer._process_packet_buffer()
+
+    def test_packets_recorded_in_timeseries(self):
+        """Test that analysed packets land in the rollup store."""
+        self.process(Ether() / ARP(op=1, psrc="10.0.0.2", pdst="10.0.0.1"),
+                     Ether() / IP(src="10.0.0.2", dst="10.0.0.1") / TCP(dport=443))
+
+        totals = self.analyzer.timeseries.get_totals()
+        self.assertEqual(totals['packets'], 2)
+        self.assertEqual(totals['arp_requests'], 1)
+        self.assertGreater(totals['bytes'], 0)
+
+    def test_http_payload_scanned_for_signatures(self):
+        """Test that HTTP requests carry the attack families in their payload."""
+        received = []
+        self.analyzer.add_packet_listener(received.append)
+        request = b"GET /item?id=1%27%20OR%201=1-- HTTP/1.1\r\nHost: shop\r\n\r\n"
+        self.process(Ether() / IP(src="10.0.0.9", dst="10.0.0.1") / TCP(dport=80) / Raw(load=request))
+
+        packet, = received
+        self.assertEqual(packet['protocol'], 'HTTP')
+        self.assertEqual(packet['http_data']['method'], 'GET')
+        self.assertIn('sql_injection', packet['web_signatures'])
+
+
+if __name__ == '__main__':
+    unittest.main()
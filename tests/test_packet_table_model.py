@@ -0,0 +1,186 @@
+import os
+import random
+import sys
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableView
+
+from app.components.packet_table_model import (
+    PacketFilterProxyModel, PacketTableModel, PROTOCOL_BRUSHES, STATUS_BRUSHES
+)
+
+PROTOCOLS = ["TCP", "UDP", "ARP", "DNS", "ICMP"]
+
+
+def make_packet(n, rng=random):
+    return {
+        'timestamp': f"10:00:{n:07d}",
+        'src_ip': f"192.168.{rng.randint(0, 3)}.{rng.randint(1, 254)}",
+        'dst_ip': f"10.0.0.{rng.randint(1, 254)}",
+        'protocol': rng.choice(PROTOCOLS),
+        'length': rng.randint(40, 1500),
+        'info': f"Packet {n} Flags [S]",
+        'status': "Malicious" if n % 97 == 0 else "",
+        'src_port': rng.randint(1, 65535)
+    }
+
+
+class TestPacketTableModel(unittest.TestCase):
+    """Test cases for the packet ring buffer model and filter proxy."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        """Set up test environment."""
+        self.rng = random.Random(1)
+        self.model = PacketTableModel(capacity=500)
+        self.proxy = PacketFilterProxyModel()
+        self.proxy.setSourceModel(self.model)
+        self.packets = []
+
+    def add(self, count):
+        batch = [make_packet(len(self.packets) + i, self.rng) for i in range(count)]
+        self.packets.extend(batch)
+        self.model.add_packets(batch)
+
+    def expected(self, protocol="All Protocols", search="", column=None, descending=False):
+        """Filter and sort the retained packets the slow way."""
+        retained = self.packets[-self.model.capacity:]
+        rows = [p for p in retained
+                if (protocol == "All Protocols" or p['protocol'] == protocol)
+                and search.lower() in "\n".join(str(p.get(f, '')) for f in
+                                                ('src_ip', 'dst_ip', 'info', 'src_port', 'dst_port')).lower()]
+        if column == 4:
+            rows.sort(key=lambda p: p['length'])
+        elif column == 1:
+            rows.sort(key=lambda p: p['src_ip'])
+        if descending:
+            rows.reverse()
+        return [p['info'] for p in rows]
+
+    def shown(self):
+        return [self.proxy.index(row, 5).data() for row in range(self.proxy.rowCount())]
+
+    def test_ring_buffer_keeps_newest(self):
+        """Test that the oldest packets are overwritten once full."""
+        self.add(300)
+        self.add(400)
+        self.assertEqual(self.model.rowCount(), 500)
+        self.assertEqual(self.model.first_seq, 200)
+        self.assertEqual(self.model.index(0, 5).data(), "Packet 200 Flags [S]")
+        self.assertEqual(self.model.index(499, 5).data(), "Packet 699 Flags [S]")
+        self.assertIs(self.model.packet(499), self.packets[699])
+        self.assertEqual(self.model.index(499, 0).data(Qt.UserRole), self.packets[699])
+
+        # Colours come from the data role
+        self.assertEqual(self.model.index(291 - 200, 2).data(Qt.BackgroundRole), STATUS_BRUSHES["Malicious"])
+        protocol = self.packets[300]['protocol']
+        self.assertEqual(self.model.index(100, 2).data(Qt.BackgroundRole), PROTOCOL_BRUSHES[protocol])
+
+        self.model.set_capacity(100)
+        self.assertEqual(self.model.index(0, 5).data(), "Packet 600 Flags [S]")
+        self.add(10)
+        self.assertEqual(self.model.index(99, 5).data(), "Packet 709 Flags [S]")
+
+    def test_incremental_filter(self):
+        """Test that filtering stays right as packets arrive and are evicted."""
+        self.add(200)
+        self.proxy.set_filter("TCP", "192.168.1")
+        self.assertEqual(self.shown(), self.expected("TCP", "192.168.1"))
+
+        # New packets are filtered on their own
+        self.add(450)
+        self.assertEqual(self.shown(), self.expected("TCP", "192.168.1"))
+
+        # Narrowing the search re-checks only the rows already shown
+        self.proxy.set_filter("TCP", "192.168.1.1")
+        self.assertEqual(self.shown(), self.expected("TCP", "192.168.1.1"))
+
+        self.proxy.set_filter("All Protocols", "FLAGS")
+        self.assertEqual(self.proxy.rowCount(), 500)
+        self.proxy.set_filter("UDP", "")
+        self.assertEqual(self.shown(), self.expected("UDP"))
+
+    def test_sorting(self):
+        """Test sorting by a column while packets arrive and are evicted."""
+        self.add(300)
+        self.proxy.set_filter("ARP", "")
+        self.proxy.sort(4, Qt.AscendingOrder)
+        self.add(250)
+        self.assertEqual(self.shown(), self.expected("ARP", column=4))
+
+        self.proxy.sort(1, Qt.DescendingOrder)
+        self.add(30)
+        self.proxy.set_filter("ARP", "192.168.2")
+        self.assertEqual(self.shown(), self.expected("ARP", "192.168.2", column=1, descending=True))
+
+        # Back to arrival order, newest first
+        self.proxy.set_filter()
+        self.proxy.sort(-1, Qt.DescendingOrder)
+        self.add(5)
+        self.assertEqual(self.shown(), self.expected(descending=True))
+
+    def test_sorted_batches(self):
+        """Test that sorted batches merge in one reset or insert by run."""
+        self.proxy.sort(4, Qt.DescendingOrder)
+        resets, inserts = [], []
+        self.proxy.modelReset.connect(lambda: resets.append(1))
+        self.proxy.rowsInserted.connect(lambda parent, first, last: inserts.append((first, last)))
+
+        # Many scattered rows are merged in one pass, and evict in one pass
+        self.add(400)
+        self.add(300)
+        self.assertEqual(len(resets), 2)
+        self.assertEqual(self.shown(), self.expected(column=4, descending=True))
+
+        # A few rows are inserted where they belong
+        resets.clear()
+        inserts.clear()
+        self.add(3)
+        self.assertEqual(resets, [])
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(self.shown(), self.expected(column=4, descending=True))
+
+        self.proxy.sort(1, Qt.AscendingOrder)
+        self.add(5)
+        self.assertEqual(self.shown(), self.expected(column=1))
+
+    def test_selection_survives_eviction(self):
+        """Test that a selected row stays selected as older rows go."""
+        view = QTableView()
+        view.setModel(self.proxy)
+        self.add(200)
+        view.selectRow(120)
+        self.add(350)
+        rows = view.selectionModel().selectedRows()
+        self.assertEqual(rows[0].row(), 70)
+        self.assertIs(self.model.packet(self.proxy.mapToSource(rows[0]).row()), self.packets[120])
+        view.deleteLater()
+
+    def test_large_capture(self):
+        """Test a capture many times the capacity, in batches, with a filter set."""
+        self.model.set_capacity(20000)
+        self.proxy.set_filter("TCP", "192.168.1")
+        view = QTableView()
+        view.setModel(self.proxy)
+        for _ in range(50):
+            self.add(2000)
+        self.assertEqual(self.model.rowCount(), 20000)
+        self.assertEqual(self.model.first_seq, 80000)
+        self.assertEqual(self.shown(), self.expected("TCP", "192.168.1"))
+
+        # Rows at the end of the view map back to the newest packets
+        view.scrollTo(self.proxy.index(self.proxy.rowCount() - 1, 0))
+        newest = [p for p in self.packets if p['protocol'] == "TCP" and "192.168.1" in p['src_ip']][-1]
+        last = self.proxy.mapToSource(self.proxy.index(self.proxy.rowCount() - 1, 0)).row()
+        self.assertIs(self.model.packet(last), newest)
+        view.deleteLater()
+
+
+if __name__ == '__main__':
+    unittest.main()
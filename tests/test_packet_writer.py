@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+
+from app.utils.database import Database
+
+
+def make_packets(count, src_ip="10.0.0.1"):
+    return [{
+        'time': datetime.now(),
+        'protocol': 'ARP',
+        'src_ip': src_ip,
+        'dst_ip': '10.0.0.254',
+        'src_mac': '00:11:22:33:44:55',
+        'length': 42,
+        'raw_packet': b'\x00' * 42
+    } for _ in range(count)]
+
+
+class TestPacketWriter(unittest.TestCase):
+    """Test cases for batched packet writes and read-only readers."""
+
+    def setUp(self):
+        """Create a database in a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = Database(os.path.join(self.temp_dir, "test.db"), write_batch_size=100,
+                           write_flush_interval=0.05)
+        self.session_id = self.db.create_capture_session("test")
+
+    def tearDown(self):
+        """Close the database and remove its files."""
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_batched_writes_visible_to_readers(self):
+        """Test that queued packets are committed in batches and read back."""
+        self.assertEqual(self.db.add_packets(self.session_id, make_packets(250)), 250)
+        self.assertTrue(self.db.flush_packets())
+
+        packets = self.db.get_packets(self.session_id, limit=1000)
+        self.assertEqual(len(packets), 250)
+        self.assertEqual(packets[0]['src_ip'], '10.0.0.1')
+        self.assertIsInstance(packets[0]['time'], datetime)
+
+        stats = self.db.get_writer_stats()
+        self.assertEqual(stats['written'], 250)
+        self.assertEqual(stats['dropped'], 0)
+        self.assertLess(stats['transactions'], 250)
+
+        journal_mode = self.db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(journal_mode.lower(), "wal")
+
+    def test_raw_data_not_stored_by_default(self):
+        """Test that the batched path skips the raw packet BLOB."""
+        self.db.add_packets(self.session_id, make_packets(3))
+        self.db.flush_packets()
+        rows = self.db.conn.execute("SELECT data FROM packets").fetchall()
+        self.assertEqual(rows, [(None,), (None,), (None,)])
+
+    def test_full_queue_drops(self):
+        """Test that a full queue drops packets instead of blocking."""
+        db = Database(os.path.join(self.temp_dir, "small.db"), write_queue_size=10)
+        try:
+            session_id = db.create_capture_session()
+            # Hold the write lock so the writer cannot drain the queue
+            blocker = db.conn
+            blocker.execute("BEGIN IMMEDIATE")
+            accepted = db.add_packets(session_id, make_packets(10))
+            accepted += db.add_packets(session_id, make_packets(10))
+            blocker.rollback()
+
+            stats = db.get_writer_stats()
+            self.assertEqual(accepted + stats['dropped'], 20)
+            self.assertGreater(stats['dropped'], 0)
+            self.assertTrue(db.flush_packets())
+            self.assertEqual(len(db.get_packets(session_id)), accepted)
+        finally:
+            db.close()
+
+    def test_reads_from_other_threads(self):
+        """Test that readers on other threads get their own connections."""
+        self.db.add_packets(self.session_id, make_packets(20, "10.0.0.2"))
+        self.db.flush_packets()
+        results = []
+
+        def read():
+            results.append(self.db.get_top_talkers(self.session_id))
+
+        threads = [threading.Thread(target=read) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([talkers['10.0.0.2']['sent_packets'] for talkers in results], [20, 20, 20])
+        self.assertEqual(len(self.db._reader_conns), 3)
+
+    def test_end_session_flushes(self):
+        """Test that ending a session writes its queued packets first."""
+        self.db.add_packets(self.session_id, make_packets(5))
+        self.assertTrue(self.db.end_capture_session(self.session_id, 5, 210))
+        self.assertEqual(self.db.get_protocol_distribution(self.session_id), {'ARP': 5})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import random
+from src.core.pattern_database import (
+    PatternDatabase, Pattern, PatternFeature, PatternCategory, PatternMatchType
+)
+from src.core.pattern_matcher import PatternMatcher
+
+
+def brute_force(matcher, features):
+    """Score every pattern without the index."""
+    results = []
+    for pattern in matcher.pattern_database.get_all_patterns():
+        result = matcher._match_pattern(pattern, features)
+        if result:
+            results.append((result.pattern_id, result.score, result.matched_features))
+    return results
+
+
+class TestFeatureIndex(unittest.TestCase):
+    """Test the compiled feature index used by the pattern matcher."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.pattern_database = PatternDatabase(None)
+        self.pattern_matcher = PatternMatcher(self.pattern_database)
+        self.pattern_database.add_pattern(Pattern(
+            id="TEST-INDEX-001",
+            name="Mixed Features",
+            description="Pattern with every match type",
+            category=PatternCategory.CUSTOM,
+            features=[
+                PatternFeature("is_gratuitous", True, weight=2.0),
+                PatternFeature("vendor", r"ab:c", PatternMatchType.REGEX),
+                PatternFeature("targets", ["a"], PatternMatchType.PARTIAL),
+                PatternFeature("rate", 100, PatternMatchType.FUZZY, weight=0.5)
+            ],
+            confidence=0.5
+        ))
+
+    def test_matches_brute_force(self):
+        """Test that indexed matching gives the same results as scoring every pattern."""
+        rng = random.Random(7)
+        names = ["is_at_request", "is_gratuitous", "sender_is_gateway_ip", "target_is_gateway",
+                 "gateway_mac_changed", "packet_rate_high", "multiple_targets",
+                 "random_mac_addresses", "rapid_changes"]
+        for _ in range(300):
+            features = {name: rng.choice([True, False, None]) for name in names}
+            features["vendor"] = rng.choice(["ab:cd", "zz", None])
+            features["targets"] = rng.choice([["a", "b"], ["b"], None])
+            features["rate"] = rng.choice([95, 150, None])
+
+            indexed = [(r.pattern_id, r.score, r.matched_features)
+                       for r in self.pattern_matcher._match_features(features)]
+            self.assertEqual(indexed, brute_force(self.pattern_matcher, features))
+
+    def test_incremental_updates(self):
+        """Test that adding, replacing and removing patterns updates the index."""
+        index = self.pattern_database.feature_index
+        features = {"is_gratuitous": True, "vendor": "zz", "targets": ["b"], "rate": 105}
+        self.assertIn("TEST-INDEX-001", [r.pattern_id for r in self.pattern_matcher._match_features(features)])
+
+        # Replacing a pattern drops its old entries
+        self.pattern_database.add_pattern(Pattern(
+            id="TEST-INDEX-001",
+            name="Replaced",
+            description="Replaced pattern",
+            category=PatternCategory.CUSTOM,
+            features=[PatternFeature("is_gratuitous", False)],
+            confidence=1.0
+        ))
+        self.assertNotIn("vendor", index.generic)
+        self.assertNotIn("TEST-INDEX-001", [r.pattern_id for r in self.pattern_matcher._match_features(features)])
+
+        self.assertTrue(self.pattern_database.remove_pattern("TEST-INDEX-001"))
+        self.assertNotIn("TEST-INDEX-001", index.patterns)
+        self.assertEqual(set(index.patterns), set(self.pattern_database.patterns))
+        self.assertEqual(sorted(index.order, key=index.order.get), list(index.patterns))
+
+    def test_context_ring_buffers(self):
+        """Test that recent context keeps only the newest entries."""
+        for i in range(150):
+            self.pattern_matcher.process_packet({
+                "arp_operation": 1,
+                "sender_ip": "10.0.0.1",
+                "sender_mac": f"{i:02x}:00:00:00:00:01",
+                "target_ip": f"10.0.0.{i}"
+            })
+
+        context = self.pattern_matcher.context
+        self.assertEqual(len(context["recent_packets"]), 100)
+        self.assertEqual(context["recent_packets"][-1]["target_ip"], "10.0.0.149")
+        self.assertEqual(len(context["recent_targets"]), 100)
+        self.assertIn("10.0.0.149", context["recent_targets"])
+        self.assertNotIn("10.0.0.0", context["recent_targets"])
+        self.assertEqual(len(context["recent_ouis"]), 50)
+        self.assertIn("95:00:00", context["recent_ouis"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import socket
+import selectors
+import threading
+import time
+import unittest
+
+from app.utils.port_scanner import PortScanner, RttEstimator
+
+BANNER = b"SSH-2.0-OpenSSH_7.4\r\n"
+
+
+class ServerFarm:
+    """Loopback TCP listeners answering like simple services."""
+
+    def __init__(self, count, banner_every=2, probe_every=5):
+        """Open count listeners; some greet clients and some answer probes."""
+        self.selector = selectors.DefaultSelector()
+        self.ports = []
+        self.greeting = set()
+        self.answering = set()
+        for i in range(count):
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.bind(("127.0.0.1", 0))
+            listener.listen(128)
+            listener.setblocking(False)
+            port = listener.getsockname()[1]
+            self.ports.append(port)
+            if i % banner_every == 0:
+                self.greeting.add(port)
+            elif i % probe_every == 1:
+                self.answering.add(port)
+            self.selector.register(listener, selectors.EVENT_READ, port)
+        self.running = True
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while self.running:
+            for key, _ in self.selector.select(0.05):
+                if key.data is None:
+                    # Probe reply from a client
+                    try:
+                        if key.fileobj.recv(1024):
+                            key.fileobj.send(b"ECHO\r\n")
+                    except OSError:
+                        pass
+                    self.selector.unregister(key.fileobj)
+                    key.fileobj.close()
+                    continue
+                try:
+                    conn, _ = key.fileobj.accept()
+                except OSError:
+                    continue
+                if key.data in self.greeting:
+                    conn.send(BANNER)
+                    conn.close()
+                elif key.data in self.answering:
+                    self.selector.register(conn, selectors.EVENT_READ, None)
+                else:
+                    conn.close()
+
+    def close(self):
+        self.running = False
+        self.thread.join()
+        for key in list(self.selector.get_map().values()):
+            key.fileobj.close()
+        self.selector.close()
+
+
+def closed_ports(count):
+    """Find loopback ports with nothing listening."""
+    sockets = []
+    for _ in range(count):
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.bind(("127.0.0.1", 0))
+        sockets.append(s)
+    ports = [s.getsockname()[1] for s in sockets]
+    for s in sockets:
+        s.close()
+    return ports
+
+
+class TestPortScanner(unittest.TestCase):
+    """Test cases for the asynchronous port scanner."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.farm = ServerFarm(20)
+        self.closed = closed_ports(10)
+        probes = {port: b"" for port in self.farm.greeting}
+        probes.update({port: b"HELLO {host}\r\n" for port in self.farm.answering})
+        self.scanner = PortScanner(timeout=1.0, banner_timeout=0.5, per_host_limit=8, probes=probes)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.farm.close()
+
+    def test_open_ports_and_banners(self):
+        """Test that open ports are found and probed ports return banners."""
+        progress = []
+        finished = []
+        results = self.scanner.scan(
+            ["127.0.0.1"], self.farm.ports + self.closed,
+            progress=lambda done, total: progress.append((done, total)),
+            host_complete=lambda host, result: finished.append(host)
+        )
+
+        result = results["127.0.0.1"]
+        self.assertEqual({port for port, is_open in result['ports'].items() if is_open}, set(self.farm.ports))
+        self.assertEqual(len(result['ports']), 30)
+        for port in self.farm.greeting:
+            self.assertEqual(result['banners'][port], BANNER)
+        for port in self.farm.answering:
+            self.assertEqual(result['banners'][port], b"ECHO\r\n")
+        self.assertEqual(set(result['banners']), self.farm.greeting | self.farm.answering)
+
+        self.assertEqual(progress[-1], (30, 30))
+        self.assertEqual(finished, ["127.0.0.1"])
+        self.assertEqual(self.scanner.stats['open_ports'], 20)
+
+    def test_cancel(self):
+        """Test that a scan can be cancelled from another thread."""
+        scanner = PortScanner(timeout=0.5, max_concurrency=1, probes={})
+        hosts = [f"127.0.{i}.1" for i in range(50)]
+        # Slow progress handling keeps the scan running long enough to cancel
+        scanner_thread = threading.Thread(
+            target=scanner.scan, args=(hosts, self.closed, lambda done, total: time.sleep(0.01)))
+        scanner_thread.start()
+        time.sleep(0.1)
+        scanner.cancel()
+        scanner_thread.join(timeout=2.0)
+
+        self.assertFalse(scanner_thread.is_alive())
+        self.assertTrue(scanner.cancelled)
+        self.assertLess(scanner.stats['ports_scanned'], 500)
+
+        # A cancelled scanner does not start new scans
+        self.assertEqual(scanner.scan(["127.0.0.1"], self.closed)["127.0.0.1"]['ports'], {})
+
+    def test_adaptive_timeout(self):
+        """Test that the connect timeout follows the observed round-trip time."""
+        rtt = RttEstimator(initial_timeout=1.0, min_timeout=0.05)
+        self.assertEqual(rtt.timeout, 1.0)
+        for _ in range(10):
+            rtt.update(0.001)
+        self.assertEqual(rtt.timeout, 0.05)
+        for _ in range(10):
+            rtt.update(0.2)
+        self.assertGreater(rtt.timeout, 0.2)
+        self.assertLessEqual(rtt.timeout, 1.0)
+
+    def test_many_hosts(self):
+        """Test that every port of every host is probed and reported."""
+        hosts = [f"127.0.0.{i}" for i in range(1, 41)]
+        scanner = PortScanner(timeout=1.0, probes={})
+        results = scanner.scan(hosts, self.farm.ports + self.closed)
+
+        self.assertEqual(sorted(results), sorted(hosts))
+        self.assertEqual(scanner.stats['ports_scanned'], 1200)
+        for host in hosts:
+            self.assertEqual(len(results[host]['ports']), 30, host)
+            # The farm only listens on the first address
+            expected = set(self.farm.ports) if host == "127.0.0.1" else set()
+            self.assertEqual({port for port, is_open in results[host]['ports'].items() if is_open},
+                             expected, host)
+
+
+if __name__ == '__main__':
+    unittest.main()
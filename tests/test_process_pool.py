@@ -0,0 +1,98 @@
+import unittest
+import tempfile
+import shutil
+import time
+from src.core.arp_batch import ARPFrameView, ARP_RECORD_SIZE
+from src.core.parallel.process_pool import SharedRingBuffer
+from src.core.detection_module import DetectionModule, DetectionModuleConfig
+from tests.test_detection_sharding import make_view
+
+
+class TestSharedRingBuffer(unittest.TestCase):
+    """Test cases for the shared memory ring buffer."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.ring = SharedRingBuffer(ARP_RECORD_SIZE, capacity=4)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.ring.close()
+
+    def test_round_trip(self):
+        """Test that views survive the compact binary encoding."""
+        view = make_view(op=2, sender_mac='aa:bb:cc:dd:ee:ff', sender_ip='10.0.0.7')
+        view.timestamp = 12.5
+        self.assertEqual(self.ring.put_many([view], ARPFrameView.pack_into), 1)
+
+        reader = SharedRingBuffer.attach(self.ring.name, ARP_RECORD_SIZE, 4)
+        [copy] = reader.get_many(10, ARPFrameView.unpack_from)
+        reader.close()
+
+        self.assertEqual((copy.op, copy.hwsrc, copy.psrc, copy.pdst, copy.timestamp),
+                         (2, 'aa:bb:cc:dd:ee:ff', '10.0.0.7', view.pdst, 12.5))
+
+    def test_full_and_wraparound(self):
+        """Test that a full ring rejects items and that indices wrap."""
+        views = [make_view(sender_ip=f'10.0.0.{i}') for i in range(1, 7)]
+        self.assertEqual(self.ring.put_many(views, ARPFrameView.pack_into), 4)
+        self.assertEqual(self.ring.qsize(), 4)
+
+        first = self.ring.get_many(3, ARPFrameView.unpack_from)
+        self.assertEqual([v.psrc for v in first], ['10.0.0.1', '10.0.0.2', '10.0.0.3'])
+
+        self.assertEqual(self.ring.put_many(views[4:], ARPFrameView.pack_into), 2)
+        rest = self.ring.get_many(10, ARPFrameView.unpack_from)
+        self.assertEqual([v.psrc for v in rest], ['10.0.0.4', '10.0.0.5', '10.0.0.6'])
+        self.assertEqual(self.ring.get_many(10, ARPFrameView.unpack_from, timeout=0.01), [])
+
+
+class TestProcessDetectionMode(unittest.TestCase):
+    """Test cases for running detection in worker processes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.storage_path = tempfile.mkdtemp()
+        self.config = DetectionModuleConfig(storage_path=self.storage_path, execution_mode='process',
+                                            worker_processes=2, detection_threshold=2)
+        self.module = DetectionModule(self.config)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        if self.module.running:
+            self.module.stop()
+        shutil.rmtree(self.storage_path, ignore_errors=True)
+
+    def test_invalid_mode(self):
+        """Test that unknown execution modes are rejected."""
+        with self.assertRaises(ValueError):
+            DetectionModuleConfig(storage_path=self.storage_path, execution_mode='fiber')
+
+    def test_alerts_and_process_stats(self):
+        """Test that worker processes detect spoofing and report throughput."""
+        self.module.start()
+        for _ in range(10):
+            for i in range(1, 9):
+                self.module.process_packet(make_view(sender_ip=f'10.0.0.{i}'))
+        for mac in ('de:ad:be:ef:00:01', 'de:ad:be:ef:00:02'):
+            self.module.process_packet(make_view(op=2, sender_mac=mac, sender_ip='10.0.0.3'))
+
+        for _ in range(100):
+            stats = self.module.get_stats()
+            if stats['attack_alerts'] and sum(p['packets_received'] for p in stats['processes']) == 82:
+                break
+            time.sleep(0.05)
+
+        self.assertEqual(stats['attack_alerts'], 1)
+        self.assertEqual(len(stats['processes']), 2)
+        self.assertTrue(all(p['alive'] for p in stats['processes']))
+        self.assertEqual(sum(p['packets_received'] for p in stats['processes']), 82)
+        self.assertEqual(stats['arp_packets_processed'] + stats['fast_path_hits'], 82)
+        self.assertGreater(stats['processes'][0]['packets_per_second'], 0)
+
+        self.module.stop()
+        self.assertIsNone(self.module.process_pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
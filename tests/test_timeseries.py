@@ -0,0 +1,90 @@
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from app.utils.timeseries import TimeSeriesStore
+
+# Start of an hour, so minute and hour buckets line up with the test data
+BASE = 1_700_000_000 - 1_700_000_000 % 3600
+
+
+class TestTimeSeriesStore(unittest.TestCase):
+    """Test cases for the multi-resolution time-series store."""
+
+    def setUp(self):
+        """Create a store in a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = TimeSeriesStore(self.temp_dir)
+
+    def tearDown(self):
+        """Remove the segment files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_rollups(self):
+        """Test that every resolution sums the same packets."""
+        for second in range(180):
+            for _ in range(second % 3):
+                self.store.record_packet({'protocol': 'ARP', 'arp_op': 'request', 'length': 42},
+                                         timestamp=BASE + second)
+
+        per_second = self.store.query('packets', BASE, BASE + 179, interval=1)
+        self.assertEqual([value for _, value in per_second[:4]], [0, 1, 2, 0])
+
+        per_minute = self.store.query('packets', BASE, BASE + 179, interval=60)
+        self.assertEqual([value for _, value in per_minute], [60, 60, 60])
+        self.assertEqual(self.store.query('bytes_arp', BASE, BASE + 3599, interval=3600), [(BASE, 180 * 42)])
+        self.assertEqual(self.store.query('packet_rate', BASE, BASE + 59, interval=60), [(BASE, 1.0)])
+        self.assertEqual(self.store.get_totals()['arp_requests'], 180)
+
+    def test_gauges_average(self):
+        """Test that gauges are averaged over each interval."""
+        self.store.record_gauges(BASE, cpu_usage=10.0)
+        self.store.record_gauges(BASE + 30, cpu_usage=30.0)
+        self.assertEqual(self.store.query('cpu_usage', BASE, BASE + 119, interval=60), [(BASE, 20.0), (BASE + 60, 0.0)])
+
+    def test_persisted_across_restart(self):
+        """Test that a new store reads closed and reopened buckets from disk."""
+        self.store.record_alert(BASE + 5, count=2)
+        self.store.record_alert(BASE + 70)
+        self.store.flush()
+
+        store = TimeSeriesStore(self.temp_dir)
+        self.assertEqual(store.query('alerts', BASE, BASE + 119, interval=60), [(BASE, 2.0), (BASE + 60, 1.0)])
+
+        # A bucket reopened after a restart keeps its earlier counts
+        store.record_alert(BASE + 80)
+        store.flush()
+        reopened = TimeSeriesStore(self.temp_dir)
+        self.assertEqual(reopened.query('alerts', BASE + 60, BASE + 119, interval=60), [(BASE + 60, 2.0)])
+        self.assertEqual(reopened.query('alerts', BASE, BASE + 3599, interval=3600), [(BASE, 4.0)])
+
+    def test_evicted_buckets_read_from_disk(self):
+        """Test that buckets that left the in-memory ring are still queryable."""
+        self.store.record(BASE, packets=7)
+        # Two hours later the first second-level bucket has been evicted and written out
+        for second in range(0, 7200, 10):
+            self.store.record(BASE + 10 + second, packets=1)
+        self.store.flush()
+
+        self.assertEqual(self.store.query('packets', BASE, BASE + 9, interval=1)[0], (BASE, 7.0))
+
+        # Late data for an evicted bucket is merged into its stored record
+        self.store.record(BASE, packets=1)
+        self.assertEqual(self.store.query('packets', BASE, BASE, interval=1), [(BASE, 8.0)])
+
+    def test_query_limits(self):
+        """Test that oversized ranges and unknown metrics are rejected."""
+        with self.assertRaises(ValueError):
+            self.store.query('packets', BASE, BASE + 86400, interval=1)
+        with self.assertRaises(ValueError):
+            self.store.query('unknown', BASE, BASE + 60)
+
+    def test_packet_time_used(self):
+        """Test that a packet's own time selects its bucket."""
+        self.store.record_packet({'protocol': 'TCP', 'length': 100, 'time': datetime.fromtimestamp(BASE + 61)})
+        self.assertEqual(self.store.query('bytes_tcp', BASE, BASE + 119, interval=60), [(BASE, 0.0), (BASE + 60, 100.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from src.core.window_stats import (
+    SlidingCounter, BindingWindow, TargetScanTracker, WindowStats, SHORT_WINDOW, MEDIUM_WINDOW
+)
+
+
+class TestSlidingCounter(unittest.TestCase):
+    """Test cases for the time-windowed event counter."""
+
+    def test_counts_and_expiry(self):
+        """Test that running counts follow evictions."""
+        window = SlidingCounter(span=10)
+        for i in range(5):
+            window.add(float(i), "request" if i % 2 else "reply")
+
+        self.assertEqual(window.count("reply"), 3)
+        self.assertEqual(window.count("request"), 2)
+
+        evicted = window.expire(12.0)
+        self.assertEqual([event[0] for event in evicted], [0.0, 1.0, 2.0])
+        self.assertEqual(window.count("reply"), 1)
+        self.assertEqual(window.count("request"), 1)
+        self.assertEqual(window.first_timestamp, 3.0)
+
+    def test_event_cap(self):
+        """Test that the oldest event is dropped once the cap is reached."""
+        window = SlidingCounter(span=100, max_events=3)
+        for i in range(5):
+            window.add(float(i), i % 2)
+
+        self.assertEqual(len(window), 3)
+        self.assertEqual(window.count(0), 2)
+        self.assertEqual(window.count(1), 1)
+
+
+class TestBindingWindow(unittest.TestCase):
+    """Test cases for incremental MAC change tracking."""
+
+    def test_changes_leave_with_window(self):
+        """Test that a change is dropped with the packet before it."""
+        window = BindingWindow(span=10)
+        window.add(0.0, "aa")
+        window.add(1.0, "bb")
+        window.add(2.0, "bb")
+        window.add(3.0, "aa")
+
+        self.assertEqual([(c["old_mac"], c["new_mac"]) for c in window.changes],
+                         [("aa", "bb"), ("bb", "aa")])
+
+        window.expire(10.5)
+        self.assertEqual([(c["old_mac"], c["new_mac"]) for c in window.changes], [("bb", "aa")])
+
+        window.expire(12.5)
+        self.assertEqual(list(window.changes), [])
+        self.assertEqual(window.mac_first_seen("aa"), 3.0)
+
+
+class TestTargetScanTracker(unittest.TestCase):
+    """Test cases for the per-/24 target bitmaps."""
+
+    def test_sequential_pairs(self):
+        """Test adjacent octet counting as targets come and go."""
+        tracker = TargetScanTracker(span=100)
+        for octet in (10, 12, 11, 11, 40):
+            tracker.add(float(octet), f"192.168.1.{octet}")
+        tracker.add(50.0, "10.0.0.1")
+
+        self.assertEqual(tracker.unique_targets, 5)
+        self.assertEqual(tracker.sequential_pairs, 2)
+        self.assertEqual(tracker.most_scanned_subnet(), ("192.168.1", 4))
+
+        # Octet 11 stays until both of its requests have left the window
+        tracker.expire(110.5)
+        self.assertEqual(tracker.unique_targets, 4)
+        self.assertEqual(tracker.sequential_pairs, 1)
+
+        tracker.expire(112.0)
+        self.assertEqual(tracker.unique_targets, 2)
+        self.assertEqual(tracker.sequential_pairs, 0)
+
+    def test_matches_pairwise_scan(self):
+        """Test that bitmap pairs equal a pairwise comparison of targets."""
+        tracker = TargetScanTracker(span=1000)
+        octets = [3, 4, 5, 9, 10, 200, 201, 0, 1, 255, 254, 77]
+        for i, octet in enumerate(octets):
+            tracker.add(float(i), f"10.1.2.{octet}")
+
+        expected = sum(1 for i, a in enumerate(octets) for b in octets[i + 1:] if abs(a - b) == 1)
+        self.assertEqual(tracker.sequential_pairs, expected)
+
+
+class TestWindowStats(unittest.TestCase):
+    """Test cases for the combined per-host window aggregates."""
+
+    def test_reply_matching(self):
+        """Test that replies are marked solicited only after a recent request."""
+        stats = WindowStats()
+        stats.update(100.0, "aa", "10.0.0.1", "10.0.0.2", is_reply=False)
+        stats.update(100.5, "bb", "10.0.0.2", "10.0.0.1", is_reply=True)
+        stats.update(105.0, "bb", "10.0.0.2", "10.0.0.1", is_reply=True)
+
+        replies = stats.macs["bb"].replies
+        self.assertEqual(replies.count(True), 1)
+        self.assertEqual(replies.count(False), 1)
+        self.assertEqual(stats.medium_requests, 1)
+        self.assertEqual(stats.medium_replies, 2)
+
+    def test_expire_forgets_idle_hosts(self):
+        """Test that totals drop and idle hosts are removed."""
+        stats = WindowStats()
+        for i in range(20):
+            stats.update(float(i), "aa", "10.0.0.1", f"10.0.0.{i + 10}", is_reply=False)
+
+        self.assertEqual(stats.short_total, 20)
+        stats.expire(SHORT_WINDOW + 10.0)
+        self.assertEqual(stats.short_total, 9)
+        self.assertEqual(stats.medium_requests, 20)
+
+        stats.expire(MEDIUM_WINDOW + 20.0)
+        self.assertEqual(stats.short_total, 0)
+        self.assertEqual(stats.medium_requests, 0)
+        self.assertEqual(stats.macs, {})
+        self.assertEqual(stats.ips, {})
+
+
+if __name__ == '__main__':
+    unittest.main()